@@ -49,6 +49,8 @@ class ContentRequest(BaseModel):
 class TrackingEventRequest(BaseModel):
     campaign_id: str
     event_type: str
+    event_id: str | None = None  # lets client retries be deduplicated
+    source: str | None = None
 
 
 class FailTrackingEventRequest(BaseModel):
@@ -138,6 +140,8 @@ async def register_tracking_event(tracking_request: TrackingEventRequest):
         await publisher.publish_tracking_event(
             tracking_request.campaign_id,
             tracking_request.event_type,
+            tracking_request.event_id,
+            tracking_request.source,
         )
         return {
             "message": "Tracking event published successfully",
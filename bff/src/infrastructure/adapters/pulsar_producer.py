@@ -134,7 +134,13 @@ class PulsarEventPublisher(EventPublisher):
             f"Event sent for content association: {content_id} to campaign {campaign_id}"
         )
 
-    async def publish_tracking_event(self, campaign_id: str, event_type: str) -> None:
+    async def publish_tracking_event(
+        self,
+        campaign_id: str,
+        event_type: str,
+        event_id: str | None = None,
+        source: str | None = None,
+    ) -> None:
         from datetime import datetime
 
         timestamp = datetime.utcnow().isoformat()
@@ -142,6 +148,8 @@ class PulsarEventPublisher(EventPublisher):
             campaign_id=campaign_id,
             event_type=event_type,
             timestamp=timestamp,
+            event_id=event_id,
+            source=source,
         )
         self.tracking_producer.send(record)
         logger.info(f"Event sent for tracking: {event_type} on campaign {campaign_id}")
@@ -19,6 +19,8 @@ class TrackingEventRecord(Record):
     campaign_id = String()
     event_type = String()
     timestamp = String()  # ISO string
+    event_id = String()  # optional client-supplied id used for dedup
+    source = String()  # optional origin of the event
 
 
 class PaymentRecord(Record):
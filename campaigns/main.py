@@ -2,6 +2,7 @@ import asyncio
 import os
 import logging
 import pulsar
+import uvicorn
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from dotenv import load_dotenv
 from src.infrastructure.adapters.postgres_partner_repository import (
@@ -28,7 +29,10 @@ from src.infrastructure.adapters.campaign_partner_association_consumer import (
     CampaignPartnerAssociationConsumer,
 )
 from src.infrastructure.adapters.content_consumer import ContentConsumer
-from src.infrastructure.adapters.models import metadata
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+from src.infrastructure.adapters.dead_letter_policy import DeadLetterPolicy
+from src.api import app, register_stats_provider
 
 load_dotenv()
 
@@ -47,9 +51,7 @@ async def main():
     )
     logger.info(f"Connecting to database: {database_url}")
     engine = create_async_engine(database_url)
-    async with engine.begin() as conn:
-        await conn.run_sync(metadata.create_all)
-    logger.info("Database tables created/verified")
+    await SchemaMigrator(engine, MIGRATIONS).check()
 
     # Dependency injection
     session_partner = AsyncSession(engine)
@@ -82,18 +84,52 @@ async def main():
         "PULSAR_CONTENT_TOPIC",
         "persistent://miso-1-2025/default/campaign-content-association",
     )
+
+    def dead_letter_policy():
+        # One per consumer, each with its own dead letter topic and counters
+        policy = DeadLetterPolicy(
+            max_redeliveries=int(os.getenv("DLQ_MAX_REDELIVERIES", "5")),
+            backoff_base_ms=int(os.getenv("DLQ_BACKOFF_BASE_MS", "500")),
+            backoff_max_ms=int(os.getenv("DLQ_BACKOFF_MAX_MS", "60000")),
+        )
+        register_stats_provider(policy)
+        return policy
+
     # Create consumers with separate clients
     partner_consumer = PulsarConsumer(
-        partner_handler, pulsar_service_url, partner_topic, pulsar_token
+        partner_handler,
+        pulsar_service_url,
+        partner_topic,
+        pulsar_token,
+        dead_letter_policy=dead_letter_policy(),
     )
     campaign_consumer = CampaignPulsarConsumer(
-        campaign_handler, pulsar_service_url, campaign_topic, pulsar_token
+        campaign_handler,
+        pulsar_service_url,
+        campaign_topic,
+        pulsar_token,
+        dead_letter_policy=dead_letter_policy(),
     )
     association_consumer = CampaignPartnerAssociationConsumer(
-        campaign_partner_handler, pulsar_service_url, association_topic, pulsar_token
+        campaign_partner_handler,
+        pulsar_service_url,
+        association_topic,
+        pulsar_token,
+        dead_letter_policy=dead_letter_policy(),
     )
     content_consumer = ContentConsumer(
-        content_handler, pulsar_service_url, content_topic, pulsar_token
+        content_handler,
+        pulsar_service_url,
+        content_topic,
+        pulsar_token,
+        dead_letter_policy=dead_letter_policy(),
+    )
+    api_server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host=os.getenv("API_HOST", "0.0.0.0"),
+            port=int(os.getenv("API_PORT", "8000")),
+        )
     )
     logger.info(
         f"Starting Pulsar consumers on {pulsar_service_url}, partner topic: {partner_topic}, campaign topic: {campaign_topic}, association topic: {association_topic}, content topic: {content_topic}"
@@ -104,6 +140,7 @@ async def main():
     campaign_task = asyncio.create_task(campaign_consumer.start())
     association_task = asyncio.create_task(association_consumer.start())
     content_task = asyncio.create_task(content_consumer.start())
+    api_task = asyncio.create_task(api_server.serve())
     try:
         await asyncio.gather(
             partner_task, campaign_task, association_task, content_task
@@ -133,6 +170,7 @@ async def main():
     except asyncio.CancelledError:
         pass
     finally:
+        api_task.cancel()
         logger.info("Closing database sessions")
         await session_partner.close()
         await session_campaign.close()
@@ -0,0 +1,18 @@
+from fastapi import FastAPI
+
+app = FastAPI(title="Campaigns Service", version="1.0.0")
+
+# Components exposing a stats() dict for /metrics, injected from main
+stats_providers = []
+
+
+def register_stats_provider(provider):
+    stats_providers.append(provider)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    metrics = {}
+    for provider in stats_providers:
+        metrics.update(provider.stats())
+    return metrics
@@ -10,6 +10,7 @@ from src.application.commands.associate_partner_to_campaign_command import (
     AssociatePartnerToCampaignCommand,
 )
 from src.domain.entities.campaign_partner import CampaignPartner
+from .dead_letter_policy import DeadLetterPolicy
 from .campaign_schemas import CampaignPartnerAssociationRecord
 
 logger = logging.getLogger(__name__)
@@ -23,11 +24,13 @@ class CampaignPartnerAssociationConsumer:
         topic: str = "persistent://miso-1-2025/default/campaign-partner-association",
         token: str = "",
         client=None,
+        dead_letter_policy: DeadLetterPolicy | None = None,
     ):
         self.handler = handler
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
         self.client = client
         self.consumer = None
 
@@ -51,6 +54,13 @@ class CampaignPartnerAssociationConsumer:
                 self.topic,
                 "campaign-partner-association-subscriber",
                 schema=AvroSchema(CampaignPartnerAssociationRecord),
+                **self.dead_letter_policy.subscribe_options(),
+            )
+            await self.dead_letter_policy.attach(
+                self.client,
+                self.consumer,
+                self.topic,
+                "campaign-partner-association-subscriber",
             )
             logger.info(
                 f"Successfully subscribed to topic: {self.topic} with subscription: campaign-partner-association-subscriber"
@@ -63,6 +73,8 @@ class CampaignPartnerAssociationConsumer:
             if asyncio.current_task().cancelled():
                 break
             msg = None
+            # Records that cannot be decoded or validated will never succeed
+            permanent = True
             try:
                 logger.info(
                     f"Campaign-partner association consumer waiting for message on topic: {self.topic}"
@@ -80,6 +92,7 @@ class CampaignPartnerAssociationConsumer:
                     "partner_id": record.partner_id,
                 }
                 campaign_partner = CampaignPartner(**data)
+                permanent = False
                 command = AssociatePartnerToCampaignCommand(campaign_partner)
                 await self.handler.handle(command)
                 await asyncio.to_thread(self.consumer.acknowledge, msg)
@@ -96,15 +109,13 @@ class CampaignPartnerAssociationConsumer:
                     f"Error processing campaign-partner association message: {e}"
                 )
                 if msg:
-                    await asyncio.to_thread(self.consumer.negative_acknowledge, msg)
-                    logger.warning(
-                        f"Negatively acknowledged message for campaign-partner association"
-                    )
+                    await self.dead_letter_policy.fail(msg, e, permanent)
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Pulsar consumer stopped")
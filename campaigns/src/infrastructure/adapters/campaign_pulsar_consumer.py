@@ -6,6 +6,7 @@ from pulsar.schema import AvroSchema
 from src.application.handlers.register_campaign_handler import RegisterCampaignHandler
 from src.application.commands.register_campaign_command import RegisterCampaignCommand
 from src.domain.entities.campaign import Campaign
+from .dead_letter_policy import DeadLetterPolicy
 from .campaign_schemas import CampaignRecord
 
 logger = logging.getLogger(__name__)
@@ -19,11 +20,13 @@ class CampaignPulsarConsumer:
         topic: str = "persistent://miso-1-2025/default/campaign-creation",
         token: str = "",
         client=None,
+        dead_letter_policy: DeadLetterPolicy | None = None,
     ):
         self.handler = handler
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
         self.client = client
         self.consumer = None
 
@@ -47,6 +50,10 @@ class CampaignPulsarConsumer:
                 self.topic,
                 "campaign-subscriber",
                 schema=AvroSchema(CampaignRecord),
+                **self.dead_letter_policy.subscribe_options(),
+            )
+            await self.dead_letter_policy.attach(
+                self.client, self.consumer, self.topic, "campaign-subscriber"
             )
             logger.info(
                 f"Successfully subscribed to topic: {self.topic} with subscription: campaign-subscriber"
@@ -59,6 +66,8 @@ class CampaignPulsarConsumer:
             if asyncio.current_task().cancelled():
                 break
             msg = None
+            # Records that cannot be decoded or validated will never succeed
+            permanent = True
             try:
                 logger.info(
                     f"Campaign consumer waiting for message on topic: {self.topic}"
@@ -71,6 +80,7 @@ class CampaignPulsarConsumer:
                 logger.info(f"Processing campaign record: {record.campaign_id}")
                 data = {"campaign_id": record.campaign_id, "name": record.name}
                 campaign = Campaign(**data)
+                permanent = False
                 command = RegisterCampaignCommand(campaign)
                 await self.handler.handle(command)
                 self.consumer.acknowledge(msg)
@@ -83,13 +93,13 @@ class CampaignPulsarConsumer:
             except Exception as e:
                 logger.error(f"Error processing campaign message: {e}")
                 if msg:
-                    self.consumer.negative_acknowledge(msg)
-                    logger.warning(f"Negatively acknowledged message for campaign")
+                    await self.dead_letter_policy.fail(msg, e, permanent)
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Pulsar consumer stopped")
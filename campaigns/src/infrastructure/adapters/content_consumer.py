@@ -6,6 +6,7 @@ from pulsar.schema import AvroSchema
 from src.application.handlers.register_content_handler import RegisterContentHandler
 from src.application.commands.register_content_command import RegisterContentCommand
 from src.domain.entities.content import Content
+from .dead_letter_policy import DeadLetterPolicy
 from .campaign_schemas import ContentRecord
 
 logger = logging.getLogger(__name__)
@@ -19,11 +20,13 @@ class ContentConsumer:
         topic: str = "persistent://miso-1-2025/default/campaign-content-association",
         token: str = "",
         client=None,
+        dead_letter_policy: DeadLetterPolicy | None = None,
     ):
         self.handler = handler
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
         self.client = client
         self.consumer = None
 
@@ -47,6 +50,10 @@ class ContentConsumer:
                 self.topic,
                 "content-association-subscriber",
                 schema=AvroSchema(ContentRecord),
+                **self.dead_letter_policy.subscribe_options(),
+            )
+            await self.dead_letter_policy.attach(
+                self.client, self.consumer, self.topic, "content-association-subscriber"
             )
             logger.info(
                 f"Successfully subscribed to topic: {self.topic} with subscription: content-association-subscriber"
@@ -59,6 +66,8 @@ class ContentConsumer:
             if asyncio.current_task().cancelled():
                 break
             msg = None
+            # Records that cannot be decoded or validated will never succeed
+            permanent = True
             try:
                 logger.info(
                     f"Content association consumer waiting for message on topic: {self.topic}"
@@ -77,6 +86,7 @@ class ContentConsumer:
                     "content_url": record.content_url,
                 }
                 content = Content(**data)
+                permanent = False
                 command = RegisterContentCommand(content)
                 await self.handler.handle(command)
                 await asyncio.to_thread(self.consumer.acknowledge, msg)
@@ -89,15 +99,13 @@ class ContentConsumer:
             except Exception as e:
                 logger.error(f"Error processing content association message: {e}")
                 if msg:
-                    await asyncio.to_thread(self.consumer.negative_acknowledge, msg)
-                    logger.warning(
-                        f"Negatively acknowledged message for content association"
-                    )
+                    await self.dead_letter_policy.fail(msg, e, permanent)
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Pulsar consumer stopped")
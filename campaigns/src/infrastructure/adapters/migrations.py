@@ -0,0 +1,81 @@
+from .schema_migrator import Migration
+
+# Applied in order by migrate.py; never edit a released migration, add a new one.
+# Version 1 uses IF NOT EXISTS so databases created by metadata.create_all
+# are adopted as they are.
+MIGRATIONS = [
+    Migration(
+        1,
+        "baseline schema",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS partners (
+                id SERIAL PRIMARY KEY,
+                partner_id VARCHAR(255) NOT NULL,
+                partner_type VARCHAR(255) NOT NULL,
+                acceptance_terms TEXT NOT NULL,
+                estimated_monthly_reach INTEGER NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS campaigns (
+                id SERIAL PRIMARY KEY,
+                campaign_id VARCHAR(255) NOT NULL,
+                name VARCHAR(255) NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS campaign_partners (
+                id SERIAL PRIMARY KEY,
+                campaign_id VARCHAR(255) NOT NULL,
+                partner_id VARCHAR(255) NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS contents (
+                id SERIAL PRIMARY KEY,
+                content_id VARCHAR(255) NOT NULL,
+                campaign_id VARCHAR(255) NOT NULL,
+                content_url TEXT NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "hot-path indexes",
+        (
+            # Partner lookup done by comissions for every commission
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaign_partners_campaign_id ON campaign_partners (campaign_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_partners_partner_id ON partners (partner_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaigns_campaign_id ON campaigns (campaign_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contents_campaign_id ON contents (campaign_id)",
+        ),
+        transactional=False,
+    ),
+]
+
+# Hot queries reported by `python migrate.py --explain`, run before and after
+# migrating to compare plans and latency
+HOT_QUERIES = [
+    (
+        "partner of campaign",
+        "SELECT partner_id FROM campaign_partners WHERE campaign_id = :campaign_id",
+        {"campaign_id": "campaign-1"},
+    ),
+    (
+        "partner by id",
+        "SELECT * FROM partners WHERE partner_id = :partner_id",
+        {"partner_id": "partner-1"},
+    ),
+    (
+        "campaign by id",
+        "SELECT * FROM campaigns WHERE campaign_id = :campaign_id",
+        {"campaign_id": "campaign-1"},
+    ),
+    (
+        "contents of campaign",
+        "SELECT * FROM contents WHERE campaign_id = :campaign_id",
+        {"campaign_id": "campaign-1"},
+    ),
+]
@@ -6,6 +6,7 @@ from pulsar.schema import AvroSchema
 from src.application.handlers.register_partner_handler import RegisterPartnerHandler
 from src.application.commands.register_partner_command import RegisterPartnerCommand
 from src.domain.entities.partner import Partner
+from .dead_letter_policy import DeadLetterPolicy
 from .schemas import PartnerRecord
 
 logger = logging.getLogger(__name__)
@@ -19,11 +20,13 @@ class PulsarConsumer:
         topic: str = "persistent://miso-1-2025/default/campaigns-partner-registration",
         token: str = "",
         client=None,
+        dead_letter_policy: DeadLetterPolicy | None = None,
     ):
         self.handler = handler
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
         self.client = client
         self.consumer = None
 
@@ -46,6 +49,10 @@ class PulsarConsumer:
                 self.topic,
                 "partner-subscriber",
                 schema=AvroSchema(PartnerRecord),
+                **self.dead_letter_policy.subscribe_options(),
+            )
+            await self.dead_letter_policy.attach(
+                self.client, self.consumer, self.topic, "partner-subscriber"
             )
             logger.info(
                 f"Successfully subscribed to topic: {self.topic} with subscription: partner-subscriber"
@@ -58,6 +65,8 @@ class PulsarConsumer:
             if asyncio.current_task().cancelled():
                 break
             msg = None
+            # Records that cannot be decoded or validated will never succeed
+            permanent = True
             try:
                 logger.info(
                     f"Partner consumer waiting for message on topic: {self.topic}"
@@ -80,6 +89,7 @@ class PulsarConsumer:
                     "estimated_monthly_reach": record.estimated_monthly_reach,
                 }
                 partner = Partner(**data)
+                permanent = False
                 command = RegisterPartnerCommand(partner)
                 await self.handler.handle(command)
                 self.consumer.acknowledge(msg)
@@ -92,13 +102,13 @@ class PulsarConsumer:
             except Exception as e:
                 logger.error(f"Error processing partner message: {e}")
                 if msg:
-                    self.consumer.negative_acknowledge(msg)
-                    logger.warning(f"Negatively acknowledged message for partner")
+                    await self.dead_letter_policy.fail(msg, e, permanent)
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Pulsar consumer stopped")
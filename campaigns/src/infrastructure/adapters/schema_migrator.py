@@ -0,0 +1,133 @@
+import logging
+from dataclasses import dataclass
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key so replicas running migrate.py at once apply each
+# migration only once
+MIGRATION_LOCK_ID = 7305001
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: tuple[str, ...]
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so
+    # non-transactional migrations run statement by statement in autocommit
+    transactional: bool = True
+
+
+class SchemaMigrator:
+    def __init__(self, engine: AsyncEngine, migrations: list[Migration]):
+        self.engine = engine
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    async def _current_version(self, conn) -> int:
+        exists = await conn.scalar(
+            text("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        )
+        if not exists:
+            return 0
+        return await conn.scalar(
+            text("SELECT coalesce(max(version), 0) FROM schema_migrations")
+        )
+
+    async def current_version(self) -> int:
+        async with self.engine.connect() as conn:
+            return await self._current_version(conn)
+
+    async def check(self) -> None:
+        # A single indexed lookup at startup instead of reflecting every table
+        current = await self.current_version()
+        if current < self.latest_version:
+            raise RuntimeError(
+                f"Database schema is at version {current}, expected {self.latest_version}; "
+                "run `python migrate.py` first"
+            )
+        if current > self.latest_version:
+            logger.warning(
+                f"Database schema version {current} is newer than this build ({self.latest_version})"
+            )
+        logger.info(f"Database schema at version {current}")
+
+    async def migrate(self) -> list[int]:
+        applied = []
+        async with self.engine.connect() as lock_conn:
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+            await lock_conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                    "version INTEGER PRIMARY KEY, "
+                    "description VARCHAR(255) NOT NULL, "
+                    "applied_at TIMESTAMP WITHOUT TIME ZONE NOT NULL "
+                    "DEFAULT (now() at time zone 'utc'))"
+                )
+            )
+            await lock_conn.execute(
+                text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID}
+            )
+            try:
+                current = await self._current_version(lock_conn)
+                for migration in self.migrations:
+                    if migration.version <= current:
+                        continue
+                    logger.info(
+                        f"Applying migration {migration.version}: {migration.description}"
+                    )
+                    if migration.transactional:
+                        async with self.engine.begin() as conn:
+                            for statement in migration.statements:
+                                await conn.execute(text(statement))
+                            await self._record(conn, migration)
+                    else:
+                        await self._drop_invalid_indexes(lock_conn)
+                        for statement in migration.statements:
+                            await lock_conn.execute(text(statement))
+                        await self._record(lock_conn, migration)
+                    applied.append(migration.version)
+            finally:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:lock_id)"),
+                    {"lock_id": MIGRATION_LOCK_ID},
+                )
+        return applied
+
+    async def _record(self, conn, migration: Migration) -> None:
+        await conn.execute(
+            text(
+                "INSERT INTO schema_migrations (version, description) "
+                "VALUES (:version, :description)"
+            ),
+            {"version": migration.version, "description": migration.description},
+        )
+
+    async def _drop_invalid_indexes(self, conn) -> None:
+        # An interrupted CREATE INDEX CONCURRENTLY leaves an invalid index
+        # behind, which IF NOT EXISTS would otherwise keep forever
+        result = await conn.execute(
+            text(
+                "SELECT c.relname FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE NOT i.indisvalid AND n.nspname = current_schema()"
+            )
+        )
+        for (index_name,) in result.fetchall():
+            logger.warning(f"Dropping invalid index {index_name} from an interrupted build")
+            await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
+
+    async def explain(self, sql: str, params: dict) -> list[str]:
+        # EXPLAIN ANALYZE executes the query; the connection is closed
+        # without committing, so it never changes data
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params
+            )
+            return [row[0] for row in result.fetchall()]
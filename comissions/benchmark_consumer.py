@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.application.handlers.register_commission_handler import (
+    RegisterCommissionHandler,
+)
+from src.infrastructure.adapters.campaigns_db_pool import CampaignsDbPool
+from src.infrastructure.adapters.migrations import MIGRATIONS
+from src.infrastructure.adapters.models import campaign_partners_table
+from src.infrastructure.adapters.postgres_commission_repository import (
+    PostgresCommissionRepository,
+)
+from src.infrastructure.adapters.postgres_partner_commission_totals_repository import (
+    PostgresPartnerCommissionTotalsRepository,
+)
+from src.infrastructure.adapters.postgres_saga_log_repository import (
+    PostgresSagaLogRepository,
+)
+from src.infrastructure.adapters.postgres_saga_state_repository import (
+    PostgresSagaStateRepository,
+)
+from src.infrastructure.adapters.pulsar_consumer import PulsarConsumer
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.schemas import CommissionRecord
+from src.infrastructure.adapters.state_backed_saga_log_repository import (
+    StateBackedSagaLogRepository,
+)
+
+# Measures commission processing throughput of the per-message path
+# (process_record, up to --concurrency in flight like the consumer loop)
+# against batch mode (process_records, batches of --batch-size). Both run
+# the real repositories against DATABASE_URL, which also serves as the
+# campaigns DB for partner lookups; the Pulsar broker is left out and events
+# are not published. It writes commissions, so use a scratch database
+# migrated with migrate.py.
+
+load_dotenv()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-message against batch commission processing"
+    )
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--campaigns", type=int, default=1_000)
+    parser.add_argument("--fan-out", type=int, default=1, help="Partners per campaign")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--partner-cache-ttl",
+        type=float,
+        default=0.0,
+        help="Partner cache TTL in seconds; 0 looks partners up for every message",
+    )
+    return parser.parse_args()
+
+
+class NullPublisher:
+    # Stands in for both event publishers
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def publish_fail_tracking_event(self, tracking_id: str) -> None:
+        pass
+
+    async def publish_commission_completed_event(self, tracking_id: str) -> None:
+        pass
+
+    def publish_fail_tracking_events(self, tracking_ids: list[str]) -> None:
+        pass
+
+    def publish_commission_completed_events(self, tracking_ids: list[str]) -> None:
+        pass
+
+
+def make_records(args, run_id: str, campaign_ids: list[str], name: str):
+    return [
+        CommissionRecord(
+            amount=0.10,
+            campaign_id=random.choice(campaign_ids),
+            commission_type="CPC",
+            tracking_id=f"bench-{run_id}-{name}-{i}",
+        )
+        for i in range(args.messages)
+    ]
+
+
+def report(name: str, elapsed: float, messages: int) -> None:
+    print(f"{name:<28} {elapsed:>8.2f} s  {messages / elapsed:>10.0f} messages/s")
+
+
+async def main():
+    args = parse_args()
+    random.seed(42)
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/commissionsdb"
+    )
+    engine = create_async_engine(database_url, pool_size=args.concurrency + 2)
+    await SchemaMigrator(engine, MIGRATIONS).check()
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    run_id = uuid.uuid4().hex[:8]
+    campaign_ids = [f"bench-{run_id}-campaign-{i}" for i in range(args.campaigns)]
+    async with engine.begin() as conn:
+        await conn.execute(
+            pg_insert(campaign_partners_table).values(
+                [
+                    {
+                        "campaign_id": campaign_id,
+                        "partner_id": f"bench-{run_id}-partner-{i}-{p}",
+                    }
+                    for i, campaign_id in enumerate(campaign_ids)
+                    for p in range(args.fan_out)
+                ]
+            )
+        )
+
+    saga_log_repo = StateBackedSagaLogRepository(
+        PostgresSagaStateRepository(sessionmaker),
+        PostgresSagaLogRepository(sessionmaker),
+    )
+    handler = RegisterCommissionHandler(
+        PostgresCommissionRepository(sessionmaker),
+        saga_log_repo,
+        PostgresPartnerCommissionTotalsRepository(sessionmaker),
+    )
+    campaigns_db = CampaignsDbPool(database_url, pool_size=args.concurrency)
+    campaigns_db.connect()
+    consumer = PulsarConsumer(
+        handler,
+        NullPublisher(),
+        NullPublisher(),
+        saga_log_repo,
+        campaigns_db,
+        partner_cache_ttl_seconds=args.partner_cache_ttl,
+        max_in_flight=args.concurrency,
+        batch_size=args.batch_size,
+    )
+    in_flight = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(work):
+        async with in_flight:
+            await work
+
+    try:
+        records = make_records(args, run_id, campaign_ids, "single")
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(bounded(consumer.process_record(record)) for record in records)
+        )
+        report("per message", time.perf_counter() - started, len(records))
+
+        if consumer.partner_cache:
+            consumer.partner_cache.invalidate_all()
+        records = make_records(args, run_id, campaign_ids, "batch")
+        batches = [
+            records[i : i + args.batch_size]
+            for i in range(0, len(records), args.batch_size)
+        ]
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(bounded(consumer.process_records(batch)) for batch in batches)
+        )
+        report(
+            f"batches of {args.batch_size}",
+            time.perf_counter() - started,
+            len(records),
+        )
+    finally:
+        await campaigns_db.dispose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
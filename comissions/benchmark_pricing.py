@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from src.domain.entities.commission import Commission
+from src.domain.entities.partner_terms import PartnerTerms
+from src.application.handlers.register_commission_handler import (
+    RegisterCommissionHandler,
+)
+from src.infrastructure.adapters.partner_terms_cache import PartnerTermsCache
+
+# Measures the pricing cost per commission event: parsing each partner's
+# acceptance terms JSON per message (what a per-message lookup would do,
+# without even counting the query) against the parsed-terms cache used by
+# RegisterCommissionHandler. Runs in memory; no database or broker needed.
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark commission pricing from partner acceptance terms"
+    )
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--partners", type=int, default=10_000)
+    parser.add_argument(
+        "--fan-out", type=int, default=1, help="Partners per commission event"
+    )
+    return parser.parse_args()
+
+
+def make_terms(partner_count: int) -> dict[str, str]:
+    # Stored the way the campaigns service stores them: JSON text
+    return {
+        f"partner-{i}": json.dumps(
+            {
+                "commission_type": random.choice(["CPA", "CPC", "CPM"]),
+                "commission_rate": round(random.uniform(0.05, 20.0), 2),
+                "cookie_duration_days": 30,
+                "promotional_methods": ["blog", "social_media"],
+            }
+        )
+        for i in range(partner_count)
+    }
+
+
+def make_events(args, partner_ids: list[str]) -> list[list[Commission]]:
+    events = []
+    for i in range(args.events):
+        commission_type = random.choice(["CPA", "CPC", "CPM"])
+        events.append(
+            [
+                Commission(
+                    amount=0.10,
+                    partner_id=partner_id,
+                    campaign_id="campaign-1",
+                    commission_type=commission_type,
+                    tracking_id=str(i),
+                )
+                for partner_id in random.sample(partner_ids, args.fan_out)
+            ]
+        )
+    return events
+
+
+def report(name: str, elapsed: float, events: int) -> None:
+    print(
+        f"{name:<28} {elapsed * 1e9 / events:>10.0f} ns/event  {events / elapsed:>12.0f} events/s"
+    )
+
+
+async def main():
+    args = parse_args()
+    random.seed(42)
+    terms_json = make_terms(args.partners)
+    partner_ids = list(terms_json)
+    events = make_events(args, partner_ids)
+
+    started = time.perf_counter()
+    for commissions in events:
+        for commission in commissions:
+            terms = PartnerTerms.from_json(
+                commission.partner_id, terms_json[commission.partner_id]
+            )
+            price = terms.price(commission.commission_type)
+            if price is not None:
+                commission.amount = price
+    report("parse JSON per message", time.perf_counter() - started, args.events)
+
+    loads = 0
+
+    async def loader(ids: list[str]) -> dict[str, PartnerTerms]:
+        nonlocal loads
+        loads += 1
+        return {
+            partner_id: PartnerTerms.from_json(partner_id, terms_json[partner_id])
+            for partner_id in ids
+        }
+
+    cache = PartnerTermsCache(loader, max_entries=args.partners)
+    handler = RegisterCommissionHandler(None, None, partner_terms=cache)
+    # Cold: every partner is loaded the first time it is seen
+    started = time.perf_counter()
+    for commissions in events:
+        await handler.apply_partner_terms(commissions)
+    report("terms cache (cold start)", time.perf_counter() - started, args.events)
+    started = time.perf_counter()
+    for commissions in events:
+        await handler.apply_partner_terms(commissions)
+    report("terms cache (warm)", time.perf_counter() - started, args.events)
+    stats = cache.stats()
+    print(
+        f"cache loads {loads}, hit rate {stats['partner_terms_hit_rate']:.4f}, entries {stats['partner_terms_entries']}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+import argparse
+import time
+from datetime import datetime
+import numpy as np
+from src.domain.entities.pricing_rule_set import PricingRuleSet
+from src.domain.entities.commission_split import CommissionSplitRules
+from src.domain.entities.volume_tier import VolumeTierSchedule
+from src.infrastructure.adapters.commission_simulator import (
+    CommissionSimulator,
+    EventChunk,
+)
+
+# Measures the what-if simulator's pricing throughput on synthetic tracking
+# events generated in memory, chunk by chunk, so it needs neither a database
+# nor Parquet files. Generation time is excluded from the figures.
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the what-if commission simulator"
+    )
+    parser.add_argument("--events", type=int, default=100_000_000)
+    parser.add_argument("--chunk-size", type=int, default=2_000_000)
+    parser.add_argument("--campaigns", type=int, default=10_000)
+    parser.add_argument("--partners", type=int, default=5_000)
+    parser.add_argument("--max-partners-per-campaign", type=int, default=3)
+    return parser.parse_args()
+
+
+def make_rule_sets() -> list[PricingRuleSet]:
+    return [
+        PricingRuleSet(name="current"),
+        PricingRuleSet(
+            name="cpa-up-replicated-clicks",
+            event_amounts={"click": 0.10, "impression": 0.01, "conversion": 1.25},
+            split_rules=CommissionSplitRules.parse("split", "CPC:replicate"),
+        ),
+        PricingRuleSet(
+            name="volume-tiers",
+            volume_tiers=VolumeTierSchedule.parse("0:1.0,1000:1.1,10000:1.25"),
+        ),
+    ]
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(42)
+    campaign_ids = [f"campaign-{i}" for i in range(args.campaigns)]
+    campaign_partners = {
+        campaign_id: [
+            f"partner-{p}"
+            for p in rng.choice(
+                args.partners,
+                rng.integers(1, args.max_partners_per_campaign + 1),
+                replace=False,
+            )
+        ]
+        for campaign_id in campaign_ids
+    }
+    start = datetime(2025, 1, 1)
+    end = datetime(2025, 4, 1)
+    simulator = CommissionSimulator(make_rule_sets(), campaign_partners, start, end)
+    event_types = ["click", "impression", "conversion"]
+    span_us = int((end - start).total_seconds() * 1e6)
+
+    priced = 0.0
+    remaining = args.events
+    offset = 0
+    while remaining:
+        size = min(args.chunk_size, remaining)
+        chunk = EventChunk(
+            campaign_codes=rng.integers(0, args.campaigns, size),
+            campaign_ids=campaign_ids,
+            event_type_codes=rng.choice(3, size, p=[0.3, 0.65, 0.05]),
+            event_types=event_types,
+            timestamps=np.datetime64(start, "us")
+            + (offset + np.arange(size, dtype=np.int64)) * (span_us // args.events),
+        )
+        started = time.perf_counter()
+        simulator.add(chunk)
+        priced += time.perf_counter() - started
+        remaining -= size
+        offset += size
+    print(
+        f"{args.events} events x {len(simulator.rule_sets)} rule sets in {priced:.1f}s "
+        f"({args.events / priced:,.0f} events/s)"
+    )
+    for rule_set, total in zip(simulator.rule_sets, simulator.totals()):
+        print(f"{rule_set.name:<28} {total:>16,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import asyncio
 import os
 import logging
+import socket
+import uvicorn
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 from src.infrastructure.adapters.postgres_commission_repository import (
@@ -9,14 +11,84 @@ from src.infrastructure.adapters.postgres_commission_repository import (
 from src.infrastructure.adapters.postgres_saga_log_repository import (
     PostgresSagaLogRepository,
 )
+from src.infrastructure.adapters.postgres_saga_state_repository import (
+    PostgresSagaStateRepository,
+)
+from src.infrastructure.adapters.state_backed_saga_log_repository import (
+    StateBackedSagaLogRepository,
+)
+from src.infrastructure.adapters.write_behind_saga_log_repository import (
+    WriteBehindSagaLogRepository,
+)
 from src.application.handlers.register_commission_handler import (
     RegisterCommissionHandler,
 )
 from src.infrastructure.adapters.pulsar_consumer import PulsarConsumer
+from src.infrastructure.adapters.campaigns_db_pool import CampaignsDbPool
+from src.infrastructure.adapters.postgres_campaign_partner_replica_repository import (
+    PostgresCampaignPartnerReplicaRepository,
+)
+from src.infrastructure.adapters.campaign_partner_replica import CampaignPartnerReplica
+from src.infrastructure.adapters.campaign_partner_association_consumer import (
+    CampaignPartnerAssociationConsumer,
+)
+from src.infrastructure.adapters.campaigns_db_partner_snapshot import (
+    fetch_campaign_partners_snapshot,
+)
 from src.infrastructure.adapters.pulsar_fail_tracking_publisher import (
     PulsarFailTrackingPublisher,
 )
-from src.infrastructure.adapters.models import metadata
+from src.infrastructure.adapters.pulsar_commission_completed_publisher import (
+    PulsarCommissionCompletedPublisher,
+)
+from src.infrastructure.adapters.postgres_partner_commission_totals_repository import (
+    PostgresPartnerCommissionTotalsRepository,
+)
+from src.application.handlers.get_partner_statement_handler import (
+    GetPartnerStatementHandler,
+)
+from src.application.handlers.get_partner_month_to_date_handler import (
+    GetPartnerMonthToDateHandler,
+)
+from src.domain.entities.volume_tier import VolumeTierSchedule
+from src.domain.entities.commission_split import CommissionSplitRules
+from src.infrastructure.adapters.partner_terms_cache import PartnerTermsCache
+from src.infrastructure.adapters.campaigns_db_partner_terms import (
+    CampaignsDbPartnerTermsLoader,
+)
+from src.infrastructure.adapters.partner_registration_consumer import (
+    PartnerRegistrationConsumer,
+)
+from src.infrastructure.adapters.campaign_budget_guard import CampaignBudgetGuard
+from src.infrastructure.adapters.postgres_campaign_budget_repository import (
+    PostgresCampaignBudgetRepository,
+)
+from src.application.handlers.set_campaign_budget_handler import (
+    SetCampaignBudgetHandler,
+)
+from src.application.handlers.get_campaign_budget_handler import (
+    GetCampaignBudgetHandler,
+)
+from src.infrastructure.adapters.partner_leaderboard import PartnerLeaderboard
+from src.infrastructure.adapters.postgres_leaderboard_repository import (
+    PostgresLeaderboardRepository,
+)
+from src.application.handlers.get_campaign_leaderboard_handler import (
+    GetCampaignLeaderboardHandler,
+)
+from src.api import (
+    app,
+    set_partner_cache,
+    set_statement_handler,
+    set_month_to_date_handler,
+    set_budget_command_handler,
+    set_budget_query_handler,
+    set_leaderboard_handler,
+    register_stats_provider,
+)
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+from src.infrastructure.adapters.dead_letter_policy import DeadLetterPolicy
 
 load_dotenv()
 
@@ -35,15 +107,45 @@ async def main():
     )
     logger.info(f"Connecting to database: {database_url}")
     engine = create_async_engine(database_url)
-    async with engine.begin() as conn:
-        await conn.run_sync(metadata.create_all)
-    logger.info("Database tables created/verified")
+    await SchemaMigrator(engine, MIGRATIONS).check()
 
     # Dependency injection
     sessionmaker_instance = async_sessionmaker(engine, expire_on_commit=False)
-    repo = PostgresCommissionRepository(sessionmaker_instance)
-    saga_log_repo = PostgresSagaLogRepository(sessionmaker_instance)
-    handler = RegisterCommissionHandler(repo, saga_log_repo)
+    leaderboard_repo = PostgresLeaderboardRepository(sessionmaker_instance)
+    leaderboard = None
+    if os.getenv("LEADERBOARD_ENABLED", "true").lower() == "true":
+        leaderboard = PartnerLeaderboard(
+            leaderboard_repo,
+            capacity=int(os.getenv("LEADERBOARD_SIZE", "100")),
+            max_campaigns=int(os.getenv("LEADERBOARD_MAX_CAMPAIGNS", "10000")),
+            snapshot_interval_seconds=float(
+                os.getenv("LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS", "10")
+            ),
+        )
+        await leaderboard.load()
+        register_stats_provider(leaderboard)
+    set_leaderboard_handler(
+        GetCampaignLeaderboardHandler(leaderboard_repo, leaderboard),
+        leaderboard.capacity if leaderboard else 100,
+    )
+    repo = PostgresCommissionRepository(
+        sessionmaker_instance, leaderboard.apply if leaderboard else None
+    )
+    saga_log_repo = StateBackedSagaLogRepository(
+        PostgresSagaStateRepository(sessionmaker_instance),
+        PostgresSagaLogRepository(sessionmaker_instance),
+        detail_sample_rate=float(os.getenv("SAGA_LOG_DETAIL_SAMPLE_RATE", "0.01")),
+    )
+    saga_log_writer = None
+    if os.getenv("SAGA_LOG_WRITE_BEHIND", "false").lower() == "true":
+        saga_log_writer = WriteBehindSagaLogRepository(
+            saga_log_repo,
+            flush_interval_ms=int(os.getenv("SAGA_LOG_FLUSH_INTERVAL_MS", "50")),
+            max_batch_size=int(os.getenv("SAGA_LOG_FLUSH_MAX_ROWS", "500")),
+            max_buffered=int(os.getenv("SAGA_LOG_BUFFER_MAX_ROWS", "10000")),
+            durable=os.getenv("SAGA_LOG_DURABLE", "false").lower() == "true",
+        )
+        saga_log_repo = saga_log_writer
     pulsar_service_url = os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650")
     pulsar_token = os.getenv("PULSAR_TOKEN", "")
     pulsar_topic = os.getenv(
@@ -52,20 +154,155 @@ async def main():
     campaigns_db_url = os.getenv(
         "CAMPAIGNS_DATABASE_URL", "postgresql+asyncpg://juan:@localhost/campaignsdb"
     )
+    campaigns_db = CampaignsDbPool(
+        campaigns_db_url,
+        pool_size=int(os.getenv("CAMPAIGNS_DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("CAMPAIGNS_DB_MAX_OVERFLOW", "10")),
+        pool_timeout_seconds=float(os.getenv("CAMPAIGNS_DB_POOL_TIMEOUT_SECONDS", "5")),
+        statement_timeout_ms=int(os.getenv("CAMPAIGNS_DB_STATEMENT_TIMEOUT_MS", "2000")),
+    )
+    totals_repo = PostgresPartnerCommissionTotalsRepository(sessionmaker_instance)
+    volume_tiers_spec = os.getenv("COMMISSION_VOLUME_TIERS", "")
+    volume_tiers = (
+        VolumeTierSchedule.parse(volume_tiers_spec) if volume_tiers_spec else None
+    )
+    split_rules = CommissionSplitRules.parse(
+        os.getenv("COMMISSION_SPLIT_DEFAULT", "split"),
+        os.getenv("COMMISSION_SPLIT_RULES", ""),
+    )
+
+    def dead_letter_policy():
+        # One per consumer, each with its own dead letter topic and counters
+        policy = DeadLetterPolicy(
+            max_redeliveries=int(os.getenv("DLQ_MAX_REDELIVERIES", "5")),
+            backoff_base_ms=int(os.getenv("DLQ_BACKOFF_BASE_MS", "500")),
+            backoff_max_ms=int(os.getenv("DLQ_BACKOFF_MAX_MS", "60000")),
+        )
+        register_stats_provider(policy)
+        return policy
+
+    partner_terms = None
+    registration_consumer = None
+    if os.getenv("PARTNER_TERMS_PRICING", "true").lower() == "true":
+        partner_terms = PartnerTermsCache(
+            CampaignsDbPartnerTermsLoader(campaigns_db),
+            negative_ttl_seconds=float(
+                os.getenv("PARTNER_TERMS_NEGATIVE_TTL_SECONDS", "60")
+            ),
+            max_entries=int(os.getenv("PARTNER_TERMS_MAX_ENTRIES", "100000")),
+        )
+        registration_consumer = PartnerRegistrationConsumer(
+            partner_terms,
+            pulsar_service_url,
+            os.getenv(
+                "PULSAR_PARTNER_TOPIC",
+                "persistent://miso-1-2025/default/campaigns-partner-registration",
+            ),
+            pulsar_token,
+            dead_letter_policy=dead_letter_policy(),
+        )
+        register_stats_provider(partner_terms)
+    budget_repo = PostgresCampaignBudgetRepository(sessionmaker_instance)
+    set_budget_command_handler(SetCampaignBudgetHandler(budget_repo))
+    set_budget_query_handler(GetCampaignBudgetHandler(budget_repo))
+    budget_guard = None
+    if os.getenv("BUDGET_ENFORCEMENT", "true").lower() == "true":
+        budget_guard = CampaignBudgetGuard(
+            budget_repo,
+            # Leases are held per process
+            os.getenv("BUDGET_HOLDER_ID") or f"{socket.gethostname()}-{os.getpid()}",
+            lease_chunk=float(os.getenv("BUDGET_LEASE_CHUNK", "100")),
+            lease_ttl_seconds=float(os.getenv("BUDGET_LEASE_TTL_SECONDS", "60")),
+            reconcile_interval_seconds=float(
+                os.getenv("BUDGET_RECONCILE_INTERVAL_SECONDS", "5")
+            ),
+            unbudgeted_ttl_seconds=float(
+                os.getenv("BUDGET_UNBUDGETED_TTL_SECONDS", "30")
+            ),
+            exhausted_ttl_seconds=float(
+                os.getenv("BUDGET_EXHAUSTED_TTL_SECONDS", "5")
+            ),
+        )
+        register_stats_provider(budget_guard)
+    handler = RegisterCommissionHandler(
+        repo,
+        saga_log_repo,
+        totals_repo,
+        volume_tiers,
+        split_rules,
+        partner_terms,
+        budget_guard,
+    )
+    set_statement_handler(GetPartnerStatementHandler(totals_repo))
+    set_month_to_date_handler(GetPartnerMonthToDateHandler(totals_repo))
     fail_tracking_topic = os.getenv(
         "FAIL_TRACKING_TOPIC", "persistent://miso-1-2025/default/fail-tracking-events"
     )
     fail_tracking_publisher = PulsarFailTrackingPublisher(
         pulsar_service_url, fail_tracking_topic, pulsar_token
     )
+    commission_completed_topic = os.getenv(
+        "COMMISSION_COMPLETED_TOPIC",
+        "persistent://miso-1-2025/default/commission-completed-events",
+    )
+    commission_completed_publisher = PulsarCommissionCompletedPublisher(
+        pulsar_service_url, commission_completed_topic, pulsar_token
+    )
+    partner_replica = None
+    association_consumer = None
+    if os.getenv("PARTNER_LOOKUP", "replica") == "replica":
+        partner_replica = CampaignPartnerReplica(
+            PostgresCampaignPartnerReplicaRepository(sessionmaker_instance),
+            lambda: fetch_campaign_partners_snapshot(campaigns_db_url),
+        )
+        association_consumer = CampaignPartnerAssociationConsumer(
+            partner_replica,
+            pulsar_service_url,
+            os.getenv(
+                "PULSAR_ASSOCIATION_TOPIC",
+                "persistent://miso-1-2025/default/campaign-partner-association",
+            ),
+            pulsar_token,
+            dead_letter_policy=dead_letter_policy(),
+        )
+        # Subscribe before the snapshot so no association is missed in between
+        await association_consumer.subscribe()
+        await partner_replica.load()
+        register_stats_provider(partner_replica)
     consumer = PulsarConsumer(
         handler,
         fail_tracking_publisher,
+        commission_completed_publisher,
         saga_log_repo,
-        campaigns_db_url,
+        campaigns_db,
         pulsar_service_url,
         pulsar_topic,
         pulsar_token,
+        partner_cache_ttl_seconds=float(os.getenv("PARTNER_CACHE_TTL_SECONDS", "300")),
+        partner_cache_negative_ttl_seconds=float(
+            os.getenv("PARTNER_CACHE_NEGATIVE_TTL_SECONDS", "30")
+        ),
+        partner_cache_max_entries=int(os.getenv("PARTNER_CACHE_MAX_ENTRIES", "10000")),
+        partner_replica=partner_replica,
+        max_in_flight=int(os.getenv("COMMISSION_MAX_IN_FLIGHT", "8")),
+        dead_letter_policy=dead_letter_policy(),
+        batch_size=int(os.getenv("COMMISSION_BATCH_SIZE", "1")),
+        batch_timeout_ms=int(os.getenv("COMMISSION_BATCH_TIMEOUT_MS", "50")),
+    )
+    register_stats_provider(campaigns_db)
+    if consumer.batch_size > 1:
+        register_stats_provider(consumer)
+    if consumer.partner_cache:
+        set_partner_cache(consumer.partner_cache)
+        register_stats_provider(consumer.partner_cache)
+    if saga_log_writer:
+        register_stats_provider(saga_log_writer)
+    api_server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host=os.getenv("API_HOST", "0.0.0.0"),
+            port=int(os.getenv("API_PORT", "8000")),
+        )
     )
     logger.info(
         f"Starting Pulsar consumer on {pulsar_service_url}, topic: {pulsar_topic}"
@@ -73,6 +310,24 @@ async def main():
 
     # Start consumer
     consumer_task = asyncio.create_task(consumer.start())
+    api_task = asyncio.create_task(api_server.serve())
+    association_task = (
+        asyncio.create_task(association_consumer.start())
+        if association_consumer
+        else None
+    )
+    registration_task = (
+        asyncio.create_task(registration_consumer.start())
+        if registration_consumer
+        else None
+    )
+    budget_task = asyncio.create_task(budget_guard.start()) if budget_guard else None
+    leaderboard_task = (
+        asyncio.create_task(leaderboard.start()) if leaderboard else None
+    )
+    writer_task = (
+        asyncio.create_task(saga_log_writer.start()) if saga_log_writer else None
+    )
     try:
         await consumer_task
     except KeyboardInterrupt:
@@ -88,6 +343,29 @@ async def main():
     except asyncio.CancelledError:
         pass
     finally:
+        api_task.cancel()
+        if association_consumer:
+            association_task.cancel()
+            association_consumer.stop()
+        if registration_consumer:
+            registration_task.cancel()
+            registration_consumer.stop()
+        if budget_guard:
+            budget_task.cancel()
+            try:
+                await budget_guard.stop()
+            except Exception as e:
+                logger.error(f"Failed to release budget leases: {e}")
+        if leaderboard:
+            leaderboard_task.cancel()
+            try:
+                await leaderboard.stop()
+            except Exception as e:
+                logger.error(f"Failed to snapshot leaderboard: {e}")
+        if saga_log_writer:
+            await saga_log_writer.stop()
+            writer_task.cancel()
+            logger.info(f"Saga log writer stats: {saga_log_writer.stats()}")
         logger.info("Disposing database engine")
         await engine.dispose()
         logger.info("Service shutdown complete")
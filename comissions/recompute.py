@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from dotenv import load_dotenv
+from src.domain.entities.recomputation import RateChange
+from src.application.commands.run_recompute_command import RunRecomputeCommand
+from src.application.handlers.run_recompute_handler import RunRecomputeHandler
+from src.infrastructure.adapters.postgres_recompute_repository import (
+    PostgresRecomputeRepository,
+)
+from src.infrastructure.adapters import recompute_worker
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_time(value: str) -> datetime:
+    # Commissions are stored in naive UTC
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Reprice commissions of a time range after a retroactive rate change, recording the differences as adjusting commissions"
+    )
+    parser.add_argument(
+        "--name",
+        required=True,
+        help="Job name; rerun with the same name and parameters to resume",
+    )
+    parser.add_argument("--commission-type", required=True, help="e.g. CPA")
+    parser.add_argument("--old-rate", type=float, required=True)
+    parser.add_argument("--new-rate", type=float, required=True)
+    parser.add_argument(
+        "--from",
+        dest="range_start",
+        type=parse_time,
+        required=True,
+        help="ISO creation time to start from, e.g. 2025-01-01T00:00:00Z",
+    )
+    parser.add_argument(
+        "--to",
+        dest="range_end",
+        type=parse_time,
+        required=True,
+        help="ISO creation time to stop before",
+    )
+    parser.add_argument(
+        "--partner", action="append", default=[], help="Only this partner (repeatable)"
+    )
+    parser.add_argument(
+        "--campaign", action="append", default=[], help="Only this campaign (repeatable)"
+    )
+    parser.add_argument("--chunk-hours", type=int, default=24)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the totals; nothing is written",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    if args.old_rate <= 0:
+        raise SystemExit("--old-rate must be positive")
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/commissionsdb"
+    )
+    engine = create_async_engine(database_url)
+    await SchemaMigrator(engine, MIGRATIONS).check()
+    sessionmaker_instance = async_sessionmaker(engine, expire_on_commit=False)
+
+    # Chunks run in separate processes, each streaming its own campaign and
+    # time slice; spawned rather than forked so no loop or connection of this
+    # process is inherited
+    pool = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=recompute_worker.init_worker,
+        initargs=(database_url,),
+    )
+    loop = asyncio.get_running_loop()
+
+    async def run_chunk(chunk, rate_change, batch_size, dry_run):
+        return await loop.run_in_executor(
+            pool, recompute_worker.run_chunk, chunk, rate_change, batch_size, dry_run
+        )
+
+    handler = RunRecomputeHandler(
+        PostgresRecomputeRepository(sessionmaker_instance), run_chunk
+    )
+    try:
+        await handler.handle(
+            RunRecomputeCommand(
+                name=args.name,
+                rate_change=RateChange(
+                    commission_type=args.commission_type,
+                    old_rate=args.old_rate,
+                    new_rate=args.new_rate,
+                    partner_ids=sorted(set(args.partner)),
+                    campaign_ids=sorted(set(args.campaign)),
+                ),
+                range_start=args.range_start,
+                range_end=args.range_end,
+                chunk_hours=args.chunk_hours,
+                batch_size=args.batch_size,
+                dry_run=args.dry_run,
+            )
+        )
+    finally:
+        pool.shutdown(cancel_futures=True)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
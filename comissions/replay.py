@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import os
+import logging
+import pulsar
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from dotenv import load_dotenv
+from src.infrastructure.adapters.postgres_commission_repository import (
+    PostgresCommissionRepository,
+)
+from src.infrastructure.adapters.postgres_saga_log_repository import (
+    PostgresSagaLogRepository,
+)
+from src.infrastructure.adapters.postgres_saga_state_repository import (
+    PostgresSagaStateRepository,
+)
+from src.infrastructure.adapters.state_backed_saga_log_repository import (
+    StateBackedSagaLogRepository,
+)
+from src.infrastructure.adapters.postgres_replay_checkpoint_repository import (
+    PostgresReplayCheckpointRepository,
+)
+from src.application.handlers.register_commission_handler import (
+    RegisterCommissionHandler,
+)
+from src.infrastructure.adapters.pulsar_consumer import PulsarConsumer
+from src.infrastructure.adapters.postgres_partner_commission_totals_repository import (
+    PostgresPartnerCommissionTotalsRepository,
+)
+from src.domain.entities.volume_tier import VolumeTierSchedule
+from src.domain.entities.commission_split import CommissionSplitRules
+from src.infrastructure.adapters.partner_terms_cache import PartnerTermsCache
+from src.infrastructure.adapters.campaigns_db_partner_terms import (
+    CampaignsDbPartnerTermsLoader,
+)
+from src.infrastructure.adapters.campaigns_db_pool import CampaignsDbPool
+from src.infrastructure.adapters.campaign_budget_guard import CampaignBudgetGuard
+from src.infrastructure.adapters.postgres_campaign_budget_repository import (
+    PostgresCampaignBudgetRepository,
+)
+from src.infrastructure.adapters.partner_leaderboard import PartnerLeaderboard
+from src.infrastructure.adapters.postgres_leaderboard_repository import (
+    PostgresLeaderboardRepository,
+)
+from src.infrastructure.adapters.pulsar_commission_completed_publisher import (
+    PulsarCommissionCompletedPublisher,
+)
+from src.infrastructure.adapters.pulsar_fail_tracking_publisher import (
+    PulsarFailTrackingPublisher,
+)
+from src.infrastructure.adapters.pulsar_topic_replayer import (
+    PulsarTopicReplayer,
+    parse_message_id,
+)
+from src.infrastructure.adapters.schemas import CommissionRecord
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Replay commission events from a chosen position through the commission handler"
+    )
+    parser.add_argument(
+        "--name",
+        required=True,
+        help="Replay job name; rerun with the same name to resume from its checkpoint",
+    )
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument(
+        "--from-message-id",
+        help='"earliest", "latest" or ledger:entry[:partition[:batch]]',
+    )
+    start.add_argument(
+        "--from-time", help="ISO publish time to start from, e.g. 2025-01-01T00:00:00Z"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=0.0,
+        help="Maximum messages per second (0 = unlimited)",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/commissionsdb"
+    )
+    engine = create_async_engine(database_url)
+    await SchemaMigrator(engine, MIGRATIONS).check()
+    sessionmaker_instance = async_sessionmaker(engine, expire_on_commit=False)
+
+    pulsar_service_url = os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650")
+    pulsar_token = os.getenv("PULSAR_TOKEN", "")
+    pulsar_topic = os.getenv(
+        "PULSAR_TOPIC", "persistent://miso-1-2025/default/assign-commission-to-partner"
+    )
+    campaigns_db_url = os.getenv(
+        "CAMPAIGNS_DATABASE_URL", "postgresql+asyncpg://juan:@localhost/campaignsdb"
+    )
+    fail_tracking_topic = os.getenv(
+        "FAIL_TRACKING_TOPIC", "persistent://miso-1-2025/default/fail-tracking-events"
+    )
+    saga_log_repo = StateBackedSagaLogRepository(
+        PostgresSagaStateRepository(sessionmaker_instance),
+        PostgresSagaLogRepository(sessionmaker_instance),
+        detail_sample_rate=float(os.getenv("SAGA_LOG_DETAIL_SAMPLE_RATE", "0.01")),
+    )
+    fail_tracking_publisher = PulsarFailTrackingPublisher(
+        pulsar_service_url, fail_tracking_topic, pulsar_token
+    )
+    await fail_tracking_publisher.connect()
+    commission_completed_publisher = PulsarCommissionCompletedPublisher(
+        pulsar_service_url,
+        os.getenv(
+            "COMMISSION_COMPLETED_TOPIC",
+            "persistent://miso-1-2025/default/commission-completed-events",
+        ),
+        pulsar_token,
+    )
+    await commission_completed_publisher.connect()
+    campaigns_db = CampaignsDbPool(
+        campaigns_db_url,
+        pool_size=int(os.getenv("CAMPAIGNS_DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("CAMPAIGNS_DB_MAX_OVERFLOW", "10")),
+        pool_timeout_seconds=float(os.getenv("CAMPAIGNS_DB_POOL_TIMEOUT_SECONDS", "5")),
+        statement_timeout_ms=int(os.getenv("CAMPAIGNS_DB_STATEMENT_TIMEOUT_MS", "2000")),
+    )
+    volume_tiers_spec = os.getenv("COMMISSION_VOLUME_TIERS", "")
+    # Replayed commissions count against campaign budgets like live ones,
+    # under a lease holder of their own
+    budget_guard = None
+    if os.getenv("BUDGET_ENFORCEMENT", "true").lower() == "true":
+        budget_guard = CampaignBudgetGuard(
+            PostgresCampaignBudgetRepository(sessionmaker_instance),
+            f"replay-{args.name}",
+            lease_chunk=float(os.getenv("BUDGET_LEASE_CHUNK", "100")),
+            lease_ttl_seconds=float(os.getenv("BUDGET_LEASE_TTL_SECONDS", "60")),
+            reconcile_interval_seconds=float(
+                os.getenv("BUDGET_RECONCILE_INTERVAL_SECONDS", "5")
+            ),
+            unbudgeted_ttl_seconds=float(
+                os.getenv("BUDGET_UNBUDGETED_TTL_SECONDS", "30")
+            ),
+            exhausted_ttl_seconds=float(
+                os.getenv("BUDGET_EXHAUSTED_TTL_SECONDS", "5")
+            ),
+        )
+    # Replayed earnings reach the live replicas' leaderboards through the
+    # snapshot; nothing is loaded since this process serves no reads
+    leaderboard = None
+    if os.getenv("LEADERBOARD_ENABLED", "true").lower() == "true":
+        leaderboard = PartnerLeaderboard(
+            PostgresLeaderboardRepository(sessionmaker_instance),
+            capacity=int(os.getenv("LEADERBOARD_SIZE", "100")),
+            max_campaigns=int(os.getenv("LEADERBOARD_MAX_CAMPAIGNS", "10000")),
+            snapshot_interval_seconds=float(
+                os.getenv("LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS", "10")
+            ),
+        )
+    # The live consumer's processing path is reused without subscribing
+    commission_consumer = PulsarConsumer(
+        RegisterCommissionHandler(
+            PostgresCommissionRepository(
+                sessionmaker_instance, leaderboard.apply if leaderboard else None
+            ),
+            saga_log_repo,
+            PostgresPartnerCommissionTotalsRepository(sessionmaker_instance),
+            VolumeTierSchedule.parse(volume_tiers_spec) if volume_tiers_spec else None,
+            CommissionSplitRules.parse(
+                os.getenv("COMMISSION_SPLIT_DEFAULT", "split"),
+                os.getenv("COMMISSION_SPLIT_RULES", ""),
+            ),
+            # Terms are read from the campaigns DB as partners are first seen
+            (
+                PartnerTermsCache(CampaignsDbPartnerTermsLoader(campaigns_db))
+                if os.getenv("PARTNER_TERMS_PRICING", "true").lower() == "true"
+                else None
+            ),
+            budget_guard,
+        ),
+        fail_tracking_publisher,
+        commission_completed_publisher,
+        saga_log_repo,
+        campaigns_db,
+        pulsar_service_url,
+        pulsar_topic,
+        pulsar_token,
+    )
+    campaigns_db.connect()
+
+    async def process(record):
+        if not await commission_consumer.process_record(record):
+            raise ValueError(f"Commission for tracking_id {record.tracking_id} rejected")
+
+    if pulsar_token:
+        client = pulsar.Client(
+            pulsar_service_url, authentication=pulsar.AuthenticationToken(pulsar_token)
+        )
+    else:
+        client = pulsar.Client(pulsar_service_url)
+
+    start_message_id = None
+    start_publish_time_ms = None
+    if args.from_message_id:
+        start_message_id = parse_message_id(args.from_message_id)
+    if args.from_time:
+        start_time = datetime.fromisoformat(args.from_time.replace("Z", "+00:00"))
+        if not start_time.tzinfo:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        start_publish_time_ms = int(start_time.timestamp() * 1000)
+
+    replayer = PulsarTopicReplayer(
+        client,
+        pulsar_topic,
+        CommissionRecord,
+        process,
+        PostgresReplayCheckpointRepository(sessionmaker_instance),
+        args.name,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_rate=args.max_rate,
+    )
+    budget_task = asyncio.create_task(budget_guard.start()) if budget_guard else None
+    leaderboard_task = (
+        asyncio.create_task(leaderboard.start()) if leaderboard else None
+    )
+    try:
+        await replayer.run(start_message_id, start_publish_time_ms)
+    finally:
+        if budget_guard:
+            budget_task.cancel()
+            await budget_guard.stop()
+        if leaderboard:
+            leaderboard_task.cancel()
+            await leaderboard.stop()
+        await fail_tracking_publisher.disconnect()
+        await commission_completed_publisher.disconnect()
+        await campaigns_db.dispose()
+        client.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import logging
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from dotenv import load_dotenv
+from src.infrastructure.adapters.postgres_settlement_repository import (
+    PostgresSettlementRepository,
+)
+from src.infrastructure.adapters.pulsar_payment_request_publisher import (
+    PulsarPaymentRequestPublisher,
+)
+from src.application.handlers.run_settlement_handler import RunSettlementHandler
+from src.application.commands.run_settlement_command import RunSettlementCommand
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Settle unsettled commissions and publish one payment request per partner payout"
+    )
+    parser.add_argument("--currency", default=os.getenv("SETTLEMENT_CURRENCY", "USD"))
+    parser.add_argument(
+        "--min-payout",
+        type=float,
+        default=float(os.getenv("SETTLEMENT_MIN_PAYOUT", "50")),
+        help="Partners owed less than this roll over to the next settlement",
+    )
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--publish-batch-size", type=int, default=1000)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/commissionsdb"
+    )
+    engine = create_async_engine(database_url)
+    await SchemaMigrator(engine, MIGRATIONS).check()
+    sessionmaker_instance = async_sessionmaker(engine, expire_on_commit=False)
+
+    publisher = PulsarPaymentRequestPublisher(
+        os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650"),
+        os.getenv(
+            "PAYMENTS_TOPIC", "persistent://miso-1-2025/default/payments-request"
+        ),
+        os.getenv("PULSAR_TOKEN", ""),
+        payment_method=os.getenv("SETTLEMENT_PAYMENT_METHOD", "bank_transfer"),
+    )
+    await publisher.connect()
+    handler = RunSettlementHandler(
+        PostgresSettlementRepository(sessionmaker_instance), publisher
+    )
+    try:
+        await handler.handle(
+            RunSettlementCommand(
+                currency=args.currency,
+                min_payout=args.min_payout,
+                chunk_size=args.chunk_size,
+                publish_batch_size=args.publish_batch_size,
+            )
+        )
+    finally:
+        await publisher.disconnect()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
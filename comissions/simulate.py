@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import csv
+import os
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from dotenv import load_dotenv
+from src.domain.entities.pricing_rule_set import PricingRuleSet
+from src.infrastructure.adapters.commission_simulator import CommissionSimulator
+from src.infrastructure.adapters.tracking_event_sources import (
+    postgres_event_chunks,
+    parquet_event_chunks,
+)
+from src.infrastructure.adapters.postgres_campaign_partner_replica_repository import (
+    PostgresCampaignPartnerReplicaRepository,
+)
+from src.infrastructure.adapters.campaigns_db_partner_snapshot import (
+    fetch_campaign_partners_snapshot,
+)
+from src.infrastructure.adapters.campaigns_db_partner_terms import (
+    CampaignsDbPartnerTermsLoader,
+)
+from src.infrastructure.adapters.campaigns_db_pool import CampaignsDbPool
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Partners per acceptance terms query
+TERMS_BATCH_SIZE = 10_000
+
+
+def parse_time(value: str) -> datetime:
+    # Tracking events are stored in naive UTC
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Price historical tracking events under candidate rule sets and compare the totals; read-only"
+    )
+    parser.add_argument(
+        "--rules", required=True, help="JSON file with a list of rule sets"
+    )
+    parser.add_argument(
+        "--from",
+        dest="range_start",
+        type=parse_time,
+        required=True,
+        help="ISO event time to start from, e.g. 2025-01-01T00:00:00Z",
+    )
+    parser.add_argument(
+        "--to",
+        dest="range_end",
+        type=parse_time,
+        required=True,
+        help="ISO event time to stop before",
+    )
+    parser.add_argument(
+        "--parquet",
+        nargs="+",
+        help="Read these Parquet exports instead of the tracking database",
+    )
+    parser.add_argument("--chunk-size", type=int, default=2_000_000)
+    parser.add_argument(
+        "--group-by",
+        default="campaign,partner,event_type",
+        help="Comma-separated subset of campaign, partner and event_type",
+    )
+    parser.add_argument("--output", help="CSV report path (default: stdout)")
+    return parser.parse_args()
+
+
+async def load_partner_terms(campaigns_db_url: str, partner_ids: list[str]) -> dict:
+    campaigns_db = CampaignsDbPool(campaigns_db_url)
+    campaigns_db.connect()
+    loader = CampaignsDbPartnerTermsLoader(campaigns_db)
+    try:
+        terms = {}
+        for i in range(0, len(partner_ids), TERMS_BATCH_SIZE):
+            terms.update(await loader(partner_ids[i : i + TERMS_BATCH_SIZE]))
+        return terms
+    finally:
+        await campaigns_db.dispose()
+
+
+def write_report(simulator: CommissionSimulator, group_by: list[str], output) -> None:
+    names = [rule_set.name for rule_set in simulator.rule_sets]
+    writer = csv.writer(output)
+    # Amounts side by side, with the difference of each rule set from the first
+    writer.writerow(
+        group_by + ["commissions"] + names + [f"{name}_diff" for name in names[1:]]
+    )
+    for group, count, amounts in simulator.results(group_by):
+        writer.writerow(
+            [*group, count]
+            + [f"{amount:.4f}" for amount in amounts]
+            + [f"{amount - amounts[0]:.4f}" for amount in amounts[1:]]
+        )
+
+
+async def main():
+    args = parse_args()
+    group_by = [column.strip() for column in args.group_by.split(",")]
+    if not set(group_by) <= {"campaign", "partner", "event_type"}:
+        raise SystemExit("--group-by takes campaign, partner and event_type")
+    rule_sets = PricingRuleSet.parse_file(args.rules)
+    campaigns_db_url = os.getenv(
+        "CAMPAIGNS_DATABASE_URL", "postgresql+asyncpg://juan:@localhost/campaignsdb"
+    )
+
+    # Campaign partners from the local replica, or the campaigns DB when the
+    # replica is not in use
+    engine = create_async_engine(
+        os.getenv("DATABASE_URL", "postgresql+asyncpg://juan:@localhost/commissionsdb")
+    )
+    try:
+        associations = await PostgresCampaignPartnerReplicaRepository(
+            async_sessionmaker(engine, expire_on_commit=False)
+        ).get_all()
+    finally:
+        await engine.dispose()
+    if not associations:
+        associations = await fetch_campaign_partners_snapshot(campaigns_db_url)
+    campaign_partners: dict[str, list[str]] = {}
+    for association in associations:
+        partners = campaign_partners.setdefault(association.campaign_id, [])
+        if association.partner_id not in partners:
+            partners.append(association.partner_id)
+    partner_ids = sorted(
+        {p for partners in campaign_partners.values() for p in partners}
+    )
+    partner_terms = None
+    if any(rule_set.use_partner_terms for rule_set in rule_sets):
+        partner_terms = await load_partner_terms(campaigns_db_url, partner_ids)
+    simulator = CommissionSimulator(
+        rule_sets, campaign_partners, args.range_start, args.range_end, partner_terms
+    )
+    logger.info(
+        f"Simulating {len(rule_sets)} rule sets over {len(campaign_partners)} campaigns and {len(partner_ids)} partners"
+    )
+
+    started = time.monotonic()
+
+    def progress():
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"{simulator.events} events priced ({simulator.events / elapsed if elapsed else 0:.0f}/s)"
+        )
+
+    if args.parquet:
+        for chunk in parquet_event_chunks(
+            args.parquet, args.range_start, args.range_end, args.chunk_size
+        ):
+            simulator.add(chunk)
+            progress()
+    else:
+        async for chunk in postgres_event_chunks(
+            os.getenv(
+                "TRACKING_DATABASE_URL",
+                "postgresql+asyncpg://juan:@localhost/trackingdb",
+            ),
+            args.range_start,
+            args.range_end,
+            args.chunk_size,
+        ):
+            simulator.add(chunk)
+            progress()
+
+    if args.output:
+        with open(args.output, "w", newline="") as output:
+            write_report(simulator, group_by, output)
+    else:
+        write_report(simulator, group_by, sys.stdout)
+    for rule_set, total in zip(rule_sets, simulator.totals()):
+        logger.info(f"Rule set {rule_set.name}: total {total:.2f}")
+    unassigned = sum(simulator.unassigned.values())
+    if unassigned:
+        logger.info(
+            f"{unassigned} events of campaigns without partners were not priced"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,241 @@
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel
+import base64
+import json
+import logging
+from datetime import date
+from src.infrastructure.adapters.campaign_partner_cache import CampaignPartnerCache
+from src.application.queries.get_partner_statement_query import (
+    GetPartnerStatementQuery,
+)
+from src.application.queries.get_partner_month_to_date_query import (
+    GetPartnerMonthToDateQuery,
+)
+from src.application.queries.get_campaign_budget_query import GetCampaignBudgetQuery
+from src.application.commands.set_campaign_budget_command import (
+    SetCampaignBudgetCommand,
+)
+from src.application.queries.get_campaign_leaderboard_query import (
+    GetCampaignLeaderboardQuery,
+)
+
+app = FastAPI(title="Commissions Service", version="1.0.0")
+
+logger = logging.getLogger(__name__)
+
+# Injected from main
+partner_cache: CampaignPartnerCache | None = None
+statement_handler = None
+month_to_date_handler = None
+budget_command_handler = None
+budget_query_handler = None
+leaderboard_handler = None
+# Largest leaderboard a request can ask for
+leaderboard_max_limit = 100
+# Components exposing a stats() dict for /metrics
+stats_providers = []
+
+
+def set_partner_cache(cache):
+    global partner_cache
+    partner_cache = cache
+
+
+def set_statement_handler(handler):
+    global statement_handler
+    statement_handler = handler
+
+
+def set_month_to_date_handler(handler):
+    global month_to_date_handler
+    month_to_date_handler = handler
+
+
+def set_budget_command_handler(handler):
+    global budget_command_handler
+    budget_command_handler = handler
+
+
+def set_budget_query_handler(handler):
+    global budget_query_handler
+    budget_query_handler = handler
+
+
+def set_leaderboard_handler(handler, max_limit: int):
+    global leaderboard_handler, leaderboard_max_limit
+    leaderboard_handler = handler
+    leaderboard_max_limit = max_limit
+
+
+def register_stats_provider(provider):
+    stats_providers.append(provider)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    metrics = {}
+    for provider in stats_providers:
+        metrics.update(provider.stats())
+    return metrics
+
+
+@app.delete("/partner-cache/{campaign_id}", status_code=204)
+async def invalidate_campaign_partner(campaign_id: str):
+    if partner_cache:
+        partner_cache.invalidate(campaign_id)
+        logger.info(f"Partner cache entry invalidated for campaign {campaign_id}")
+
+
+@app.delete("/partner-cache", status_code=204)
+async def invalidate_partner_cache():
+    if partner_cache:
+        partner_cache.invalidate_all()
+
+
+def _total_to_dict(total) -> dict:
+    return {
+        "period_start": total.period_start.isoformat(),
+        "campaign_id": total.campaign_id,
+        "commission_type": total.commission_type,
+        "commission_count": total.commission_count,
+        "total_amount": total.total_amount,
+    }
+
+
+def _encode_cursor(total) -> str:
+    key = [total.period_start.isoformat(), total.campaign_id, total.commission_type]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[date, str, str]:
+    try:
+        period, campaign_id, commission_type = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return date.fromisoformat(period), campaign_id, commission_type
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@app.get("/partners/{partner_id}/statement")
+async def get_partner_statement(
+    partner_id: str,
+    from_period: date | None = None,
+    to_period: date | None = None,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    if not statement_handler:
+        raise HTTPException(status_code=503, detail="Statements not available")
+    query = GetPartnerStatementQuery(
+        partner_id=partner_id,
+        from_period=from_period,
+        to_period=to_period,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    try:
+        totals = await statement_handler.handle(query)
+    except Exception as e:
+        logger.error(f"Error querying statement for partner {partner_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to query statement")
+    return {
+        "partner_id": partner_id,
+        "lines": [_total_to_dict(total) for total in totals],
+        # A full page may have more lines after it
+        "next_cursor": _encode_cursor(totals[-1]) if len(totals) == limit else None,
+    }
+
+
+@app.get("/partners/{partner_id}/month-to-date")
+async def get_partner_month_to_date(partner_id: str):
+    if not month_to_date_handler:
+        raise HTTPException(status_code=503, detail="Statements not available")
+    try:
+        totals = await month_to_date_handler.handle(
+            GetPartnerMonthToDateQuery(partner_id=partner_id)
+        )
+    except Exception as e:
+        logger.error(f"Error querying month-to-date for partner {partner_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to query month-to-date")
+    return {
+        "partner_id": partner_id,
+        "commission_count": sum(total.commission_count for total in totals),
+        "total_amount": sum(total.total_amount for total in totals),
+        "lines": [_total_to_dict(total) for total in totals],
+    }
+
+
+class BudgetRequest(BaseModel):
+    budget: float
+
+
+def _budget_to_dict(budget) -> dict:
+    return {
+        "campaign_id": budget.campaign_id,
+        "budget": budget.budget,
+        "spent": budget.spent,
+        "leased": budget.leased,
+        "available": budget.available,
+    }
+
+
+@app.put("/campaigns/{campaign_id}/budget")
+async def set_campaign_budget(campaign_id: str, request: BudgetRequest):
+    if not budget_command_handler:
+        raise HTTPException(status_code=503, detail="Budgets not available")
+    if request.budget < 0:
+        raise HTTPException(status_code=400, detail="Budget must not be negative")
+    try:
+        budget = await budget_command_handler.handle(
+            SetCampaignBudgetCommand(campaign_id=campaign_id, budget=request.budget)
+        )
+    except Exception as e:
+        logger.error(f"Error setting budget of campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to set budget")
+    return _budget_to_dict(budget)
+
+
+@app.get("/campaigns/{campaign_id}/budget")
+async def get_campaign_budget(campaign_id: str):
+    if not budget_query_handler:
+        raise HTTPException(status_code=503, detail="Budgets not available")
+    try:
+        budget = await budget_query_handler.handle(
+            GetCampaignBudgetQuery(campaign_id=campaign_id)
+        )
+    except Exception as e:
+        logger.error(f"Error querying budget of campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to query budget")
+    if not budget:
+        raise HTTPException(status_code=404, detail="Campaign has no budget")
+    return _budget_to_dict(budget)
+
+
+@app.get("/campaigns/{campaign_id}/leaderboard")
+async def get_campaign_leaderboard(campaign_id: str, limit: int = Query(10, ge=1)):
+    if not leaderboard_handler:
+        raise HTTPException(status_code=503, detail="Leaderboard not available")
+    if limit > leaderboard_max_limit:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be at most {leaderboard_max_limit}"
+        )
+    try:
+        leaders = await leaderboard_handler.handle(
+            GetCampaignLeaderboardQuery(campaign_id=campaign_id, limit=limit)
+        )
+    except Exception as e:
+        logger.error(f"Error querying leaderboard of campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to query leaderboard")
+    return {
+        "campaign_id": campaign_id,
+        "partners": [
+            {
+                "rank": rank,
+                "partner_id": entry.partner_id,
+                "commission_count": entry.commission_count,
+                "total_amount": entry.total_amount,
+            }
+            for rank, entry in enumerate(leaders, start=1)
+        ],
+    }
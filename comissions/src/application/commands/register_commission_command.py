@@ -2,5 +2,8 @@ from src.domain.entities.commission import Commission
 
 
 class RegisterCommissionCommand:
-    def __init__(self, commission: Commission):
+    def __init__(self, commission: Commission, partner_ids: list[str] | None = None):
         self.commission = commission
+        # When given, the commission is fanned out to these partners
+        # according to the split rules instead of going to commission.partner_id
+        self.partner_ids = partner_ids
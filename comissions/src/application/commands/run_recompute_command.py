@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from datetime import datetime
+from src.domain.entities.recomputation import RateChange
+
+
+class RunRecomputeCommand(BaseModel):
+    # Rerunning a name resumes the job from its chunk checkpoints
+    name: str
+    rate_change: RateChange
+    range_start: datetime
+    range_end: datetime
+    chunk_hours: int = 24
+    batch_size: int = 5000
+    # Reports the differences without recording or checkpointing anything
+    dry_run: bool = False
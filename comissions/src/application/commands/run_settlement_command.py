@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class RunSettlementCommand(BaseModel):
+    currency: str = "USD"
+    # Partners below this amount roll over to the next run
+    min_payout: float = 50.0
+    chunk_size: int = 100_000
+    publish_batch_size: int = 1000
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class SetCampaignBudgetCommand(BaseModel):
+    campaign_id: str
+    budget: float = Field(ge=0)
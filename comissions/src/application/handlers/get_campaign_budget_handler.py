@@ -0,0 +1,15 @@
+import logging
+from src.application.queries.get_campaign_budget_query import GetCampaignBudgetQuery
+from src.domain.entities.campaign_budget import CampaignBudget
+from src.domain.ports.campaign_budget_repository import CampaignBudgetRepository
+
+logger = logging.getLogger(__name__)
+
+
+class GetCampaignBudgetHandler:
+    def __init__(self, budget_repository: CampaignBudgetRepository):
+        self.budget_repository = budget_repository
+
+    async def handle(self, query: GetCampaignBudgetQuery) -> CampaignBudget | None:
+        logger.info(f"Handling GetCampaignBudgetQuery for campaign: {query.campaign_id}")
+        return await self.budget_repository.get(query.campaign_id)
@@ -0,0 +1,30 @@
+import logging
+from src.application.queries.get_campaign_leaderboard_query import (
+    GetCampaignLeaderboardQuery,
+)
+from src.domain.entities.partner_earnings import PartnerEarnings
+from src.domain.ports.leaderboard_repository import LeaderboardRepository
+from src.infrastructure.adapters.partner_leaderboard import PartnerLeaderboard
+
+logger = logging.getLogger(__name__)
+
+
+class GetCampaignLeaderboardHandler:
+    def __init__(
+        self,
+        leaderboard_repository: LeaderboardRepository,
+        leaderboard: PartnerLeaderboard | None = None,
+    ):
+        self.leaderboard_repository = leaderboard_repository
+        self.leaderboard = leaderboard
+
+    async def handle(self, query: GetCampaignLeaderboardQuery) -> list[PartnerEarnings]:
+        logger.info(
+            f"Handling GetCampaignLeaderboardQuery for campaign: {query.campaign_id}"
+        )
+        if self.leaderboard:
+            return await self.leaderboard.top(query.campaign_id, query.limit)
+        # Without the in-memory leaderboard the earnings index is read directly
+        return await self.leaderboard_repository.get_top_earners(
+            query.campaign_id, query.limit
+        )
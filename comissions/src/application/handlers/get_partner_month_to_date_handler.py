@@ -0,0 +1,29 @@
+import logging
+from datetime import datetime
+from src.application.queries.get_partner_month_to_date_query import (
+    GetPartnerMonthToDateQuery,
+)
+from src.domain.entities.partner_commission_total import (
+    PartnerCommissionTotal,
+    period_start,
+)
+from src.domain.ports.partner_commission_totals_repository import (
+    PartnerCommissionTotalsRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class GetPartnerMonthToDateHandler:
+    def __init__(self, totals_repository: PartnerCommissionTotalsRepository):
+        self.totals_repository = totals_repository
+
+    async def handle(
+        self, query: GetPartnerMonthToDateQuery
+    ) -> list[PartnerCommissionTotal]:
+        logger.info(
+            f"Handling GetPartnerMonthToDateQuery for partner: {query.partner_id}"
+        )
+        return await self.totals_repository.get_period(
+            query.partner_id, period_start(datetime.utcnow())
+        )
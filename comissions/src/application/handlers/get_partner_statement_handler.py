@@ -0,0 +1,29 @@
+import logging
+from src.application.queries.get_partner_statement_query import (
+    GetPartnerStatementQuery,
+)
+from src.domain.entities.partner_commission_total import PartnerCommissionTotal
+from src.domain.ports.partner_commission_totals_repository import (
+    PartnerCommissionTotalsRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class GetPartnerStatementHandler:
+    def __init__(self, totals_repository: PartnerCommissionTotalsRepository):
+        self.totals_repository = totals_repository
+
+    async def handle(
+        self, query: GetPartnerStatementQuery
+    ) -> list[PartnerCommissionTotal]:
+        logger.info(
+            f"Handling GetPartnerStatementQuery for partner: {query.partner_id}"
+        )
+        return await self.totals_repository.get_page(
+            query.partner_id,
+            query.from_period,
+            query.to_period,
+            query.after,
+            query.limit,
+        )
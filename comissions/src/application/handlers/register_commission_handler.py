@@ -4,6 +4,16 @@ from src.application.commands.register_commission_command import (
 )
 from src.domain.ports.commission_repository import CommissionRepository
 from src.domain.ports.saga_log_repository import SagaLogRepository
+from src.domain.ports.partner_commission_totals_repository import (
+    PartnerCommissionTotalsRepository,
+)
+from src.domain.entities.partner_commission_total import period_start
+from src.domain.entities.volume_tier import VolumeTierSchedule
+from src.domain.entities.commission import Commission
+from src.domain.entities.commission_split import CommissionSplitRules
+from src.infrastructure.adapters.partner_terms_cache import PartnerTermsCache
+from src.infrastructure.adapters.campaign_budget_guard import CampaignBudgetGuard
+from src.domain.entities.campaign_budget import CampaignBudgetExceeded
 from src.domain.entities.saga_log import SagaLog, SagaStep, SagaStatus
 
 logger = logging.getLogger(__name__)
@@ -14,46 +24,222 @@ class RegisterCommissionHandler:
         self,
         commission_repository: CommissionRepository,
         saga_log_repository: SagaLogRepository,
+        totals_repository: PartnerCommissionTotalsRepository | None = None,
+        volume_tiers: VolumeTierSchedule | None = None,
+        split_rules: CommissionSplitRules | None = None,
+        partner_terms: PartnerTermsCache | None = None,
+        budget_guard: CampaignBudgetGuard | None = None,
     ):
         self.commission_repository = commission_repository
         self.saga_log_repository = saga_log_repository
+        self.totals_repository = totals_repository
+        self.volume_tiers = volume_tiers
+        self.split_rules = split_rules or CommissionSplitRules()
+        self.partner_terms = partner_terms
+        self.budget_guard = budget_guard
 
-    async def handle(self, command: RegisterCommissionCommand) -> None:
-        saga_id = str(command.commission.tracking_id)
+    def fan_out(self, command: RegisterCommissionCommand) -> list[Commission]:
+        commission = command.commission
+        if not command.partner_ids:
+            return [commission]
+        amounts = self.split_rules.amounts(
+            commission.commission_type, commission.amount, len(command.partner_ids)
+        )
+        return [
+            commission.model_copy(update={"partner_id": partner_id, "amount": amount})
+            for partner_id, amount in zip(command.partner_ids, amounts)
+        ]
 
-        # Log commission received
-        await self.saga_log_repository.save(
-            SagaLog(
-                saga_id=saga_id,
-                step=SagaStep.COMMISSION_RECEIVED,
-                status=SagaStatus.SUCCESS,
-            )
+    async def apply_partner_terms(self, commissions: list[Commission]) -> None:
+        # A partner that accepted this commission type is paid its own rate;
+        # otherwise the amount on the event (or its split share) stands
+        if not self.partner_terms:
+            return
+        terms = await self.partner_terms.get_many(
+            [commission.partner_id for commission in commissions]
         )
+        for commission in commissions:
+            partner_terms = terms.get(commission.partner_id)
+            price = partner_terms.price(commission.commission_type) if partner_terms else None
+            if price is not None:
+                commission.amount = price
+
+    async def apply_volume_tiers(self, commissions: list[Commission]) -> None:
+        # Month-to-date counts of all partners come from the totals table in
+        # one query, so tiers are found without rescanning commissions
+        if not self.volume_tiers or not self.totals_repository:
+            return
+        # A batch can span the start of a month
+        periods: dict = {}
+        for commission in commissions:
+            periods.setdefault(period_start(commission.created_at), []).append(
+                commission
+            )
+        for start, period_commissions in periods.items():
+            counts = await self.totals_repository.get_period_counts(
+                list(dict.fromkeys(c.partner_id for c in period_commissions)), start
+            )
+            for commission in period_commissions:
+                count = counts[commission.partner_id]
+                # Earlier commissions of the partner in the same batch count
+                counts[commission.partner_id] = count + 1
+                multiplier = self.volume_tiers.multiplier_for(count)
+                if multiplier != 1.0:
+                    commission.amount = commission.amount * multiplier
+                    logger.info(
+                        f"Volume tier x{multiplier} applied for partner {commission.partner_id} ({count} commissions this month)"
+                    )
+
+    async def handle(self, command: RegisterCommissionCommand) -> bool:
+        # Returns False when the commission was already recorded by an earlier
+        # delivery, in which case nothing is written
+        saga_id = str(command.commission.tracking_id)
+        commissions = self.fan_out(command)
+        partner_ids = [commission.partner_id for commission in commissions]
 
         logger.info(
-            f"Handling RegisterCommissionCommand for partner: {command.commission.partner_id}, campaign: {command.commission.campaign_id}"
+            f"Handling RegisterCommissionCommand for {len(partner_ids)} partners, campaign: {command.commission.campaign_id}"
         )
 
-        # Log partner queried (assuming it's done in consumer)
-        await self.saga_log_repository.save(
-            SagaLog(
-                saga_id=saga_id,
-                step=SagaStep.PARTNER_QUERIED,
-                status=SagaStatus.SUCCESS,
-                details=f"partner_id: {command.commission.partner_id}",
+        await self.apply_partner_terms(commissions)
+        await self.apply_volume_tiers(commissions)
+        campaign_id = command.commission.campaign_id
+        amount = sum(commission.amount for commission in commissions)
+        # Reserved in memory against the campaign's budget lease
+        if self.budget_guard and not await self.budget_guard.reserve(
+            campaign_id, amount
+        ):
+            # A redelivery of a commission recorded before the budget ran
+            # out is a duplicate, not a rejection
+            if await self.commission_repository.is_recorded(saga_id):
+                logger.info(f"Commission for tracking_id {saga_id} already recorded")
+                return False
+            raise CampaignBudgetExceeded(campaign_id, amount)
+        # One multi-row insert for every partner's commission; pairs already
+        # recorded are skipped by the insert
+        try:
+            recorded = await self.commission_repository.save_many(commissions)
+        except Exception:
+            if self.budget_guard:
+                self.budget_guard.release(campaign_id, amount)
+            raise
+        if self.budget_guard:
+            self.budget_guard.release(
+                campaign_id, amount - sum(commission.amount for commission in recorded)
             )
+        if not recorded:
+            logger.info(f"Commission for tracking_id {saga_id} already recorded")
+            return False
+        logger.info(
+            f"Commission registered successfully for {len(recorded)} of {len(commissions)} partners"
         )
 
-        await self.commission_repository.save(command.commission)
-        logger.info(
-            f"Commission registered successfully for partner: {command.commission.partner_id}"
+        # Log commission received, partner queried (done in consumer) and
+        # saved in one write
+        await self.saga_log_repository.save_many(
+            self._saved_saga_logs(saga_id, partner_ids)
         )
+        return True
 
-        # Log commission saved
-        await self.saga_log_repository.save(
+    def _saved_saga_logs(self, saga_id: str, partner_ids: list[str]) -> list[SagaLog]:
+        return [
+            SagaLog(
+                saga_id=saga_id,
+                step=SagaStep.COMMISSION_RECEIVED,
+                status=SagaStatus.SUCCESS,
+            ),
+            SagaLog(
+                saga_id=saga_id,
+                step=SagaStep.PARTNER_QUERIED,
+                status=SagaStatus.SUCCESS,
+                details=(
+                    f"partner_id: {partner_ids[0]}"
+                    if len(partner_ids) == 1
+                    else f"{len(partner_ids)} partners"
+                ),
+            ),
             SagaLog(
                 saga_id=saga_id,
                 step=SagaStep.COMMISSION_SAVED,
                 status=SagaStatus.SUCCESS,
+            ),
+        ]
+
+    async def handle_many(
+        self, commands: list[RegisterCommissionCommand]
+    ) -> list[bool | CampaignBudgetExceeded]:
+        # Batch form of handle: one terms lookup, one count query and one
+        # multi-row insert for every commission of the batch, and one write
+        # for all their saga logs. Per command, True when recorded, False
+        # for a duplicate, or the CampaignBudgetExceeded it was rejected
+        # with. Any other error fails the whole batch and nothing is recorded.
+        fanned = [self.fan_out(command) for command in commands]
+        # Redeliveries within the batch are dropped before pricing, so they
+        # neither count towards the month-to-date volume tiers nor reach the
+        # insert, which cannot record the same (tracking_id, partner_id) twice
+        unique = []
+        seen = set()
+        for i, command in enumerate(commands):
+            saga_id = str(command.commission.tracking_id)
+            if saga_id not in seen:
+                seen.add(saga_id)
+                unique.append(i)
+        commissions = [commission for i in unique for commission in fanned[i]]
+        logger.info(
+            f"Handling {len(commands)} RegisterCommissionCommands for {len(commissions)} partner commissions"
+        )
+        await self.apply_partner_terms(commissions)
+        await self.apply_volume_tiers(commissions)
+        outcomes: list = [False] * len(commands)
+        reserved: dict[int, float] = {}
+        for i in unique:
+            command, group = commands[i], fanned[i]
+            saga_id = str(command.commission.tracking_id)
+            campaign_id = command.commission.campaign_id
+            amount = sum(commission.amount for commission in group)
+            if self.budget_guard and not await self.budget_guard.reserve(
+                campaign_id, amount
+            ):
+                if not await self.commission_repository.is_recorded(saga_id):
+                    outcomes[i] = CampaignBudgetExceeded(campaign_id, amount)
+                continue
+            reserved[i] = amount
+        try:
+            recorded = await self.commission_repository.save_many(
+                [commission for i in reserved for commission in fanned[i]]
             )
+        except Exception:
+            if self.budget_guard:
+                for i, amount in reserved.items():
+                    self.budget_guard.release(
+                        commands[i].commission.campaign_id, amount
+                    )
+            raise
+        recorded_keys = {
+            (commission.tracking_id, commission.partner_id) for commission in recorded
+        }
+        saga_logs = []
+        for i, amount in reserved.items():
+            new = [
+                commission
+                for commission in fanned[i]
+                if (commission.tracking_id, commission.partner_id) in recorded_keys
+            ]
+            if self.budget_guard:
+                self.budget_guard.release(
+                    commands[i].commission.campaign_id,
+                    amount - sum(commission.amount for commission in new),
+                )
+            if new:
+                outcomes[i] = True
+                saga_logs.extend(
+                    self._saved_saga_logs(
+                        str(commands[i].commission.tracking_id),
+                        [commission.partner_id for commission in fanned[i]],
+                    )
+                )
+        await self.saga_log_repository.save_many(saga_logs)
+        logger.info(
+            f"Commissions registered for {outcomes.count(True)} of {len(commands)} commands"
         )
+        return outcomes
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable
+from src.application.commands.run_recompute_command import RunRecomputeCommand
+from src.domain.entities.recomputation import (
+    RateChange,
+    RecomputeJob,
+    RecomputeChunk,
+    RecomputeChunkStatus,
+)
+from src.domain.ports.recompute_repository import RecomputeRepository
+
+logger = logging.getLogger(__name__)
+
+ChunkRunner = Callable[
+    [RecomputeChunk, RateChange, int, bool], Awaitable[RecomputeChunk]
+]
+
+
+class RunRecomputeHandler:
+    def __init__(
+        self, recompute_repository: RecomputeRepository, chunk_runner: ChunkRunner
+    ):
+        self.recompute_repository = recompute_repository
+        # Runs one chunk, e.g. in a pool process; chunks are handed to it all
+        # at once and it bounds how many run in parallel
+        self.chunk_runner = chunk_runner
+
+    async def _plan(self, command: RunRecomputeCommand) -> list[RecomputeChunk]:
+        campaign_ids = command.rate_change.campaign_ids or (
+            await self.recompute_repository.find_campaigns(
+                command.rate_change, command.range_start, command.range_end
+            )
+        )
+        step = timedelta(hours=command.chunk_hours)
+        chunks = []
+        for campaign_id in campaign_ids:
+            start = command.range_start
+            while start < command.range_end:
+                end = min(start + step, command.range_end)
+                chunks.append(
+                    RecomputeChunk(
+                        job_name=command.name,
+                        campaign_id=campaign_id,
+                        range_start=start,
+                        range_end=end,
+                    )
+                )
+                start = end
+        return chunks
+
+    async def handle(self, command: RunRecomputeCommand) -> list[RecomputeChunk]:
+        if command.dry_run:
+            chunks = await self._plan(command)
+            logger.info(f"Dry run of {command.name} over {len(chunks)} chunks")
+            return await self._run(command, chunks, [])
+
+        job = await self.recompute_repository.get_job(command.name)
+        if job:
+            if (
+                job.rate_change != command.rate_change
+                or job.range_start != command.range_start
+                or job.range_end != command.range_end
+            ):
+                raise ValueError(
+                    f"Recomputation {command.name} exists with other parameters"
+                )
+            chunks = await self.recompute_repository.get_chunks(command.name)
+            done = [c for c in chunks if c.status == RecomputeChunkStatus.COMPLETED]
+            logger.info(
+                f"Resuming recomputation {command.name}: {len(done)} of {len(chunks)} chunks done"
+            )
+        else:
+            chunks = await self._plan(command)
+            await self.recompute_repository.create_job(
+                RecomputeJob(
+                    name=command.name,
+                    rate_change=command.rate_change,
+                    range_start=command.range_start,
+                    range_end=command.range_end,
+                ),
+                chunks,
+            )
+            done = []
+            logger.info(f"Started recomputation {command.name} with {len(chunks)} chunks")
+        pending = [c for c in chunks if c.status == RecomputeChunkStatus.PENDING]
+        results = await self._run(command, pending, done)
+        await self.recompute_repository.complete_job(command.name)
+        logger.info(f"Recomputation {command.name} completed")
+        return results
+
+    async def _run(
+        self,
+        command: RunRecomputeCommand,
+        pending: list[RecomputeChunk],
+        done: list[RecomputeChunk],
+    ) -> list[RecomputeChunk]:
+        started = time.monotonic()
+        results = list(done)
+        failures = 0
+        tasks = [
+            asyncio.ensure_future(
+                self.chunk_runner(
+                    chunk, command.rate_change, command.batch_size, command.dry_run
+                )
+            )
+            for chunk in pending
+        ]
+        for task in asyncio.as_completed(tasks):
+            try:
+                chunk = await task
+            except Exception as e:
+                # The chunk stays pending; rerunning the job picks it up
+                failures += 1
+                logger.error(f"Recomputation chunk failed: {e}")
+                continue
+            results.append(chunk)
+            logger.info(
+                f"Chunk {chunk.campaign_id} {chunk.range_start:%Y-%m-%d %H:%M}: "
+                f"{chunk.commission_count} commissions, delta {chunk.delta_amount:.2f} "
+                f"({len(results) - len(done)}/{len(pending)} in {time.monotonic() - started:.1f}s)"
+            )
+        self._report(results)
+        if failures:
+            raise RuntimeError(
+                f"{failures} of {len(pending)} chunks failed; run the job again to resume"
+            )
+        return results
+
+    def _report(self, chunks: list[RecomputeChunk]) -> None:
+        totals: dict[str, list] = {}
+        for chunk in chunks:
+            total = totals.setdefault(chunk.campaign_id, [0, 0.0])
+            total[0] += chunk.commission_count
+            total[1] += chunk.delta_amount
+        for campaign_id, (count, amount) in sorted(totals.items()):
+            logger.info(f"Campaign {campaign_id}: {count} commissions, delta {amount:.2f}")
+        logger.info(
+            f"Total: {sum(count for count, _ in totals.values())} commissions, "
+            f"delta {sum(amount for _, amount in totals.values()):.2f}"
+        )
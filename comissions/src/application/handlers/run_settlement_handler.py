@@ -0,0 +1,120 @@
+import logging
+import time
+import uuid
+from src.application.commands.run_settlement_command import RunSettlementCommand
+from src.domain.entities.settlement import SettlementRun, SettlementStatus
+from src.domain.ports.settlement_repository import SettlementRepository
+from src.infrastructure.adapters.pulsar_payment_request_publisher import (
+    PulsarPaymentRequestPublisher,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RunSettlementHandler:
+    def __init__(
+        self,
+        settlement_repository: SettlementRepository,
+        payment_request_publisher: PulsarPaymentRequestPublisher,
+    ):
+        self.settlement_repository = settlement_repository
+        self.payment_request_publisher = payment_request_publisher
+
+    async def handle(self, command: RunSettlementCommand) -> SettlementRun:
+        # An unfinished run is resumed from its checkpoint before a new one
+        # is started, so a crashed job is simply rerun
+        run = await self.settlement_repository.get_unfinished_run()
+        if run:
+            logger.info(
+                f"Resuming settlement {run.settlement_id} at {run.status.value}, last settled id {run.last_settled_id}"
+            )
+        else:
+            run = SettlementRun(
+                settlement_id=uuid.uuid4().hex,
+                currency=command.currency,
+                min_payout=command.min_payout,
+                cutoff_id=await self.settlement_repository.max_commission_id(),
+            )
+            await self.settlement_repository.create_run(run)
+            logger.info(
+                f"Started settlement {run.settlement_id} up to commission {run.cutoff_id}"
+            )
+
+        if run.status == SettlementStatus.AGGREGATING:
+            await self._select_payouts(run, command.chunk_size)
+            run.status = SettlementStatus.SETTLING
+            await self.settlement_repository.set_status(run.settlement_id, run.status)
+        if run.status == SettlementStatus.SETTLING:
+            await self._settle(run, command.chunk_size)
+            run.status = SettlementStatus.PUBLISHING
+            await self.settlement_repository.set_status(run.settlement_id, run.status)
+        if run.status == SettlementStatus.PUBLISHING:
+            await self._publish(run, command.publish_batch_size)
+            run.status = SettlementStatus.COMPLETED
+            await self.settlement_repository.set_status(run.settlement_id, run.status)
+        logger.info(f"Settlement {run.settlement_id} completed")
+        return run
+
+    async def _select_payouts(self, run: SettlementRun, chunk_size: int) -> None:
+        # Unsettled commissions are streamed in id order and grouped per
+        # partner in the database; only per-partner running totals are kept
+        # here, so memory is bounded by the number of partners
+        totals: dict[str, float] = {}
+        after_id = run.last_settled_id
+        rows = 0
+        started = time.monotonic()
+        while True:
+            chunk, last_id = await self.settlement_repository.aggregate_unsettled(
+                after_id, run.cutoff_id, chunk_size
+            )
+            if last_id is None:
+                break
+            for partner_id, (count, amount) in chunk.items():
+                totals[partner_id] = totals.get(partner_id, 0.0) + amount
+                rows += count
+            after_id = last_id
+        partner_ids = sorted(
+            partner_id
+            for partner_id, amount in totals.items()
+            if amount >= run.min_payout
+        )
+        await self.settlement_repository.create_payouts(
+            run.settlement_id, run.currency, partner_ids
+        )
+        logger.info(
+            f"Aggregated {rows} unsettled commissions of {len(totals)} partners in {time.monotonic() - started:.1f}s; "
+            f"{len(partner_ids)} reach the minimum payout of {run.min_payout} {run.currency}"
+        )
+
+    async def _settle(self, run: SettlementRun, chunk_size: int) -> None:
+        settled = 0
+        started = time.monotonic()
+        while True:
+            rows = await self.settlement_repository.settle_chunk(run, chunk_size)
+            if not rows:
+                break
+            settled += rows
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Settled {settled} commissions ({settled / elapsed if elapsed else 0:.0f}/s), last id {run.last_settled_id}"
+            )
+
+    async def _publish(self, run: SettlementRun, batch_size: int) -> None:
+        # Payouts are marked published only after the broker acknowledged
+        # them; a crash in between republishes that batch on resume, and
+        # payments drops the repeats by their payout_id
+        published = 0
+        while True:
+            payouts = await self.settlement_repository.get_unpublished_payouts(
+                run.settlement_id, batch_size
+            )
+            if not payouts:
+                break
+            await self.payment_request_publisher.publish_payouts(payouts)
+            await self.settlement_repository.mark_published(
+                run.settlement_id, [payout.partner_id for payout in payouts]
+            )
+            published += len(payouts)
+        logger.info(
+            f"Published {published} payment requests for settlement {run.settlement_id}"
+        )
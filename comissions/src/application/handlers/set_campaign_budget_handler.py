@@ -0,0 +1,23 @@
+import logging
+from src.application.commands.set_campaign_budget_command import (
+    SetCampaignBudgetCommand,
+)
+from src.domain.entities.campaign_budget import CampaignBudget
+from src.domain.ports.campaign_budget_repository import CampaignBudgetRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SetCampaignBudgetHandler:
+    def __init__(self, budget_repository: CampaignBudgetRepository):
+        self.budget_repository = budget_repository
+
+    async def handle(self, command: SetCampaignBudgetCommand) -> CampaignBudget:
+        logger.info(
+            f"Setting budget of campaign {command.campaign_id} to {command.budget}"
+        )
+        # Replicas pick up a raised budget when they next lease, at the latest
+        # after BUDGET_EXHAUSTED_TTL_SECONDS
+        return await self.budget_repository.set_budget(
+            command.campaign_id, command.budget
+        )
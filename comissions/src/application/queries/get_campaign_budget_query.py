@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+
+class GetCampaignBudgetQuery(BaseModel):
+    campaign_id: str
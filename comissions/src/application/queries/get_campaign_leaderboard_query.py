@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class GetCampaignLeaderboardQuery(BaseModel):
+    campaign_id: str
+    limit: int = 10
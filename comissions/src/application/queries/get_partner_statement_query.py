@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import date
+
+
+class GetPartnerStatementQuery(BaseModel):
+    partner_id: str
+    from_period: date | None = None
+    to_period: date | None = None
+    # Keyset cursor: (period_start, campaign_id, commission_type) of the last line seen
+    after: tuple[date, str, str] | None = None
+    limit: int = 100
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class CampaignBudget(BaseModel):
+    campaign_id: str
+    budget: float
+    # Recorded commissions reported by the replicas
+    spent: float = 0.0
+    # Handed out to replicas as leases and not yet spent
+    leased: float = 0.0
+
+    @property
+    def available(self) -> float:
+        return max(self.budget - self.spent - self.leased, 0.0)
+
+
+# Raised when a commission would take its campaign over budget; the
+# commission is rejected and compensated like one without a partner
+class CampaignBudgetExceeded(Exception):
+    def __init__(self, campaign_id: str, amount: float):
+        super().__init__(
+            f"Budget of campaign {campaign_id} exhausted ({amount} requested)"
+        )
+        self.campaign_id = campaign_id
+        self.amount = amount
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 
@@ -9,4 +9,11 @@ class Commission(BaseModel):
     commission_type: str  # e.g., "CPA", "CPC"
     tracking_id: str
     status: str = "success"
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set on adjusting commissions written by a recomputation job: the
+    # tracking_id of the commission whose amount they correct
+    adjusts_tracking_id: str | None = None
+
+    @property
+    def is_adjustment(self) -> bool:
+        return self.adjusts_tracking_id is not None
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from enum import Enum
+
+
+class SplitMode(str, Enum):
+    SPLIT = "split"  # the amount is divided evenly among the partners
+    REPLICATE = "replicate"  # every partner earns the full amount
+
+
+class CommissionSplitRules(BaseModel):
+    default: SplitMode = SplitMode.SPLIT
+    # Overrides per commission type, e.g. {"CPC": SplitMode.REPLICATE}
+    by_commission_type: dict[str, SplitMode] = {}
+
+    @classmethod
+    def parse(cls, default: str, spec: str) -> "CommissionSplitRules":
+        # spec: "CPA:split,CPC:replicate"
+        by_commission_type = {}
+        for part in spec.split(","):
+            if not part.strip():
+                continue
+            commission_type, mode = part.split(":")
+            by_commission_type[commission_type.strip()] = SplitMode(mode.strip())
+        return cls(default=SplitMode(default), by_commission_type=by_commission_type)
+
+    def amounts(
+        self, commission_type: str, amount: float, partner_count: int
+    ) -> list[float]:
+        mode = self.by_commission_type.get(commission_type, self.default)
+        if mode == SplitMode.REPLICATE or partner_count == 1:
+            return [amount] * partner_count
+        share = amount / partner_count
+        # The last partner takes the remainder, so shares add up to the amount
+        return [share] * (partner_count - 1) + [amount - share * (partner_count - 1)]
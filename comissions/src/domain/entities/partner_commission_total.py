@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+
+
+def period_start(moment: datetime) -> date:
+    # Earnings are aggregated per calendar month (UTC)
+    return moment.date().replace(day=1)
+
+
+class PartnerCommissionTotal(BaseModel):
+    partner_id: str
+    period_start: date
+    campaign_id: str
+    commission_type: str
+    commission_count: int
+    total_amount: float
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+# All-time earnings of a partner on a campaign
+class PartnerEarnings(BaseModel):
+    campaign_id: str
+    partner_id: str
+    commission_count: int
+    total_amount: float
+    # Bumped by every change of the row; rate cuts lower totals, so the
+    # newest total is the one with the highest version, not the largest
+    version: int = 0
@@ -0,0 +1,33 @@
+import json
+from pydantic import BaseModel
+
+
+# A partner's accepted pricing: commission_rate is the price of one action of
+# commission_type (CPA, CPC), or of a thousand impressions for CPM
+class PartnerTerms(BaseModel):
+    partner_id: str
+    commission_type: str
+    commission_rate: float
+    # Publish time of the registration event the terms came from (0 when
+    # read from the campaigns DB); older versions never replace newer ones
+    version: int = 0
+
+    @classmethod
+    def from_json(
+        cls, partner_id: str, acceptance_terms: str, version: int = 0
+    ) -> "PartnerTerms":
+        terms = json.loads(acceptance_terms)
+        return cls(
+            partner_id=partner_id,
+            commission_type=terms["commission_type"],
+            commission_rate=float(terms["commission_rate"]),
+            version=version,
+        )
+
+    def price(self, commission_type: str) -> float | None:
+        # None when the partner did not accept this commission type
+        if commission_type != self.commission_type:
+            return None
+        if commission_type == "CPM":
+            return self.commission_rate / 1000
+        return self.commission_rate
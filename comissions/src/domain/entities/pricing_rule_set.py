@@ -0,0 +1,56 @@
+import json
+from pydantic import BaseModel
+from src.domain.entities.commission_split import CommissionSplitRules
+from src.domain.entities.volume_tier import VolumeTierSchedule
+
+
+# A candidate set of pricing rules for the what-if simulator, covering the
+# whole pricing path: the commission type and amount the tracking service
+# derives from an event, the split among the campaign's partners, partner
+# rates and volume tiers
+class PricingRuleSet(BaseModel):
+    name: str
+    # Defaults are what the tracking service publishes today
+    event_commission_types: dict[str, str] = {
+        "click": "CPC",
+        "impression": "CPM",
+        "conversion": "CPA",
+    }
+    event_amounts: dict[str, float] = {
+        "click": 0.10,
+        "impression": 0.01,
+        "conversion": 1.00,
+    }
+    # Used for event types missing from the maps above
+    default_commission_type: str = "CPC"
+    default_amount: float = 0.10
+    split_rules: CommissionSplitRules = CommissionSplitRules()
+    # Price partners at their current acceptance terms, like the live service
+    use_partner_terms: bool = False
+    # partner_id -> commission type -> rate, priced like acceptance terms
+    # (per thousand for CPM) and taking precedence over them
+    partner_rates: dict[str, dict[str, float]] = {}
+    volume_tiers: VolumeTierSchedule | None = None
+
+    @classmethod
+    def parse_file(cls, path: str) -> list["PricingRuleSet"]:
+        # A JSON list of rule sets; "split" and "volume_tiers" take the same
+        # specs as COMMISSION_SPLIT_RULES and COMMISSION_VOLUME_TIERS, e.g.
+        # {"name": "cpa-up", "event_amounts": {"conversion": 1.5},
+        #  "split": "split", "split_rules": "CPC:replicate",
+        #  "volume_tiers": "0:1.0,1000:1.1"}
+        with open(path) as f:
+            specs = json.load(f)
+        rule_sets = []
+        for spec in specs:
+            spec = dict(spec)
+            # Given event types are added to (or replace) the defaults
+            for field in ("event_commission_types", "event_amounts"):
+                spec[field] = {**cls.model_fields[field].default, **spec.get(field, {})}
+            spec["split_rules"] = CommissionSplitRules.parse(
+                spec.pop("split", "split"), spec.pop("split_rules", "")
+            )
+            tiers = spec.pop("volume_tiers", "")
+            spec["volume_tiers"] = VolumeTierSchedule.parse(tiers) if tiers else None
+            rule_sets.append(cls(**spec))
+        return rule_sets
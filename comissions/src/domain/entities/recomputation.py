@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+
+
+# A retroactive change of the rate paid for one commission type. Amounts are
+# proportional to the rate (split shares and volume tiers multiply it), so
+# repricing scales each commission by new_rate / old_rate.
+class RateChange(BaseModel):
+    commission_type: str
+    old_rate: float
+    new_rate: float
+    # Restricts the change to these partners / campaigns when not empty
+    partner_ids: list[str] = []
+    campaign_ids: list[str] = []
+
+    @property
+    def factor(self) -> float:
+        return self.new_rate / self.old_rate
+
+
+class RecomputeJob(BaseModel):
+    name: str
+    rate_change: RateChange
+    # Commissions created in [range_start, range_end) are repriced
+    range_start: datetime
+    range_end: datetime
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: datetime | None = None
+
+
+class RecomputeChunkStatus(str, Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+
+
+# One campaign over one slice of the job's time range
+class RecomputeChunk(BaseModel):
+    job_name: str
+    campaign_id: str
+    range_start: datetime
+    range_end: datetime
+    status: RecomputeChunkStatus = RecomputeChunkStatus.PENDING
+    commission_count: int = 0
+    delta_amount: float = 0.0
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
 
@@ -21,5 +21,5 @@ class SagaLog(BaseModel):
     saga_id: str  # tracking_id
     step: SagaStep
     status: SagaStatus
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
     details: str | None = None
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+
+
+class SettlementStatus(str, Enum):
+    AGGREGATING = "aggregating"
+    SETTLING = "settling"
+    PUBLISHING = "publishing"
+    COMPLETED = "completed"
+
+
+class SettlementRun(BaseModel):
+    settlement_id: str
+    currency: str
+    min_payout: float
+    # Only commissions up to this id belong to the run
+    cutoff_id: int
+    # Highest commission id marked settled so far, for resuming
+    last_settled_id: int = 0
+    status: SettlementStatus = SettlementStatus.AGGREGATING
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SettlementPayout(BaseModel):
+    settlement_id: str
+    partner_id: str
+    currency: str
+    commission_count: int
+    amount: float
+
+    @property
+    def payout_id(self) -> str:
+        return f"{self.settlement_id}:{self.partner_id}"
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class VolumeTier(BaseModel):
+    min_count: int  # commissions already earned this period
+    multiplier: float
+
+
+class VolumeTierSchedule(BaseModel):
+    tiers: list[VolumeTier]
+
+    @classmethod
+    def parse(cls, spec: str) -> "VolumeTierSchedule":
+        # "0:1.0,1000:1.1,10000:1.25" -> tiers by minimum monthly count
+        tiers = []
+        for part in spec.split(","):
+            if not part.strip():
+                continue
+            min_count, multiplier = part.split(":")
+            tiers.append(VolumeTier(min_count=int(min_count), multiplier=float(multiplier)))
+        return cls(tiers=sorted(tiers, key=lambda tier: tier.min_count))
+
+    def multiplier_for(self, count: int) -> float:
+        multiplier = 1.0
+        for tier in self.tiers:
+            if count >= tier.min_count:
+                multiplier = tier.multiplier
+        return multiplier
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from src.domain.entities.campaign_budget import CampaignBudget
+
+
+class CampaignBudgetRepository(ABC):
+    @abstractmethod
+    async def get(self, campaign_id: str) -> CampaignBudget | None:
+        pass
+
+    @abstractmethod
+    async def set_budget(self, campaign_id: str, budget: float) -> CampaignBudget:
+        pass
+
+    # Leases budget to a holder: chunk when that much is available, else
+    # just what is needed, else nothing. Returns the holder's whole lease on
+    # the campaign afterwards, or None when the campaign has no budget.
+    @abstractmethod
+    async def acquire_lease(
+        self,
+        campaign_id: str,
+        holder: str,
+        chunk: float,
+        needed: float,
+        expires_at: datetime,
+    ) -> float | None:
+        pass
+
+    # Moves spend out of the holder's leases into spent (a negative amount is
+    # a credit back into the lease), hands released amounts back and extends
+    # the holder's remaining leases, atomically
+    @abstractmethod
+    async def reconcile(
+        self,
+        holder: str,
+        spent: dict[str, float],
+        released: dict[str, float],
+        expires_at: datetime,
+    ) -> None:
+        pass
+
+    # Returns leases that expired (their holder stopped renewing them) to
+    # their campaigns; returns the number of leases reclaimed
+    @abstractmethod
+    async def reclaim_expired(self, now: datetime) -> int:
+        pass
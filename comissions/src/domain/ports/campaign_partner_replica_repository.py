@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from src.domain.entities.campaign_partner import CampaignPartner
+
+
+class CampaignPartnerReplicaRepository(ABC):
+    @abstractmethod
+    async def is_bootstrapped(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def bootstrap(self, campaign_partners: list[CampaignPartner]) -> None:
+        pass
+
+    @abstractmethod
+    async def save_many(self, campaign_partners: list[CampaignPartner]) -> None:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> list[CampaignPartner]:
+        pass
@@ -4,5 +4,15 @@ from src.domain.entities.commission import Commission
 
 class CommissionRepository(ABC):
     @abstractmethod
-    async def save(self, commission: Commission) -> None:
+    async def save(self, commission: Commission) -> bool:
+        pass
+
+    # Returns the commissions that were recorded; those already recorded for
+    # their (tracking_id, partner_id) are left out
+    @abstractmethod
+    async def save_many(self, commissions: list[Commission]) -> list[Commission]:
+        pass
+
+    @abstractmethod
+    async def is_recorded(self, tracking_id: str) -> bool:
         pass
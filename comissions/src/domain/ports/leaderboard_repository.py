@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from src.domain.entities.partner_earnings import PartnerEarnings
+
+
+class LeaderboardRepository(ABC):
+    # Highest earners of a campaign, straight from the earnings table
+    @abstractmethod
+    async def get_top_earners(
+        self, campaign_id: str, limit: int
+    ) -> list[PartnerEarnings]:
+        pass
+
+    # Merges the leaders of each campaign into the snapshot, keeping the
+    # newest version per partner and at most keep entries per campaign
+    @abstractmethod
+    async def save_snapshot(
+        self, leaders: dict[str, list[PartnerEarnings]], keep: int
+    ) -> None:
+        pass
+
+    # Brings the campaign's snapshot entries up to date with the earnings
+    # table; returns how many changed
+    @abstractmethod
+    async def refresh_snapshot(self, campaign_id: str) -> int:
+        pass
+
+    # Snapshot entries changed after since (all of them when None), with the
+    # latest change time seen
+    @abstractmethod
+    async def load_snapshot(
+        self, since: datetime | None = None
+    ) -> tuple[list[PartnerEarnings], datetime | None]:
+        pass
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from src.domain.entities.partner_commission_total import PartnerCommissionTotal
+
+
+class PartnerCommissionTotalsRepository(ABC):
+    @abstractmethod
+    async def get_page(
+        self,
+        partner_id: str,
+        from_period: date | None,
+        to_period: date | None,
+        after: tuple[date, str, str] | None,
+        limit: int,
+    ) -> list[PartnerCommissionTotal]:
+        pass
+
+    @abstractmethod
+    async def get_period(
+        self, partner_id: str, period_start: date
+    ) -> list[PartnerCommissionTotal]:
+        pass
+
+    @abstractmethod
+    async def get_period_counts(
+        self, partner_ids: list[str], period_start: date
+    ) -> dict[str, int]:
+        pass
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from src.domain.entities.recomputation import (
+    RateChange,
+    RecomputeJob,
+    RecomputeChunk,
+)
+
+
+class RecomputeRepository(ABC):
+    @abstractmethod
+    async def get_job(self, name: str) -> RecomputeJob | None:
+        pass
+
+    # Stores the job with all of its chunks as pending
+    @abstractmethod
+    async def create_job(self, job: RecomputeJob, chunks: list[RecomputeChunk]) -> None:
+        pass
+
+    @abstractmethod
+    async def complete_job(self, name: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_chunks(self, name: str) -> list[RecomputeChunk]:
+        pass
+
+    # Campaigns with commissions the rate change applies to in the range
+    @abstractmethod
+    async def find_campaigns(
+        self, rate_change: RateChange, range_start: datetime, range_end: datetime
+    ) -> list[str]:
+        pass
+
+    # Reprices the chunk's commissions batch by batch and, unless dry_run,
+    # records the differences as adjusting commissions and marks the chunk
+    # completed. Returns the chunk with its count and total difference.
+    @abstractmethod
+    async def recompute_chunk(
+        self,
+        chunk: RecomputeChunk,
+        rate_change: RateChange,
+        batch_size: int,
+        dry_run: bool,
+    ) -> RecomputeChunk:
+        pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+
+
+class ReplayCheckpointRepository(ABC):
+    @abstractmethod
+    async def get(self, name: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    async def save(
+        self,
+        name: str,
+        topic: str,
+        message_id: bytes,
+        processed: int,
+        failures: list[tuple[bytes, str]],
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def get_failures(self, name: str) -> list[bytes]:
+        pass
+
+    @abstractmethod
+    async def delete_failure(self, name: str, message_id: bytes) -> None:
+        pass
@@ -7,6 +7,10 @@ class SagaLogRepository(ABC):
     async def save(self, saga_log: SagaLog) -> int:
         pass
 
+    @abstractmethod
+    async def save_many(self, saga_logs: list[SagaLog]) -> None:
+        pass
+
     @abstractmethod
     async def get_by_saga_id(self, saga_id: str) -> list[SagaLog]:
         pass
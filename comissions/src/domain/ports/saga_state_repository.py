@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from src.domain.entities.saga_log import SagaLog
+from src.domain.entities.saga_state import SagaState
+
+
+class SagaStateRepository(ABC):
+    @abstractmethod
+    async def apply(
+        self, saga_logs: list[SagaLog], detail_logs: list[SagaLog] | None = None
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, saga_id: str) -> SagaState | None:
+        pass
+
+    @abstractmethod
+    async def update_status(
+        self, saga_id: str, step: str, status: str, detail: bool = False
+    ) -> None:
+        pass
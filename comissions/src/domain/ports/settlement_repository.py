@@ -0,0 +1,55 @@
+from abc import ABC, abstractmethod
+from src.domain.entities.settlement import (
+    SettlementRun,
+    SettlementPayout,
+    SettlementStatus,
+)
+
+
+class SettlementRepository(ABC):
+    @abstractmethod
+    async def get_unfinished_run(self) -> SettlementRun | None:
+        pass
+
+    @abstractmethod
+    async def max_commission_id(self) -> int:
+        pass
+
+    @abstractmethod
+    async def create_run(self, run: SettlementRun) -> None:
+        pass
+
+    @abstractmethod
+    async def set_status(self, settlement_id: str, status: SettlementStatus) -> None:
+        pass
+
+    @abstractmethod
+    async def aggregate_unsettled(
+        self, after_id: int, cutoff_id: int, limit: int
+    ) -> tuple[dict[str, tuple[int, float]], int | None]:
+        # Per-partner (count, amount) of the next `limit` unsettled commissions
+        # and the last id covered, None once there are none left
+        pass
+
+    @abstractmethod
+    async def create_payouts(
+        self, settlement_id: str, currency: str, partner_ids: list[str]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def settle_chunk(self, run: SettlementRun, limit: int) -> int:
+        # Marks the next `limit` commissions of the run's payout partners as
+        # settled, adds them to the payouts and advances last_settled_id in
+        # one transaction; returns the number of rows settled
+        pass
+
+    @abstractmethod
+    async def get_unpublished_payouts(
+        self, settlement_id: str, limit: int
+    ) -> list[SettlementPayout]:
+        pass
+
+    @abstractmethod
+    async def mark_published(self, settlement_id: str, partner_ids: list[str]) -> None:
+        pass
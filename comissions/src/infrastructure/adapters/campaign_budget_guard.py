@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from src.domain.ports.campaign_budget_repository import CampaignBudgetRepository
+
+logger = logging.getLogger(__name__)
+
+
+class _Allowance:
+    def __init__(self):
+        # Leased budget this replica can still reserve
+        self.remaining = 0.0
+        # Reserved by recorded commissions, not yet reported to the ledger;
+        # negative when releases of already reconciled reservations are
+        # waiting to be credited back against spent
+        self.pending = 0.0
+        # Campaigns without a budget are not looked up again until then
+        self.unlimited_until = 0.0
+        # A campaign out of budget is rejected from memory until then
+        self.exhausted_until = 0.0
+        self.last_used = 0.0
+
+
+# Enforces campaign budgets on the commission hot path from memory. Each
+# replica (holder) leases budget in chunks from the campaign_budgets ledger
+# and reserves commissions against its lease without touching the database;
+# only an exhausted lease costs a round trip. Every reconcile interval the
+# reserved amounts are moved into the ledger's spent column in one batched
+# transaction, leases in use are renewed and leases idle for a while are
+# handed back. Leases of a replica that stops renewing expire and are
+# reclaimed by the others, so at most one unreconciled interval of a dead
+# replica's spend can go over budget.
+class CampaignBudgetGuard:
+    def __init__(
+        self,
+        repository: CampaignBudgetRepository,
+        holder: str,
+        lease_chunk: float = 100.0,
+        lease_ttl_seconds: float = 60.0,
+        reconcile_interval_seconds: float = 5.0,
+        unbudgeted_ttl_seconds: float = 30.0,
+        exhausted_ttl_seconds: float = 5.0,
+    ):
+        self.repository = repository
+        self.holder = holder
+        self.lease_chunk = lease_chunk
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self.unbudgeted_ttl_seconds = unbudgeted_ttl_seconds
+        self.exhausted_ttl_seconds = exhausted_ttl_seconds
+        self._allowances: dict[str, _Allowance] = {}
+        # Lease acquisition and reconciliation never overlap, so a lease
+        # read back from the ledger always matches the local pending spend
+        self._ledger_lock = asyncio.Lock()
+        self._last_reconciled = time.monotonic()
+        self._running = False
+        self.reservations = 0
+        self.rejections = 0
+        self.lease_acquisitions = 0
+        self.reconciliations = 0
+        self.reconcile_failures = 0
+        self.leases_reclaimed = 0
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_ttl_seconds)
+
+    def _take(self, allowance: _Allowance, amount: float) -> bool:
+        allowance.remaining -= amount
+        allowance.pending += amount
+        self.reservations += 1
+        return True
+
+    async def reserve(self, campaign_id: str, amount: float) -> bool:
+        if amount <= 0:
+            return True
+        now = time.monotonic()
+        allowance = self._allowances.get(campaign_id)
+        if not allowance:
+            allowance = self._allowances[campaign_id] = _Allowance()
+        allowance.last_used = now
+        if allowance.unlimited_until > now:
+            return True
+        # Without a recent reconciliation the lease may have expired and
+        # been reclaimed, so it is read back from the ledger first
+        leases_valid = now - self._last_reconciled < self.lease_ttl_seconds
+        if leases_valid and allowance.remaining >= amount:
+            return self._take(allowance, amount)
+        if leases_valid and allowance.exhausted_until > now:
+            self.rejections += 1
+            return False
+        async with self._ledger_lock:
+            # Another reservation may have leased more while this one waited
+            if leases_valid and allowance.remaining >= amount:
+                return self._take(allowance, amount)
+            self.lease_acquisitions += 1
+            lease = await self.repository.acquire_lease(
+                campaign_id,
+                self.holder,
+                self.lease_chunk,
+                max(amount - allowance.remaining, 0.0),
+                self._expires_at(),
+            )
+            if lease is None:
+                allowance.unlimited_until = now + self.unbudgeted_ttl_seconds
+                return True
+            allowance.remaining = max(lease - allowance.pending, 0.0)
+            if allowance.remaining >= amount:
+                return self._take(allowance, amount)
+            allowance.exhausted_until = now + self.exhausted_ttl_seconds
+            self.rejections += 1
+            logger.info(f"Campaign {campaign_id} is out of budget")
+            return False
+
+    def release(self, campaign_id: str, amount: float) -> None:
+        # Gives back a reservation whose commission was not recorded. A
+        # reconcile may already have moved the reservation into spent; pending
+        # then goes negative and the next reconcile credits it back
+        if amount <= 0:
+            return
+        allowance = self._allowances.get(campaign_id)
+        if allowance:
+            allowance.remaining += amount
+        else:
+            # The lease was handed back, so only the credit is carried
+            allowance = self._allowances[campaign_id] = _Allowance()
+            allowance.last_used = time.monotonic()
+        allowance.pending -= amount
+
+    async def reconcile(self, release_all: bool = False) -> None:
+        async with self._ledger_lock:
+            started = time.monotonic()
+            spent = {}
+            released = {}
+            idle = {}
+            for campaign_id, allowance in self._allowances.items():
+                if allowance.pending != 0:
+                    spent[campaign_id] = allowance.pending
+                    allowance.pending = 0.0
+                elif release_all or (
+                    started - allowance.last_used > self.lease_ttl_seconds
+                ):
+                    idle[campaign_id] = allowance
+                    if allowance.remaining > 0:
+                        released[campaign_id] = allowance.remaining
+            for campaign_id in idle:
+                del self._allowances[campaign_id]
+            try:
+                await self.repository.reconcile(
+                    self.holder, spent, released, self._expires_at()
+                )
+            except Exception as e:
+                self.reconcile_failures += 1
+                logger.error(f"Failed to reconcile campaign budgets: {e}")
+                for campaign_id, amount in spent.items():
+                    self._allowances[campaign_id].pending += amount
+                for campaign_id, allowance in idle.items():
+                    self._allowances.setdefault(campaign_id, allowance)
+                raise
+            self._last_reconciled = started
+            self.reconciliations += 1
+        self.leases_reclaimed += await self.repository.reclaim_expired(
+            datetime.utcnow()
+        )
+
+    def stats(self) -> dict:
+        return {
+            "budget_campaigns_tracked": len(self._allowances),
+            "budget_reservations": self.reservations,
+            "budget_rejections": self.rejections,
+            "budget_lease_acquisitions": self.lease_acquisitions,
+            "budget_pending_spend": sum(
+                allowance.pending for allowance in self._allowances.values()
+            ),
+            "budget_reconciliations": self.reconciliations,
+            "budget_reconcile_failures": self.reconcile_failures,
+            "budget_leases_reclaimed": self.leases_reclaimed,
+        }
+
+    async def start(self) -> None:
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.reconcile_interval_seconds)
+            try:
+                await self.reconcile()
+            except Exception:
+                pass
+
+    async def stop(self) -> None:
+        # Reports the last spend and hands every unused lease back
+        self._running = False
+        await self.reconcile(release_all=True)
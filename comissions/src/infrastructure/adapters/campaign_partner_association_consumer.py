@@ -0,0 +1,98 @@
+import pulsar
+import asyncio
+import logging
+from pulsar.schema import AvroSchema
+from src.domain.entities.campaign_partner import CampaignPartner
+from .campaign_partner_replica import CampaignPartnerReplica
+from .dead_letter_policy import DeadLetterPolicy
+from .schemas import CampaignPartnerAssociationRecord
+
+logger = logging.getLogger(__name__)
+
+
+# Feeds the local campaign_partners replica from the campaigns service's
+# association events. subscribe() must run before the replica takes its
+# bootstrap snapshot, so no association falls between the two.
+class CampaignPartnerAssociationConsumer:
+    def __init__(
+        self,
+        replica: CampaignPartnerReplica,
+        pulsar_service_url: str = "pulsar://localhost:6650",
+        topic: str = "persistent://miso-1-2025/default/campaign-partner-association",
+        token: str = "",
+        dead_letter_policy: DeadLetterPolicy | None = None,
+    ):
+        self.replica = replica
+        self.pulsar_service_url = pulsar_service_url
+        self.topic = topic
+        self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
+        self.client = None
+        self.consumer = None
+
+    async def subscribe(self):
+        logger.info(f"Connecting to Pulsar at {self.pulsar_service_url}")
+        if self.token:
+            self.client = pulsar.Client(
+                self.pulsar_service_url,
+                authentication=pulsar.AuthenticationToken(self.token),
+            )
+        else:
+            self.client = pulsar.Client(self.pulsar_service_url)
+        self.consumer = await asyncio.to_thread(
+            self.client.subscribe,
+            self.topic,
+            "commissions-campaign-partner-replica",
+            schema=AvroSchema(CampaignPartnerAssociationRecord),
+            initial_position=pulsar.InitialPosition.Earliest,
+            **self.dead_letter_policy.subscribe_options(),
+        )
+        await self.dead_letter_policy.attach(
+            self.client,
+            self.consumer,
+            self.topic,
+            "commissions-campaign-partner-replica",
+        )
+        logger.info(f"Subscribed to topic: {self.topic}")
+
+    async def start(self):
+        if not self.consumer:
+            await self.subscribe()
+        while True:
+            if asyncio.current_task().cancelled():
+                break
+            msg = None
+            # Records that cannot be decoded will never succeed
+            permanent = True
+            try:
+                msg = await asyncio.to_thread(self.consumer.receive)
+                record = msg.value()
+                permanent = False
+                await self.replica.apply(
+                    [
+                        CampaignPartner(
+                            campaign_id=record.campaign_id,
+                            partner_id=record.partner_id,
+                        )
+                    ]
+                )
+                await asyncio.to_thread(self.consumer.acknowledge, msg)
+                logger.info(
+                    f"Replicated campaign-partner association: {record.campaign_id} - {record.partner_id}"
+                )
+            except pulsar.Interrupted:
+                logger.info("Campaign-partner association consumer interrupted, shutting down")
+                break
+            except Exception as e:
+                logger.error(f"Error replicating campaign-partner association: {e}")
+                if msg:
+                    await self.dead_letter_policy.fail(msg, e, permanent)
+
+    def stop(self):
+        logger.info("Stopping campaign-partner association consumer")
+        if self.consumer:
+            self.consumer.close()
+        self.dead_letter_policy.close()
+        if self.client:
+            self.client.close()
+        logger.info("Campaign-partner association consumer stopped")
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+# Read-through cache of campaign -> partners lookups. Entries expire after a
+# TTL and the least recently used ones are evicted beyond max_entries.
+# Campaigns without a partner are cached too, for a shorter TTL, so a burst
+# for an unassociated campaign does not hit the campaigns DB per message.
+# Concurrent misses for one campaign share a single load. With a
+# batch_loader, the misses of get_many are loaded together in one query.
+class CampaignPartnerCache:
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[tuple[str, ...]]],
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 30.0,
+        max_entries: int = 10_000,
+        batch_loader: (
+            Callable[[list[str]], Awaitable[dict[str, tuple[str, ...]]]] | None
+        ) = None,
+    ):
+        self.loader = loader
+        self.batch_loader = batch_loader
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        # campaign_id -> (partner_ids, empty when none, expires_at)
+        self._entries: OrderedDict[str, tuple[tuple[str, ...], float]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Bumped on invalidation so a load that started before it is not cached
+        self._generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.load_failures = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lookup_seconds = 0.0
+        self._load_seconds = 0.0
+
+    def _cached(self, campaign_id: str, now: float) -> tuple[str, ...] | None:
+        entry = self._entries.get(campaign_id)
+        if entry and entry[1] > now:
+            self._entries.move_to_end(campaign_id)
+            if not entry[0]:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    async def get(self, campaign_id: str) -> tuple[str, ...]:
+        started = time.monotonic()
+        try:
+            partner_ids = self._cached(campaign_id, started)
+            if partner_ids is not None:
+                return partner_ids
+            inflight = self._inflight.get(campaign_id)
+            if inflight:
+                self.coalesced += 1
+                return await asyncio.shield(inflight)
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[campaign_id] = future
+            try:
+                partner_ids = await self._load(campaign_id)
+            except Exception as e:
+                future.set_exception(e)
+                # Mark retrieved so a failure nobody else awaited is not logged
+                future.exception()
+                raise
+            else:
+                future.set_result(partner_ids)
+                return partner_ids
+            finally:
+                self._inflight.pop(campaign_id, None)
+        finally:
+            self._lookup_seconds += time.monotonic() - started
+
+    async def get_many(self, campaign_ids: list[str]) -> dict[str, tuple[str, ...]]:
+        if not self.batch_loader:
+            return {
+                campaign_id: await self.get(campaign_id)
+                for campaign_id in dict.fromkeys(campaign_ids)
+            }
+        started = time.monotonic()
+        try:
+            found = {}
+            waiting = {}
+            futures = {}
+            for campaign_id in dict.fromkeys(campaign_ids):
+                partner_ids = self._cached(campaign_id, started)
+                if partner_ids is not None:
+                    found[campaign_id] = partner_ids
+                elif campaign_id in self._inflight:
+                    self.coalesced += 1
+                    waiting[campaign_id] = self._inflight[campaign_id]
+                else:
+                    future = asyncio.get_running_loop().create_future()
+                    futures[campaign_id] = self._inflight[campaign_id] = future
+            if futures:
+                try:
+                    loaded = await self._load_many(list(futures))
+                except Exception as e:
+                    for future in futures.values():
+                        future.set_exception(e)
+                        future.exception()
+                    raise
+                else:
+                    for campaign_id, future in futures.items():
+                        future.set_result(loaded[campaign_id])
+                    found.update(loaded)
+                finally:
+                    for campaign_id in futures:
+                        self._inflight.pop(campaign_id, None)
+            for campaign_id, future in waiting.items():
+                found[campaign_id] = await asyncio.shield(future)
+            return found
+        finally:
+            self._lookup_seconds += time.monotonic() - started
+
+    def _store(self, campaign_id: str, partner_ids: tuple[str, ...]) -> None:
+        ttl = self.ttl_seconds if partner_ids else self.negative_ttl_seconds
+        self._entries[campaign_id] = (partner_ids, time.monotonic() + ttl)
+        self._entries.move_to_end(campaign_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _load(self, campaign_id: str) -> tuple[str, ...]:
+        generation = self._generation
+        started = time.monotonic()
+        self.loads += 1
+        try:
+            partner_ids = await self.loader(campaign_id)
+        except Exception:
+            self.load_failures += 1
+            raise
+        finally:
+            self._load_seconds += time.monotonic() - started
+        if generation == self._generation:
+            self._store(campaign_id, partner_ids)
+        return partner_ids
+
+    async def _load_many(self, campaign_ids: list[str]) -> dict[str, tuple[str, ...]]:
+        generation = self._generation
+        started = time.monotonic()
+        self.loads += 1
+        try:
+            loaded = await self.batch_loader(campaign_ids)
+        except Exception:
+            self.load_failures += 1
+            raise
+        finally:
+            self._load_seconds += time.monotonic() - started
+        if generation == self._generation:
+            for campaign_id in campaign_ids:
+                self._store(campaign_id, loaded[campaign_id])
+        return loaded
+
+    def invalidate(self, campaign_id: str) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.pop(campaign_id, None)
+
+    def invalidate_all(self) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+        logger.info("Campaign partner cache cleared")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "partner_cache_entries": len(self._entries),
+            "partner_cache_lookups": lookups,
+            "partner_cache_hits": self.hits,
+            "partner_cache_negative_hits": self.negative_hits,
+            "partner_cache_misses": self.misses,
+            "partner_cache_coalesced_misses": self.coalesced,
+            "partner_cache_hit_rate": (
+                (self.hits + self.negative_hits) / lookups if lookups else 0.0
+            ),
+            "partner_cache_loads": self.loads,
+            "partner_cache_load_failures": self.load_failures,
+            "partner_cache_evictions": self.evictions,
+            "partner_cache_invalidations": self.invalidations,
+            "partner_cache_avg_lookup_ms": (
+                self._lookup_seconds / lookups * 1000 if lookups else 0.0
+            ),
+            "partner_cache_avg_load_ms": (
+                self._load_seconds / self.loads * 1000 if self.loads else 0.0
+            ),
+        }
@@ -0,0 +1,68 @@
+import logging
+from typing import Awaitable, Callable
+from src.domain.entities.campaign_partner import CampaignPartner
+from src.domain.ports.campaign_partner_replica_repository import (
+    CampaignPartnerReplicaRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# In-memory index over the local campaign_partners projection. It is loaded
+# once at startup (taking a snapshot of the campaigns DB the first time) and
+# then kept current by campaign-partner association events, so resolving a
+# partner on the commission hot path is a dict lookup.
+class CampaignPartnerReplica:
+    def __init__(
+        self,
+        repository: CampaignPartnerReplicaRepository,
+        snapshot_loader: Callable[[], Awaitable[list[CampaignPartner]]],
+    ):
+        self.repository = repository
+        self.snapshot_loader = snapshot_loader
+        # campaign_id -> partner_ids in association order
+        self._partners: dict[str, list[str]] = {}
+        self.loaded = False
+        self.events_applied = 0
+        self.lookups = 0
+        self.misses = 0
+
+    def _index(self, campaign_partners: list[CampaignPartner]) -> int:
+        added = 0
+        for campaign_partner in campaign_partners:
+            partners = self._partners.setdefault(campaign_partner.campaign_id, [])
+            if campaign_partner.partner_id not in partners:
+                partners.append(campaign_partner.partner_id)
+                added += 1
+        return added
+
+    async def load(self) -> None:
+        if not await self.repository.is_bootstrapped():
+            await self.repository.bootstrap(await self.snapshot_loader())
+        self._partners = {}
+        self._index(await self.repository.get_all())
+        self.loaded = True
+        logger.info(f"Campaign partner replica loaded for {len(self._partners)} campaigns")
+
+    async def apply(self, campaign_partners: list[CampaignPartner]) -> None:
+        # Persist first, so the index never holds an association a restart
+        # would lose
+        await self.repository.save_many(campaign_partners)
+        self.events_applied += len(campaign_partners)
+        self._index(campaign_partners)
+
+    def partners_of(self, campaign_id: str) -> list[str]:
+        self.lookups += 1
+        partners = self._partners.get(campaign_id)
+        if not partners:
+            self.misses += 1
+            return []
+        return list(partners)
+
+    def stats(self) -> dict:
+        return {
+            "partner_replica_campaigns": len(self._partners),
+            "partner_replica_events_applied": self.events_applied,
+            "partner_replica_lookups": self.lookups,
+            "partner_replica_misses": self.misses,
+        }
@@ -0,0 +1,27 @@
+import logging
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import select
+from src.domain.entities.campaign_partner import CampaignPartner
+from .models import campaign_partners_table
+
+logger = logging.getLogger(__name__)
+
+
+async def fetch_campaign_partners_snapshot(campaigns_db_url: str) -> list[CampaignPartner]:
+    # One-off read of every association from the campaigns service's
+    # database, only needed to bootstrap the local replica
+    logger.info("Taking campaign partner snapshot from the campaigns DB")
+    engine = create_async_engine(campaigns_db_url)
+    try:
+        async with engine.connect() as conn:
+            stmt = select(
+                campaign_partners_table.c.campaign_id,
+                campaign_partners_table.c.partner_id,
+            ).order_by(campaign_partners_table.c.id)
+            result = await conn.execute(stmt)
+            return [
+                CampaignPartner(campaign_id=row.campaign_id, partner_id=row.partner_id)
+                for row in result.fetchall()
+            ]
+    finally:
+        await engine.dispose()
@@ -0,0 +1,36 @@
+import logging
+from sqlalchemy import select
+from src.domain.entities.partner_terms import PartnerTerms
+from .campaigns_db_pool import CampaignsDbPool
+from .models import partners_table
+
+logger = logging.getLogger(__name__)
+
+
+# Loads the latest acceptance terms of several partners from the campaigns DB
+# in one query, parsing the JSON once per partner
+class CampaignsDbPartnerTermsLoader:
+    def __init__(self, campaigns_db: CampaignsDbPool):
+        self.campaigns_db = campaigns_db
+
+    async def __call__(self, partner_ids: list[str]) -> dict[str, PartnerTerms]:
+        async with self.campaigns_db.connection() as conn:
+            # A partner registered more than once keeps its latest row
+            stmt = (
+                select(partners_table.c.partner_id, partners_table.c.acceptance_terms)
+                .where(partners_table.c.partner_id.in_(partner_ids))
+                .distinct(partners_table.c.partner_id)
+                .order_by(partners_table.c.partner_id, partners_table.c.id.desc())
+            )
+            result = await conn.execute(stmt)
+            terms = {}
+            for row in result.fetchall():
+                try:
+                    terms[row.partner_id] = PartnerTerms.from_json(
+                        row.partner_id, row.acceptance_terms
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Ignoring unreadable acceptance terms of partner {row.partner_id}: {e}"
+                    )
+            return terms
@@ -0,0 +1,79 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import create_async_engine
+
+logger = logging.getLogger(__name__)
+
+
+# Connection pool for the campaigns service's database. Every lookup checks
+# out its own connection for one statement, so lookups run in parallel and no
+# transaction is held open between them.
+class CampaignsDbPool:
+    def __init__(
+        self,
+        campaigns_db_url: str,
+        pool_size: int = 10,
+        max_overflow: int = 10,
+        pool_timeout_seconds: float = 5.0,
+        statement_timeout_ms: int = 2000,
+    ):
+        self.campaigns_db_url = campaigns_db_url
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout_seconds = pool_timeout_seconds
+        self.statement_timeout_ms = statement_timeout_ms
+        self.engine = None
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self._wait_seconds = 0.0
+        self.max_wait_ms = 0.0
+
+    def connect(self):
+        logger.info(f"Creating campaigns DB pool for {self.campaigns_db_url}")
+        self.engine = create_async_engine(
+            self.campaigns_db_url,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout_seconds,
+            # Drops connections the campaigns DB closed while they sat idle
+            pool_pre_ping=True,
+            connect_args={
+                "server_settings": {"statement_timeout": str(self.statement_timeout_ms)}
+            },
+        )
+
+    @asynccontextmanager
+    async def connection(self):
+        started = time.monotonic()
+        try:
+            conn = await self.engine.connect()
+        except Exception:
+            self.checkout_failures += 1
+            raise
+        waited = time.monotonic() - started
+        self.checkouts += 1
+        self._wait_seconds += waited
+        self.max_wait_ms = max(self.max_wait_ms, waited * 1000)
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    def stats(self) -> dict:
+        pool = self.engine.pool if self.engine else None
+        return {
+            "campaigns_db_pool_size": pool.size() if pool else 0,
+            "campaigns_db_pool_checked_out": pool.checkedout() if pool else 0,
+            "campaigns_db_pool_overflow": pool.overflow() if pool else 0,
+            "campaigns_db_pool_checkouts": self.checkouts,
+            "campaigns_db_pool_checkout_failures": self.checkout_failures,
+            "campaigns_db_pool_avg_wait_ms": (
+                self._wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0
+            ),
+            "campaigns_db_pool_max_wait_ms": self.max_wait_ms,
+        }
+
+    async def dispose(self):
+        if self.engine:
+            await self.engine.dispose()
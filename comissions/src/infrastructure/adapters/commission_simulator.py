@@ -0,0 +1,374 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+import numpy as np
+from src.domain.entities.pricing_rule_set import PricingRuleSet
+from src.domain.entities.partner_terms import PartnerTerms
+from src.domain.entities.commission_split import SplitMode
+
+logger = logging.getLogger(__name__)
+
+
+# A chunk of tracking events as columns. Campaigns and event types are
+# dictionary-encoded: codes index the chunk's own lists of distinct values.
+@dataclass
+class EventChunk:
+    campaign_codes: np.ndarray
+    campaign_ids: list[str]
+    event_type_codes: np.ndarray
+    event_types: list[str]
+    # Any datetime64 resolution, in event order
+    timestamps: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.campaign_codes)
+
+
+def month_index(value) -> int:
+    return int(np.datetime64(value, "M").astype(np.int64))
+
+
+@dataclass
+class _PricingArrays:
+    # (campaign/partner pair) x event type amount of one commission
+    unit: np.ndarray
+    tier_min_counts: np.ndarray | None
+    tier_multipliers: np.ndarray | None
+
+
+# Prices historical tracking events under several rule sets at once, one
+# chunk at a time, with array operations only. Without volume tiers the
+# amount of a commission depends only on its campaign/partner pair and event
+# type (split, partner price), so events are just counted per (campaign,
+# event type) with bincount and priced per pair when results are read. With
+# volume tiers each event is fanned out to its campaign's partners (campaign
+# -> partners is held as CSR arrays, so a fanned row's position is also its
+# pair) and the tier multipliers are summed per (pair, event type). Memory is
+# the chunk's arrays plus accumulators sized by the number of pairs, whatever
+# the number of events. Pricing follows RegisterCommissionHandler.
+class CommissionSimulator:
+    def __init__(
+        self,
+        rule_sets: list[PricingRuleSet],
+        campaign_partners: dict[str, list[str]],
+        range_start: datetime,
+        range_end: datetime,
+        partner_terms: dict[str, PartnerTerms] | None = None,
+    ):
+        self.rule_sets = rule_sets
+        self.campaign_ids = list(campaign_partners)
+        self._campaigns = {c: i for i, c in enumerate(self.campaign_ids)}
+        self.partner_ids = list(
+            dict.fromkeys(
+                p for partners in campaign_partners.values() for p in partners
+            )
+        )
+        partners = {p: i for i, p in enumerate(self.partner_ids)}
+        degree = [len(campaign_partners[c]) for c in self.campaign_ids]
+        self._degree = np.array(degree, dtype=np.int64)
+        self._pair_start = np.cumsum(self._degree) - self._degree
+        self._pair_partner = np.array(
+            [partners[p] for c in self.campaign_ids for p in campaign_partners[c]],
+            dtype=np.int64,
+        )
+        self._pair_campaign = np.repeat(
+            np.arange(len(self.campaign_ids), dtype=np.int64), self._degree
+        )
+        self.event_types: list[str] = []
+        self._event_type_index: dict[str, int] = {}
+        self.commission_types = list(
+            dict.fromkeys(
+                t
+                for rule_set in rule_sets
+                for t in [
+                    *rule_set.event_commission_types.values(),
+                    rule_set.default_commission_type,
+                ]
+            )
+        )
+        self._partner_terms = partner_terms or {}
+        self._prices = [self._partner_prices(rule_set) for rule_set in rule_sets]
+        self._pricing: list[_PricingArrays] = []
+        self._counts = np.zeros((len(self.campaign_ids), 0), dtype=np.int64)
+        # Rule set index -> pair x event type sum of tier multipliers
+        self._tier_weights: dict[int, np.ndarray] = {
+            r: np.zeros((len(self._pair_partner), 0))
+            for r, rule_set in enumerate(rule_sets)
+            if rule_set.volume_tiers
+        }
+        # Month-to-date commission counts per partner for volume tiers;
+        # counting starts at range_start
+        self._first_month = month_index(range_start)
+        self._months = month_index(range_end) - self._first_month + 1
+        self._month_starts = np.arange(
+            self._first_month, self._first_month + self._months + 1
+        ).astype("datetime64[M]")
+        self._tier_counts = None
+        if self._tier_weights:
+            self._tier_counts = np.zeros(
+                len(self.partner_ids) * self._months, dtype=np.int64
+            )
+            self._tier_boundaries = np.unique(
+                [
+                    tier.min_count
+                    for rule_set in rule_sets
+                    if rule_set.volume_tiers
+                    for tier in rule_set.volume_tiers.tiers
+                ]
+            )
+        # (campaign_id, event_type) -> events of campaigns without partners
+        self.unassigned: dict[tuple[str, str], int] = {}
+        self.events = 0
+
+    def _add_event_types(self, event_types: list[str]) -> None:
+        new = [t for t in event_types if t not in self._event_type_index]
+        if not new:
+            return
+        for event_type in new:
+            self._event_type_index[event_type] = len(self.event_types)
+            self.event_types.append(event_type)
+        width = len(self.event_types) - self._counts.shape[1]
+        self._counts = np.pad(self._counts, ((0, 0), (0, width)))
+        for r, weights in self._tier_weights.items():
+            self._tier_weights[r] = np.pad(weights, ((0, 0), (0, width)))
+        self._pricing = [
+            self._pricing_arrays(rule_set, prices)
+            for rule_set, prices in zip(self.rule_sets, self._prices)
+        ]
+
+    def _partner_prices(self, rule_set: PricingRuleSet) -> np.ndarray | None:
+        # partner x commission type price, NaN where the partner has none;
+        # built once per rule set
+        if not (rule_set.use_partner_terms or rule_set.partner_rates):
+            return None
+        prices = np.full((len(self.partner_ids), len(self.commission_types)), np.nan)
+        for p, partner_id in enumerate(self.partner_ids):
+            terms = self._partner_terms.get(partner_id)
+            rates = rule_set.partner_rates.get(partner_id, {})
+            for t, commission_type in enumerate(self.commission_types):
+                rate = rates.get(commission_type)
+                if rate is not None:
+                    # Priced the same way as acceptance terms
+                    price = PartnerTerms(
+                        partner_id=partner_id,
+                        commission_type=commission_type,
+                        commission_rate=rate,
+                    ).price(commission_type)
+                elif rule_set.use_partner_terms and terms:
+                    price = terms.price(commission_type)
+                else:
+                    price = None
+                if price is not None:
+                    prices[p, t] = price
+        return prices
+
+    def _pricing_arrays(
+        self, rule_set: PricingRuleSet, prices: np.ndarray | None
+    ) -> _PricingArrays:
+        type_index = {t: i for i, t in enumerate(self.commission_types)}
+        commission_type = np.array(
+            [
+                type_index[
+                    rule_set.event_commission_types.get(
+                        event_type, rule_set.default_commission_type
+                    )
+                ]
+                for event_type in self.event_types
+            ],
+            dtype=np.int64,
+        )
+        base = np.array(
+            [
+                rule_set.event_amounts.get(event_type, rule_set.default_amount)
+                for event_type in self.event_types
+            ]
+        )
+        replicate = np.array(
+            [
+                rule_set.split_rules.by_commission_type.get(
+                    t, rule_set.split_rules.default
+                )
+                == SplitMode.REPLICATE
+                for t in self.commission_types
+            ]
+        )[commission_type]
+        degree = self._degree[self._pair_campaign][:, None]
+        position = (
+            np.arange(len(self._pair_partner)) - self._pair_start[self._pair_campaign]
+        )
+        last = (position == degree[:, 0] - 1)[:, None]
+        share = base / degree
+        # Same split as CommissionSplitRules: the last partner takes the
+        # remainder
+        unit = np.where(
+            replicate | (degree == 1),
+            base,
+            np.where(last, base - share * (degree - 1), share),
+        )
+        if prices is not None:
+            price = prices[self._pair_partner][:, commission_type]
+            unit = np.where(np.isnan(price), unit, price)
+        tiers = rule_set.volume_tiers.tiers if rule_set.volume_tiers else []
+        return _PricingArrays(
+            unit=unit,
+            tier_min_counts=(
+                np.array([tier.min_count for tier in tiers]) if tiers else None
+            ),
+            tier_multipliers=(
+                np.array([tier.multiplier for tier in tiers]) if tiers else None
+            ),
+        )
+
+    def _campaign_codes(self, campaign_ids: list[str]) -> np.ndarray:
+        # Campaigns not in the mapping get -1
+        return np.array(
+            [self._campaigns.get(c, -1) for c in campaign_ids], dtype=np.int64
+        )
+
+    def _tier_counts_before(
+        self, partner: np.ndarray, months: np.ndarray
+    ) -> np.ndarray:
+        # Each fanned row's partner month-to-date count before it, in event
+        # order. Only its tier matters, so rows of a (partner, month) that
+        # stays within one tier during the chunk all get the count it started
+        # at, and only those of groups crossing a tier boundary are ranked.
+        key = partner * self._months + months
+        sizes = np.bincount(key, minlength=len(self._tier_counts))
+        start = self._tier_counts.copy()
+        self._tier_counts += sizes
+        crossing = (sizes > 1) & (
+            np.searchsorted(self._tier_boundaries, start, side="right")
+            != np.searchsorted(self._tier_boundaries, start + sizes - 1, side="right")
+        )
+        before = start[key]
+        rows = np.flatnonzero(crossing[key])
+        if len(rows):
+            # Rank within the group, in event order, by a stable sort
+            order = rows[np.argsort(key[rows], kind="stable")]
+            sorted_key = key[order]
+            starts = np.flatnonzero(np.diff(sorted_key, prepend=-1))
+            lengths = np.diff(np.append(starts, len(sorted_key)))
+            before[order] += np.arange(len(order)) - np.repeat(starts, lengths)
+        return before
+
+    def _add_tier_weights(
+        self,
+        campaign: np.ndarray,
+        event_type: np.ndarray,
+        months: np.ndarray,
+        degree: np.ndarray,
+    ) -> None:
+        # Fan out: row i of the fanned arrays is partner position[i] of
+        # event source[i]
+        source = np.repeat(np.arange(len(campaign)), degree)
+        position = np.arange(len(source)) - np.repeat(
+            np.cumsum(degree) - degree, degree
+        )
+        pair = self._pair_start[campaign[source]] + position
+        before = self._tier_counts_before(self._pair_partner[pair], months[source])
+        key = pair * len(self.event_types) + event_type[source]
+        for r, weights in self._tier_weights.items():
+            pricing = self._pricing[r]
+            tier = np.searchsorted(pricing.tier_min_counts, before, side="right") - 1
+            multiplier = np.where(
+                tier >= 0, pricing.tier_multipliers[np.maximum(tier, 0)], 1.0
+            )
+            weights += np.bincount(
+                key, weights=multiplier, minlength=weights.size
+            ).reshape(weights.shape)
+
+    def add(self, chunk: EventChunk) -> None:
+        if not len(chunk):
+            return
+        self._add_event_types(chunk.event_types)
+        campaign = self._campaign_codes(chunk.campaign_ids)[chunk.campaign_codes]
+        event_type = np.array(
+            [self._event_type_index[t] for t in chunk.event_types], dtype=np.int64
+        )[chunk.event_type_codes]
+        self.events += len(chunk)
+
+        degree = np.where(campaign >= 0, self._degree[np.maximum(campaign, 0)], 0)
+        priced = degree > 0
+        self._count_unassigned(chunk, ~priced)
+        if not priced.all():
+            campaign = campaign[priced]
+            event_type = event_type[priced]
+            degree = degree[priced]
+        key = campaign * len(self.event_types) + event_type
+        self._counts += np.bincount(key, minlength=self._counts.size).reshape(
+            self._counts.shape
+        )
+        if self._tier_counts is not None:
+            timestamps = chunk.timestamps if priced.all() else chunk.timestamps[priced]
+            # Month since range_start; a search is much cheaper than a
+            # calendar conversion
+            months = np.clip(
+                np.searchsorted(
+                    self._month_starts.astype(timestamps.dtype),
+                    timestamps,
+                    side="right",
+                )
+                - 1,
+                0,
+                self._months - 1,
+            )
+            self._add_tier_weights(campaign, event_type, months, degree)
+
+    def _count_unassigned(self, chunk: EventChunk, unassigned: np.ndarray) -> None:
+        if not unassigned.any():
+            return
+        keys = chunk.campaign_codes[unassigned] * len(chunk.event_types) + (
+            chunk.event_type_codes[unassigned]
+        )
+        values, counts = np.unique(keys, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            campaign_code, event_type_code = divmod(value, len(chunk.event_types))
+            key = (
+                chunk.campaign_ids[campaign_code],
+                chunk.event_types[event_type_code],
+            )
+            self.unassigned[key] = self.unassigned.get(key, 0) + count
+
+    def _pair_amounts(self) -> tuple[np.ndarray, np.ndarray]:
+        # pair x event type commissions, and their amounts per rule set
+        counts = self._counts[self._pair_campaign]
+        amounts = (
+            np.stack(
+                [
+                    pricing.unit * self._tier_weights.get(r, counts)
+                    for r, pricing in enumerate(self._pricing)
+                ]
+            )
+            if self._pricing
+            else np.zeros((len(self.rule_sets), *counts.shape))
+        )
+        return counts, amounts
+
+    def results(self, group_by: list[str]) -> list[tuple[tuple, int, list[float]]]:
+        # (group values, commissions, amount per rule set), grouped by any of
+        # "campaign", "partner" and "event_type"
+        counts, amounts = self._pair_amounts()
+        pairs, types = np.nonzero(counts)
+        groups: dict[tuple, list] = {}
+        for pair, event_type, count, pair_amounts in zip(
+            pairs.tolist(),
+            types.tolist(),
+            counts[pairs, types].tolist(),
+            amounts[:, pairs, types].T.tolist(),
+        ):
+            values = {
+                "campaign": self.campaign_ids[self._pair_campaign[pair]],
+                "partner": self.partner_ids[self._pair_partner[pair]],
+                "event_type": self.event_types[event_type],
+            }
+            group = tuple(values[column] for column in group_by)
+            total = groups.setdefault(group, [0, [0.0] * len(self.rule_sets)])
+            total[0] += count
+            total[1] = [a + b for a, b in zip(total[1], pair_amounts)]
+        return [
+            (group, count, amounts)
+            for group, (count, amounts) in sorted(groups.items())
+        ]
+
+    def totals(self) -> list[float]:
+        return self._pair_amounts()[1].sum(axis=(1, 2)).tolist()
@@ -0,0 +1,391 @@
+from .schema_migrator import Migration
+
+# Applied in order by migrate.py; never edit a released migration, add a new one.
+# Version 1 uses IF NOT EXISTS so databases created by metadata.create_all
+# are adopted as they are. The authoritative campaign_partners table lives in
+# the campaigns database and is migrated there; version 3 adds the local replica.
+MIGRATIONS = [
+    Migration(
+        1,
+        "baseline schema",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS commissions (
+                id SERIAL PRIMARY KEY,
+                amount DOUBLE PRECISION NOT NULL,
+                partner_id VARCHAR(255) NOT NULL,
+                campaign_id VARCHAR(255) NOT NULL,
+                commission_type VARCHAR(50) NOT NULL,
+                tracking_id VARCHAR(255) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS saga_logs (
+                id SERIAL PRIMARY KEY,
+                saga_id VARCHAR(255) NOT NULL,
+                step VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                details TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS saga_state (
+                saga_id VARCHAR(255) PRIMARY KEY,
+                current_step VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                commission_received_at TIMESTAMP WITHOUT TIME ZONE,
+                partner_queried_at TIMESTAMP WITHOUT TIME ZONE,
+                commission_saved_at TIMESTAMP WITHOUT TIME ZONE,
+                commission_failed_at TIMESTAMP WITHOUT TIME ZONE,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                last_error TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS replay_checkpoints (
+                name VARCHAR(100) PRIMARY KEY,
+                topic VARCHAR(255) NOT NULL,
+                message_id BYTEA NOT NULL,
+                processed BIGINT NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "hot-path indexes",
+        (
+            # Saga history lookups and per-step status updates
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_saga_logs_saga_id_step ON saga_logs (saga_id, step)",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        3,
+        "local campaign_partners replica",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS campaign_partners (
+                id SERIAL PRIMARY KEY,
+                campaign_id VARCHAR(255) NOT NULL,
+                partner_id VARCHAR(255) NOT NULL
+            )
+            """,
+            # Association events are redelivered and overlap the bootstrap
+            # snapshot, so replica writes are idempotent on the pair
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_campaign_partners_pair ON campaign_partners (campaign_id, partner_id)",
+            """
+            CREATE TABLE IF NOT EXISTS projection_snapshots (
+                name VARCHAR(100) PRIMARY KEY,
+                rows BIGINT NOT NULL,
+                taken_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        4,
+        "partner commission totals",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS partner_commission_totals (
+                partner_id VARCHAR(255) NOT NULL,
+                period_start DATE NOT NULL,
+                campaign_id VARCHAR(255) NOT NULL,
+                commission_type VARCHAR(50) NOT NULL,
+                commission_count BIGINT NOT NULL,
+                total_amount DOUBLE PRECISION NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (partner_id, period_start, campaign_id, commission_type)
+            )
+            """,
+            # Backfill from existing commissions; runs in the same transaction
+            # as the table, so totals and history start out consistent
+            """
+            INSERT INTO partner_commission_totals
+                (partner_id, period_start, campaign_id, commission_type,
+                 commission_count, total_amount, updated_at)
+            SELECT partner_id, date_trunc('month', created_at)::date, campaign_id,
+                   commission_type, count(*), sum(amount), now() AT TIME ZONE 'utc'
+            FROM commissions
+            GROUP BY partner_id, date_trunc('month', created_at)::date,
+                     campaign_id, commission_type
+            ON CONFLICT DO NOTHING
+            """,
+        ),
+    ),
+    Migration(
+        5,
+        "commission settlement",
+        (
+            # Nullable without a default, so adding them does not rewrite the table
+            "ALTER TABLE commissions ADD COLUMN IF NOT EXISTS settled_at TIMESTAMP WITHOUT TIME ZONE",
+            "ALTER TABLE commissions ADD COLUMN IF NOT EXISTS settlement_id VARCHAR(64)",
+            """
+            CREATE TABLE IF NOT EXISTS settlement_runs (
+                settlement_id VARCHAR(64) PRIMARY KEY,
+                currency VARCHAR(3) NOT NULL,
+                min_payout DOUBLE PRECISION NOT NULL,
+                cutoff_id BIGINT NOT NULL,
+                last_settled_id BIGINT NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            # At most one unfinished run at a time
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_settlement_runs_unfinished ON settlement_runs ((true)) WHERE status <> 'completed'",
+            """
+            CREATE TABLE IF NOT EXISTS settlement_payouts (
+                settlement_id VARCHAR(64) NOT NULL,
+                partner_id VARCHAR(255) NOT NULL,
+                currency VARCHAR(3) NOT NULL,
+                commission_count BIGINT NOT NULL,
+                amount DOUBLE PRECISION NOT NULL,
+                published_at TIMESTAMP WITHOUT TIME ZONE,
+                PRIMARY KEY (settlement_id, partner_id)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        6,
+        "unsettled commissions index",
+        (
+            # Settlement walks unsettled commissions in id order; the partial
+            # index stays small as history gets settled
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_commissions_unsettled ON commissions (id) INCLUDE (partner_id, amount) WHERE settled_at IS NULL AND status = 'success'",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        7,
+        "exactly-once commissions",
+        (
+            # Redelivered messages used to record a commission more than once.
+            # Extra copies are moved aside (a settled copy is kept in place)
+            # and taken out of the totals, then the pair is made unique. The
+            # index is built in this transaction rather than concurrently, so
+            # no new duplicate can slip in between the cleanup and the index.
+            "CREATE TABLE IF NOT EXISTS commission_duplicates (LIKE commissions)",
+            """
+            WITH ranked AS (
+                SELECT id, row_number() OVER (
+                    PARTITION BY tracking_id, partner_id
+                    ORDER BY settled_at IS NULL, id
+                ) AS copy
+                FROM commissions
+            ), moved AS (
+                DELETE FROM commissions c
+                USING ranked
+                WHERE c.id = ranked.id AND ranked.copy > 1
+                RETURNING c.*
+            )
+            INSERT INTO commission_duplicates SELECT * FROM moved
+            """,
+            """
+            UPDATE partner_commission_totals t
+            SET commission_count = t.commission_count - d.commission_count,
+                total_amount = t.total_amount - d.total_amount,
+                updated_at = now() AT TIME ZONE 'utc'
+            FROM (
+                SELECT partner_id, date_trunc('month', created_at)::date AS period_start,
+                       campaign_id, commission_type,
+                       count(*) AS commission_count, sum(amount) AS total_amount
+                FROM commission_duplicates
+                GROUP BY 1, 2, 3, 4
+            ) d
+            WHERE t.partner_id = d.partner_id
+              AND t.period_start = d.period_start
+              AND t.campaign_id = d.campaign_id
+              AND t.commission_type = d.commission_type
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_commissions_tracking_partner ON commissions (tracking_id, partner_id)",
+        ),
+    ),
+    Migration(
+        8,
+        "campaign budgets",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS campaign_budgets (
+                campaign_id VARCHAR(255) PRIMARY KEY,
+                budget DOUBLE PRECISION NOT NULL,
+                spent DOUBLE PRECISION NOT NULL,
+                leased DOUBLE PRECISION NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS budget_leases (
+                campaign_id VARCHAR(255) NOT NULL,
+                holder VARCHAR(255) NOT NULL,
+                amount DOUBLE PRECISION NOT NULL,
+                expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (campaign_id, holder)
+            )
+            """,
+            # Every replica looks for expired leases each reconcile interval
+            "CREATE INDEX IF NOT EXISTS ix_budget_leases_expires_at ON budget_leases (expires_at)",
+        ),
+    ),
+    Migration(
+        9,
+        "campaign partner earnings and leaderboard snapshots",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS campaign_partner_earnings (
+                campaign_id VARCHAR(255) NOT NULL,
+                partner_id VARCHAR(255) NOT NULL,
+                commission_count BIGINT NOT NULL,
+                total_amount DOUBLE PRECISION NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (campaign_id, partner_id)
+            )
+            """,
+            # Backfilled from the monthly totals rather than the commissions
+            """
+            INSERT INTO campaign_partner_earnings
+            SELECT campaign_id, partner_id, sum(commission_count), sum(total_amount),
+                   now() AT TIME ZONE 'utc'
+            FROM partner_commission_totals
+            GROUP BY campaign_id, partner_id
+            ON CONFLICT DO NOTHING
+            """,
+            # Seeds a campaign's leaderboard with its first rows
+            "CREATE INDEX IF NOT EXISTS ix_campaign_partner_earnings_top ON campaign_partner_earnings (campaign_id, total_amount DESC)",
+            """
+            CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+                campaign_id VARCHAR(255) NOT NULL,
+                partner_id VARCHAR(255) NOT NULL,
+                commission_count BIGINT NOT NULL,
+                total_amount DOUBLE PRECISION NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (campaign_id, partner_id)
+            )
+            """,
+            # Starts complete: the top 1000 (SNAPSHOT_DEPTH) of every campaign
+            """
+            INSERT INTO leaderboard_snapshots
+            SELECT campaign_id, partner_id, commission_count, total_amount, updated_at
+            FROM (
+                SELECT *, row_number() OVER (
+                    PARTITION BY campaign_id ORDER BY total_amount DESC
+                ) AS position
+                FROM campaign_partner_earnings
+            ) ranked
+            WHERE position <= 1000
+            ON CONFLICT DO NOTHING
+            """,
+            # Replicas read back the entries merged since their last pass
+            "CREATE INDEX IF NOT EXISTS ix_leaderboard_snapshots_updated_at ON leaderboard_snapshots (updated_at)",
+        ),
+    ),
+    Migration(
+        10,
+        "commission recomputation jobs",
+        (
+            # Nullable without a default, so adding it does not rewrite the table
+            "ALTER TABLE commissions ADD COLUMN IF NOT EXISTS adjusts_tracking_id VARCHAR(255)",
+            """
+            CREATE TABLE IF NOT EXISTS recompute_jobs (
+                name VARCHAR(64) PRIMARY KEY,
+                rate_change TEXT NOT NULL,
+                range_start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                range_end TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                completed_at TIMESTAMP WITHOUT TIME ZONE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS recompute_chunks (
+                job_name VARCHAR(64) NOT NULL,
+                campaign_id VARCHAR(255) NOT NULL,
+                range_start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                range_end TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                commission_count BIGINT NOT NULL,
+                delta_amount DOUBLE PRECISION NOT NULL,
+                completed_at TIMESTAMP WITHOUT TIME ZONE,
+                PRIMARY KEY (job_name, campaign_id, range_start)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        11,
+        "recomputation indexes",
+        (
+            # Each recomputation chunk reads one campaign over a time slice
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_commissions_campaign_created_at ON commissions (campaign_id, created_at)",
+            # Earlier adjustments of a commission, summed into its current amount
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_commissions_adjustments ON commissions (adjusts_tracking_id, partner_id) INCLUDE (amount) WHERE adjusts_tracking_id IS NOT NULL",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        12,
+        "replay failures",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS replay_failures (
+                name VARCHAR(100) NOT NULL,
+                message_id BYTEA NOT NULL,
+                error TEXT,
+                failed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (name, message_id)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        13,
+        "earnings versions",
+        (
+            # Recomputations can lower totals, so leaderboards order updates
+            # by version instead of by amount. A constant default does not
+            # rewrite the tables.
+            "ALTER TABLE campaign_partner_earnings ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0",
+            "ALTER TABLE leaderboard_snapshots ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0",
+        ),
+    ),
+]
+
+# Hot queries reported by `python migrate.py --explain`, run before and after
+# migrating to compare plans and latency
+HOT_QUERIES = [
+    (
+        "saga log history",
+        "SELECT * FROM saga_logs WHERE saga_id = :saga_id",
+        {"saga_id": "1"},
+    ),
+    (
+        "saga log status update",
+        "UPDATE saga_logs SET status = status WHERE saga_id = :saga_id AND step = :step",
+        {"saga_id": "1", "step": "commission_saved"},
+    ),
+    (
+        "partner month-to-date totals",
+        "SELECT * FROM partner_commission_totals WHERE partner_id = :partner_id AND period_start = date_trunc('month', now())::date",
+        {"partner_id": "1"},
+    ),
+    (
+        "settlement unsettled chunk",
+        "SELECT partner_id, count(*), sum(amount) FROM (SELECT id, partner_id, amount FROM commissions WHERE settled_at IS NULL AND status = 'success' AND id > :after_id ORDER BY id LIMIT 100000) chunk GROUP BY partner_id",
+        {"after_id": 0},
+    ),
+    (
+        "duplicate commission insert",
+        "INSERT INTO commissions (amount, partner_id, campaign_id, commission_type, tracking_id, status, created_at) VALUES (0, :partner_id, '', '', :tracking_id, 'success', now()) ON CONFLICT (tracking_id, partner_id) DO NOTHING RETURNING tracking_id",
+        {"partner_id": "1", "tracking_id": "1"},
+    ),
+    (
+        "campaign leaderboard seed",
+        "SELECT * FROM campaign_partner_earnings WHERE campaign_id = :campaign_id ORDER BY total_amount DESC LIMIT 100",
+        {"campaign_id": "1"},
+    ),
+]
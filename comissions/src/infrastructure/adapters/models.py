@@ -1,4 +1,16 @@
-from sqlalchemy import Table, Column, Integer, String, Float, DateTime, Text, MetaData
+from sqlalchemy import (
+    Table,
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    Float,
+    DateTime,
+    Date,
+    Text,
+    LargeBinary,
+    MetaData,
+)
 
 metadata = MetaData()
 
@@ -13,6 +25,9 @@ commissions_table = Table(
     Column("tracking_id", String(255), nullable=False),
     Column("status", String(20), nullable=False, default="success"),
     Column("created_at", DateTime, nullable=False),
+    Column("settled_at", DateTime, nullable=True),
+    Column("settlement_id", String(64), nullable=True),
+    Column("adjusts_tracking_id", String(255), nullable=True),
 )
 
 saga_logs_table = Table(
@@ -26,7 +41,44 @@ saga_logs_table = Table(
     Column("details", Text, nullable=True),
 )
 
-# Table for querying campaigns db
+# Current state of each saga, one row per saga_id maintained with upserts
+saga_state_table = Table(
+    "saga_state",
+    metadata,
+    Column("saga_id", String(255), primary_key=True),
+    Column("current_step", String(50), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("commission_received_at", DateTime, nullable=True),
+    Column("partner_queried_at", DateTime, nullable=True),
+    Column("commission_saved_at", DateTime, nullable=True),
+    Column("commission_failed_at", DateTime, nullable=True),
+    Column("updated_at", DateTime, nullable=False),
+    Column("last_error", Text, nullable=True),
+)
+
+# Last message handled by each replay job, so a restarted replay resumes
+replay_checkpoints_table = Table(
+    "replay_checkpoints",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("topic", String(255), nullable=False),
+    Column("message_id", LargeBinary, nullable=False),
+    Column("processed", BigInteger, nullable=False, default=0),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Messages a replay job failed to process, retried when it resumes
+replay_failures_table = Table(
+    "replay_failures",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("message_id", LargeBinary, primary_key=True),
+    Column("error", Text, nullable=True),
+    Column("failed_at", DateTime, nullable=False),
+)
+
+# Same shape in the campaigns db and in the local replica fed by
+# campaign-partner association events
 campaign_partners_table = Table(
     "campaign_partners",
     metadata,
@@ -34,3 +86,147 @@ campaign_partners_table = Table(
     Column("campaign_id", String(255), nullable=False),
     Column("partner_id", String(255), nullable=False),
 )
+
+# Only in the campaigns db; read for partner acceptance terms
+partners_table = Table(
+    "partners",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("partner_id", String(255), nullable=False),
+    Column("partner_type", String(255), nullable=False),
+    Column("acceptance_terms", Text, nullable=False),  # JSON as text
+    Column("estimated_monthly_reach", Integer, nullable=False),
+)
+
+# Snapshots the local projections were bootstrapped from
+projection_snapshots_table = Table(
+    "projection_snapshots",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("rows", BigInteger, nullable=False),
+    Column("taken_at", DateTime, nullable=False),
+)
+
+# Per-partner earnings, maintained in the same transaction as each commission
+# insert so statements never scan commissions
+partner_commission_totals_table = Table(
+    "partner_commission_totals",
+    metadata,
+    Column("partner_id", String(255), primary_key=True),
+    Column("period_start", Date, primary_key=True),
+    Column("campaign_id", String(255), primary_key=True),
+    Column("commission_type", String(50), primary_key=True),
+    Column("commission_count", BigInteger, nullable=False),
+    Column("total_amount", Float, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# One row per settlement job; a run that is not completed is resumed
+settlement_runs_table = Table(
+    "settlement_runs",
+    metadata,
+    Column("settlement_id", String(64), primary_key=True),
+    Column("currency", String(3), nullable=False),
+    Column("min_payout", Float, nullable=False),
+    Column("cutoff_id", BigInteger, nullable=False),
+    Column("last_settled_id", BigInteger, nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Payout per partner of a settlement run, published to payments once the run
+# has settled its commissions (outbox)
+settlement_payouts_table = Table(
+    "settlement_payouts",
+    metadata,
+    Column("settlement_id", String(64), primary_key=True),
+    Column("partner_id", String(255), primary_key=True),
+    Column("currency", String(3), nullable=False),
+    Column("commission_count", BigInteger, nullable=False),
+    Column("amount", Float, nullable=False),
+    Column("published_at", DateTime, nullable=True),
+)
+
+# Durable budget ledger per campaign; spent and leased are only changed by
+# lease acquisition and the replicas' periodic reconciliation
+campaign_budgets_table = Table(
+    "campaign_budgets",
+    metadata,
+    Column("campaign_id", String(255), primary_key=True),
+    Column("budget", Float, nullable=False),
+    Column("spent", Float, nullable=False),
+    Column("leased", Float, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Budget leased to each replica (holder); reclaimed once it expires
+budget_leases_table = Table(
+    "budget_leases",
+    metadata,
+    Column("campaign_id", String(255), primary_key=True),
+    Column("holder", String(255), primary_key=True),
+    Column("amount", Float, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+)
+
+# All-time earnings per campaign and partner, maintained with the commissions
+campaign_partner_earnings_table = Table(
+    "campaign_partner_earnings",
+    metadata,
+    Column("campaign_id", String(255), primary_key=True),
+    Column("partner_id", String(255), primary_key=True),
+    Column("commission_count", BigInteger, nullable=False),
+    Column("total_amount", Float, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("version", BigInteger, nullable=False, server_default="0"),
+)
+
+# Persisted leaders per campaign, merged from every replica's leaderboard
+leaderboard_snapshots_table = Table(
+    "leaderboard_snapshots",
+    metadata,
+    Column("campaign_id", String(255), primary_key=True),
+    Column("partner_id", String(255), primary_key=True),
+    Column("commission_count", BigInteger, nullable=False),
+    Column("total_amount", Float, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("version", BigInteger, nullable=False, server_default="0"),
+)
+
+# Retroactive repricing jobs; rate_change holds the RateChange as JSON
+recompute_jobs_table = Table(
+    "recompute_jobs",
+    metadata,
+    Column("name", String(64), primary_key=True),
+    Column("rate_change", Text, nullable=False),
+    Column("range_start", DateTime, nullable=False),
+    Column("range_end", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("completed_at", DateTime, nullable=True),
+)
+
+# Checkpoint of each (campaign, time slice) chunk of a recomputation job
+recompute_chunks_table = Table(
+    "recompute_chunks",
+    metadata,
+    Column("job_name", String(64), primary_key=True),
+    Column("campaign_id", String(255), primary_key=True),
+    Column("range_start", DateTime, primary_key=True),
+    Column("range_end", DateTime, nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("commission_count", BigInteger, nullable=False),
+    Column("delta_amount", Float, nullable=False),
+    Column("completed_at", DateTime, nullable=True),
+)
+
+# Only in the tracking db; read by the what-if simulator
+tracking_events_table = Table(
+    "tracking_events",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("campaign_id", String(255), nullable=False),
+    Column("event_type", String(50), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("timestamp", DateTime, nullable=False),
+)
@@ -0,0 +1,224 @@
+import asyncio
+import heapq
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+from src.domain.entities.partner_earnings import PartnerEarnings
+from src.domain.ports.leaderboard_repository import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+# Entries kept per campaign in leaderboard_snapshots (and backfilled by
+# migration 9); the in-memory capacity can be raised up to it
+SNAPSHOT_DEPTH = 1000
+
+
+# Top-N earners of one campaign: the partner -> earnings map holds at most
+# capacity entries and a min-heap over it finds the floor to evict. Heap
+# entries are replaced lazily; stale ones are skipped when they surface and
+# dropped when the heap grows past twice the capacity.
+class CampaignTopN:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: dict[str, PartnerEarnings] = {}
+        self._heap: list[tuple[float, str]] = []
+        # Seeded boards hold the campaign's true leaders; boards created by
+        # live updates alone only know the partners seen since
+        self.seeded = False
+        self.dirty = False
+
+    def _floor(self) -> tuple[float, str]:
+        while True:
+            total, partner_id = self._heap[0]
+            entry = self.entries.get(partner_id)
+            if entry and entry.total_amount == total:
+                return total, partner_id
+            heapq.heappop(self._heap)
+
+    def update(self, earnings: PartnerEarnings) -> bool:
+        # Totals are absolute, so an older version arriving late is ignored
+        current = self.entries.get(earnings.partner_id)
+        if current:
+            if earnings.version <= current.version:
+                return False
+            if (
+                earnings.total_amount < current.total_amount
+                and len(self.entries) >= self.capacity
+            ):
+                # A lowered leader of a full board may now rank below
+                # partners the board does not hold; reseeded on the next read
+                self.seeded = False
+        elif len(self.entries) >= self.capacity:
+            total, partner_id = self._floor()
+            if earnings.total_amount <= total:
+                return False
+            heapq.heappop(self._heap)
+            del self.entries[partner_id]
+        self.entries[earnings.partner_id] = earnings
+        heapq.heappush(self._heap, (earnings.total_amount, earnings.partner_id))
+        if len(self._heap) > 2 * self.capacity:
+            self._heap = [
+                (entry.total_amount, entry.partner_id)
+                for entry in self.entries.values()
+            ]
+            heapq.heapify(self._heap)
+        self.dirty = True
+        return True
+
+    def top(self, limit: int) -> list[PartnerEarnings]:
+        return heapq.nlargest(
+            limit, self.entries.values(), key=lambda entry: entry.total_amount
+        )
+
+
+# Per-campaign top-N leaderboards fed by the commission repository with the
+# all-time totals of every (campaign, partner) it records. Reads never touch
+# the commissions table: a campaign in memory is served from its board and
+# one that is not is seeded from the earnings table's top rows. Boards are
+# bounded by capacity entries each and max_campaigns in total (least
+# recently used evicted). Changed boards are merged into leaderboard_snapshots
+# every snapshot interval, and the entries other replicas merged since the
+# last pass are read back, so every replica sees every update within about
+# one interval. On restart the boards are rebuilt from the snapshot.
+class PartnerLeaderboard:
+    def __init__(
+        self,
+        repository: LeaderboardRepository,
+        capacity: int = 100,
+        max_campaigns: int = 10_000,
+        snapshot_interval_seconds: float = 10.0,
+    ):
+        self.repository = repository
+        self.capacity = min(max(capacity, 1), SNAPSHOT_DEPTH)
+        self.max_campaigns = max_campaigns
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self._boards: OrderedDict[str, CampaignTopN] = OrderedDict()
+        # Leaders of dirty boards evicted before they were snapshotted
+        self._unsaved: dict[str, dict[str, PartnerEarnings]] = {}
+        self._watermark = None
+        self._running = False
+        self.updates = 0
+        self.reads = 0
+        self.seeds = 0
+        self.evictions = 0
+        self.snapshots = 0
+        self.snapshot_failures = 0
+
+    def _board(self, campaign_id: str) -> CampaignTopN:
+        board = self._boards.get(campaign_id)
+        if board:
+            self._boards.move_to_end(campaign_id)
+            return board
+        board = self._boards[campaign_id] = CampaignTopN(self.capacity)
+        while len(self._boards) > self.max_campaigns:
+            evicted_id, evicted = self._boards.popitem(last=False)
+            if evicted.dirty:
+                self._keep(evicted_id, evicted.entries.values())
+            self.evictions += 1
+        return board
+
+    def _keep(self, campaign_id: str, entries) -> None:
+        # A campaign can be evicted and dirtied again within one interval;
+        # the newest total of each partner is the one to save
+        unsaved = self._unsaved.setdefault(campaign_id, {})
+        for entry in entries:
+            current = unsaved.get(entry.partner_id)
+            if not current or entry.version > current.version:
+                unsaved[entry.partner_id] = entry
+
+    def _merge(self, rows: list[PartnerEarnings], seeded: bool) -> None:
+        for row in rows:
+            board = self._boards.get(row.campaign_id)
+            if board is None and not seeded:
+                # Partial snapshot rows are only merged into boards in memory
+                continue
+            board = self._board(row.campaign_id)
+            # Snapshot rows are already stored, so they leave the board clean
+            dirty = board.dirty
+            board.update(row)
+            board.dirty = dirty
+            board.seeded = board.seeded or seeded
+
+    def apply(self, earnings: list[PartnerEarnings]) -> None:
+        for entry in earnings:
+            if self._board(entry.campaign_id).update(entry):
+                self.updates += 1
+
+    async def top(self, campaign_id: str, limit: int) -> list[PartnerEarnings]:
+        self.reads += 1
+        board = self._boards.get(campaign_id)
+        if not board or not board.seeded:
+            self.seeds += 1
+            rows = await self.repository.get_top_earners(campaign_id, self.capacity)
+            board = self._board(campaign_id)
+            dirty = board.dirty
+            for row in rows:
+                board.update(row)
+            # Seeding reads what is already stored, nothing to snapshot
+            board.dirty = dirty
+            board.seeded = True
+        else:
+            self._boards.move_to_end(campaign_id)
+        return board.top(limit)
+
+    async def load(self) -> None:
+        rows, self._watermark = await self.repository.load_snapshot()
+        self._merge(rows, seeded=True)
+        logger.info(
+            f"Leaderboard rebuilt for {len(self._boards)} campaigns from {len(rows)} snapshot entries"
+        )
+
+    async def snapshot(self) -> None:
+        for campaign_id, board in self._boards.items():
+            if board.dirty:
+                self._keep(campaign_id, board.entries.values())
+                board.dirty = False
+        leaders = {
+            campaign_id: list(entries.values())
+            for campaign_id, entries in self._unsaved.items()
+        }
+        self._unsaved = {}
+        try:
+            await self.repository.save_snapshot(leaders, SNAPSHOT_DEPTH)
+            # Rows committed around the last pass may carry an earlier
+            # updated_at; merging them twice is harmless
+            since = self._watermark
+            if since:
+                since -= timedelta(seconds=self.snapshot_interval_seconds)
+            rows, latest = await self.repository.load_snapshot(since)
+        except Exception as e:
+            self.snapshot_failures += 1
+            logger.error(f"Failed to snapshot leaderboard: {e}")
+            for campaign_id, entries in leaders.items():
+                self._keep(campaign_id, entries)
+            raise
+        self._merge(rows, seeded=False)
+        self._watermark = max(latest, self._watermark) if self._watermark else latest
+        self.snapshots += 1
+
+    def stats(self) -> dict:
+        return {
+            "leaderboard_campaigns": len(self._boards),
+            "leaderboard_entries": sum(
+                len(board.entries) for board in self._boards.values()
+            ),
+            "leaderboard_updates": self.updates,
+            "leaderboard_reads": self.reads,
+            "leaderboard_seeds": self.seeds,
+            "leaderboard_evictions": self.evictions,
+            "leaderboard_snapshots": self.snapshots,
+            "leaderboard_snapshot_failures": self.snapshot_failures,
+        }
+
+    async def start(self) -> None:
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.snapshot_interval_seconds)
+            try:
+                await self.snapshot()
+            except Exception:
+                pass
+
+    async def stop(self) -> None:
+        self._running = False
+        await self.snapshot()
@@ -0,0 +1,87 @@
+import pulsar
+import asyncio
+import logging
+from pulsar.schema import AvroSchema
+from src.domain.entities.partner_terms import PartnerTerms
+from .partner_terms_cache import PartnerTermsCache
+from .dead_letter_policy import DeadLetterPolicy
+from .schemas import PartnerRecord
+
+logger = logging.getLogger(__name__)
+
+
+# Keeps the partner terms cache current from partner-registration events;
+# each event replaces the partner's terms if it is newer than the cached ones
+class PartnerRegistrationConsumer:
+    def __init__(
+        self,
+        terms_cache: PartnerTermsCache,
+        pulsar_service_url: str = "pulsar://localhost:6650",
+        topic: str = "persistent://miso-1-2025/default/campaigns-partner-registration",
+        token: str = "",
+        dead_letter_policy: DeadLetterPolicy | None = None,
+    ):
+        self.terms_cache = terms_cache
+        self.pulsar_service_url = pulsar_service_url
+        self.topic = topic
+        self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
+        self.client = None
+        self.consumer = None
+
+    async def start(self):
+        logger.info(f"Connecting to Pulsar at {self.pulsar_service_url}")
+        if self.token:
+            self.client = pulsar.Client(
+                self.pulsar_service_url,
+                authentication=pulsar.AuthenticationToken(self.token),
+            )
+        else:
+            self.client = pulsar.Client(self.pulsar_service_url)
+        self.consumer = await asyncio.to_thread(
+            self.client.subscribe,
+            self.topic,
+            "commissions-partner-terms",
+            schema=AvroSchema(PartnerRecord),
+            **self.dead_letter_policy.subscribe_options(),
+        )
+        await self.dead_letter_policy.attach(
+            self.client, self.consumer, self.topic, "commissions-partner-terms"
+        )
+        logger.info(f"Subscribed to topic: {self.topic}")
+        while True:
+            if asyncio.current_task().cancelled():
+                break
+            msg = None
+            # Records that cannot be decoded will never succeed
+            permanent = True
+            try:
+                msg = await asyncio.to_thread(self.consumer.receive)
+                record = msg.value()
+                permanent = False
+                self.terms_cache.apply(
+                    PartnerTerms(
+                        partner_id=record.partner_id,
+                        commission_type=record.acceptance_terms.commission_type,
+                        commission_rate=record.acceptance_terms.commission_rate,
+                        version=msg.publish_timestamp(),
+                    )
+                )
+                await asyncio.to_thread(self.consumer.acknowledge, msg)
+                logger.info(f"Partner terms updated for partner: {record.partner_id}")
+            except pulsar.Interrupted:
+                logger.info("Partner registration consumer interrupted, shutting down")
+                break
+            except Exception as e:
+                logger.error(f"Error applying partner registration: {e}")
+                if msg:
+                    await self.dead_letter_policy.fail(msg, e, permanent)
+
+    def stop(self):
+        logger.info("Stopping partner registration consumer")
+        if self.consumer:
+            self.consumer.close()
+        self.dead_letter_policy.close()
+        if self.client:
+            self.client.close()
+        logger.info("Partner registration consumer stopped")
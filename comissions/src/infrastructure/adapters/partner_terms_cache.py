@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from src.domain.entities.partner_terms import PartnerTerms
+
+logger = logging.getLogger(__name__)
+
+
+# Parsed acceptance terms by partner_id. Terms are kept until a newer version
+# arrives with a partner-registration event, so pricing a commission is a
+# dict lookup; only partners never seen are loaded, all of a message's
+# missing partners in one call. Partners without terms are cached for
+# negative_ttl_seconds. Concurrent misses for a partner share one load.
+class PartnerTermsCache:
+    def __init__(
+        self,
+        loader: Callable[[list[str]], Awaitable[dict[str, PartnerTerms]]],
+        negative_ttl_seconds: float = 60.0,
+        max_entries: int = 100_000,
+    ):
+        self.loader = loader
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        # partner_id -> (terms or None, expires_at)
+        self._entries: OrderedDict[str, tuple[PartnerTerms | None, float]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_failures = 0
+        self.evictions = 0
+        self.updates = 0
+        self.stale_updates = 0
+
+    def _store(self, partner_id: str, terms: PartnerTerms | None) -> None:
+        expires_at = (
+            math.inf if terms else time.monotonic() + self.negative_ttl_seconds
+        )
+        self._entries[partner_id] = (terms, expires_at)
+        self._entries.move_to_end(partner_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_many(self, partner_ids: list[str]) -> dict[str, PartnerTerms | None]:
+        now = time.monotonic()
+        found: dict[str, PartnerTerms | None] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        to_load = []
+        for partner_id in dict.fromkeys(partner_ids):
+            entry = self._entries.get(partner_id)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(partner_id)
+                if entry[0] is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                found[partner_id] = entry[0]
+                continue
+            self.misses += 1
+            inflight = self._inflight.get(partner_id)
+            if inflight:
+                waiting[partner_id] = inflight
+            else:
+                to_load.append(partner_id)
+        if to_load:
+            await self._load(to_load)
+            for partner_id in to_load:
+                found[partner_id] = self._entries.get(partner_id, (None, 0))[0]
+        for partner_id, future in waiting.items():
+            found[partner_id] = await asyncio.shield(future)
+        return found
+
+    async def _load(self, partner_ids: list[str]) -> None:
+        loop = asyncio.get_running_loop()
+        futures = {partner_id: loop.create_future() for partner_id in partner_ids}
+        self._inflight.update(futures)
+        self.loads += 1
+        try:
+            loaded = await self.loader(partner_ids)
+        except Exception as e:
+            self.load_failures += 1
+            for future in futures.values():
+                future.set_exception(e)
+                # Mark retrieved so a failure nobody else awaited is not logged
+                future.exception()
+            raise
+        finally:
+            for partner_id in partner_ids:
+                self._inflight.pop(partner_id, None)
+        for partner_id, future in futures.items():
+            current = self._entries.get(partner_id)
+            # A registration event applied during the load is newer than the
+            # campaigns DB row that was read
+            if not (current and current[0]):
+                self._store(partner_id, loaded.get(partner_id))
+            future.set_result(self._entries[partner_id][0])
+
+    def apply(self, terms: PartnerTerms) -> None:
+        current = self._entries.get(terms.partner_id)
+        if current and current[0] and current[0].version > terms.version:
+            self.stale_updates += 1
+            return
+        self.updates += 1
+        self._store(terms.partner_id, terms)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "partner_terms_entries": len(self._entries),
+            "partner_terms_lookups": lookups,
+            "partner_terms_hits": self.hits,
+            "partner_terms_negative_hits": self.negative_hits,
+            "partner_terms_misses": self.misses,
+            "partner_terms_hit_rate": (
+                (self.hits + self.negative_hits) / lookups if lookups else 0.0
+            ),
+            "partner_terms_loads": self.loads,
+            "partner_terms_load_failures": self.load_failures,
+            "partner_terms_evictions": self.evictions,
+            "partner_terms_updates": self.updates,
+            "partner_terms_stale_updates": self.stale_updates,
+        }
@@ -0,0 +1,265 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, update, delete, values, column, String, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.campaign_budget import CampaignBudget
+from src.domain.ports.campaign_budget_repository import CampaignBudgetRepository
+from .models import campaign_budgets_table, budget_leases_table
+
+logger = logging.getLogger(__name__)
+
+budgets = campaign_budgets_table
+leases = budget_leases_table
+
+
+async def _lock_budgets(session, campaign_ids) -> None:
+    # Budget rows are always locked before lease rows and in campaign order,
+    # so replicas reconciling and reclaiming at once do not deadlock
+    await session.execute(
+        select(budgets.c.campaign_id)
+        .where(budgets.c.campaign_id.in_(sorted(campaign_ids)))
+        .order_by(budgets.c.campaign_id)
+        .with_for_update()
+    )
+
+
+def _deltas(name: str, rows: dict[str, tuple[float, float]]):
+    return values(
+        column("campaign_id", String),
+        column("spent", Float),
+        column("released", Float),
+        name=name,
+    ).data(
+        [(campaign_id, *amounts) for campaign_id, amounts in sorted(rows.items())]
+    )
+
+
+class PostgresCampaignBudgetRepository(CampaignBudgetRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    def _to_budget(self, row) -> CampaignBudget:
+        return CampaignBudget(
+            campaign_id=row.campaign_id,
+            budget=row.budget,
+            spent=row.spent,
+            leased=row.leased,
+        )
+
+    async def get(self, campaign_id: str) -> CampaignBudget | None:
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                select(budgets).where(budgets.c.campaign_id == campaign_id)
+            )
+            row = result.first()
+            return self._to_budget(row) if row else None
+        finally:
+            await session.close()
+
+    async def set_budget(self, campaign_id: str, budget: float) -> CampaignBudget:
+        session = self.sessionmaker()
+        try:
+            stmt = pg_insert(budgets).values(
+                campaign_id=campaign_id,
+                budget=budget,
+                spent=0.0,
+                leased=0.0,
+                updated_at=datetime.utcnow(),
+            )
+            # Changing a budget keeps what has been spent and leased so far
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[budgets.c.campaign_id],
+                set_={
+                    "budget": stmt.excluded.budget,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            ).returning(budgets)
+            result = await session.execute(stmt)
+            row = result.first()
+            await session.commit()
+            return self._to_budget(row)
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def acquire_lease(
+        self,
+        campaign_id: str,
+        holder: str,
+        chunk: float,
+        needed: float,
+        expires_at: datetime,
+    ) -> float | None:
+        # Only runs when a replica's lease on the campaign runs out, so the
+        # row lock is taken once per chunk rather than once per commission
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                select(budgets.c.budget, budgets.c.spent, budgets.c.leased)
+                .where(budgets.c.campaign_id == campaign_id)
+                .with_for_update()
+            )
+            row = result.first()
+            if not row:
+                await session.commit()
+                return None
+            available = row.budget - row.spent - row.leased
+            wanted = max(chunk, needed)
+            if available >= wanted:
+                grant = wanted
+            elif available >= needed:
+                # Near the end of the budget replicas take only what they
+                # need, so one of them does not hold the rest idle
+                grant = needed
+            else:
+                grant = 0.0
+            if grant > 0:
+                await session.execute(
+                    update(budgets)
+                    .where(budgets.c.campaign_id == campaign_id)
+                    .values(
+                        leased=budgets.c.leased + grant, updated_at=datetime.utcnow()
+                    )
+                )
+            stmt = pg_insert(leases).values(
+                campaign_id=campaign_id,
+                holder=holder,
+                amount=grant,
+                expires_at=expires_at,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[leases.c.campaign_id, leases.c.holder],
+                set_={
+                    "amount": leases.c.amount + stmt.excluded.amount,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+            ).returning(leases.c.amount)
+            result = await session.execute(stmt)
+            lease = result.scalar_one()
+            await session.commit()
+            return lease
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def reconcile(
+        self,
+        holder: str,
+        spent: dict[str, float],
+        released: dict[str, float],
+        expires_at: datetime,
+    ) -> None:
+        session = self.sessionmaker()
+        try:
+            campaign_ids = set(spent) | set(released)
+            if campaign_ids:
+                await _lock_budgets(session, campaign_ids)
+                result = await session.execute(
+                    select(leases.c.campaign_id, leases.c.amount)
+                    .where(
+                        leases.c.holder == holder,
+                        leases.c.campaign_id.in_(sorted(campaign_ids)),
+                    )
+                    .order_by(leases.c.campaign_id)
+                    .with_for_update()
+                )
+                held = dict(result.tuples().all())
+                # Spend comes out of the holder's lease and a credit (negative
+                # spend) goes back into it; if the lease was reclaimed in the
+                # meantime either is only applied to spent
+                rows = {}
+                for campaign_id in campaign_ids:
+                    lease = held.get(campaign_id)
+                    amount = spent.get(campaign_id, 0.0)
+                    returned = amount + released.get(campaign_id, 0.0)
+                    rows[campaign_id] = (
+                        amount,
+                        0.0 if lease is None else min(lease, returned),
+                    )
+                # One batched update per table for every campaign
+                deltas = _deltas("budget_deltas", rows)
+                await session.execute(
+                    update(budgets)
+                    .where(budgets.c.campaign_id == deltas.c.campaign_id)
+                    .values(
+                        spent=budgets.c.spent + deltas.c.spent,
+                        leased=budgets.c.leased - deltas.c.released,
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+                deltas = _deltas("lease_deltas", rows)
+                await session.execute(
+                    update(leases)
+                    .where(
+                        leases.c.holder == holder,
+                        leases.c.campaign_id == deltas.c.campaign_id,
+                    )
+                    .values(amount=leases.c.amount - deltas.c.released)
+                )
+            await session.execute(
+                update(leases)
+                .where(leases.c.holder == holder, leases.c.amount > 0)
+                .values(expires_at=expires_at)
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def reclaim_expired(self, now: datetime) -> int:
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                select(leases.c.campaign_id)
+                .where(leases.c.expires_at < now)
+                .distinct()
+            )
+            campaign_ids = result.scalars().all()
+            if not campaign_ids:
+                await session.commit()
+                return 0
+            await _lock_budgets(session, campaign_ids)
+            # A lease renewed since the first select is re-checked and kept
+            result = await session.execute(
+                delete(leases)
+                .where(leases.c.expires_at < now)
+                .returning(leases.c.campaign_id, leases.c.amount)
+            )
+            reclaimed: dict[str, float] = {}
+            count = 0
+            for campaign_id, amount in result.tuples().all():
+                reclaimed[campaign_id] = reclaimed.get(campaign_id, 0.0) + amount
+                count += 1
+            if reclaimed:
+                deltas = _deltas(
+                    "reclaimed",
+                    {
+                        campaign_id: (0.0, amount)
+                        for campaign_id, amount in reclaimed.items()
+                    },
+                )
+                await session.execute(
+                    update(budgets)
+                    .where(budgets.c.campaign_id == deltas.c.campaign_id)
+                    .values(
+                        leased=budgets.c.leased - deltas.c.released,
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+            await session.commit()
+            if count:
+                logger.info(f"Reclaimed {count} expired budget leases")
+            return count
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
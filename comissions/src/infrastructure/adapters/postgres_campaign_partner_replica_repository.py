@@ -0,0 +1,112 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.campaign_partner import CampaignPartner
+from src.domain.ports.campaign_partner_replica_repository import (
+    CampaignPartnerReplicaRepository,
+)
+from .models import campaign_partners_table, projection_snapshots_table
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAME = "campaign_partners"
+# Keeps each multi-row insert well under the bind parameter limit
+INSERT_CHUNK_SIZE = 5000
+
+
+class PostgresCampaignPartnerReplicaRepository(CampaignPartnerReplicaRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    async def _insert(self, session, campaign_partners: list[CampaignPartner]) -> None:
+        for i in range(0, len(campaign_partners), INSERT_CHUNK_SIZE):
+            chunk = campaign_partners[i : i + INSERT_CHUNK_SIZE]
+            stmt = pg_insert(campaign_partners_table).values(
+                [
+                    {
+                        "campaign_id": campaign_partner.campaign_id,
+                        "partner_id": campaign_partner.partner_id,
+                    }
+                    for campaign_partner in chunk
+                ]
+            )
+            await session.execute(
+                stmt.on_conflict_do_nothing(
+                    index_elements=[
+                        campaign_partners_table.c.campaign_id,
+                        campaign_partners_table.c.partner_id,
+                    ]
+                )
+            )
+
+    async def is_bootstrapped(self) -> bool:
+        session = self.sessionmaker()
+        try:
+            stmt = select(projection_snapshots_table.c.name).where(
+                projection_snapshots_table.c.name == SNAPSHOT_NAME
+            )
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none() is not None
+        finally:
+            await session.close()
+
+    async def bootstrap(self, campaign_partners: list[CampaignPartner]) -> None:
+        # Rows and the snapshot marker commit together, so a crash mid-way
+        # simply takes the snapshot again
+        session = self.sessionmaker()
+        try:
+            await self._insert(session, campaign_partners)
+            await session.execute(
+                pg_insert(projection_snapshots_table)
+                .values(
+                    name=SNAPSHOT_NAME,
+                    rows=len(campaign_partners),
+                    taken_at=datetime.utcnow(),
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[projection_snapshots_table.c.name]
+                )
+            )
+            await session.commit()
+            logger.info(
+                f"Campaign partner replica bootstrapped with {len(campaign_partners)} associations"
+            )
+        except Exception as e:
+            logger.error(f"Failed to bootstrap campaign partner replica: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def save_many(self, campaign_partners: list[CampaignPartner]) -> None:
+        if not campaign_partners:
+            return
+        session = self.sessionmaker()
+        try:
+            await self._insert(session, campaign_partners)
+            await session.commit()
+        except Exception as e:
+            logger.error(
+                f"Failed to save {len(campaign_partners)} campaign partner associations: {e}"
+            )
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def get_all(self) -> list[CampaignPartner]:
+        session = self.sessionmaker()
+        try:
+            stmt = select(
+                campaign_partners_table.c.campaign_id,
+                campaign_partners_table.c.partner_id,
+            ).order_by(campaign_partners_table.c.id)
+            result = await session.execute(stmt)
+            return [
+                CampaignPartner(campaign_id=row.campaign_id, partner_id=row.partner_id)
+                for row in result.fetchall()
+            ]
+        finally:
+            await session.close()
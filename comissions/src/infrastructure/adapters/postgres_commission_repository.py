@@ -1,39 +1,121 @@
 import logging
+from typing import Callable
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from src.domain.entities.commission import Commission
+from src.domain.entities.partner_earnings import PartnerEarnings
 from src.domain.ports.commission_repository import CommissionRepository
 from .models import commissions_table
+from .postgres_partner_commission_totals_repository import upsert_totals
+from .postgres_leaderboard_repository import upsert_earnings
 
 logger = logging.getLogger(__name__)
 
+# Keeps each multi-row insert well under the bind parameter limit
+INSERT_CHUNK_SIZE = 4000
+
 
 class PostgresCommissionRepository(CommissionRepository):
-    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        earnings_listener: Callable[[list[PartnerEarnings]], None] | None = None,
+    ):
         self.sessionmaker = sessionmaker
+        # Told the new all-time totals of every (campaign, partner) that
+        # recorded commissions, once they are committed
+        self.earnings_listener = earnings_listener
 
-    async def save(self, commission: Commission) -> None:
+    async def save(self, commission: Commission) -> bool:
         logger.info(
             f"Saving commission to database for partner: {commission.partner_id}, campaign: {commission.campaign_id}"
         )
-        session = self.sessionmaker()
-        try:
-            stmt = insert(commissions_table).values(
-                amount=commission.amount,
-                partner_id=commission.partner_id,
-                campaign_id=commission.campaign_id,
-                commission_type=commission.commission_type,
-                tracking_id=commission.tracking_id,
-                status=commission.status,
-                created_at=commission.created_at,
-            )
-            await session.execute(stmt)
-            await session.commit()
+        recorded = bool(await self.save_many([commission]))
+        if recorded:
             logger.info(
                 f"Commission saved successfully for partner: {commission.partner_id}"
             )
+        return recorded
+
+    async def save_many(self, commissions: list[Commission]) -> list[Commission]:
+        # All rows of a fanned-out commission and their totals commit together.
+        # A (tracking_id, partner_id) pair that is already recorded is skipped
+        # by the insert itself and reported through RETURNING, so duplicates
+        # need no extra round trip; only the new rows are added to the totals.
+        if not commissions:
+            return []
+        session = self.sessionmaker()
+        try:
+            recorded = []
+            for i in range(0, len(commissions), INSERT_CHUNK_SIZE):
+                chunk = commissions[i : i + INSERT_CHUNK_SIZE]
+                stmt = pg_insert(commissions_table).values(
+                    [
+                        {
+                            "amount": commission.amount,
+                            "partner_id": commission.partner_id,
+                            "campaign_id": commission.campaign_id,
+                            "commission_type": commission.commission_type,
+                            "tracking_id": commission.tracking_id,
+                            "status": commission.status,
+                            "created_at": commission.created_at,
+                            "adjusts_tracking_id": commission.adjusts_tracking_id,
+                        }
+                        for commission in chunk
+                    ]
+                )
+                stmt = stmt.on_conflict_do_nothing(
+                    index_elements=[
+                        commissions_table.c.tracking_id,
+                        commissions_table.c.partner_id,
+                    ]
+                ).returning(
+                    commissions_table.c.tracking_id, commissions_table.c.partner_id
+                )
+                result = await session.execute(stmt)
+                inserted = set(result.tuples().all())
+                recorded.extend(
+                    commission
+                    for commission in chunk
+                    if (commission.tracking_id, commission.partner_id) in inserted
+                )
+            # Totals commit with the commissions, so they never drift from them
+            for stmt in upsert_totals(recorded):
+                await session.execute(stmt)
+            earnings = []
+            for stmt in upsert_earnings(recorded):
+                result = await session.execute(stmt)
+                earnings.extend(
+                    PartnerEarnings(
+                        campaign_id=row.campaign_id,
+                        partner_id=row.partner_id,
+                        commission_count=row.commission_count,
+                        total_amount=row.total_amount,
+                        version=row.version,
+                    )
+                    for row in result.fetchall()
+                )
+            await session.commit()
         except Exception as e:
+            logger.error(f"Failed to save {len(commissions)} commissions: {e}")
             await session.rollback()
             raise
         finally:
             await session.close()
+        if self.earnings_listener and earnings:
+            self.earnings_listener(earnings)
+        return recorded
+
+    async def is_recorded(self, tracking_id: str) -> bool:
+        # Served by the unique (tracking_id, partner_id) index
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                select(commissions_table.c.id)
+                .where(commissions_table.c.tracking_id == tracking_id)
+                .limit(1)
+            )
+            return result.first() is not None
+        finally:
+            await session.close()
@@ -0,0 +1,213 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.commission import Commission
+from src.domain.entities.partner_earnings import PartnerEarnings
+from src.domain.ports.leaderboard_repository import LeaderboardRepository
+from .models import campaign_partner_earnings_table, leaderboard_snapshots_table
+
+logger = logging.getLogger(__name__)
+
+# Keeps each multi-row upsert well under the bind parameter limit
+UPSERT_CHUNK_SIZE = 5000
+
+earnings = campaign_partner_earnings_table
+snapshots = leaderboard_snapshots_table
+
+
+def upsert_earnings(commissions: list[Commission]) -> list:
+    # Like the partner totals, one delta row per (campaign, partner) is added
+    # in the caller's transaction. RETURNING hands back the new all-time
+    # totals and their row versions, so every replica's leaderboard sees
+    # absolute amounts and can tell which one is newest.
+    deltas: dict[tuple, list] = defaultdict(lambda: [0, 0.0])
+    for commission in commissions:
+        key = (commission.campaign_id, commission.partner_id)
+        # Adjustments change amounts, not the number of commissions
+        if not commission.is_adjustment:
+            deltas[key][0] += 1
+        deltas[key][1] += commission.amount
+    now = datetime.utcnow()
+    # Sorted so concurrent transactions lock rows in the same order
+    rows = [
+        {
+            "campaign_id": campaign_id,
+            "partner_id": partner_id,
+            "commission_count": count,
+            "total_amount": amount,
+            "updated_at": now,
+            "version": 1,
+        }
+        for (campaign_id, partner_id), (count, amount) in sorted(deltas.items())
+    ]
+    statements = []
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(earnings).values(rows[i : i + UPSERT_CHUNK_SIZE])
+        statements.append(
+            stmt.on_conflict_do_update(
+                index_elements=[earnings.c.campaign_id, earnings.c.partner_id],
+                set_={
+                    "commission_count": earnings.c.commission_count
+                    + stmt.excluded.commission_count,
+                    "total_amount": earnings.c.total_amount
+                    + stmt.excluded.total_amount,
+                    "updated_at": stmt.excluded.updated_at,
+                    "version": earnings.c.version + 1,
+                },
+            ).returning(
+                earnings.c.campaign_id,
+                earnings.c.partner_id,
+                earnings.c.commission_count,
+                earnings.c.total_amount,
+                earnings.c.version,
+            )
+        )
+    return statements
+
+
+def _to_earnings(row) -> PartnerEarnings:
+    return PartnerEarnings(
+        campaign_id=row.campaign_id,
+        partner_id=row.partner_id,
+        commission_count=row.commission_count,
+        total_amount=row.total_amount,
+        version=row.version,
+    )
+
+
+class PostgresLeaderboardRepository(LeaderboardRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    async def get_top_earners(
+        self, campaign_id: str, limit: int
+    ) -> list[PartnerEarnings]:
+        session = self.sessionmaker()
+        try:
+            # Reads the first rows of ix_campaign_partner_earnings_top
+            stmt = (
+                select(earnings)
+                .where(earnings.c.campaign_id == campaign_id)
+                .order_by(earnings.c.total_amount.desc())
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return [_to_earnings(row) for row in result.fetchall()]
+        finally:
+            await session.close()
+
+    async def save_snapshot(
+        self, leaders: dict[str, list[PartnerEarnings]], keep: int
+    ) -> None:
+        rows = [
+            {
+                "campaign_id": entry.campaign_id,
+                "partner_id": entry.partner_id,
+                "commission_count": entry.commission_count,
+                "total_amount": entry.total_amount,
+                "updated_at": datetime.utcnow(),
+                "version": entry.version,
+            }
+            for campaign_id in sorted(leaders)
+            for entry in leaders[campaign_id]
+        ]
+        if not rows:
+            return
+        session = self.sessionmaker()
+        try:
+            for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                stmt = pg_insert(snapshots).values(rows[i : i + UPSERT_CHUNK_SIZE])
+                # Replicas each snapshot what they have seen; the highest
+                # version is the most recent total, lower or not
+                newer = stmt.excluded.version > snapshots.c.version
+                await session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[snapshots.c.campaign_id, snapshots.c.partner_id],
+                        set_={
+                            "commission_count": stmt.excluded.commission_count,
+                            "total_amount": stmt.excluded.total_amount,
+                            "updated_at": stmt.excluded.updated_at,
+                            "version": stmt.excluded.version,
+                        },
+                        where=newer,
+                    )
+                )
+            # Entries pushed below the top `keep` of their campaign are dropped
+            ranked = (
+                select(
+                    snapshots.c.campaign_id,
+                    snapshots.c.partner_id,
+                    func.row_number()
+                    .over(
+                        partition_by=snapshots.c.campaign_id,
+                        order_by=snapshots.c.total_amount.desc(),
+                    )
+                    .label("position"),
+                )
+                .where(snapshots.c.campaign_id.in_(sorted(leaders)))
+                .subquery("ranked")
+            )
+            await session.execute(
+                delete(snapshots).where(
+                    and_(
+                        snapshots.c.campaign_id == ranked.c.campaign_id,
+                        snapshots.c.partner_id == ranked.c.partner_id,
+                        ranked.c.position > keep,
+                    )
+                )
+            )
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to save leaderboard snapshot: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def refresh_snapshot(self, campaign_id: str) -> int:
+        # Totals changed without going through a leaderboard (recomputations)
+        # are copied into the campaign's snapshot entries; replicas merge
+        # them on their next pass like any other replica's update
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                update(snapshots)
+                .where(
+                    snapshots.c.campaign_id == campaign_id,
+                    earnings.c.campaign_id == snapshots.c.campaign_id,
+                    earnings.c.partner_id == snapshots.c.partner_id,
+                    earnings.c.version > snapshots.c.version,
+                )
+                .values(
+                    commission_count=earnings.c.commission_count,
+                    total_amount=earnings.c.total_amount,
+                    version=earnings.c.version,
+                    updated_at=datetime.utcnow(),
+                )
+            )
+            await session.commit()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Failed to refresh leaderboard snapshot of {campaign_id}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def load_snapshot(
+        self, since: datetime | None = None
+    ) -> tuple[list[PartnerEarnings], datetime | None]:
+        session = self.sessionmaker()
+        try:
+            stmt = select(snapshots)
+            if since:
+                stmt = stmt.where(snapshots.c.updated_at > since)
+            result = await session.execute(stmt)
+            rows = result.fetchall()
+            latest = max((row.updated_at for row in rows), default=since)
+            return [_to_earnings(row) for row in rows], latest
+        finally:
+            await session.close()
@@ -0,0 +1,162 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.commission import Commission
+from src.domain.entities.partner_commission_total import (
+    PartnerCommissionTotal,
+    period_start,
+)
+from src.domain.ports.partner_commission_totals_repository import (
+    PartnerCommissionTotalsRepository,
+)
+from .models import partner_commission_totals_table
+
+logger = logging.getLogger(__name__)
+
+# Keeps each multi-row upsert well under the bind parameter limit
+UPSERT_CHUNK_SIZE = 4000
+
+
+def upsert_totals(commissions: list[Commission]) -> list:
+    # Commissions are folded into one delta row per totals key; a conflicting
+    # row is incremented, never replaced. The statements are executed in the
+    # caller's transaction.
+    deltas: dict[tuple, list] = defaultdict(lambda: [0, 0.0])
+    for commission in commissions:
+        key = (
+            commission.partner_id,
+            period_start(commission.created_at),
+            commission.campaign_id,
+            commission.commission_type,
+        )
+        # Adjustments change amounts, not the number of commissions
+        if not commission.is_adjustment:
+            deltas[key][0] += 1
+        deltas[key][1] += commission.amount
+    now = datetime.utcnow()
+    # Sorted so concurrent transactions lock rows in the same order
+    rows = [
+        {
+            "partner_id": partner_id,
+            "period_start": period,
+            "campaign_id": campaign_id,
+            "commission_type": commission_type,
+            "commission_count": count,
+            "total_amount": amount,
+            "updated_at": now,
+        }
+        for (partner_id, period, campaign_id, commission_type), (
+            count,
+            amount,
+        ) in sorted(deltas.items())
+    ]
+    statements = []
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(partner_commission_totals_table).values(
+            rows[i : i + UPSERT_CHUNK_SIZE]
+        )
+        statements.append(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    partner_commission_totals_table.c.partner_id,
+                    partner_commission_totals_table.c.period_start,
+                    partner_commission_totals_table.c.campaign_id,
+                    partner_commission_totals_table.c.commission_type,
+                ],
+                set_={
+                    "commission_count": partner_commission_totals_table.c.commission_count
+                    + stmt.excluded.commission_count,
+                    "total_amount": partner_commission_totals_table.c.total_amount
+                    + stmt.excluded.total_amount,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+    return statements
+
+
+class PostgresPartnerCommissionTotalsRepository(PartnerCommissionTotalsRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    def _to_entity(self, row) -> PartnerCommissionTotal:
+        return PartnerCommissionTotal(
+            partner_id=row.partner_id,
+            period_start=row.period_start,
+            campaign_id=row.campaign_id,
+            commission_type=row.commission_type,
+            commission_count=row.commission_count,
+            total_amount=row.total_amount,
+        )
+
+    async def get_page(
+        self,
+        partner_id: str,
+        from_period: date | None,
+        to_period: date | None,
+        after: tuple[date, str, str] | None,
+        limit: int,
+    ) -> list[PartnerCommissionTotal]:
+        table = partner_commission_totals_table
+        key = tuple_(table.c.period_start, table.c.campaign_id, table.c.commission_type)
+        session = self.sessionmaker()
+        try:
+            # Keyset pagination on the primary key, so every page is an index
+            # range scan no matter how deep the client has paged
+            stmt = select(table).where(table.c.partner_id == partner_id)
+            if from_period:
+                stmt = stmt.where(table.c.period_start >= from_period)
+            if to_period:
+                stmt = stmt.where(table.c.period_start <= to_period)
+            if after:
+                stmt = stmt.where(key > tuple_(*after))
+            stmt = stmt.order_by(
+                table.c.period_start, table.c.campaign_id, table.c.commission_type
+            ).limit(limit)
+            result = await session.execute(stmt)
+            return [self._to_entity(row) for row in result.fetchall()]
+        finally:
+            await session.close()
+
+    async def get_period(
+        self, partner_id: str, period_start: date
+    ) -> list[PartnerCommissionTotal]:
+        table = partner_commission_totals_table
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                select(table)
+                .where(
+                    table.c.partner_id == partner_id,
+                    table.c.period_start == period_start,
+                )
+                .order_by(table.c.campaign_id, table.c.commission_type)
+            )
+            result = await session.execute(stmt)
+            return [self._to_entity(row) for row in result.fetchall()]
+        finally:
+            await session.close()
+
+    async def get_period_counts(
+        self, partner_ids: list[str], period_start: date
+    ) -> dict[str, int]:
+        # One query for all partners of a fanned-out commission
+        table = partner_commission_totals_table
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                select(table.c.partner_id, func.sum(table.c.commission_count))
+                .where(
+                    table.c.partner_id.in_(partner_ids),
+                    table.c.period_start == period_start,
+                )
+                .group_by(table.c.partner_id)
+            )
+            result = await session.execute(stmt)
+            counts = {partner_id: int(count) for partner_id, count in result.fetchall()}
+            return {partner_id: counts.get(partner_id, 0) for partner_id in partner_ids}
+        finally:
+            await session.close()
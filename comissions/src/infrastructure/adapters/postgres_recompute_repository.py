@@ -0,0 +1,281 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, update, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.commission import Commission
+from src.domain.entities.recomputation import (
+    RateChange,
+    RecomputeJob,
+    RecomputeChunk,
+    RecomputeChunkStatus,
+)
+from src.domain.ports.recompute_repository import RecomputeRepository
+from .models import commissions_table, recompute_jobs_table, recompute_chunks_table
+from .postgres_commission_repository import PostgresCommissionRepository
+from .postgres_leaderboard_repository import PostgresLeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+# Keeps each multi-row insert well under the bind parameter limit
+INSERT_CHUNK_SIZE = 5000
+
+# Differences below this are rounding noise and not recorded
+MIN_ADJUSTMENT = 1e-6
+
+jobs = recompute_jobs_table
+job_chunks = recompute_chunks_table
+
+
+def adjustment_tracking_id(tracking_id: str, job_name: str) -> str:
+    # One adjustment per commission and job: a chunk that is run again after
+    # a crash hits the (tracking_id, partner_id) index instead of adjusting twice
+    return f"{tracking_id}@{job_name}"
+
+
+class PostgresRecomputeRepository(RecomputeRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+        # Adjustments go through the regular insert, so partner totals and
+        # earnings are updated with them
+        self.commission_repository = PostgresCommissionRepository(sessionmaker)
+        self.leaderboard_repository = PostgresLeaderboardRepository(sessionmaker)
+
+    def _to_chunk(self, row) -> RecomputeChunk:
+        return RecomputeChunk(
+            job_name=row.job_name,
+            campaign_id=row.campaign_id,
+            range_start=row.range_start,
+            range_end=row.range_end,
+            status=RecomputeChunkStatus(row.status),
+            commission_count=row.commission_count,
+            delta_amount=row.delta_amount,
+        )
+
+    async def get_job(self, name: str) -> RecomputeJob | None:
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(select(jobs).where(jobs.c.name == name))
+            row = result.first()
+            if not row:
+                return None
+            return RecomputeJob(
+                name=row.name,
+                rate_change=RateChange.model_validate_json(row.rate_change),
+                range_start=row.range_start,
+                range_end=row.range_end,
+                created_at=row.created_at,
+                completed_at=row.completed_at,
+            )
+        finally:
+            await session.close()
+
+    async def create_job(self, job: RecomputeJob, chunks: list[RecomputeChunk]) -> None:
+        session = self.sessionmaker()
+        try:
+            await session.execute(
+                pg_insert(jobs).values(
+                    name=job.name,
+                    rate_change=job.rate_change.model_dump_json(),
+                    range_start=job.range_start,
+                    range_end=job.range_end,
+                    created_at=job.created_at,
+                )
+            )
+            rows = [
+                {
+                    "job_name": chunk.job_name,
+                    "campaign_id": chunk.campaign_id,
+                    "range_start": chunk.range_start,
+                    "range_end": chunk.range_end,
+                    "status": chunk.status.value,
+                    "commission_count": 0,
+                    "delta_amount": 0.0,
+                }
+                for chunk in chunks
+            ]
+            for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+                await session.execute(
+                    pg_insert(job_chunks).values(rows[i : i + INSERT_CHUNK_SIZE])
+                )
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to create recomputation job {job.name}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def complete_job(self, name: str) -> None:
+        session = self.sessionmaker()
+        try:
+            await session.execute(
+                update(jobs)
+                .where(jobs.c.name == name)
+                .values(completed_at=datetime.utcnow())
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def get_chunks(self, name: str) -> list[RecomputeChunk]:
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                select(job_chunks)
+                .where(job_chunks.c.job_name == name)
+                .order_by(job_chunks.c.campaign_id, job_chunks.c.range_start)
+            )
+            return [self._to_chunk(row) for row in result.fetchall()]
+        finally:
+            await session.close()
+
+    async def find_campaigns(
+        self, rate_change: RateChange, range_start: datetime, range_end: datetime
+    ) -> list[str]:
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                select(commissions_table.c.campaign_id)
+                .where(
+                    commissions_table.c.commission_type == rate_change.commission_type,
+                    commissions_table.c.created_at >= range_start,
+                    commissions_table.c.created_at < range_end,
+                    commissions_table.c.adjusts_tracking_id.is_(None),
+                )
+                .distinct()
+                .order_by(commissions_table.c.campaign_id)
+            )
+            if rate_change.partner_ids:
+                stmt = stmt.where(
+                    commissions_table.c.partner_id.in_(rate_change.partner_ids)
+                )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+        finally:
+            await session.close()
+
+    def _repricing(self, chunk: RecomputeChunk, rate_change: RateChange):
+        # Each commission's current amount is the original plus the
+        # adjustments of earlier jobs, so consecutive rate changes compose.
+        # This job's own adjustments are left out, which makes a rerun of a
+        # chunk compute the same differences it already recorded.
+        original = commissions_table
+        adjustment = commissions_table.alias("adjustment")
+        current = original.c.amount + func.coalesce(func.sum(adjustment.c.amount), 0.0)
+        # Repriced in the database, a whole batch per round trip
+        delta = current * (rate_change.factor - 1.0)
+        conditions = [
+            original.c.campaign_id == chunk.campaign_id,
+            original.c.commission_type == rate_change.commission_type,
+            original.c.created_at >= chunk.range_start,
+            original.c.created_at < chunk.range_end,
+            original.c.adjusts_tracking_id.is_(None),
+        ]
+        if rate_change.partner_ids:
+            conditions.append(original.c.partner_id.in_(rate_change.partner_ids))
+        return (
+            select(
+                original.c.tracking_id,
+                original.c.partner_id,
+                delta.label("delta"),
+            )
+            .select_from(
+                original.outerjoin(
+                    adjustment,
+                    and_(
+                        adjustment.c.adjusts_tracking_id == original.c.tracking_id,
+                        adjustment.c.partner_id == original.c.partner_id,
+                        adjustment.c.tracking_id
+                        != func.concat(original.c.tracking_id, f"@{chunk.job_name}"),
+                    ),
+                )
+            )
+            .where(*conditions)
+            .group_by(original.c.id)
+            .having(func.abs(delta) >= MIN_ADJUSTMENT)
+        )
+
+    async def recompute_chunk(
+        self,
+        chunk: RecomputeChunk,
+        rate_change: RateChange,
+        batch_size: int,
+        dry_run: bool,
+    ) -> RecomputeChunk:
+        count = 0
+        total = 0.0
+        session = self.sessionmaker()
+        try:
+            # Streamed through a server-side cursor, batch_size rows at a time
+            result = await session.stream(
+                self._repricing(chunk, rate_change).execution_options(
+                    yield_per=batch_size
+                )
+            )
+            async for rows in result.partitions():
+                count += len(rows)
+                total += sum(row.delta for row in rows)
+                if dry_run:
+                    continue
+                # Posted now, so closed periods and statements are not rewritten
+                now = datetime.utcnow()
+                await self.commission_repository.save_many(
+                    [
+                        Commission(
+                            amount=row.delta,
+                            partner_id=row.partner_id,
+                            campaign_id=chunk.campaign_id,
+                            commission_type=rate_change.commission_type,
+                            tracking_id=adjustment_tracking_id(
+                                row.tracking_id, chunk.job_name
+                            ),
+                            created_at=now,
+                            adjusts_tracking_id=row.tracking_id,
+                        )
+                        for row in rows
+                    ]
+                )
+        finally:
+            await session.close()
+        chunk = chunk.model_copy(
+            update={"commission_count": count, "delta_amount": total}
+        )
+        if dry_run:
+            return chunk
+        # A rate cut lowers totals, which running leaderboards only learn
+        # from the snapshot. Refreshed before the chunk is marked completed,
+        # so a crash in between refreshes it again on resume.
+        refreshed = await self.leaderboard_repository.refresh_snapshot(
+            chunk.campaign_id
+        )
+        logger.info(
+            f"Refreshed {refreshed} leaderboard entries of campaign {chunk.campaign_id}"
+        )
+        chunk.status = RecomputeChunkStatus.COMPLETED
+        session = self.sessionmaker()
+        try:
+            await session.execute(
+                update(job_chunks)
+                .where(
+                    job_chunks.c.job_name == chunk.job_name,
+                    job_chunks.c.campaign_id == chunk.campaign_id,
+                    job_chunks.c.range_start == chunk.range_start,
+                )
+                .values(
+                    status=chunk.status.value,
+                    commission_count=count,
+                    delta_amount=total,
+                    completed_at=datetime.utcnow(),
+                )
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+        return chunk
@@ -0,0 +1,114 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.ports.replay_checkpoint_repository import ReplayCheckpointRepository
+from .models import replay_checkpoints_table, replay_failures_table
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresReplayCheckpointRepository(ReplayCheckpointRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    async def get(self, name: str) -> bytes | None:
+        session = self.sessionmaker()
+        try:
+            stmt = select(replay_checkpoints_table.c.message_id).where(
+                replay_checkpoints_table.c.name == name
+            )
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
+        finally:
+            await session.close()
+
+    async def save(
+        self,
+        name: str,
+        topic: str,
+        message_id: bytes,
+        processed: int,
+        failures: list[tuple[bytes, str]],
+    ) -> None:
+        session = self.sessionmaker()
+        try:
+            # The checkpoint only moves past failed messages together with
+            # the record of them, so a resumed replay retries them
+            if failures:
+                failed = pg_insert(replay_failures_table).values(
+                    [
+                        {
+                            "name": name,
+                            "message_id": failed_id,
+                            "error": error,
+                            "failed_at": datetime.utcnow(),
+                        }
+                        for failed_id, error in failures
+                    ]
+                )
+                failed = failed.on_conflict_do_update(
+                    index_elements=[
+                        replay_failures_table.c.name,
+                        replay_failures_table.c.message_id,
+                    ],
+                    set_={
+                        "error": failed.excluded.error,
+                        "failed_at": failed.excluded.failed_at,
+                    },
+                )
+                await session.execute(failed)
+            stmt = pg_insert(replay_checkpoints_table).values(
+                name=name,
+                topic=topic,
+                message_id=message_id,
+                processed=processed,
+                updated_at=datetime.utcnow(),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[replay_checkpoints_table.c.name],
+                set_={
+                    "message_id": stmt.excluded.message_id,
+                    "processed": replay_checkpoints_table.c.processed
+                    + stmt.excluded.processed,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            await session.execute(stmt)
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to save replay checkpoint {name}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def get_failures(self, name: str) -> list[bytes]:
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                select(replay_failures_table.c.message_id)
+                .where(replay_failures_table.c.name == name)
+                .order_by(replay_failures_table.c.failed_at)
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars())
+        finally:
+            await session.close()
+
+    async def delete_failure(self, name: str, message_id: bytes) -> None:
+        session = self.sessionmaker()
+        try:
+            stmt = delete(replay_failures_table).where(
+                replay_failures_table.c.name == name,
+                replay_failures_table.c.message_id == message_id,
+            )
+            await session.execute(stmt)
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to delete replay failure of {name}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
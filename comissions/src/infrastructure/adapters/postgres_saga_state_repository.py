@@ -0,0 +1,138 @@
+import logging
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, update, func, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.saga_log import SagaLog, SagaStep, SagaStatus
+from src.domain.entities.saga_state import SagaState
+from src.domain.ports.saga_state_repository import SagaStateRepository
+from .models import saga_state_table
+from .postgres_saga_log_repository import insert_saga_logs, update_saga_log_status
+
+logger = logging.getLogger(__name__)
+
+
+# Steps are declared in saga order; a late log for an earlier step must not
+# move the current step backwards
+STEP_RANK = {step.value: rank for rank, step in enumerate(SagaStep)}
+
+
+def _step_column(step: SagaStep) -> str:
+    return f"{step.value}_at"
+
+
+class PostgresSagaStateRepository(SagaStateRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    def _collapse(self, saga_logs: list[SagaLog]) -> list[dict]:
+        # One row per saga: a multi-row upsert may not touch the same key twice
+        rows: dict[str, dict] = {}
+        for saga_log in saga_logs:
+            row = rows.get(saga_log.saga_id)
+            if row is None:
+                row = {_step_column(step): None for step in SagaStep}
+                row["saga_id"] = saga_log.saga_id
+                row["last_error"] = None
+                rows[saga_log.saga_id] = row
+            if STEP_RANK[saga_log.step.value] >= STEP_RANK.get(row.get("current_step"), -1):
+                row["current_step"] = saga_log.step.value
+                row["status"] = saga_log.status.value
+                row["updated_at"] = saga_log.timestamp
+            row[_step_column(saga_log.step)] = saga_log.timestamp
+            if saga_log.status == SagaStatus.FAILED:
+                row["last_error"] = saga_log.details
+        return list(rows.values())
+
+    async def apply(
+        self, saga_logs: list[SagaLog], detail_logs: list[SagaLog] | None = None
+    ) -> None:
+        if not saga_logs:
+            return
+        session = self.sessionmaker()
+        try:
+            stmt = pg_insert(saga_state_table).values(self._collapse(saga_logs))
+            # Step timestamps and the last error are only ever filled in
+            keep_existing = {
+                column: func.coalesce(
+                    stmt.excluded[column], saga_state_table.c[column]
+                )
+                for column in [_step_column(step) for step in SagaStep] + ["last_error"]
+            }
+            regresses = case(
+                STEP_RANK, value=saga_state_table.c.current_step, else_=-1
+            ) > case(STEP_RANK, value=stmt.excluded.current_step, else_=-1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[saga_state_table.c.saga_id],
+                set_={
+                    column: case(
+                        (regresses, saga_state_table.c[column]),
+                        else_=stmt.excluded[column],
+                    )
+                    for column in ["current_step", "status", "updated_at"]
+                }
+                | keep_existing,
+            )
+            await session.execute(stmt)
+            # Sampled step history commits with the state, never without it
+            if detail_logs:
+                await session.execute(insert_saga_logs(detail_logs))
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to apply {len(saga_logs)} saga logs to saga state: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def get(self, saga_id: str) -> SagaState | None:
+        session = self.sessionmaker()
+        try:
+            stmt = select(saga_state_table).where(
+                saga_state_table.c.saga_id == saga_id
+            )
+            result = await session.execute(stmt)
+            row = result.first()
+            if row is None:
+                return None
+            values = row._mapping
+            return SagaState(
+                saga_id=row.saga_id,
+                current_step=row.current_step,
+                status=row.status,
+                step_timestamps={
+                    step: values[_step_column(step)]
+                    for step in SagaStep
+                    if values[_step_column(step)] is not None
+                },
+                updated_at=row.updated_at,
+                last_error=row.last_error,
+            )
+        finally:
+            await session.close()
+
+    async def update_status(
+        self, saga_id: str, step: str, status: str, detail: bool = False
+    ) -> None:
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                update(saga_state_table)
+                .where(
+                    (saga_state_table.c.saga_id == saga_id)
+                    & (saga_state_table.c.current_step == step)
+                )
+                .values(status=status)
+            )
+            result = await session.execute(stmt)
+            logger.info(
+                f"Saga state update for saga_id {saga_id}, step {step}, rows affected: {result.rowcount}"
+            )
+            if detail:
+                await session.execute(update_saga_log_status(saga_id, step, status))
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to update saga state for saga_id {saga_id}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
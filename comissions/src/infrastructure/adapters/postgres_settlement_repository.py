@@ -0,0 +1,290 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, update, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.settlement import (
+    SettlementRun,
+    SettlementPayout,
+    SettlementStatus,
+)
+from src.domain.ports.settlement_repository import SettlementRepository
+from .models import (
+    commissions_table,
+    settlement_runs_table,
+    settlement_payouts_table,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keeps each multi-row insert well under the bind parameter limit
+INSERT_CHUNK_SIZE = 5000
+
+
+def _unsettled(after_id: int, cutoff_id: int):
+    # Matches the ix_commissions_unsettled partial index
+    return and_(
+        commissions_table.c.settled_at.is_(None),
+        commissions_table.c.status == "success",
+        commissions_table.c.id > after_id,
+        commissions_table.c.id <= cutoff_id,
+    )
+
+
+class PostgresSettlementRepository(SettlementRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    def _to_run(self, row) -> SettlementRun:
+        return SettlementRun(
+            settlement_id=row.settlement_id,
+            currency=row.currency,
+            min_payout=row.min_payout,
+            cutoff_id=row.cutoff_id,
+            last_settled_id=row.last_settled_id,
+            status=SettlementStatus(row.status),
+            created_at=row.created_at,
+        )
+
+    async def get_unfinished_run(self) -> SettlementRun | None:
+        session = self.sessionmaker()
+        try:
+            stmt = select(settlement_runs_table).where(
+                settlement_runs_table.c.status != SettlementStatus.COMPLETED.value
+            )
+            result = await session.execute(stmt)
+            row = result.first()
+            return self._to_run(row) if row else None
+        finally:
+            await session.close()
+
+    async def max_commission_id(self) -> int:
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(
+                select(func.coalesce(func.max(commissions_table.c.id), 0))
+            )
+            return int(result.scalar_one())
+        finally:
+            await session.close()
+
+    async def create_run(self, run: SettlementRun) -> None:
+        session = self.sessionmaker()
+        try:
+            await session.execute(
+                pg_insert(settlement_runs_table).values(
+                    settlement_id=run.settlement_id,
+                    currency=run.currency,
+                    min_payout=run.min_payout,
+                    cutoff_id=run.cutoff_id,
+                    last_settled_id=run.last_settled_id,
+                    status=run.status.value,
+                    created_at=run.created_at,
+                    updated_at=run.created_at,
+                )
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def set_status(self, settlement_id: str, status: SettlementStatus) -> None:
+        session = self.sessionmaker()
+        try:
+            await session.execute(
+                update(settlement_runs_table)
+                .where(settlement_runs_table.c.settlement_id == settlement_id)
+                .values(status=status.value, updated_at=datetime.utcnow())
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def aggregate_unsettled(
+        self, after_id: int, cutoff_id: int, limit: int
+    ) -> tuple[dict[str, tuple[int, float]], int | None]:
+        session = self.sessionmaker()
+        try:
+            chunk = (
+                select(
+                    commissions_table.c.id,
+                    commissions_table.c.partner_id,
+                    commissions_table.c.amount,
+                )
+                .where(_unsettled(after_id, cutoff_id))
+                .order_by(commissions_table.c.id)
+                .limit(limit)
+                .subquery("chunk")
+            )
+            # Grouped in the database, so only one row per partner comes back
+            stmt = select(
+                chunk.c.partner_id,
+                func.count().label("commission_count"),
+                func.sum(chunk.c.amount).label("amount"),
+                func.max(chunk.c.id).label("last_id"),
+            ).group_by(chunk.c.partner_id)
+            result = await session.execute(stmt)
+            totals = {}
+            last_id = None
+            for row in result.fetchall():
+                totals[row.partner_id] = (row.commission_count, row.amount)
+                last_id = max(last_id or 0, row.last_id)
+            return totals, last_id
+        finally:
+            await session.close()
+
+    async def create_payouts(
+        self, settlement_id: str, currency: str, partner_ids: list[str]
+    ) -> None:
+        # Amounts start at zero and are filled in from the rows actually
+        # marked settled, so a payout always equals its commissions
+        session = self.sessionmaker()
+        try:
+            for i in range(0, len(partner_ids), INSERT_CHUNK_SIZE):
+                chunk = partner_ids[i : i + INSERT_CHUNK_SIZE]
+                stmt = pg_insert(settlement_payouts_table).values(
+                    [
+                        {
+                            "settlement_id": settlement_id,
+                            "partner_id": partner_id,
+                            "currency": currency,
+                            "commission_count": 0,
+                            "amount": 0.0,
+                        }
+                        for partner_id in chunk
+                    ]
+                )
+                await session.execute(stmt.on_conflict_do_nothing())
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def settle_chunk(self, run: SettlementRun, limit: int) -> int:
+        commissions = commissions_table
+        payouts = settlement_payouts_table
+        now = datetime.utcnow()
+        # A single statement: pick the next chunk of the payout partners'
+        # commissions, mark it settled, add it to the payouts and advance the
+        # run's checkpoint. A crash leaves either all of it or none of it.
+        chunk = (
+            select(commissions.c.id)
+            .join(
+                payouts,
+                and_(
+                    payouts.c.settlement_id == run.settlement_id,
+                    payouts.c.partner_id == commissions.c.partner_id,
+                ),
+            )
+            .where(_unsettled(run.last_settled_id, run.cutoff_id))
+            .order_by(commissions.c.id)
+            .limit(limit)
+            .cte("chunk")
+        )
+        settled = (
+            update(commissions)
+            .where(commissions.c.id == chunk.c.id)
+            .values(settled_at=now, settlement_id=run.settlement_id)
+            .returning(commissions.c.id, commissions.c.partner_id, commissions.c.amount)
+            .cte("settled")
+        )
+        sums = (
+            select(
+                settled.c.partner_id,
+                func.count().label("commission_count"),
+                func.sum(settled.c.amount).label("amount"),
+            )
+            .group_by(settled.c.partner_id)
+            .subquery("sums")
+        )
+        added = (
+            update(payouts)
+            .where(
+                payouts.c.settlement_id == run.settlement_id,
+                payouts.c.partner_id == sums.c.partner_id,
+            )
+            .values(
+                commission_count=payouts.c.commission_count + sums.c.commission_count,
+                amount=payouts.c.amount + sums.c.amount,
+            )
+            .returning(payouts.c.partner_id)
+            .cte("added")
+        )
+        progress = select(
+            func.count(settled.c.id).label("settled"),
+            func.max(settled.c.id).label("last_id"),
+            select(func.count()).select_from(added).scalar_subquery().label("payouts"),
+        )
+        session = self.sessionmaker()
+        try:
+            result = await session.execute(progress)
+            row = result.one()
+            if row.settled:
+                await session.execute(
+                    update(settlement_runs_table)
+                    .where(settlement_runs_table.c.settlement_id == run.settlement_id)
+                    .values(last_settled_id=row.last_id, updated_at=now)
+                )
+                run.last_settled_id = row.last_id
+            await session.commit()
+            return row.settled
+        except Exception as e:
+            logger.error(f"Failed to settle chunk of run {run.settlement_id}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def get_unpublished_payouts(
+        self, settlement_id: str, limit: int
+    ) -> list[SettlementPayout]:
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                select(settlement_payouts_table)
+                .where(
+                    settlement_payouts_table.c.settlement_id == settlement_id,
+                    settlement_payouts_table.c.published_at.is_(None),
+                    settlement_payouts_table.c.commission_count > 0,
+                )
+                .order_by(settlement_payouts_table.c.partner_id)
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return [
+                SettlementPayout(
+                    settlement_id=row.settlement_id,
+                    partner_id=row.partner_id,
+                    currency=row.currency,
+                    commission_count=row.commission_count,
+                    amount=row.amount,
+                )
+                for row in result.fetchall()
+            ]
+        finally:
+            await session.close()
+
+    async def mark_published(self, settlement_id: str, partner_ids: list[str]) -> None:
+        session = self.sessionmaker()
+        try:
+            await session.execute(
+                update(settlement_payouts_table)
+                .where(
+                    settlement_payouts_table.c.settlement_id == settlement_id,
+                    settlement_payouts_table.c.partner_id.in_(partner_ids),
+                )
+                .values(published_at=datetime.utcnow())
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -0,0 +1,68 @@
+import pulsar
+import logging
+from functools import partial
+from pulsar.schema import AvroSchema
+from .schemas import CommissionCompletedRecord
+
+logger = logging.getLogger(__name__)
+
+
+class PulsarCommissionCompletedPublisher:
+    def __init__(
+        self,
+        pulsar_service_url: str,
+        commission_completed_topic: str,
+        token: str = "",
+    ):
+        self.pulsar_service_url = pulsar_service_url
+        self.commission_completed_topic = commission_completed_topic
+        self.token = token
+        self.client = None
+        self.producer = None
+
+    async def connect(self):
+        logger.info(
+            f"Connecting to Pulsar for commission completed at {self.pulsar_service_url}"
+        )
+        if self.token:
+            self.client = pulsar.Client(
+                self.pulsar_service_url,
+                authentication=pulsar.AuthenticationToken(self.token),
+            )
+        else:
+            self.client = pulsar.Client(self.pulsar_service_url)
+        self.producer = self.client.create_producer(
+            self.commission_completed_topic,
+            schema=AvroSchema(CommissionCompletedRecord),
+        )
+        logger.info(
+            f"Commission completed producer created for topic: {self.commission_completed_topic}"
+        )
+
+    async def publish_commission_completed_event(self, tracking_id: str) -> None:
+        record = CommissionCompletedRecord(tracking_id=tracking_id)
+        self.producer.send(record)
+        logger.info(f"Commission completed event sent for tracking_id: {tracking_id}")
+
+    def publish_commission_completed_events(self, tracking_ids: list[str]) -> None:
+        # Queued without waiting for the broker, for the batch consumer;
+        # a failed send is only logged, as with publish_commission_completed_event
+        for tracking_id in tracking_ids:
+            self.producer.send_async(
+                CommissionCompletedRecord(tracking_id=tracking_id),
+                partial(self._sent, tracking_id),
+            )
+
+    def _sent(self, tracking_id: str, result, msg_id) -> None:
+        # Called on the Pulsar client's thread
+        if result != pulsar.Result.Ok:
+            logger.error(
+                f"Failed to send commission completed event for tracking_id {tracking_id}: {result}"
+            )
+
+    async def disconnect(self):
+        if self.producer:
+            self.producer.close()
+        if self.client:
+            self.client.close()
+        logger.info("Commission completed producer disconnected")
@@ -1,8 +1,8 @@
 import pulsar
 import asyncio
 import logging
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from pulsar.schema import AvroSchema
 from src.application.handlers.register_commission_handler import (
     RegisterCommissionHandler,
@@ -11,11 +11,17 @@ from src.application.commands.register_commission_command import (
     RegisterCommissionCommand,
 )
 from src.domain.entities.commission import Commission
+from src.domain.entities.campaign_budget import CampaignBudgetExceeded
 from src.domain.entities.saga_log import SagaLog, SagaStep, SagaStatus
 from src.domain.ports.saga_log_repository import SagaLogRepository
 from .schemas import CommissionRecord
 from .models import campaign_partners_table
 from .pulsar_fail_tracking_publisher import PulsarFailTrackingPublisher
+from .pulsar_commission_completed_publisher import PulsarCommissionCompletedPublisher
+from .campaign_partner_cache import CampaignPartnerCache
+from .campaign_partner_replica import CampaignPartnerReplica
+from .campaigns_db_pool import CampaignsDbPool
+from .dead_letter_policy import DeadLetterPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -25,33 +31,55 @@ class PulsarConsumer:
         self,
         handler: RegisterCommissionHandler,
         fail_tracking_publisher: PulsarFailTrackingPublisher,
+        commission_completed_publisher: PulsarCommissionCompletedPublisher,
         saga_log_repository: SagaLogRepository,
-        campaigns_db_url: str,
+        campaigns_db: CampaignsDbPool,
         pulsar_service_url: str = "pulsar://localhost:6650",
         topic: str = "persistent://miso-1-2025/default/assign-commission-to-partner",
         token: str = "",
+        partner_cache_ttl_seconds: float = 300.0,
+        partner_cache_negative_ttl_seconds: float = 30.0,
+        partner_cache_max_entries: int = 10_000,
+        partner_replica: CampaignPartnerReplica | None = None,
+        max_in_flight: int = 1,
+        dead_letter_policy: DeadLetterPolicy | None = None,
+        batch_size: int = 1,
+        batch_timeout_ms: int = 50,
     ):
         self.handler = handler
         self.fail_tracking_publisher = fail_tracking_publisher
+        self.commission_completed_publisher = commission_completed_publisher
         self.saga_log_repository = saga_log_repository
-        self.campaigns_db_url = campaigns_db_url
+        self.campaigns_db = campaigns_db
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
         self.client = None
         self.consumer = None
-        self.campaigns_engine = None
-        self.campaigns_session = None
-
-    async def connect_campaigns_db(self):
-        logger.info(f"Connecting to campaigns DB at {self.campaigns_db_url}")
-        self.campaigns_engine = create_async_engine(self.campaigns_db_url)
-        self.campaigns_session = AsyncSession(self.campaigns_engine)
-        logger.info("Connected to campaigns DB")
+        self.max_in_flight = max(max_in_flight, 1)
+        # Above 1, messages are received and recorded in batches of up to
+        # batch_size, waiting at most batch_timeout_ms to fill one
+        self.batch_size = max(batch_size, 1)
+        self.batch_timeout_ms = batch_timeout_ms
+        self.batches = 0
+        self.batch_messages = 0
+        self.batch_fallbacks = 0
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
+        self.partner_replica = partner_replica
+        self.partner_cache = None
+        if partner_cache_ttl_seconds > 0:
+            self.partner_cache = CampaignPartnerCache(
+                self._query_partners,
+                ttl_seconds=partner_cache_ttl_seconds,
+                negative_ttl_seconds=partner_cache_negative_ttl_seconds,
+                max_entries=partner_cache_max_entries,
+                batch_loader=self._query_partners_many,
+            )
 
     async def start(self):
-        await self.connect_campaigns_db()
+        self.campaigns_db.connect()
         await self.fail_tracking_publisher.connect()
+        await self.commission_completed_publisher.connect()
         logger.info(f"Connecting to Pulsar at {self.pulsar_service_url}")
         if self.token:
             self.client = pulsar.Client(
@@ -60,109 +88,374 @@ class PulsarConsumer:
             )
         else:
             self.client = pulsar.Client(self.pulsar_service_url)
+        options = self.dead_letter_policy.subscribe_options()
+        if self.batch_size > 1:
+            options["batch_receive_policy"] = pulsar.ConsumerBatchReceivePolicy(
+                self.batch_size, -1, self.batch_timeout_ms
+            )
         self.consumer = self.client.subscribe(
-            self.topic, "commission-subscriber", schema=AvroSchema(CommissionRecord)
+            self.topic,
+            "commission-subscriber",
+            schema=AvroSchema(CommissionRecord),
+            **options,
+        )
+        await self.dead_letter_policy.attach(
+            self.client, self.consumer, self.topic, "commission-subscriber"
         )
         logger.info(f"Subscribed to topic: {self.topic}")
 
+        # Up to max_in_flight messages (or batches) are processed
+        # concurrently, each acknowledged on its own
+        receive, handle = self.consumer.receive, self._handle_message
+        if self.batch_size > 1:
+            receive, handle = self.consumer.batch_receive, self._handle_batch
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+
+        def done(task):
+            tasks.discard(task)
+            in_flight.release()
+
         while True:
             if asyncio.current_task().cancelled():
                 break
-            msg = None
+            await in_flight.acquire()
+            try:
+                msg = await asyncio.to_thread(receive)
+            except pulsar.Interrupted:
+                in_flight.release()
+                logger.info("Consumer interrupted, shutting down")
+                break
+            except Exception as e:
+                in_flight.release()
+                logger.error(f"Error receiving message: {e}")
+                continue
+            if self.batch_size > 1 and not msg:
+                # The batch timed out empty
+                in_flight.release()
+                continue
+            logger.info("Received commission message from Pulsar")
+            task = asyncio.create_task(handle(msg))
+            tasks.add(task)
+            task.add_done_callback(done)
+
+    async def _handle_message(self, msg) -> None:
+        try:
+            record = msg.value()
+        except Exception as e:
+            logger.error(f"Undecodable commission message: {e}")
+            await self.dead_letter_policy.fail(msg, e, permanent=True)
+            return
+        try:
+            # A rejected commission has been compensated, so it is
+            # acknowledged too rather than redelivered
+            await self.process_record(
+                record,
+                compensate_on_error=self.dead_letter_policy.is_final_attempt(msg),
+            )
+            self.consumer.acknowledge(msg)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            await self.dead_letter_policy.fail(msg, e)
+
+    async def _handle_batch(self, msgs) -> None:
+        records = []
+        batch = []
+        for msg in msgs:
             try:
-                msg = self.consumer.receive()
-                logger.info("Received commission message from Pulsar")
-                record = msg.value()
-                # Query campaigns DB for partner_id
-                campaign_id = record.campaign_id
-                stmt = select(campaign_partners_table.c.partner_id).where(
-                    campaign_partners_table.c.campaign_id == campaign_id
+                records.append(msg.value())
+                batch.append(msg)
+            except Exception as e:
+                logger.error(f"Undecodable commission message: {e}")
+                await self.dead_letter_policy.fail(msg, e, permanent=True)
+        if not batch:
+            return
+        self.batches += 1
+        self.batch_messages += len(batch)
+        try:
+            await self.process_records(records)
+        except Exception as e:
+            # One failing commission fails the batch's single insert, so the
+            # batch is processed again one message at a time: the others are
+            # recorded and only the failing one is retried and compensated
+            self.batch_fallbacks += 1
+            logger.error(
+                f"Batch of {len(batch)} commissions failed, processing one at a time: {e}"
+            )
+            for msg in batch:
+                await self._handle_message(msg)
+            return
+        # Rejected commissions have been compensated, so the whole batch is
+        # acknowledged; the client groups the acknowledgements it sends
+        await asyncio.to_thread(self._acknowledge, batch)
+
+    def _acknowledge(self, msgs) -> None:
+        for msg in msgs:
+            self.consumer.acknowledge(msg)
+
+    async def find_partners(self, campaign_id: str) -> tuple[str, ...]:
+        if self.partner_replica:
+            partner_ids = self.partner_replica.partners_of(campaign_id)
+            if partner_ids:
+                return tuple(partner_ids)
+            # The association event may not have been replicated yet; ask
+            # the campaigns DB (negatively cached) before rejecting
+        if self.partner_cache:
+            return await self.partner_cache.get(campaign_id)
+        return await self._query_partners(campaign_id)
+
+    async def find_partners_many(
+        self, campaign_ids: list[str]
+    ) -> dict[str, tuple[str, ...]]:
+        # Campaigns missing from the replica are resolved together
+        partners = {}
+        missing = []
+        for campaign_id in dict.fromkeys(campaign_ids):
+            partner_ids = (
+                self.partner_replica.partners_of(campaign_id)
+                if self.partner_replica
+                else None
+            )
+            if partner_ids:
+                partners[campaign_id] = tuple(partner_ids)
+            else:
+                missing.append(campaign_id)
+        if missing and self.partner_cache:
+            partners.update(await self.partner_cache.get_many(missing))
+        elif missing:
+            partners.update(await self._query_partners_many(missing))
+        return partners
+
+    async def _query_partners_many(
+        self, campaign_ids: list[str]
+    ) -> dict[str, tuple[str, ...]]:
+        # Every partner of every campaign in one query; the ids go in a
+        # single array parameter, so the statement is the same for any batch
+        async with self.campaigns_db.connection() as conn:
+            stmt = (
+                select(
+                    campaign_partners_table.c.campaign_id,
+                    campaign_partners_table.c.partner_id,
                 )
-                result = await self.campaigns_session.execute(stmt)
-                partner_id = result.scalar_one_or_none()
-                if not partner_id:
-                    logger.error(f"No partner found for campaign {campaign_id}")
-                    saga_id = str(record.tracking_id)
-                    await self.saga_log_repository.save(
-                        SagaLog(
-                            saga_id=saga_id,
-                            step=SagaStep.PARTNER_QUERIED,
-                            status=SagaStatus.FAILED,
-                            details=f"No partner for campaign {campaign_id}",
-                        )
+                .where(
+                    campaign_partners_table.c.campaign_id
+                    == any_(bindparam("campaign_ids", type_=ARRAY(String)))
+                )
+                .order_by(campaign_partners_table.c.id)
+            )
+            result = await conn.execute(stmt, {"campaign_ids": campaign_ids})
+            rows = result.tuples().all()
+        partners: dict[str, dict[str, None]] = {c: {} for c in campaign_ids}
+        for campaign_id, partner_id in rows:
+            partners[campaign_id][partner_id] = None
+        return {
+            campaign_id: tuple(partner_ids)
+            for campaign_id, partner_ids in partners.items()
+        }
+
+    async def _query_partners(self, campaign_id: str) -> tuple[str, ...]:
+        # Every partner of the campaign in one query, in association order
+        async with self.campaigns_db.connection() as conn:
+            stmt = (
+                select(campaign_partners_table.c.partner_id)
+                .where(campaign_partners_table.c.campaign_id == campaign_id)
+                .order_by(campaign_partners_table.c.id)
+            )
+            result = await conn.execute(stmt)
+            return tuple(dict.fromkeys(result.scalars().all()))
+
+    async def process_record(
+        self, record: CommissionRecord, compensate_on_error: bool = True
+    ) -> bool:
+        # Returns False when the commission was rejected and compensated.
+        # Errors are compensated only when compensate_on_error is set, so a
+        # message that is still going to be retried does not fail its saga
+        try:
+            # Resolve every partner of the campaign
+            campaign_id = record.campaign_id
+            partner_ids = await self.find_partners(campaign_id)
+            if not partner_ids:
+                logger.error(f"No partner found for campaign {campaign_id}")
+                saga_id = str(record.tracking_id)
+                await self.saga_log_repository.save(
+                    SagaLog(
+                        saga_id=saga_id,
+                        step=SagaStep.PARTNER_QUERIED,
+                        status=SagaStatus.FAILED,
+                        details=f"No partner for campaign {campaign_id}",
                     )
-                    await self.saga_log_repository.save(
-                        SagaLog(
-                            saga_id=saga_id,
-                            step=SagaStep.COMMISSION_FAILED,
-                            status=SagaStatus.FAILED,
-                            details="No partner found",
-                        )
+                )
+                await self.saga_log_repository.save(
+                    SagaLog(
+                        saga_id=saga_id,
+                        step=SagaStep.COMMISSION_FAILED,
+                        status=SagaStatus.FAILED,
+                        details="No partner found",
                     )
-                    try:
-                        await self.fail_tracking_publisher.publish_fail_tracking_event(
-                            record.tracking_id
-                        )
-                        logger.info(
-                            f"Fail tracking event sent for tracking_id: {record.tracking_id}"
-                        )
-                    except Exception as publish_error:
-                        logger.error(
-                            f"Failed to send fail tracking event: {publish_error}"
-                        )
-                    self.consumer.negative_acknowledge(msg)
-                    continue
-                data = {
-                    "amount": record.amount,
-                    "partner_id": partner_id,
-                    "campaign_id": record.campaign_id,
-                    "commission_type": record.commission_type,
-                    "tracking_id": record.tracking_id,
-                }
-                commission = Commission(**data)
-                command = RegisterCommissionCommand(commission)
-                await self.handler.handle(command)
-                self.consumer.acknowledge(msg)
+                )
+                await self._publish_fail_tracking(record.tracking_id)
+                return False
+            command = self._command(record, partner_ids)
+            try:
+                recorded = await self.handler.handle(command)
+            except CampaignBudgetExceeded as e:
+                # Rejected like a commission without a partner
+                logger.warning(str(e))
+                await self.saga_log_repository.save(
+                    SagaLog(
+                        saga_id=str(record.tracking_id),
+                        step=SagaStep.COMMISSION_FAILED,
+                        status=SagaStatus.FAILED,
+                        details=str(e),
+                    )
+                )
+                await self._publish_fail_tracking(record.tracking_id)
+                return False
+            if recorded:
                 logger.info(
-                    f"Message processed successfully for partner: {commission.partner_id}"
+                    f"Message processed successfully for {len(partner_ids)} partners"
                 )
-            except pulsar.Interrupted:
-                logger.info("Consumer interrupted, shutting down")
-                break
-            except Exception as e:
-                logger.error(f"Error processing message: {e}")
-                if msg:
-                    saga_id = str(record.tracking_id)
-                    await self.saga_log_repository.save(
-                        SagaLog(
-                            saga_id=saga_id,
-                            step=SagaStep.COMMISSION_FAILED,
-                            status=SagaStatus.FAILED,
-                            details=str(e),
-                        )
+            else:
+                logger.info(
+                    f"Duplicate delivery for tracking_id {record.tracking_id} skipped"
+                )
+            # Also sent for duplicates: the first delivery may have stopped
+            # before sending it, and tracking handles it idempotently
+            await self._publish_commission_completed(record.tracking_id)
+            return True
+        except Exception as e:
+            if not compensate_on_error:
+                raise
+            saga_id = str(record.tracking_id)
+            await self.saga_log_repository.save(
+                SagaLog(
+                    saga_id=saga_id,
+                    step=SagaStep.COMMISSION_FAILED,
+                    status=SagaStatus.FAILED,
+                    details=str(e),
+                )
+            )
+            await self._publish_fail_tracking(record.tracking_id)
+            raise
+
+    def _command(
+        self, record: CommissionRecord, partner_ids: tuple[str, ...]
+    ) -> RegisterCommissionCommand:
+        data = {
+            "amount": record.amount,
+            # Fanned out over partner_ids by the handler
+            "partner_id": partner_ids[0],
+            "campaign_id": record.campaign_id,
+            "commission_type": record.commission_type,
+            "tracking_id": record.tracking_id,
+        }
+        return RegisterCommissionCommand(Commission(**data), list(partner_ids))
+
+    async def process_records(self, records: list[CommissionRecord]) -> list[bool]:
+        # Batch form of process_record: the partners of every campaign in one
+        # query, every commission in one multi-row insert and the saga logs in
+        # one write per outcome. Returns per record False when it was
+        # rejected and compensated. Other errors fail the whole batch without
+        # compensation, for the caller to process it again record by record.
+        partners = await self.find_partners_many(
+            [record.campaign_id for record in records]
+        )
+        results = [False] * len(records)
+        commands = []
+        accepted = []
+        failed_logs = []
+        failed_ids = []
+        for i, record in enumerate(records):
+            partner_ids = partners.get(record.campaign_id)
+            if not partner_ids:
+                logger.error(f"No partner found for campaign {record.campaign_id}")
+                saga_id = str(record.tracking_id)
+                failed_logs.append(
+                    SagaLog(
+                        saga_id=saga_id,
+                        step=SagaStep.PARTNER_QUERIED,
+                        status=SagaStatus.FAILED,
+                        details=f"No partner for campaign {record.campaign_id}",
+                    )
+                )
+                failed_logs.append(
+                    SagaLog(
+                        saga_id=saga_id,
+                        step=SagaStep.COMMISSION_FAILED,
+                        status=SagaStatus.FAILED,
+                        details="No partner found",
                     )
-                    try:
-                        await self.fail_tracking_publisher.publish_fail_tracking_event(
-                            record.tracking_id
-                        )
-                        logger.info(
-                            f"Fail tracking event sent for tracking_id: {record.tracking_id}"
-                        )
-                    except Exception as publish_error:
-                        logger.error(
-                            f"Failed to send fail tracking event: {publish_error}"
-                        )
-                    self.consumer.negative_acknowledge(msg)
+                )
+                failed_ids.append(record.tracking_id)
+                continue
+            commands.append(self._command(record, partner_ids))
+            accepted.append(i)
+        outcomes = await self.handler.handle_many(commands) if commands else []
+        completed_ids = []
+        for i, outcome in zip(accepted, outcomes):
+            record = records[i]
+            if isinstance(outcome, CampaignBudgetExceeded):
+                logger.warning(str(outcome))
+                failed_logs.append(
+                    SagaLog(
+                        saga_id=str(record.tracking_id),
+                        step=SagaStep.COMMISSION_FAILED,
+                        status=SagaStatus.FAILED,
+                        details=str(outcome),
+                    )
+                )
+                failed_ids.append(record.tracking_id)
+                continue
+            results[i] = True
+            # Also sent for duplicates, as in process_record
+            completed_ids.append(record.tracking_id)
+        if failed_logs:
+            await self.saga_log_repository.save_many(failed_logs)
+        # Neither is waited for; lost events are handled as in process_record
+        self.fail_tracking_publisher.publish_fail_tracking_events(failed_ids)
+        self.commission_completed_publisher.publish_commission_completed_events(
+            completed_ids
+        )
+        logger.info(
+            f"Batch of {len(records)} commissions processed, {len(failed_ids)} rejected"
+        )
+        return results
+
+    async def _publish_fail_tracking(self, tracking_id: str) -> None:
+        try:
+            await self.fail_tracking_publisher.publish_fail_tracking_event(tracking_id)
+            logger.info(f"Fail tracking event sent for tracking_id: {tracking_id}")
+        except Exception as publish_error:
+            logger.error(f"Failed to send fail tracking event: {publish_error}")
+
+    async def _publish_commission_completed(self, tracking_id: str) -> None:
+        # The commission is already saved; if this is lost, the tracking
+        # service's stuck-saga scan republishes the commission event instead
+        try:
+            await self.commission_completed_publisher.publish_commission_completed_event(
+                tracking_id
+            )
+        except Exception as publish_error:
+            logger.error(f"Failed to send commission completed event: {publish_error}")
+
+    def stats(self) -> dict:
+        return {
+            "commission_batches": self.batches,
+            "commission_batch_messages": self.batch_messages,
+            "commission_avg_batch_size": (
+                self.batch_messages / self.batches if self.batches else 0.0
+            ),
+            "commission_batch_fallbacks": self.batch_fallbacks,
+        }
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         asyncio.create_task(self.fail_tracking_publisher.disconnect())
-        if self.campaigns_session:
-            asyncio.create_task(self.campaigns_session.close())
-        if self.campaigns_engine:
-            asyncio.create_task(self.campaigns_engine.dispose())
+        asyncio.create_task(self.commission_completed_publisher.disconnect())
+        asyncio.create_task(self.campaigns_db.dispose())
         logger.info("Pulsar consumer stopped")
@@ -1,5 +1,6 @@
 import pulsar
 import logging
+from functools import partial
 from pulsar.schema import AvroSchema
 from .schemas import FailTrackingEventRecord
 
@@ -42,6 +43,22 @@ class PulsarFailTrackingPublisher:
         self.producer.send(record)
         logger.info(f"Fail tracking event sent for tracking_id: {tracking_id}")
 
+    def publish_fail_tracking_events(self, tracking_ids: list[str]) -> None:
+        # Queued without waiting for the broker, for the batch consumer;
+        # a failed send is only logged, as with publish_fail_tracking_event
+        for tracking_id in tracking_ids:
+            self.producer.send_async(
+                FailTrackingEventRecord(tracking_id=tracking_id),
+                partial(self._sent, tracking_id),
+            )
+
+    def _sent(self, tracking_id: str, result, msg_id) -> None:
+        # Called on the Pulsar client's thread
+        if result != pulsar.Result.Ok:
+            logger.error(
+                f"Failed to send fail tracking event for tracking_id {tracking_id}: {result}"
+            )
+
     async def disconnect(self):
         if self.producer:
             self.producer.close()
@@ -0,0 +1,84 @@
+import json
+import pulsar
+import logging
+import asyncio
+from pulsar.schema import AvroSchema
+from src.domain.entities.settlement import SettlementPayout
+from .schemas import PaymentRecord
+
+logger = logging.getLogger(__name__)
+
+
+class PulsarPaymentRequestPublisher:
+    def __init__(
+        self,
+        pulsar_service_url: str,
+        payments_topic: str,
+        token: str = "",
+        payment_method: str = "bank_transfer",
+    ):
+        self.pulsar_service_url = pulsar_service_url
+        self.payments_topic = payments_topic
+        self.token = token
+        self.payment_method = payment_method
+        self.client = None
+        self.producer = None
+
+    async def connect(self):
+        logger.info(
+            f"Connecting to Pulsar for payment requests at {self.pulsar_service_url}"
+        )
+        if self.token:
+            self.client = pulsar.Client(
+                self.pulsar_service_url,
+                authentication=pulsar.AuthenticationToken(self.token),
+            )
+        else:
+            self.client = pulsar.Client(self.pulsar_service_url)
+        self.producer = self.client.create_producer(
+            self.payments_topic,
+            schema=AvroSchema(PaymentRecord),
+            batching_enabled=True,
+            batching_max_publish_delay_ms=10,
+        )
+        logger.info(f"Payment request producer created for topic: {self.payments_topic}")
+
+    async def publish_payouts(self, payouts: list[SettlementPayout]) -> None:
+        # Sent asynchronously and batched by the producer; returns once every
+        # payout has been acknowledged by the broker, raises if any failed
+        loop = asyncio.get_running_loop()
+        results = [loop.create_future() for _ in payouts]
+
+        def callback(future):
+            def done(res, msg_id):
+                loop.call_soon_threadsafe(future.set_result, res)
+
+            return done
+
+        for payout, future in zip(payouts, results):
+            record = PaymentRecord(
+                amount=payout.amount,
+                currency=payout.currency,
+                payment_method=self.payment_method,
+                account_details=json.dumps(
+                    {
+                        "settlement_id": payout.settlement_id,
+                        "commission_count": payout.commission_count,
+                    }
+                ),
+                user_id=payout.partner_id,
+                payout_id=payout.payout_id,
+            )
+            self.producer.send_async(record, callback(future))
+        await asyncio.to_thread(self.producer.flush)
+        for res in await asyncio.gather(*results):
+            if res != pulsar.Result.Ok:
+                raise RuntimeError(f"Failed to publish payment request: {res}")
+        logger.info(f"Published {len(payouts)} payment requests")
+
+    async def disconnect(self):
+        if self.producer:
+            self.producer.close()
+        if self.client:
+            self.client.close()
+        logger.info("Payment request producer disconnected")
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from src.domain.entities.recomputation import RateChange, RecomputeChunk
+from .postgres_recompute_repository import PostgresRecomputeRepository
+
+# Entry points for the recomputation job's process pool. Each pool process
+# gets its own event loop and a small engine once, in init_worker, and runs
+# the chunks it is handed on them.
+_loop: asyncio.AbstractEventLoop | None = None
+_repository: PostgresRecomputeRepository | None = None
+
+
+def init_worker(database_url: str) -> None:
+    global _loop, _repository
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    _loop = asyncio.new_event_loop()
+    # One connection streams the chunk while another writes its adjustments
+    engine = create_async_engine(database_url, pool_size=2, max_overflow=0)
+    _repository = PostgresRecomputeRepository(
+        async_sessionmaker(engine, expire_on_commit=False)
+    )
+
+
+def run_chunk(
+    chunk: RecomputeChunk, rate_change: RateChange, batch_size: int, dry_run: bool
+) -> RecomputeChunk:
+    return _loop.run_until_complete(
+        _repository.recompute_chunk(chunk, rate_change, batch_size, dry_run)
+    )
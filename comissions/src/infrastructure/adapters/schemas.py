@@ -1,4 +1,4 @@
-from pulsar.schema import Record, String, Float
+from pulsar.schema import Record, String, Integer, Float, Array
 
 
 class CommissionRecord(Record):
@@ -10,3 +10,38 @@ class CommissionRecord(Record):
 
 class FailTrackingEventRecord(Record):
     tracking_id = String()
+
+
+class CommissionCompletedRecord(Record):
+    tracking_id = String()
+
+
+class CampaignPartnerAssociationRecord(Record):
+    campaign_id = String()
+    partner_id = String()
+
+
+# Same name and fields as the payments service's record on payments-request
+class PaymentRecord(Record):
+    amount = Float()
+    currency = String()
+    payment_method = String()
+    account_details = String()  # JSON string of account details
+    user_id = String()
+    # Idempotency key of a settlement payout; payments stores each one once
+    payout_id = String()
+
+
+# Partner registrations published by the bff (campaigns-partner-registration)
+class AcceptanceTermsRecord(Record):
+    commission_type = String()
+    commission_rate = Float()
+    cookie_duration_days = Integer()
+    promotional_methods = Array(String())
+
+
+class PartnerRecord(Record):
+    partner_id = String()
+    partner_type = String()
+    acceptance_terms = AcceptanceTermsRecord()
+    estimated_monthly_reach = Integer()
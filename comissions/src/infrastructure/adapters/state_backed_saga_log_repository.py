@@ -0,0 +1,50 @@
+import logging
+import zlib
+from src.domain.entities.saga_log import SagaLog
+from src.domain.ports.saga_log_repository import SagaLogRepository
+from src.domain.ports.saga_state_repository import SagaStateRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Every saga log updates the one-row-per-saga state; the append-only step log
+# is only written for a sample of sagas, in the same transaction as the state.
+# Sampling is by saga_id, so a sampled saga keeps its complete history.
+class StateBackedSagaLogRepository(SagaLogRepository):
+    def __init__(
+        self,
+        saga_state_repository: SagaStateRepository,
+        detail_repository: SagaLogRepository | None = None,
+        detail_sample_rate: float = 0.01,
+    ):
+        self.saga_state_repository = saga_state_repository
+        self.detail_repository = detail_repository
+        self.detail_sample_rate = detail_sample_rate
+
+    def _sampled(self, saga_id: str) -> bool:
+        if not self.detail_repository or self.detail_sample_rate <= 0:
+            return False
+        if self.detail_sample_rate >= 1:
+            return True
+        return zlib.crc32(saga_id.encode()) % 10_000 < self.detail_sample_rate * 10_000
+
+    async def save(self, saga_log: SagaLog) -> int:
+        sampled = [saga_log] if self._sampled(saga_log.saga_id) else None
+        await self.saga_state_repository.apply([saga_log], sampled)
+        return 0
+
+    async def save_many(self, saga_logs: list[SagaLog]) -> None:
+        sampled = [log for log in saga_logs if self._sampled(log.saga_id)]
+        await self.saga_state_repository.apply(saga_logs, sampled)
+
+    async def get_by_saga_id(self, saga_id: str) -> list[SagaLog]:
+        # Step history only exists for sampled sagas; use the state store
+        # for the current step of any saga
+        if not self.detail_repository:
+            return []
+        return await self.detail_repository.get_by_saga_id(saga_id)
+
+    async def update_status(self, saga_id: str, step: str, status: str) -> None:
+        await self.saga_state_repository.update_status(
+            saga_id, step, status, detail=self._sampled(saga_id)
+        )
@@ -0,0 +1,117 @@
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Iterator
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from .commission_simulator import EventChunk
+from .models import tracking_events_table
+
+logger = logging.getLogger(__name__)
+
+EVENT_COLUMNS = ["campaign_id", "event_type", "timestamp"]
+
+
+def _encode(values: list[str]) -> tuple[np.ndarray, list[str]]:
+    # Dictionary-encodes a column in one pass: codes and distinct values
+    index: dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+async def postgres_event_chunks(
+    database_url: str, range_start: datetime, range_end: datetime, chunk_size: int
+) -> AsyncIterator[EventChunk]:
+    # Successful events of the window from the tracking database, streamed
+    # through a server-side cursor chunk_size rows at a time in id order,
+    # which is the order they were recorded in
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.connect() as conn:
+            stmt = (
+                select(
+                    tracking_events_table.c.campaign_id,
+                    tracking_events_table.c.event_type,
+                    tracking_events_table.c.timestamp,
+                )
+                .where(
+                    tracking_events_table.c.status == "success",
+                    tracking_events_table.c.timestamp >= range_start,
+                    tracking_events_table.c.timestamp < range_end,
+                )
+                .order_by(tracking_events_table.c.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            result = await conn.stream(stmt)
+            async for rows in result.partitions():
+                campaign_ids, event_types, timestamps = zip(*rows)
+                campaign_codes, campaigns = _encode(campaign_ids)
+                event_type_codes, types = _encode(event_types)
+                yield EventChunk(
+                    campaign_codes=campaign_codes,
+                    campaign_ids=campaigns,
+                    event_type_codes=event_type_codes,
+                    event_types=types,
+                    timestamps=np.array(timestamps, dtype="datetime64[us]"),
+                )
+    finally:
+        await engine.dispose()
+
+
+def _dictionary(column) -> tuple[np.ndarray, list[str]]:
+    import pyarrow.compute as pc
+
+    if not hasattr(column, "indices"):
+        column = pc.dictionary_encode(column)
+    return (
+        column.indices.to_numpy(zero_copy_only=False).astype(np.int64),
+        column.dictionary.to_pylist(),
+    )
+
+
+def parquet_event_chunks(
+    paths: list[str], range_start: datetime, range_end: datetime, chunk_size: int
+) -> Iterator[EventChunk]:
+    # Tracking events exported to Parquet (campaign_id, event_type,
+    # timestamp and optionally status columns), read chunk_size rows at a
+    # time with the string columns dictionary-encoded by the reader
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Reading Parquet exports needs pyarrow installed")
+    start = np.datetime64(range_start, "us")
+    end = np.datetime64(range_end, "us")
+    for path in paths:
+        parquet = pq.ParquetFile(
+            path, read_dictionary=["campaign_id", "event_type", "status"]
+        )
+        columns = EVENT_COLUMNS + (
+            ["status"] if "status" in parquet.schema_arrow.names else []
+        )
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            timestamps = (
+                batch.column("timestamp")
+                .to_numpy(zero_copy_only=False)
+                .astype("datetime64[us]")
+            )
+            keep = (timestamps >= start) & (timestamps < end)
+            if "status" in columns:
+                success = pc.equal(
+                    batch.column("status").cast(pa.string()), "success"
+                ).fill_null(False)
+                keep &= success.to_numpy(zero_copy_only=False)
+            campaign_codes, campaigns = _dictionary(batch.column("campaign_id"))
+            event_type_codes, types = _dictionary(batch.column("event_type"))
+            yield EventChunk(
+                campaign_codes=campaign_codes[keep],
+                campaign_ids=campaigns,
+                event_type_codes=event_type_codes[keep],
+                event_types=types,
+                timestamps=timestamps[keep],
+            )
@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+from datetime import datetime
+from src.domain.entities.partner_earnings import PartnerEarnings
+from src.domain.ports.leaderboard_repository import LeaderboardRepository
+from src.infrastructure.adapters.partner_leaderboard import PartnerLeaderboard
+
+
+class InMemoryLeaderboardRepository(LeaderboardRepository):
+    # The earnings table and the snapshot, with the snapshot upsert's rule:
+    # an entry is replaced by a higher version only
+    def __init__(self):
+        self.earnings: dict[tuple[str, str], PartnerEarnings] = {}
+        self.snapshot: dict[tuple[str, str], tuple[PartnerEarnings, datetime]] = {}
+
+    def record(self, campaign_id, partner_id, amount, count=1) -> PartnerEarnings:
+        current = self.earnings.get((campaign_id, partner_id))
+        entry = PartnerEarnings(
+            campaign_id=campaign_id,
+            partner_id=partner_id,
+            commission_count=(current.commission_count if current else 0) + count,
+            total_amount=(current.total_amount if current else 0.0) + amount,
+            version=(current.version if current else 0) + 1,
+        )
+        self.earnings[(campaign_id, partner_id)] = entry
+        return entry
+
+    async def get_top_earners(self, campaign_id, limit):
+        rows = [e for e in self.earnings.values() if e.campaign_id == campaign_id]
+        return sorted(rows, key=lambda e: e.total_amount, reverse=True)[:limit]
+
+    async def save_snapshot(self, leaders, keep):
+        for entries in leaders.values():
+            for entry in entries:
+                key = (entry.campaign_id, entry.partner_id)
+                current = self.snapshot.get(key)
+                if not current or entry.version > current[0].version:
+                    self.snapshot[key] = (entry, datetime.utcnow())
+
+    async def refresh_snapshot(self, campaign_id):
+        refreshed = 0
+        for key, (entry, _) in list(self.snapshot.items()):
+            latest = self.earnings.get(key)
+            if entry.campaign_id == campaign_id and latest.version > entry.version:
+                self.snapshot[key] = (latest, datetime.utcnow())
+                refreshed += 1
+        return refreshed
+
+    async def load_snapshot(self, since=None):
+        rows = [
+            (entry, updated_at)
+            for entry, updated_at in self.snapshot.values()
+            if not since or updated_at > since
+        ]
+        latest = max((updated_at for _, updated_at in rows), default=since)
+        return [entry for entry, _ in rows], latest
+
+
+class RateCutLeaderboardTest(unittest.TestCase):
+    # A recomputation from rate 0.10 to 0.05 (factor 0.5) records a negative
+    # adjustment, so the partner's all-time total goes down
+    def setUp(self):
+        self.repository = InMemoryLeaderboardRepository()
+        self.leaderboard = PartnerLeaderboard(self.repository, capacity=2)
+
+    def _top(self, leaderboard, campaign_id="c1"):
+        entries = asyncio.run(leaderboard.top(campaign_id, 10))
+        return [(entry.partner_id, entry.total_amount) for entry in entries]
+
+    def test_factor_below_one_lowers_the_total(self):
+        self.leaderboard.apply(
+            [
+                self.repository.record("c1", "p1", 100.0),
+                self.repository.record("c1", "p2", 80.0),
+            ]
+        )
+        self.assertEqual(self._top(self.leaderboard), [("p1", 100.0), ("p2", 80.0)])
+        self.leaderboard.apply([self.repository.record("c1", "p1", -50.0, count=0)])
+        self.assertEqual(self._top(self.leaderboard), [("p2", 80.0), ("p1", 50.0)])
+
+    def test_older_total_arriving_late_is_ignored(self):
+        before = self.repository.record("c1", "p1", 100.0)
+        after = self.repository.record("c1", "p1", -50.0, count=0)
+        self.leaderboard.apply([after, before])
+        self.assertEqual(self._top(self.leaderboard), [("p1", 50.0)])
+
+    def test_lowered_total_survives_snapshot_and_restart(self):
+        before = self.repository.record("c1", "p1", 100.0)
+        self.leaderboard.apply([before])
+        asyncio.run(self.leaderboard.snapshot())
+        # The recomputation job only refreshes the snapshot entries
+        self.repository.record("c1", "p1", -50.0, count=0)
+        asyncio.run(self.repository.refresh_snapshot("c1"))
+        # Another replica's older, higher total does not overwrite it
+        asyncio.run(self.repository.save_snapshot({"c1": [before]}, keep=1000))
+        restarted = PartnerLeaderboard(self.repository, capacity=2)
+        asyncio.run(restarted.load())
+        self.assertEqual(self._top(restarted), [("p1", 50.0)])
+
+    def test_running_replica_merges_the_refreshed_snapshot(self):
+        self.leaderboard.apply([self.repository.record("c1", "p1", 100.0)])
+        asyncio.run(self.leaderboard.snapshot())
+        self.repository.record("c1", "p1", -50.0, count=0)
+        asyncio.run(self.repository.refresh_snapshot("c1"))
+        asyncio.run(self.leaderboard.snapshot())
+        self.assertEqual(self._top(self.leaderboard), [("p1", 50.0)])
+
+    def test_full_board_is_reseeded_when_a_leader_drops(self):
+        for partner_id, amount in (("p1", 100.0), ("p2", 90.0), ("p3", 70.0)):
+            self.repository.record("c1", partner_id, amount)
+        self.assertEqual(self._top(self.leaderboard), [("p1", 100.0), ("p2", 90.0)])
+        self.leaderboard.apply([self.repository.record("c1", "p1", -50.0, count=0)])
+        # p3 was never on the board but now outranks p1
+        self.assertEqual(self._top(self.leaderboard), [("p2", 90.0), ("p3", 70.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
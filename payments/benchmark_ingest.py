@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from src.application.commands.register_payment_command import RegisterPaymentCommand
+from src.application.handlers.register_payment_handler import RegisterPaymentHandler
+from src.domain.entities.payment import Payment
+from src.infrastructure.adapters.migrations import MIGRATIONS
+from src.infrastructure.adapters.postgres_payment_repository import (
+    PostgresPaymentRepository,
+)
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+
+# Measures payment ingest throughput of the per-message path (one insert and
+# commit per payment, as with PAYMENT_BATCH_SIZE=1) against batch ingest
+# (handle_many, batches of --batch-size) for a burst such as a month-end payout
+# run. Both run the real repository against DATABASE_URL; the Pulsar broker is
+# left out. It writes payments, so use a scratch database migrated with
+# migrate.py.
+
+load_dotenv()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-message against batch payment ingest"
+    )
+    parser.add_argument("--payments", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    return parser.parse_args()
+
+
+def make_commands(args, run_id: str, name: str) -> list[RegisterPaymentCommand]:
+    return [
+        RegisterPaymentCommand(
+            Payment(
+                amount=round(random.uniform(10, 5000), 2),
+                currency="USD",
+                payment_method=random.choice(["bank_transfer", "credit_card"]),
+                account_details={
+                    "bank": "bench_bank",
+                    "account_number": f"{run_id}-{name}-{i}",
+                },
+                user_id=f"bench-{run_id}-user-{random.randrange(args.users)}",
+            )
+        )
+        for i in range(args.payments)
+    ]
+
+
+def report(name: str, elapsed: float, payments: int) -> None:
+    print(f"{name:<20} {elapsed:>8.2f} s  {payments / elapsed:>10.0f} payments/s")
+
+
+async def main():
+    args = parse_args()
+    random.seed(42)
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/paymentsdb"
+    )
+    engine = create_async_engine(database_url)
+    await SchemaMigrator(engine, MIGRATIONS).check()
+    handler = RegisterPaymentHandler(
+        PostgresPaymentRepository(async_sessionmaker(engine, expire_on_commit=False))
+    )
+    run_id = uuid.uuid4().hex[:8]
+    try:
+        commands = make_commands(args, run_id, "single")
+        started = time.perf_counter()
+        for command in commands:
+            await handler.handle(command)
+        report("per message", time.perf_counter() - started, len(commands))
+
+        commands = make_commands(args, run_id, "batch")
+        started = time.perf_counter()
+        for i in range(0, len(commands), args.batch_size):
+            await handler.handle_many(commands[i : i + args.batch_size])
+        report(
+            f"batches of {args.batch_size}",
+            time.perf_counter() - started,
+            len(commands),
+        )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,19 @@
 import asyncio
 import os
 import logging
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import uvicorn
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 from src.infrastructure.adapters.postgres_payment_repository import (
     PostgresPaymentRepository,
 )
 from src.application.handlers.register_payment_handler import RegisterPaymentHandler
+from src.application.handlers.get_payments_handler import GetPaymentsHandler
 from src.infrastructure.adapters.pulsar_consumer import PulsarConsumer
-from src.infrastructure.adapters.models import metadata
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+from src.infrastructure.adapters.dead_letter_policy import DeadLetterPolicy
+from src.api import app, register_stats_provider, set_payments_handler
 
 load_dotenv()
 
@@ -27,26 +32,48 @@ async def main():
     )
     logger.info(f"Connecting to database: {database_url}")
     engine = create_async_engine(database_url)
-    async with engine.begin() as conn:
-        await conn.run_sync(metadata.create_all)
-    logger.info("Database tables created/verified")
+    await SchemaMigrator(engine, MIGRATIONS).check()
 
     # Dependency injection
-    session = AsyncSession(engine)
-    repo = PostgresPaymentRepository(session)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    repo = PostgresPaymentRepository(sessionmaker)
     handler = RegisterPaymentHandler(repo)
+    set_payments_handler(GetPaymentsHandler(repo))
     pulsar_service_url = os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650")
     pulsar_token = os.getenv("PULSAR_TOKEN", "")
     pulsar_topic = os.getenv(
         "PULSAR_TOPIC", "persistent://miso-1-2025/default/payments-request"
     )
-    consumer = PulsarConsumer(handler, pulsar_service_url, pulsar_topic, pulsar_token)
+    dead_letter_policy = DeadLetterPolicy(
+        max_redeliveries=int(os.getenv("DLQ_MAX_REDELIVERIES", "5")),
+        backoff_base_ms=int(os.getenv("DLQ_BACKOFF_BASE_MS", "500")),
+        backoff_max_ms=int(os.getenv("DLQ_BACKOFF_MAX_MS", "60000")),
+    )
+    register_stats_provider(dead_letter_policy)
+    consumer = PulsarConsumer(
+        handler,
+        pulsar_service_url,
+        pulsar_topic,
+        pulsar_token,
+        dead_letter_policy=dead_letter_policy,
+        batch_size=int(os.getenv("PAYMENT_BATCH_SIZE", "1")),
+        batch_timeout_ms=int(os.getenv("PAYMENT_BATCH_TIMEOUT_MS", "50")),
+    )
+    register_stats_provider(consumer)
+    api_server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host=os.getenv("API_HOST", "0.0.0.0"),
+            port=int(os.getenv("API_PORT", "8000")),
+        )
+    )
     logger.info(
         f"Starting Pulsar consumer on {pulsar_service_url}, topic: {pulsar_topic}"
     )
 
     # Start consumer
     consumer_task = asyncio.create_task(consumer.start())
+    api_task = asyncio.create_task(api_server.serve())
     try:
         await consumer_task
     except KeyboardInterrupt:
@@ -62,8 +89,8 @@ async def main():
     except asyncio.CancelledError:
         pass
     finally:
-        logger.info("Closing database session")
-        await session.close()
+        api_task.cancel()
+        logger.info("Closing database connections")
         await engine.dispose()
         logger.info("Service shutdown complete")
 
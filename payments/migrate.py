@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import os
+import logging
+import time
+from sqlalchemy.ext.asyncio import create_async_engine
+from dotenv import load_dotenv
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS, HOT_QUERIES
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Apply pending schema migrations to the payments database"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--status", action="store_true", help="Show the current and latest schema version"
+    )
+    mode.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print query plans and latency of the hot-path queries",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/paymentsdb"
+    )
+    engine = create_async_engine(database_url)
+    migrator = SchemaMigrator(engine, MIGRATIONS)
+    try:
+        if args.status:
+            current = await migrator.current_version()
+            logger.info(f"Schema version {current}, latest {migrator.latest_version}")
+        elif args.explain:
+            for name, sql, params in HOT_QUERIES:
+                started = time.monotonic()
+                plan = await migrator.explain(sql, params)
+                elapsed_ms = (time.monotonic() - started) * 1000
+                print(f"== {name} ({elapsed_ms:.1f} ms round trip)")
+                print("\n".join(plan))
+        else:
+            applied = await migrator.migrate()
+            if applied:
+                logger.info(f"Applied migrations: {applied}")
+            else:
+                logger.info(f"Schema already at version {migrator.latest_version}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+import base64
+import json
+import logging
+from datetime import datetime, timezone
+from fastapi import FastAPI, HTTPException, Query
+from src.application.queries.get_payments_query import GetPaymentsQuery
+
+app = FastAPI(title="Payments Service", version="1.0.0")
+
+logger = logging.getLogger(__name__)
+
+# Injected from main
+payments_handler = None
+# Components exposing a stats() dict for /metrics
+stats_providers = []
+
+
+def set_payments_handler(handler):
+    global payments_handler
+    payments_handler = handler
+
+
+def register_stats_provider(provider):
+    stats_providers.append(provider)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    metrics = {}
+    for provider in stats_providers:
+        metrics.update(provider.stats())
+    return metrics
+
+
+def _payment_to_dict(payment) -> dict:
+    return {
+        "id": payment.id,
+        "amount": payment.amount,
+        "currency": payment.currency,
+        "payment_method": payment.payment_method,
+        "account_details": payment.account_details,
+        "user_id": payment.user_id,
+        "payout_id": payment.payout_id,
+        "created_at": payment.created_at.isoformat(),
+    }
+
+
+def _encode_cursor(payment) -> str:
+    key = [payment.created_at.isoformat(), payment.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, payment_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(payment_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC
+    if value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@app.get("/payments")
+async def get_payments(
+    user_id: str | None = None,
+    payment_method: str | None = None,
+    from_date: datetime | None = None,
+    to_date: datetime | None = None,
+    bank: str | None = None,
+    iban: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    if not payments_handler:
+        raise HTTPException(status_code=503, detail="Payment queries not available")
+    account_details = {
+        key: value for key, value in (("bank", bank), ("iban", iban)) if value
+    }
+    query = GetPaymentsQuery(
+        user_id=user_id,
+        payment_method=payment_method,
+        from_date=_to_utc_naive(from_date) if from_date else None,
+        to_date=_to_utc_naive(to_date) if to_date else None,
+        account_details=account_details or None,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    try:
+        payments = await payments_handler.handle(query)
+    except Exception as e:
+        logger.error(f"Error querying payments: {e}")
+        raise HTTPException(status_code=500, detail="Failed to query payments")
+    return {
+        "payments": [_payment_to_dict(payment) for payment in payments],
+        # A full page may have more payments after it
+        "next_cursor": (
+            _encode_cursor(payments[-1]) if len(payments) == limit else None
+        ),
+    }
@@ -0,0 +1,25 @@
+import logging
+from src.application.queries.get_payments_query import GetPaymentsQuery
+from src.domain.entities.payment import Payment
+from src.domain.ports.payment_repository import PaymentRepository
+
+logger = logging.getLogger(__name__)
+
+
+class GetPaymentsHandler:
+    def __init__(self, payment_repository: PaymentRepository):
+        self.payment_repository = payment_repository
+
+    async def handle(self, query: GetPaymentsQuery) -> list[Payment]:
+        logger.info(
+            f"Handling GetPaymentsQuery for user: {query.user_id}, method: {query.payment_method}"
+        )
+        return await self.payment_repository.get_page(
+            query.user_id,
+            query.payment_method,
+            query.from_date,
+            query.to_date,
+            query.account_details,
+            query.after,
+            query.limit,
+        )
@@ -17,3 +17,11 @@ class RegisterPaymentHandler:
         logger.info(
             f"Payment registered successfully for user: {command.payment.user_id}"
         )
+
+    async def handle_many(self, commands: list[RegisterPaymentCommand]) -> None:
+        # Registers the payments of a batch in one transaction
+        logger.info(f"Handling {len(commands)} RegisterPaymentCommands")
+        await self.payment_repository.save_many(
+            [command.payment for command in commands]
+        )
+        logger.info(f"{len(commands)} payments registered successfully")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class GetPaymentsQuery(BaseModel):
+    user_id: str | None = None
+    payment_method: str | None = None
+    from_date: datetime | None = None
+    to_date: datetime | None = None
+    # Matched by containment, e.g. {"bank": "example_bank"}
+    account_details: dict[str, str] | None = None
+    # Keyset cursor: (created_at, id) of the last payment seen
+    after: tuple[datetime, int] | None = None
+    limit: int = 100
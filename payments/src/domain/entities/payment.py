@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import Dict, Any
 
 
@@ -8,3 +9,8 @@ class Payment(BaseModel):
     payment_method: str
     account_details: Dict[str, Any]  # JSON for account details
     user_id: str
+    # Set for settlement payouts; a payout_id is only ever stored once
+    payout_id: str | None = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Assigned by the database once stored
+    id: int | None = None
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from src.domain.entities.payment import Payment
 
 
@@ -6,3 +7,20 @@ class PaymentRepository(ABC):
     @abstractmethod
     async def save(self, payment: Payment) -> None:
         pass
+
+    @abstractmethod
+    async def save_many(self, payments: list[Payment]) -> None:
+        pass
+
+    @abstractmethod
+    async def get_page(
+        self,
+        user_id: str | None,
+        payment_method: str | None,
+        from_date: datetime | None,
+        to_date: datetime | None,
+        account_details: dict[str, str] | None,
+        after: tuple[datetime, int] | None,
+        limit: int,
+    ) -> list[Payment]:
+        pass
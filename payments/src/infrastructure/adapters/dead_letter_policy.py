@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+# Failure handling shared by the Pulsar consumers. A failed message is
+# negatively acknowledged after an exponential backoff (base * 2^redeliveries,
+# capped), so a failing dependency is not hammered. Once it has been
+# redelivered max_redeliveries times, or straight away for a permanent
+# failure such as an undecodable payload, it is moved to the dead-letter
+# topic with the error and its origin as properties and acknowledged.
+class DeadLetterPolicy:
+    def __init__(
+        self,
+        max_redeliveries: int = 5,
+        backoff_base_ms: int = 500,
+        backoff_max_ms: int = 60_000,
+        dead_letter_topic: str | None = None,
+    ):
+        self.max_redeliveries = max_redeliveries
+        self.backoff_base_ms = backoff_base_ms
+        self.backoff_max_ms = backoff_max_ms
+        self.dead_letter_topic = dead_letter_topic
+        self.name = ""
+        self.topic = ""
+        self.subscription = ""
+        self.consumer = None
+        self.producer = None
+        self.retries = 0
+        self.retries_pending = 0
+        self.dead_lettered = 0
+        self.dead_letter_failures = 0
+
+    def subscribe_options(self) -> dict:
+        # The backoff is applied before the negative ack, so the client's
+        # own redelivery delay only needs to be short
+        return {"negative_ack_redelivery_delay_ms": 100}
+
+    async def attach(self, client, consumer, topic: str, subscription: str) -> None:
+        self.consumer = consumer
+        self.topic = topic
+        self.subscription = subscription
+        self.name = subscription.replace("-", "_")
+        if not self.dead_letter_topic:
+            # Same naming as Pulsar's built-in dead letter topics
+            self.dead_letter_topic = f"{topic}-{subscription}-DLQ"
+        self.producer = await asyncio.to_thread(
+            client.create_producer, self.dead_letter_topic
+        )
+        logger.info(
+            f"Dead letter topic for {subscription}: {self.dead_letter_topic} after {self.max_redeliveries} redeliveries"
+        )
+
+    def is_final_attempt(self, msg) -> bool:
+        return msg.redelivery_count() >= self.max_redeliveries
+
+    def backoff_ms(self, msg) -> int:
+        return min(
+            self.backoff_base_ms * 2 ** msg.redelivery_count(), self.backoff_max_ms
+        )
+
+    async def fail(self, msg, error: Exception, permanent: bool = False) -> None:
+        if permanent or self.is_final_attempt(msg):
+            try:
+                await self._dead_letter(msg, error)
+                return
+            except Exception as e:
+                self.dead_letter_failures += 1
+                logger.error(
+                    f"Failed to dead-letter message {msg.message_id()} of {self.subscription}: {e}"
+                )
+        self.retries += 1
+        self.retries_pending += 1
+        delay_ms = self.backoff_ms(msg)
+        logger.warning(
+            f"Message {msg.message_id()} of {self.subscription} failed (redelivery {msg.redelivery_count()}), retrying in {delay_ms} ms: {error}"
+        )
+        asyncio.get_running_loop().call_later(delay_ms / 1000, self._redeliver, msg)
+
+    def _redeliver(self, msg) -> None:
+        self.retries_pending -= 1
+        try:
+            self.consumer.negative_acknowledge(msg)
+        except Exception as e:
+            # Consumer closed; the broker redelivers unacknowledged messages
+            logger.error(f"Failed to negatively acknowledge message: {e}")
+
+    async def _dead_letter(self, msg, error: Exception) -> None:
+        properties = dict(msg.properties())
+        properties.update(
+            {
+                "DLQ_ORIGIN_TOPIC": msg.topic_name() or self.topic,
+                "DLQ_ORIGIN_SUBSCRIPTION": self.subscription,
+                "DLQ_ORIGIN_MESSAGE_ID": str(msg.message_id()),
+                "DLQ_REDELIVERY_COUNT": str(msg.redelivery_count()),
+                "DLQ_ERROR": f"{type(error).__name__}: {error}"[:1000],
+                "DLQ_FAILED_AT": datetime.utcnow().isoformat(),
+            }
+        )
+        kwargs = {"properties": properties}
+        if msg.partition_key():
+            kwargs["partition_key"] = msg.partition_key()
+        await asyncio.to_thread(self.producer.send, msg.data(), **kwargs)
+        self.consumer.acknowledge(msg)
+        self.dead_lettered += 1
+        logger.error(
+            f"Message {msg.message_id()} of {self.subscription} moved to {self.dead_letter_topic}: {error}"
+        )
+
+    def stats(self) -> dict:
+        if not self.name:
+            return {}
+        return {
+            f"{self.name}_retries": self.retries,
+            f"{self.name}_retries_pending": self.retries_pending,
+            f"{self.name}_dead_lettered": self.dead_lettered,
+            f"{self.name}_dead_letter_failures": self.dead_letter_failures,
+        }
+
+    def close(self) -> None:
+        if self.producer:
+            self.producer.close()
@@ -0,0 +1,91 @@
+from .schema_migrator import Migration
+
+# Applied in order by migrate.py; never edit a released migration, add a new one.
+# Version 1 uses IF NOT EXISTS so databases created by metadata.create_all
+# are adopted as they are.
+MIGRATIONS = [
+    Migration(
+        1,
+        "baseline schema",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS payments (
+                id SERIAL PRIMARY KEY,
+                amount DOUBLE PRECISION NOT NULL,
+                currency VARCHAR(10) NOT NULL,
+                payment_method VARCHAR(50) NOT NULL,
+                account_details TEXT NOT NULL,
+                user_id VARCHAR(255) NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "jsonb account details and creation time",
+        (
+            # account_details held json.dumps output as text, which could not
+            # be queried without parsing every row. Rewrites the table.
+            "ALTER TABLE payments ALTER COLUMN account_details TYPE JSONB USING account_details::jsonb",
+            # Payments stored before this migration get its time
+            "ALTER TABLE payments ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() at time zone 'utc')",
+        ),
+    ),
+    Migration(
+        3,
+        "payment lookup indexes",
+        (
+            # Payments by user, by method and by date, newest first; the
+            # trailing (created_at, id) matches the keyset pagination order
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_user_created_at ON payments (user_id, created_at, id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_method_created_at ON payments (payment_method, created_at, id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_created_at ON payments (created_at, id)",
+            # Containment lookups on any account detail (bank, IBAN, ...);
+            # jsonb_path_ops is smaller than the default operator class and
+            # only @> is queried
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_account_details ON payments USING GIN (account_details jsonb_path_ops)",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        4,
+        "settlement payout id",
+        # Nullable, so adding it does not rewrite the table
+        ("ALTER TABLE payments ADD COLUMN IF NOT EXISTS payout_id VARCHAR(255)",),
+    ),
+    Migration(
+        5,
+        "unique settlement payout id",
+        (
+            # Target of the inserts' ON CONFLICT DO NOTHING; payments without
+            # a payout_id are NULL and never conflict
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS payments_payout_id_key ON payments (payout_id)",
+        ),
+        transactional=False,
+    ),
+]
+
+# Hot queries reported by `python migrate.py --explain`, run before and after
+# migrating to compare plans and latency
+HOT_QUERIES = [
+    (
+        "payments by user",
+        "SELECT * FROM payments WHERE user_id = :user_id ORDER BY created_at DESC, id DESC LIMIT 100",
+        {"user_id": "1"},
+    ),
+    (
+        "payments by method, next page",
+        "SELECT * FROM payments WHERE payment_method = :payment_method AND (created_at, id) < (now() at time zone 'utc', 2147483647) ORDER BY created_at DESC, id DESC LIMIT 100",
+        {"payment_method": "credit_card"},
+    ),
+    (
+        "payments by date",
+        "SELECT * FROM payments WHERE created_at >= date_trunc('day', now() at time zone 'utc') ORDER BY created_at DESC, id DESC LIMIT 100",
+        {},
+    ),
+    (
+        "payments by bank",
+        "SELECT * FROM payments WHERE account_details @> CAST(:details AS jsonb) ORDER BY created_at DESC, id DESC LIMIT 100",
+        {"details": '{"bank": "example_bank"}'},
+    ),
+]
@@ -1,4 +1,5 @@
-from sqlalchemy import Table, Column, Integer, String, Float, Text, MetaData
+from sqlalchemy import Table, Column, Integer, String, Float, DateTime, MetaData
+from sqlalchemy.dialects.postgresql import JSONB
 
 metadata = MetaData()
 
@@ -9,6 +10,8 @@ payments_table = Table(
     Column("amount", Float, nullable=False),
     Column("currency", String(10), nullable=False),
     Column("payment_method", String(50), nullable=False),
-    Column("account_details", Text, nullable=False),  # JSON as text
+    Column("account_details", JSONB, nullable=False),
     Column("user_id", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("payout_id", String(255), nullable=True, unique=True),
 )
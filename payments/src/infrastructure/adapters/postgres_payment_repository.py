@@ -1,27 +1,110 @@
-import json
 import logging
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from src.domain.entities.payment import Payment
 from src.domain.ports.payment_repository import PaymentRepository
 from .models import payments_table
 
 logger = logging.getLogger(__name__)
 
+# Keeps each multi-row insert well under the bind parameter limit
+INSERT_CHUNK_SIZE = 4000
+
 
 class PostgresPaymentRepository(PaymentRepository):
-    def __init__(self, session: AsyncSession):
-        self.session = session
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        # Each call gets its own pooled session instead of sharing one for the
+        # process lifetime
+        self.sessionmaker = sessionmaker
 
     async def save(self, payment: Payment) -> None:
         logger.info(f"Saving payment to database for user: {payment.user_id}")
-        stmt = insert(payments_table).values(
-            amount=payment.amount,
-            currency=payment.currency,
-            payment_method=payment.payment_method,
-            account_details=json.dumps(payment.account_details),
-            user_id=payment.user_id,
-        )
-        await self.session.execute(stmt)
-        await self.session.commit()
+        await self.save_many([payment])
         logger.info(f"Payment saved successfully for user: {payment.user_id}")
+
+    async def save_many(self, payments: list[Payment]) -> None:
+        # All payments are inserted with multi-row inserts and committed in one
+        # transaction, so either all of them are stored or none is. A payout
+        # that is already stored is skipped, so a redelivered or republished
+        # settlement payout is not paid twice
+        if not payments:
+            return
+        session = self.sessionmaker()
+        try:
+            for i in range(0, len(payments), INSERT_CHUNK_SIZE):
+                rows = [
+                    {
+                        "amount": payment.amount,
+                        "currency": payment.currency,
+                        "payment_method": payment.payment_method,
+                        "account_details": payment.account_details,
+                        "user_id": payment.user_id,
+                        "created_at": payment.created_at,
+                        "payout_id": payment.payout_id,
+                    }
+                    for payment in payments[i : i + INSERT_CHUNK_SIZE]
+                ]
+                stmt = pg_insert(payments_table).values(rows).on_conflict_do_nothing(
+                    index_elements=[payments_table.c.payout_id]
+                )
+                await session.execute(stmt)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    def _to_entity(self, row) -> Payment:
+        return Payment(
+            id=row.id,
+            amount=row.amount,
+            currency=row.currency,
+            payment_method=row.payment_method,
+            account_details=row.account_details,
+            user_id=row.user_id,
+            created_at=row.created_at,
+            payout_id=row.payout_id,
+        )
+
+    async def get_page(
+        self,
+        user_id: str | None,
+        payment_method: str | None,
+        from_date: datetime | None,
+        to_date: datetime | None,
+        account_details: dict[str, str] | None,
+        after: tuple[datetime, int] | None,
+        limit: int,
+    ) -> list[Payment]:
+        table = payments_table
+        key = tuple_(table.c.created_at, table.c.id)
+        session = self.sessionmaker()
+        try:
+            # Newest first with keyset pagination on (created_at, id), so each
+            # page is a range scan of the user, method or creation time index
+            # that stops after limit rows, however large the table is or how
+            # deep the client has paged
+            stmt = select(table)
+            if user_id:
+                stmt = stmt.where(table.c.user_id == user_id)
+            if payment_method:
+                stmt = stmt.where(table.c.payment_method == payment_method)
+            if from_date:
+                stmt = stmt.where(table.c.created_at >= from_date)
+            if to_date:
+                stmt = stmt.where(table.c.created_at < to_date)
+            if account_details:
+                # Containment, answered by the jsonb_path_ops GIN index
+                stmt = stmt.where(table.c.account_details.contains(account_details))
+            if after:
+                stmt = stmt.where(key < tuple_(*after))
+            stmt = stmt.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(
+                limit
+            )
+            result = await session.execute(stmt)
+            return [self._to_entity(row) for row in result.fetchall()]
+        finally:
+            await session.close()
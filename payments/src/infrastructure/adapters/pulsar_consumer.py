@@ -6,6 +6,7 @@ from pulsar.schema import AvroSchema
 from src.application.handlers.register_payment_handler import RegisterPaymentHandler
 from src.application.commands.register_payment_command import RegisterPaymentCommand
 from src.domain.entities.payment import Payment
+from .dead_letter_policy import DeadLetterPolicy
 from .schemas import PaymentRecord
 
 logger = logging.getLogger(__name__)
@@ -18,11 +19,22 @@ class PulsarConsumer:
         pulsar_service_url: str = "pulsar://localhost:6650",
         topic: str = "persistent://miso-1-2025/default/payments-request",
         token: str = "",
+        dead_letter_policy: DeadLetterPolicy | None = None,
+        batch_size: int = 1,
+        batch_timeout_ms: int = 50,
     ):
         self.handler = handler
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
+        # Above 1, payment requests are received and stored in batches of up
+        # to batch_size, waiting at most batch_timeout_ms to fill one
+        self.batch_size = max(batch_size, 1)
+        self.batch_timeout_ms = batch_timeout_ms
+        self.batches = 0
+        self.batch_messages = 0
+        self.batch_fallbacks = 0
         self.client = None
         self.consumer = None
 
@@ -35,45 +47,121 @@ class PulsarConsumer:
             )
         else:
             self.client = pulsar.Client(self.pulsar_service_url)
+        options = self.dead_letter_policy.subscribe_options()
+        if self.batch_size > 1:
+            options["batch_receive_policy"] = pulsar.ConsumerBatchReceivePolicy(
+                self.batch_size, -1, self.batch_timeout_ms
+            )
         self.consumer = self.client.subscribe(
-            self.topic, "payment-subscriber", schema=AvroSchema(PaymentRecord)
+            self.topic,
+            "payment-subscriber",
+            schema=AvroSchema(PaymentRecord),
+            **options,
+        )
+        await self.dead_letter_policy.attach(
+            self.client, self.consumer, self.topic, "payment-subscriber"
         )
         logger.info(f"Subscribed to topic: {self.topic}")
 
+        receive, handle = self.consumer.receive, self._handle_message
+        if self.batch_size > 1:
+            receive, handle = self.consumer.batch_receive, self._handle_batch
         while True:
             if asyncio.current_task().cancelled():
                 break
-            msg = None
             try:
-                msg = self.consumer.receive()
-                logger.info("Received payment request message from Pulsar")
-                record = msg.value()
-                data = {
-                    "amount": record.amount,
-                    "currency": record.currency,
-                    "payment_method": record.payment_method,
-                    "account_details": json.loads(record.account_details),
-                    "user_id": record.user_id,
-                }
-                payment = Payment(**data)
-                command = RegisterPaymentCommand(payment)
-                await self.handler.handle(command)
-                self.consumer.acknowledge(msg)
-                logger.info(
-                    f"Message processed successfully for user: {payment.user_id}"
-                )
+                # Off the event loop, so retry backoffs and the API keep running
+                msg = await asyncio.to_thread(receive)
             except pulsar.Interrupted:
                 logger.info("Consumer interrupted, shutting down")
                 break
             except Exception as e:
-                logger.error(f"Error processing message: {e}")
-                if msg:
-                    self.consumer.negative_acknowledge(msg)
+                logger.error(f"Error receiving message: {e}")
+                continue
+            if self.batch_size > 1 and not msg:
+                # The batch timed out empty
+                continue
+            logger.info("Received payment request message from Pulsar")
+            await handle(msg)
+
+    def _payment(self, msg) -> Payment:
+        record = msg.value()
+        data = {
+            "amount": record.amount,
+            "currency": record.currency,
+            "payment_method": record.payment_method,
+            "account_details": json.loads(record.account_details),
+            "user_id": record.user_id,
+            "payout_id": record.payout_id,
+        }
+        return Payment(**data)
+
+    async def _handle_message(self, msg) -> None:
+        try:
+            payment = self._payment(msg)
+        except Exception as e:
+            # Records that cannot be decoded or validated will never succeed
+            logger.error(f"Invalid payment request message: {e}")
+            await self.dead_letter_policy.fail(msg, e, permanent=True)
+            return
+        try:
+            await self.handler.handle(RegisterPaymentCommand(payment))
+            self.consumer.acknowledge(msg)
+            logger.info(f"Message processed successfully for user: {payment.user_id}")
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            await self.dead_letter_policy.fail(msg, e)
+
+    async def _handle_batch(self, msgs) -> None:
+        commands = []
+        batch = []
+        for msg in msgs:
+            try:
+                commands.append(RegisterPaymentCommand(self._payment(msg)))
+                batch.append(msg)
+            except Exception as e:
+                logger.error(f"Invalid payment request message: {e}")
+                await self.dead_letter_policy.fail(msg, e, permanent=True)
+        if not batch:
+            return
+        self.batches += 1
+        self.batch_messages += len(batch)
+        try:
+            await self.handler.handle_many(commands)
+        except Exception as e:
+            # The batch's transaction was rolled back, so it is stored again
+            # one message at a time: the others are kept and only the failing
+            # payment is retried
+            self.batch_fallbacks += 1
+            logger.error(
+                f"Batch of {len(batch)} payments failed, processing one at a time: {e}"
+            )
+            for msg in batch:
+                await self._handle_message(msg)
+            return
+        # The client groups the acknowledgements it sends
+        await asyncio.to_thread(self._acknowledge, batch)
+        logger.info(f"Batch of {len(batch)} payments processed successfully")
+
+    def _acknowledge(self, msgs) -> None:
+        for msg in msgs:
+            self.consumer.acknowledge(msg)
+
+    def stats(self) -> dict:
+        return {
+            "payment_batches": self.batches,
+            "payment_batch_messages": self.batch_messages,
+            "payment_avg_batch_size": (
+                self.batch_messages / self.batches if self.batches else 0.0
+            ),
+            "payment_batch_fallbacks": self.batch_fallbacks,
+        }
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Pulsar consumer stopped")
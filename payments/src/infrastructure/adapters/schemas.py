@@ -7,3 +7,5 @@ class PaymentRecord(Record):
     payment_method = String()
     account_details = String()  # JSON string of account details
     user_id = String()
+    # Idempotency key of a settlement payout; payments stores each one once
+    payout_id = String()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from src import api
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.queries = []
+
+    async def handle(self, query):
+        self.queries.append(query)
+        return []
+
+
+class GetPaymentsDateFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = RecordingHandler()
+        api.set_payments_handler(self.handler)
+        self.client = TestClient(api.app)
+
+    def tearDown(self):
+        api.set_payments_handler(None)
+
+    def test_aware_dates_are_queried_as_naive_utc(self):
+        # created_at is a naive UTC column; asyncpg rejects aware values
+        response = self.client.get(
+            "/payments",
+            params={
+                "from_date": "2025-03-01T02:00:00+02:00",
+                "to_date": "2025-03-02T00:00:00Z",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        query = self.handler.queries[0]
+        self.assertEqual(query.from_date, datetime(2025, 3, 1, 0, 0))
+        self.assertEqual(query.to_date, datetime(2025, 3, 2, 0, 0))
+        self.assertIsNone(query.from_date.tzinfo)
+        self.assertIsNone(query.to_date.tzinfo)
+
+    def test_naive_dates_are_kept(self):
+        response = self.client.get(
+            "/payments", params={"from_date": "2025-03-01T00:00:00"}
+        )
+        self.assertEqual(response.status_code, 200)
+        query = self.handler.queries[0]
+        self.assertEqual(query.from_date, datetime(2025, 3, 1, 0, 0))
+        self.assertIsNone(query.to_date)
+
+
+if __name__ == "__main__":
+    unittest.main()
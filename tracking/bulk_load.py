@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import os
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from sqlalchemy.ext.asyncio import create_async_engine
+from dotenv import load_dotenv
+from src.infrastructure.adapters.bulk_tracking_loader import (
+    plan_chunks,
+    register_job,
+    to_asyncpg_dsn,
+    load_chunk_in_process,
+)
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bulk load historical tracking events from NDJSON/CSV files (optionally gzipped)"
+    )
+    parser.add_argument("files", nargs="+", help="Input .ndjson, .jsonl, .csv or .gz files")
+    parser.add_argument(
+        "--job",
+        required=True,
+        help="Job name used for resumable checkpoints; rerun with the same name to resume",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=64,
+        help="Size of the byte ranges uncompressed files are split into",
+    )
+    parser.add_argument(
+        "--with-saga-logs",
+        action="store_true",
+        help="Also write started/tracking_saved saga log rows for every event",
+    )
+    return parser.parse_args()
+
+
+async def ensure_schema(database_url: str):
+    engine = create_async_engine(database_url)
+    try:
+        await SchemaMigrator(engine, MIGRATIONS).check()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    args = parse_args()
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/trackingdb"
+    )
+    asyncio.run(ensure_schema(database_url))
+
+    chunk_bytes = args.chunk_mb * 1024 * 1024
+    chunks = plan_chunks(args.files, chunk_bytes)
+    asyncio.run(
+        register_job(to_asyncpg_dsn(database_url), args.job, chunk_bytes, chunks)
+    )
+    logger.info(
+        f"Loading {len(args.files)} files as {len(chunks)} chunks with {args.workers} workers (job: {args.job})"
+    )
+    worker = partial(
+        load_chunk_in_process,
+        to_asyncpg_dsn(database_url),
+        args.job,
+        args.batch_size,
+        args.with_saga_logs,
+    )
+
+    started = time.monotonic()
+    total_rows = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(worker, chunk): chunk for chunk in chunks}
+        for done, future in enumerate(as_completed(futures), start=1):
+            chunk = futures[future]
+            total_rows += future.result()
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"[{done}/{len(chunks)}] {chunk.key} done, {total_rows} rows in {elapsed:.1f}s "
+                f"({total_rows / max(elapsed, 1e-6):.0f} rows/s)"
+            )
+    logger.info(f"Bulk load finished: {total_rows} rows")
+
+
+if __name__ == "__main__":
+    main()
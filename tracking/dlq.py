@@ -0,0 +1,175 @@
+import argparse
+import asyncio
+import json
+import os
+import logging
+import time
+import pulsar
+from datetime import datetime, timezone
+from pulsar.schema import AvroSchema
+from dotenv import load_dotenv
+from src.infrastructure.adapters.schemas import (
+    TrackingEventRecord,
+    FailTrackingEventRecord,
+    CommissionCompletedRecord,
+)
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Payload schema by the subscription that dead-lettered the message, so
+# listed messages can be decoded
+RECORDS = {
+    "tracking-subscriber": TrackingEventRecord,
+    "fail-tracking-consumer-debug2": FailTrackingEventRecord,
+    "tracking-commission-completed-subscriber": CommissionCompletedRecord,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Inspect a dead letter topic and re-drive its messages to their original topic"
+    )
+    parser.add_argument("action", choices=["list", "redrive"])
+    parser.add_argument(
+        "--topic", required=True, help="Dead letter topic, e.g. <topic>-<subscription>-DLQ"
+    )
+    parser.add_argument("--limit", type=int, default=0, help="Maximum messages (0 = all)")
+    parser.add_argument(
+        "--error-contains", help="Only messages whose DLQ_ERROR contains this text"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=0.0,
+        help="Maximum re-driven messages per second (0 = unlimited)",
+    )
+    return parser.parse_args()
+
+
+def describe(msg) -> dict:
+    properties = msg.properties()
+    payload = None
+    record = RECORDS.get(properties.get("DLQ_ORIGIN_SUBSCRIPTION"))
+    if record:
+        try:
+            decoded = AvroSchema(record).decode(msg.data())
+            payload = {
+                key: value
+                for key, value in vars(decoded).items()
+                if not key.startswith("_")
+            }
+        except Exception as e:
+            payload = f"undecodable: {e}"
+    return {
+        "message_id": str(msg.message_id()),
+        "published_at": datetime.fromtimestamp(
+            msg.publish_timestamp() / 1000, timezone.utc
+        ).isoformat(),
+        "origin_topic": properties.get("DLQ_ORIGIN_TOPIC"),
+        "subscription": properties.get("DLQ_ORIGIN_SUBSCRIPTION"),
+        "redelivery_count": properties.get("DLQ_REDELIVERY_COUNT"),
+        "failed_at": properties.get("DLQ_FAILED_AT"),
+        "error": properties.get("DLQ_ERROR"),
+        "size": len(msg.data()),
+        "payload": payload,
+    }
+
+
+def matches(msg, args) -> bool:
+    if not args.error_contains:
+        return True
+    return args.error_contains in msg.properties().get("DLQ_ERROR", "")
+
+
+def list_messages(client, args) -> None:
+    # A reader leaves the dead letter topic untouched
+    reader = client.create_reader(args.topic, pulsar.MessageId.earliest)
+    listed = 0
+    try:
+        while not args.limit or listed < args.limit:
+            try:
+                msg = reader.read_next(timeout_millis=2000)
+            except pulsar.Timeout:
+                break
+            if matches(msg, args):
+                print(json.dumps(describe(msg), default=str))
+                listed += 1
+    finally:
+        reader.close()
+    logger.info(f"Listed {listed} dead-lettered messages")
+
+
+def redrive(client, args) -> None:
+    # Matching messages are republished to their original topic, where they
+    # start over with a fresh redelivery count, and then acknowledged; the
+    # others stay in the dead letter topic
+    consumer = client.subscribe(
+        args.topic,
+        "dlq-redrive",
+        initial_position=pulsar.InitialPosition.Earliest,
+    )
+    producers = {}
+    redriven = 0
+    skipped = 0
+    started = time.monotonic()
+    try:
+        while not args.limit or redriven < args.limit:
+            try:
+                msg = consumer.receive(timeout_millis=2000)
+            except pulsar.Timeout:
+                break
+            origin = msg.properties().get("DLQ_ORIGIN_TOPIC")
+            if not origin or not matches(msg, args):
+                skipped += 1
+                continue
+            if origin not in producers:
+                producers[origin] = client.create_producer(origin)
+            properties = {
+                key: value
+                for key, value in msg.properties().items()
+                if not key.startswith("DLQ_")
+            }
+            properties["DLQ_REDRIVEN_FROM"] = str(msg.message_id())
+            kwargs = {"properties": properties}
+            if msg.partition_key():
+                kwargs["partition_key"] = msg.partition_key()
+            producers[origin].send(msg.data(), **kwargs)
+            consumer.acknowledge(msg)
+            redriven += 1
+            if args.max_rate > 0:
+                ahead = redriven / args.max_rate - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+    finally:
+        for producer in producers.values():
+            producer.close()
+        consumer.close()
+    logger.info(f"Re-drove {redriven} messages, left {skipped} in {args.topic}")
+
+
+async def main():
+    args = parse_args()
+    pulsar_service_url = os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650")
+    pulsar_token = os.getenv("PULSAR_TOKEN", "")
+    if pulsar_token:
+        client = pulsar.Client(
+            pulsar_service_url, authentication=pulsar.AuthenticationToken(pulsar_token)
+        )
+    else:
+        client = pulsar.Client(pulsar_service_url)
+    try:
+        if args.action == "list":
+            await asyncio.to_thread(list_messages, client, args)
+        else:
+            await asyncio.to_thread(redrive, client, args)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,8 @@
 import asyncio
 import os
 import logging
+import uvicorn
+from datetime import timedelta
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 from src.infrastructure.adapters.postgres_tracking_event_repository import (
@@ -9,21 +11,57 @@ from src.infrastructure.adapters.postgres_tracking_event_repository import (
 from src.infrastructure.adapters.postgres_saga_log_repository import (
     PostgresSagaLogRepository,
 )
+from src.infrastructure.adapters.postgres_saga_state_repository import (
+    PostgresSagaStateRepository,
+)
+from src.infrastructure.adapters.state_backed_saga_log_repository import (
+    StateBackedSagaLogRepository,
+)
+from src.infrastructure.adapters.write_behind_saga_log_repository import (
+    WriteBehindSagaLogRepository,
+)
 from src.infrastructure.adapters.postgres_processed_message_repository import (
     PostgresProcessedMessageRepository,
 )
+from src.infrastructure.adapters.postgres_event_rollup_repository import (
+    PostgresEventRollupRepository,
+)
+from src.infrastructure.adapters.event_rollup_aggregator import EventRollupAggregator
+from src.infrastructure.adapters.postgres_event_dedup_repository import (
+    PostgresEventDedupRepository,
+)
+from src.infrastructure.adapters.event_deduplicator import EventDeduplicator
 from src.application.handlers.register_tracking_event_handler import (
     RegisterTrackingEventHandler,
 )
 from src.application.handlers.fail_tracking_event_handler import (
     FailTrackingEventHandler,
 )
+from src.application.handlers.complete_tracking_saga_handler import (
+    CompleteTrackingSagaHandler,
+)
+from src.application.handlers.recover_stuck_sagas_handler import (
+    RecoverStuckSagasHandler,
+)
+from src.application.commands.recover_stuck_sagas_command import (
+    RecoverStuckSagasCommand,
+)
+from src.application.handlers.get_campaign_event_series_handler import (
+    GetCampaignEventSeriesHandler,
+)
 from src.infrastructure.adapters.pulsar_consumer import PulsarConsumer
 from src.infrastructure.adapters.fail_tracking_event_consumer import (
     FailTrackingEventConsumer,
 )
+from src.infrastructure.adapters.commission_completed_consumer import (
+    CommissionCompletedConsumer,
+)
+from src.infrastructure.adapters.stuck_saga_scanner import StuckSagaScanner
 from src.infrastructure.adapters.pulsar_producer import PulsarCommissionPublisher
-from src.infrastructure.adapters.models import metadata
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+from src.infrastructure.adapters.dead_letter_policy import DeadLetterPolicy
+from src.api import app, set_event_series_handler, register_stats_provider
 
 load_dotenv()
 
@@ -42,15 +80,51 @@ async def main():
     )
     logger.info(f"Connecting to database: {database_url}")
     engine = create_async_engine(database_url)
-    async with engine.begin() as conn:
-        await conn.run_sync(metadata.create_all)
-    logger.info("Database tables created/verified")
+    await SchemaMigrator(engine, MIGRATIONS).check()
 
     # Dependency injection
     sessionmaker_instance = async_sessionmaker(engine, expire_on_commit=False)
     repo = PostgresTrackingEventRepository(sessionmaker_instance)
-    saga_log_repo = PostgresSagaLogRepository(sessionmaker_instance)
+    saga_state_repo = PostgresSagaStateRepository(sessionmaker_instance)
+    state_backed_saga_log_repo = StateBackedSagaLogRepository(
+        saga_state_repo,
+        PostgresSagaLogRepository(sessionmaker_instance),
+        detail_sample_rate=float(os.getenv("SAGA_LOG_DETAIL_SAMPLE_RATE", "0.01")),
+    )
+    saga_log_repo = state_backed_saga_log_repo
+    saga_log_writer = None
+    if os.getenv("SAGA_LOG_WRITE_BEHIND", "false").lower() == "true":
+        saga_log_writer = WriteBehindSagaLogRepository(
+            state_backed_saga_log_repo,
+            flush_interval_ms=int(os.getenv("SAGA_LOG_FLUSH_INTERVAL_MS", "50")),
+            max_batch_size=int(os.getenv("SAGA_LOG_FLUSH_MAX_ROWS", "500")),
+            max_buffered=int(os.getenv("SAGA_LOG_BUFFER_MAX_ROWS", "10000")),
+            durable=os.getenv("SAGA_LOG_DURABLE", "false").lower() == "true",
+        )
+        saga_log_repo = saga_log_writer
     processed_message_repo = PostgresProcessedMessageRepository(sessionmaker_instance)
+    event_rollup_repo = PostgresEventRollupRepository(sessionmaker_instance)
+    event_rollup_aggregator = EventRollupAggregator(
+        event_rollup_repo,
+        flush_interval_seconds=float(os.getenv("ROLLUP_FLUSH_INTERVAL_SECONDS", "5")),
+        compaction_interval_seconds=float(
+            os.getenv("ROLLUP_COMPACTION_INTERVAL_SECONDS", "300")
+        ),
+        minute_retention=timedelta(
+            hours=float(os.getenv("ROLLUP_MINUTE_RETENTION_HOURS", "2"))
+        ),
+        hour_retention=timedelta(
+            days=float(os.getenv("ROLLUP_HOUR_RETENTION_DAYS", "2"))
+        ),
+        sweep_interval_seconds=float(
+            os.getenv("ROLLUP_SWEEP_INTERVAL_SECONDS", "60")
+        ),
+    )
+    # Count events left unclaimed by a crash before consuming new ones
+    await event_rollup_aggregator.recover()
+    set_event_series_handler(
+        GetCampaignEventSeriesHandler(event_rollup_repo, event_rollup_aggregator)
+    )
     pulsar_service_url = os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650")
     pulsar_token = os.getenv("PULSAR_TOKEN", "")
     pulsar_topic = os.getenv(
@@ -65,8 +139,40 @@ async def main():
     )
     await commission_publisher.connect()
 
-    handler = RegisterTrackingEventHandler(repo, commission_publisher, saga_log_repo)
-    consumer = PulsarConsumer(handler, pulsar_service_url, pulsar_topic, pulsar_token)
+    handler = RegisterTrackingEventHandler(
+        repo,
+        commission_publisher,
+        saga_log_repo,
+        event_rollup_aggregator,
+        saga_state_repo,
+    )
+    dedup_persistent = os.getenv("DEDUP_PERSISTENT", "false").lower() == "true"
+    deduplicator = EventDeduplicator(
+        PostgresEventDedupRepository(sessionmaker_instance) if dedup_persistent else None,
+        window_seconds=float(os.getenv("DEDUP_WINDOW_SECONDS", "600")),
+        bucket_seconds=float(os.getenv("DEDUP_BUCKET_SECONDS", "60")),
+        max_keys=int(os.getenv("DEDUP_MAX_KEYS", "1000000")),
+    )
+    register_stats_provider(deduplicator)
+
+    def dead_letter_policy():
+        # One per consumer, each with its own dead letter topic and counters
+        policy = DeadLetterPolicy(
+            max_redeliveries=int(os.getenv("DLQ_MAX_REDELIVERIES", "5")),
+            backoff_base_ms=int(os.getenv("DLQ_BACKOFF_BASE_MS", "500")),
+            backoff_max_ms=int(os.getenv("DLQ_BACKOFF_MAX_MS", "60000")),
+        )
+        register_stats_provider(policy)
+        return policy
+
+    consumer = PulsarConsumer(
+        handler,
+        pulsar_service_url,
+        pulsar_topic,
+        pulsar_token,
+        deduplicator,
+        dead_letter_policy=dead_letter_policy(),
+    )
     logger.info(
         f"Starting Pulsar consumer on {pulsar_service_url}, topic: {pulsar_topic}"
     )
@@ -83,6 +189,9 @@ async def main():
         pulsar_service_url,
         fail_topic,
         pulsar_token,
+        batch_max_messages=int(os.getenv("FAIL_BATCH_MAX_MESSAGES", "500")),
+        batch_timeout_ms=int(os.getenv("FAIL_BATCH_TIMEOUT_MS", "200")),
+        dead_letter_policy=dead_letter_policy(),
     )
     print(f"Fail consumer created: {fail_consumer}")
     print("Fail consumer created")
@@ -90,26 +199,103 @@ async def main():
         f"Starting fail tracking event consumer on {pulsar_service_url}, topic: {fail_topic}"
     )
 
+    completed_topic = os.getenv(
+        "COMMISSION_COMPLETED_TOPIC",
+        "persistent://miso-1-2025/default/commission-completed-events",
+    )
+    completed_consumer = CommissionCompletedConsumer(
+        CompleteTrackingSagaHandler(saga_log_repo),
+        pulsar_service_url,
+        completed_topic,
+        pulsar_token,
+        dead_letter_policy=dead_letter_policy(),
+    )
+    # The scanner re-records republished sagas synchronously: find_stale reads
+    # saga_state directly, so a buffered step would let the drain loop find
+    # the same sagas again and burn through their republish attempts
+    stuck_saga_scanner = StuckSagaScanner(
+        RecoverStuckSagasHandler(
+            saga_state_repo, state_backed_saga_log_repo, repo, handler, fail_handler
+        ),
+        RecoverStuckSagasCommand(
+            deadline_seconds=float(os.getenv("STUCK_SAGA_DEADLINE_SECONDS", "300")),
+            batch_size=int(os.getenv("STUCK_SAGA_BATCH_SIZE", "100")),
+            max_republish_attempts=int(
+                os.getenv("STUCK_SAGA_MAX_REPUBLISH_ATTEMPTS", "3")
+            ),
+        ),
+        interval_seconds=float(os.getenv("STUCK_SAGA_SCAN_INTERVAL_SECONDS", "60")),
+    )
+    register_stats_provider(stuck_saga_scanner)
+    if saga_log_writer:
+        register_stats_provider(saga_log_writer)
+
+    api_server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host=os.getenv("API_HOST", "0.0.0.0"),
+            port=int(os.getenv("API_PORT", "8000")),
+        )
+    )
+
     # Start consumers
     consumer_task = asyncio.create_task(consumer.start())
     fail_consumer_task = asyncio.create_task(fail_consumer.start())
+    rollup_task = asyncio.create_task(event_rollup_aggregator.start())
+    dedup_task = asyncio.create_task(deduplicator.start())
+    completed_task = asyncio.create_task(completed_consumer.start())
+    scanner_task = asyncio.create_task(stuck_saga_scanner.start())
+    api_task = asyncio.create_task(api_server.serve())
+    background_tasks = []
+    if saga_log_writer:
+        background_tasks.append(asyncio.create_task(saga_log_writer.start()))
     try:
-        await asyncio.gather(consumer_task, fail_consumer_task)
+        await asyncio.gather(
+            consumer_task,
+            fail_consumer_task,
+            rollup_task,
+            dedup_task,
+            completed_task,
+            scanner_task,
+            api_task,
+            *background_tasks,
+        )
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
         consumer_task.cancel()
         fail_consumer_task.cancel()
+        rollup_task.cancel()
+        dedup_task.cancel()
+        completed_task.cancel()
+        scanner_task.cancel()
+        api_task.cancel()
+        for task in background_tasks:
+            task.cancel()
         try:
             await asyncio.gather(
-                consumer_task, fail_consumer_task, return_exceptions=True
+                consumer_task,
+                fail_consumer_task,
+                rollup_task,
+                dedup_task,
+                completed_task,
+                scanner_task,
+                api_task,
+                *background_tasks,
+                return_exceptions=True,
             )
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
         consumer.stop()
         fail_consumer.stop()
+        deduplicator.stop()
+        completed_consumer.stop()
+        stuck_saga_scanner.stop()
     except asyncio.CancelledError:
         pass
     finally:
+        await event_rollup_aggregator.stop()
+        if saga_log_writer:
+            await saga_log_writer.stop()
         logger.info("Disposing database engine")
         await engine.dispose()
         logger.info("Service shutdown complete")
@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import os
+import logging
+import pulsar
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from dotenv import load_dotenv
+from src.infrastructure.adapters.postgres_tracking_event_repository import (
+    PostgresTrackingEventRepository,
+)
+from src.infrastructure.adapters.postgres_saga_log_repository import (
+    PostgresSagaLogRepository,
+)
+from src.infrastructure.adapters.postgres_saga_state_repository import (
+    PostgresSagaStateRepository,
+)
+from src.infrastructure.adapters.state_backed_saga_log_repository import (
+    StateBackedSagaLogRepository,
+)
+from src.infrastructure.adapters.postgres_replay_checkpoint_repository import (
+    PostgresReplayCheckpointRepository,
+)
+from src.infrastructure.adapters.postgres_event_rollup_repository import (
+    PostgresEventRollupRepository,
+)
+from src.infrastructure.adapters.event_rollup_aggregator import EventRollupAggregator
+from src.infrastructure.adapters.postgres_event_dedup_repository import (
+    PostgresEventDedupRepository,
+)
+from src.infrastructure.adapters.event_deduplicator import EventDeduplicator
+from src.application.handlers.register_tracking_event_handler import (
+    RegisterTrackingEventHandler,
+)
+from src.application.commands.register_tracking_event_command import (
+    RegisterTrackingEventCommand,
+)
+from src.infrastructure.adapters.pulsar_consumer import (
+    record_dedup_key,
+    record_to_tracking_event,
+)
+from src.infrastructure.adapters.pulsar_producer import PulsarCommissionPublisher
+from src.infrastructure.adapters.pulsar_topic_replayer import (
+    PulsarTopicReplayer,
+    parse_message_id,
+)
+from src.infrastructure.adapters.schemas import TrackingEventRecord
+from src.infrastructure.adapters.schema_migrator import SchemaMigrator
+from src.infrastructure.adapters.migrations import MIGRATIONS
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Replay tracking events from a chosen position through the tracking handler"
+    )
+    parser.add_argument(
+        "--name",
+        required=True,
+        help="Replay job name; rerun with the same name to resume from its checkpoint",
+    )
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument(
+        "--from-message-id",
+        help='"earliest", "latest" or ledger:entry[:partition[:batch]]',
+    )
+    start.add_argument(
+        "--from-time", help="ISO publish time to start from, e.g. 2025-01-01T00:00:00Z"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=0.0,
+        help="Maximum messages per second (0 = unlimited)",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    database_url = os.getenv(
+        "DATABASE_URL", "postgresql+asyncpg://juan:@localhost/trackingdb"
+    )
+    engine = create_async_engine(database_url)
+    await SchemaMigrator(engine, MIGRATIONS).check()
+    sessionmaker_instance = async_sessionmaker(engine, expire_on_commit=False)
+
+    pulsar_service_url = os.getenv("PULSAR_SERVICE_URL", "pulsar://localhost:6650")
+    pulsar_token = os.getenv("PULSAR_TOKEN", "")
+    pulsar_topic = os.getenv(
+        "PULSAR_TOPIC", "persistent://miso-1-2025/default/campaign-tracking-events"
+    )
+    commission_topic = os.getenv(
+        "PULSAR_COMMISSION_TOPIC",
+        "persistent://miso-1-2025/default/assign-commission-to-partner",
+    )
+    commission_publisher = PulsarCommissionPublisher(
+        pulsar_service_url, commission_topic, pulsar_token
+    )
+    await commission_publisher.connect()
+    # Replayed events are counted and deduplicated like live ones; the sweep
+    # of the running service does not run here
+    event_rollup_aggregator = EventRollupAggregator(
+        PostgresEventRollupRepository(sessionmaker_instance),
+        flush_interval_seconds=float(os.getenv("ROLLUP_FLUSH_INTERVAL_SECONDS", "5")),
+        sweep_interval_seconds=float("inf"),
+        compaction_interval_seconds=float("inf"),
+    )
+    deduplicator = EventDeduplicator(
+        (
+            PostgresEventDedupRepository(sessionmaker_instance)
+            if os.getenv("DEDUP_PERSISTENT", "false").lower() == "true"
+            else None
+        ),
+        window_seconds=float(os.getenv("DEDUP_WINDOW_SECONDS", "600")),
+        bucket_seconds=float(os.getenv("DEDUP_BUCKET_SECONDS", "60")),
+        max_keys=int(os.getenv("DEDUP_MAX_KEYS", "1000000")),
+    )
+    saga_state_repo = PostgresSagaStateRepository(sessionmaker_instance)
+    handler = RegisterTrackingEventHandler(
+        PostgresTrackingEventRepository(sessionmaker_instance),
+        commission_publisher,
+        StateBackedSagaLogRepository(
+            saga_state_repo,
+            PostgresSagaLogRepository(sessionmaker_instance),
+            detail_sample_rate=float(os.getenv("SAGA_LOG_DETAIL_SAMPLE_RATE", "0.01")),
+        ),
+        event_rollup_aggregator,
+        saga_state_repo,
+    )
+
+    async def process(record):
+        tracking_event = record_to_tracking_event(record)
+        dedup_key = record_dedup_key(record)
+        if deduplicator.is_duplicate(dedup_key):
+            return
+        command = RegisterTrackingEventCommand(
+            tracking_event, dedup_key if deduplicator.durable else None
+        )
+        try:
+            if await handler.handle(command) is None:
+                deduplicator.durable_duplicate(dedup_key)
+        except Exception:
+            deduplicator.release(dedup_key)
+            raise
+
+    if pulsar_token:
+        client = pulsar.Client(
+            pulsar_service_url, authentication=pulsar.AuthenticationToken(pulsar_token)
+        )
+    else:
+        client = pulsar.Client(pulsar_service_url)
+
+    start_message_id = None
+    start_publish_time_ms = None
+    if args.from_message_id:
+        start_message_id = parse_message_id(args.from_message_id)
+    if args.from_time:
+        start_time = datetime.fromisoformat(args.from_time.replace("Z", "+00:00"))
+        if not start_time.tzinfo:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        start_publish_time_ms = int(start_time.timestamp() * 1000)
+
+    replayer = PulsarTopicReplayer(
+        client,
+        pulsar_topic,
+        TrackingEventRecord,
+        process,
+        PostgresReplayCheckpointRepository(sessionmaker_instance),
+        args.name,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_rate=args.max_rate,
+    )
+    rollup_task = asyncio.create_task(event_rollup_aggregator.start())
+    try:
+        await replayer.run(start_message_id, start_publish_time_ms)
+    finally:
+        rollup_task.cancel()
+        await event_rollup_aggregator.stop()
+        await commission_publisher.disconnect()
+        client.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+from fastapi import FastAPI, HTTPException
+from datetime import datetime, timezone
+import logging
+from src.application.queries.get_campaign_event_series_query import (
+    GetCampaignEventSeriesQuery,
+)
+from src.application.handlers.get_campaign_event_series_handler import (
+    GetCampaignEventSeriesHandler,
+)
+from src.domain.entities.event_rollup import RollupGranularity
+
+app = FastAPI(title="Tracking Service", version="1.0.0")
+
+logger = logging.getLogger(__name__)
+
+# Query handlers are injected from main
+event_series_handler: GetCampaignEventSeriesHandler | None = None
+# Components exposing a stats() dict for /metrics
+stats_providers = []
+
+
+def set_event_series_handler(h):
+    global event_series_handler
+    event_series_handler = h
+
+
+def register_stats_provider(provider):
+    stats_providers.append(provider)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    metrics = {}
+    for provider in stats_providers:
+        metrics.update(provider.stats())
+    return metrics
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC
+    if value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@app.get("/campaigns/{campaign_id}/event-series")
+async def get_campaign_event_series(
+    campaign_id: str,
+    start: datetime,
+    end: datetime,
+    granularity: RollupGranularity = RollupGranularity.HOUR,
+    event_type: str | None = None,
+):
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    try:
+        query = GetCampaignEventSeriesQuery(
+            campaign_id=campaign_id,
+            granularity=granularity,
+            start=_to_utc_naive(start),
+            end=_to_utc_naive(end),
+            event_type=event_type,
+        )
+        rollups = await event_series_handler.handle(query)
+        return {
+            "campaign_id": campaign_id,
+            "granularity": granularity.value,
+            "series": [
+                {
+                    "bucket_start": rollup.bucket_start.isoformat(),
+                    "event_type": rollup.event_type,
+                    "count": rollup.count,
+                }
+                for rollup in rollups
+            ],
+        }
+    except Exception as e:
+        logger.error(f"Error querying event series for campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to query event series")
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class RecoverStuckSagasCommand(BaseModel):
+    deadline_seconds: float
+    batch_size: int = 100
+    max_republish_attempts: int = 3
@@ -2,5 +2,7 @@ from src.domain.entities.tracking_event import TrackingEvent
 
 
 class RegisterTrackingEventCommand:
-    def __init__(self, tracking_event: TrackingEvent):
+    def __init__(self, tracking_event: TrackingEvent, dedup_key: str | None = None):
         self.tracking_event = tracking_event
+        # Claimed durably together with the event when set
+        self.dedup_key = dedup_key
@@ -0,0 +1,27 @@
+import logging
+from src.application.commands.complete_tracking_saga_command import (
+    CompleteTrackingSagaCommand,
+)
+from src.domain.ports.saga_log_repository import SagaLogRepository
+from src.domain.entities.saga_log import SagaLog, SagaStep, SagaStatus
+
+logger = logging.getLogger(__name__)
+
+
+class CompleteTrackingSagaHandler:
+    def __init__(self, saga_log_repository: SagaLogRepository):
+        self.saga_log_repository = saga_log_repository
+
+    async def handle_batch(self, commands: list[CompleteTrackingSagaCommand]) -> None:
+        tracking_ids = sorted({command.tracking_id for command in commands})
+        logger.info(f"Marking {len(tracking_ids)} sagas as commission completed")
+        await self.saga_log_repository.save_many(
+            [
+                SagaLog(
+                    saga_id=str(tracking_id),
+                    step=SagaStep.COMMISSION_COMPLETED,
+                    status=SagaStatus.SUCCESS,
+                )
+                for tracking_id in tracking_ids
+            ]
+        )
@@ -66,3 +66,51 @@ class FailTrackingEventHandler:
                 )
             )
             raise
+
+    async def handle_batch(self, commands: list[FailTrackingEventCommand]) -> None:
+        tracking_ids = sorted({command.tracking_id for command in commands})
+        logger.info(
+            f"Handling {len(commands)} FailTrackingEventCommands for {len(tracking_ids)} tracking ids"
+        )
+        try:
+            updated = await self.tracking_event_repository.update_status_many(
+                tracking_ids, "failed"
+            )
+            logger.info(f"{updated} tracking events marked as failed")
+
+            saga_logs = []
+            for tracking_id in tracking_ids:
+                saga_logs.append(
+                    SagaLog(
+                        saga_id=str(tracking_id),
+                        step=SagaStep.COMMISSION_FAILED,
+                        status=SagaStatus.FAILED,
+                        details=f"tracking_id: {tracking_id}",
+                    )
+                )
+                saga_logs.append(
+                    SagaLog(
+                        saga_id=str(tracking_id),
+                        step=SagaStep.COMPENSATION_COMPLETED,
+                        status=SagaStatus.SUCCESS,
+                        details="Marked tracking as failed",
+                    )
+                )
+            await self.saga_log_repository.save_many(saga_logs)
+
+        except Exception as e:
+            logger.error(
+                f"Failed to handle batch of {len(tracking_ids)} FailTrackingEventCommands: {e}"
+            )
+            await self.saga_log_repository.save_many(
+                [
+                    SagaLog(
+                        saga_id=str(tracking_id),
+                        step=SagaStep.COMPENSATION_COMPLETED,
+                        status=SagaStatus.FAILED,
+                        details=str(e),
+                    )
+                    for tracking_id in tracking_ids
+                ]
+            )
+            raise
@@ -0,0 +1,67 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from src.application.queries.get_campaign_event_series_query import (
+    GetCampaignEventSeriesQuery,
+)
+from src.domain.entities.event_rollup import EventRollup, RollupGranularity
+from src.domain.ports.event_rollup_repository import EventRollupRepository
+from src.infrastructure.adapters.event_rollup_aggregator import EventRollupAggregator
+
+logger = logging.getLogger(__name__)
+
+
+class GetCampaignEventSeriesHandler:
+    def __init__(
+        self,
+        event_rollup_repository: EventRollupRepository,
+        event_rollup_aggregator: EventRollupAggregator | None = None,
+    ):
+        self.event_rollup_repository = event_rollup_repository
+        self.event_rollup_aggregator = event_rollup_aggregator
+
+    async def handle(self, query: GetCampaignEventSeriesQuery) -> list[EventRollup]:
+        logger.info(
+            f"Handling GetCampaignEventSeriesQuery for campaign: {query.campaign_id}, granularity: {query.granularity.value}"
+        )
+        rollups = await self.event_rollup_repository.get_series(
+            query.campaign_id,
+            query.granularity,
+            query.start,
+            query.end,
+            query.event_type,
+        )
+        if not self.event_rollup_aggregator:
+            return rollups
+
+        # Merge counts not flushed yet so the series is up to date
+        totals: dict[tuple[datetime, str], int] = defaultdict(int)
+        for rollup in rollups:
+            totals[(rollup.bucket_start, rollup.event_type)] += rollup.count
+        for rollup in self.event_rollup_aggregator.pending(query.campaign_id):
+            if query.event_type and rollup.event_type != query.event_type:
+                continue
+            if not query.start <= rollup.bucket_start < query.end:
+                continue
+            bucket = self._truncate(rollup.bucket_start, query.granularity)
+            totals[(bucket, rollup.event_type)] += rollup.count
+
+        return [
+            EventRollup(
+                campaign_id=query.campaign_id,
+                event_type=event_type,
+                granularity=query.granularity,
+                bucket_start=bucket,
+                count=count,
+            )
+            for (bucket, event_type), count in sorted(totals.items())
+        ]
+
+    def _truncate(
+        self, bucket_start: datetime, granularity: RollupGranularity
+    ) -> datetime:
+        if granularity == RollupGranularity.DAY:
+            return bucket_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if granularity == RollupGranularity.HOUR:
+            return bucket_start.replace(minute=0, second=0, microsecond=0)
+        return bucket_start
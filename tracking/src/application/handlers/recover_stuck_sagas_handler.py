@@ -0,0 +1,99 @@
+import logging
+from datetime import datetime, timedelta
+from src.application.commands.recover_stuck_sagas_command import (
+    RecoverStuckSagasCommand,
+)
+from src.application.commands.fail_tracking_event_command import (
+    FailTrackingEventCommand,
+)
+from src.application.handlers.fail_tracking_event_handler import (
+    FailTrackingEventHandler,
+)
+from src.domain.ports.saga_state_repository import SagaStateRepository
+from src.domain.ports.saga_log_repository import SagaLogRepository
+from src.domain.ports.tracking_event_repository import TrackingEventRepository
+from src.domain.entities.saga_log import SagaLog, SagaStep, SagaStatus
+from src.application.handlers.register_tracking_event_handler import (
+    RegisterTrackingEventHandler,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RecoverStuckSagasHandler:
+    def __init__(
+        self,
+        saga_state_repository: SagaStateRepository,
+        saga_log_repository: SagaLogRepository,
+        tracking_event_repository: TrackingEventRepository,
+        register_handler: RegisterTrackingEventHandler,
+        fail_handler: FailTrackingEventHandler,
+    ):
+        self.saga_state_repository = saga_state_repository
+        self.saga_log_repository = saga_log_repository
+        self.tracking_event_repository = tracking_event_repository
+        self.register_handler = register_handler
+        self.fail_handler = fail_handler
+
+    async def handle(self, command: RecoverStuckSagasCommand) -> int:
+        # Returns how many sagas were handled, so callers can keep draining
+        # while full batches come back
+        older_than = datetime.utcnow() - timedelta(seconds=command.deadline_seconds)
+        stuck = await self.saga_state_repository.find_stale(
+            SagaStep.COMMISSION_PUBLISHED, older_than, command.batch_size
+        )
+        if not stuck:
+            return 0
+        logger.info(f"Found {len(stuck)} sagas stuck at commission_published")
+
+        to_compensate = [
+            int(state.saga_id)
+            for state in stuck
+            if state.retry_count >= command.max_republish_attempts
+        ]
+        to_republish = [
+            state for state in stuck if state.retry_count < command.max_republish_attempts
+        ]
+
+        if to_republish:
+            # Sagas whose tracking event no longer exists cannot be republished
+            to_compensate += await self._republish(to_republish)
+        if to_compensate:
+            logger.info(
+                f"Compensating {len(to_compensate)} sagas after {command.max_republish_attempts} republish attempts"
+            )
+            await self.fail_handler.handle_batch(
+                [
+                    FailTrackingEventCommand(tracking_id=tracking_id)
+                    for tracking_id in to_compensate
+                ]
+            )
+        return len(stuck)
+
+    async def _republish(self, states) -> list[int]:
+        retry_counts = {state.saga_id: state.retry_count for state in states}
+        tracking_events = await self.tracking_event_repository.get_many(
+            [int(saga_id) for saga_id in retry_counts]
+        )
+        republished = []
+        for tracking_event in tracking_events:
+            await self.register_handler.publish_commission(
+                tracking_event.id, tracking_event
+            )
+            republished.append(str(tracking_event.id))
+        logger.info(f"Republished commission events for {len(republished)} stuck sagas")
+
+        # Re-recording the step restarts the saga's deadline
+        await self.saga_state_repository.increment_retry_count(republished)
+        await self.saga_log_repository.save_many(
+            [
+                SagaLog(
+                    saga_id=saga_id,
+                    step=SagaStep.COMMISSION_PUBLISHED,
+                    status=SagaStatus.SUCCESS,
+                    details=f"republished, attempt {retry_counts[saga_id] + 1}",
+                )
+                for saga_id in republished
+            ]
+        )
+        return [int(saga_id) for saga_id in retry_counts if saga_id not in republished]
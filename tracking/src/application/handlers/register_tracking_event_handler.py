@@ -3,12 +3,18 @@ from src.application.commands.register_tracking_event_command import (
     RegisterTrackingEventCommand,
 )
 from src.domain.ports.tracking_event_repository import TrackingEventRepository
+from src.domain.entities.tracking_event import TrackingEvent
 from src.domain.ports.saga_log_repository import SagaLogRepository
+from src.domain.ports.saga_state_repository import SagaStateRepository
 from src.domain.entities.saga_log import SagaLog, SagaStep, SagaStatus
 from src.infrastructure.adapters.pulsar_producer import PulsarCommissionPublisher
+from src.infrastructure.adapters.event_rollup_aggregator import EventRollupAggregator
 
 logger = logging.getLogger(__name__)
 
+# Steps in saga order, to tell how far an interrupted saga got
+STEP_RANK = {step: rank for rank, step in enumerate(SagaStep)}
+
 
 class RegisterTrackingEventHandler:
     def __init__(
@@ -16,49 +22,93 @@ class RegisterTrackingEventHandler:
         tracking_event_repository: TrackingEventRepository,
         commission_publisher: PulsarCommissionPublisher,
         saga_log_repository: SagaLogRepository,
+        event_rollup_aggregator: EventRollupAggregator | None = None,
+        saga_state_repository: SagaStateRepository | None = None,
     ):
         self.tracking_event_repository = tracking_event_repository
         self.commission_publisher = commission_publisher
         self.saga_log_repository = saga_log_repository
+        self.event_rollup_aggregator = event_rollup_aggregator
+        # Needed to resume the saga of a redelivered event whose dedup key
+        # was claimed but whose saga did not get as far as publishing
+        self.saga_state_repository = saga_state_repository
 
-    async def handle(self, command: RegisterTrackingEventCommand) -> None:
+    async def handle(self, command: RegisterTrackingEventCommand) -> int | None:
+        # Returns the new tracking_id, or None when the dedup key was already
+        # claimed by a stored event; that event's saga is resumed if it
+        # stopped before the commission was published
         logger.info(
             f"Handling RegisterTrackingEventCommand for campaign: {command.tracking_event.campaign_id}, event: {command.tracking_event.event_type}"
         )
-        tracking_id = await self.tracking_event_repository.save(command.tracking_event)
+        tracking_id = await self.tracking_event_repository.save(
+            command.tracking_event, command.dedup_key
+        )
+        if tracking_id is None:
+            await self._resume(command)
+            return None
         logger.info(
             f"Tracking event registered successfully for campaign: {command.tracking_event.campaign_id} with id: {tracking_id}"
         )
 
+        if self.event_rollup_aggregator:
+            self.event_rollup_aggregator.record(tracking_id, command.tracking_event)
+
+        await self._run_saga(tracking_id, command.tracking_event)
+        return tracking_id
+
+    async def _resume(self, command: RegisterTrackingEventCommand) -> None:
+        # The event and its dedup key commit before the saga steps run, so a
+        # failure after the commit is redelivered as a duplicate. The stuck
+        # saga scan only covers published commissions, so the remaining steps
+        # are run here.
+        if not command.dedup_key or not self.saga_state_repository:
+            return
+        tracking_id = await self.tracking_event_repository.get_id_by_dedup_key(
+            command.dedup_key
+        )
+        if tracking_id is None:
+            return
+        state = await self.saga_state_repository.get(str(tracking_id))
+        done = state.current_step if state else None
+        if done and STEP_RANK[done] >= STEP_RANK[SagaStep.COMMISSION_PUBLISHED]:
+            return
+        logger.info(
+            f"Resuming saga {tracking_id} of a redelivered event after {done.value if done else 'none'}"
+        )
+        await self._run_saga(tracking_id, command.tracking_event, done)
+
+    async def _run_saga(
+        self,
+        tracking_id: int,
+        tracking_event: TrackingEvent,
+        done: SagaStep | None = None,
+    ) -> None:
+        # Runs the saga steps after done, the last step already recorded
         saga_id = str(tracking_id)
 
         # Log saga start
-        await self.saga_log_repository.save(
-            SagaLog(saga_id=saga_id, step=SagaStep.STARTED, status=SagaStatus.PENDING)
-        )
+        if done is None:
+            await self.saga_log_repository.save(
+                SagaLog(
+                    saga_id=saga_id, step=SagaStep.STARTED, status=SagaStatus.PENDING
+                )
+            )
 
         # Log tracking saved
-        await self.saga_log_repository.save(
-            SagaLog(
-                saga_id=saga_id,
-                step=SagaStep.TRACKING_SAVED,
-                status=SagaStatus.SUCCESS,
-                details=f"tracking_id: {tracking_id}",
+        if done in (None, SagaStep.STARTED):
+            await self.saga_log_repository.save(
+                SagaLog(
+                    saga_id=saga_id,
+                    step=SagaStep.TRACKING_SAVED,
+                    status=SagaStatus.SUCCESS,
+                    details=f"tracking_id: {tracking_id}",
+                )
             )
-        )
 
         # Publish commission event
-        event_type = command.tracking_event.event_type
-        commission_type = self._map_event_to_commission_type(event_type)
-        amount = self._calculate_commission_amount(event_type)
-        await self.commission_publisher.publish_commission_event(
-            amount=amount,
-            campaign_id=command.tracking_event.campaign_id,
-            commission_type=commission_type,
-            tracking_id=tracking_id,
-        )
+        await self.publish_commission(tracking_id, tracking_event)
         logger.info(
-            f"Commission event published for campaign: {command.tracking_event.campaign_id} with tracking_id: {tracking_id}"
+            f"Commission event published for campaign: {tracking_event.campaign_id} with tracking_id: {tracking_id}"
         )
 
         # Log commission published
@@ -70,6 +120,19 @@ class RegisterTrackingEventHandler:
             )
         )
 
+    async def publish_commission(
+        self, tracking_id: int, tracking_event: TrackingEvent
+    ) -> None:
+        event_type = tracking_event.event_type
+        commission_type = self._map_event_to_commission_type(event_type)
+        amount = self._calculate_commission_amount(event_type)
+        await self.commission_publisher.publish_commission_event(
+            amount=amount,
+            campaign_id=tracking_event.campaign_id,
+            commission_type=commission_type,
+            tracking_id=tracking_id,
+        )
+
     def _map_event_to_commission_type(self, event_type: str) -> str:
         mapping = {
             "click": "CPC",
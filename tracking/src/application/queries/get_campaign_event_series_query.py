@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import datetime
+from src.domain.entities.event_rollup import RollupGranularity
+
+
+class GetCampaignEventSeriesQuery(BaseModel):
+    campaign_id: str
+    granularity: RollupGranularity = RollupGranularity.HOUR
+    start: datetime
+    end: datetime
+    event_type: str | None = None
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+
+
+class RollupGranularity(str, Enum):
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
+class EventRollup(BaseModel):
+    campaign_id: str
+    event_type: str
+    granularity: RollupGranularity = RollupGranularity.MINUTE
+    bucket_start: datetime
+    count: int
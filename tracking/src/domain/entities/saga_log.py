@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
 
@@ -7,6 +7,7 @@ class SagaStep(str, Enum):
     STARTED = "started"
     TRACKING_SAVED = "tracking_saved"
     COMMISSION_PUBLISHED = "commission_published"
+    COMMISSION_COMPLETED = "commission_completed"
     COMMISSION_FAILED = "commission_failed"
     COMPENSATION_COMPLETED = "compensation_completed"
 
@@ -23,5 +24,5 @@ class SagaLog(BaseModel):
     saga_id: str  # tracking_id
     step: SagaStep
     status: SagaStatus
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
     details: str | None = None
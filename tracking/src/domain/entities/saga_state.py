@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+from src.domain.entities.saga_log import SagaStep, SagaStatus
+
+
+class SagaState(BaseModel):
+    saga_id: str  # tracking_id
+    current_step: SagaStep
+    status: SagaStatus
+    step_timestamps: dict[SagaStep, datetime] = {}
+    updated_at: datetime
+    last_error: str | None = None
+    retry_count: int = 0
@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class EventDedupRepository(ABC):
+    @abstractmethod
+    async def purge_older_than(self, cutoff: datetime) -> int:
+        pass
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from src.domain.entities.event_rollup import EventRollup, RollupGranularity
+
+
+class EventRollupRepository(ABC):
+    @abstractmethod
+    async def flush(self, tracking_ids: list[int]) -> int:
+        pass
+
+    @abstractmethod
+    async def claim_unrolled(self, up_to_id: int, limit: int) -> int:
+        pass
+
+    @abstractmethod
+    async def max_tracking_id(self) -> int:
+        pass
+
+    @abstractmethod
+    async def compact(
+        self,
+        source: RollupGranularity,
+        target: RollupGranularity,
+        older_than: datetime,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    async def get_series(
+        self,
+        campaign_id: str,
+        granularity: RollupGranularity,
+        start: datetime,
+        end: datetime,
+        event_type: str | None = None,
+    ) -> list[EventRollup]:
+        pass
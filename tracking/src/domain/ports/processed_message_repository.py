@@ -10,3 +10,11 @@ class ProcessedMessageRepository(ABC):
     @abstractmethod
     async def mark_processed(self, message_id: str) -> None:
         pass
+
+    @abstractmethod
+    async def get_processed(self, message_ids: list[str]) -> set[str]:
+        pass
+
+    @abstractmethod
+    async def mark_processed_many(self, message_ids: list[str]) -> None:
+        pass
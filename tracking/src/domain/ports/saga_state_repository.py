@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from src.domain.entities.saga_log import SagaLog, SagaStep
+from src.domain.entities.saga_state import SagaState
+
+
+class SagaStateRepository(ABC):
+    @abstractmethod
+    async def apply(
+        self, saga_logs: list[SagaLog], detail_logs: list[SagaLog] | None = None
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, saga_id: str) -> SagaState | None:
+        pass
+
+    @abstractmethod
+    async def update_status(
+        self, saga_id: str, step: str, status: str, detail: bool = False
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def find_stale(
+        self, step: SagaStep, older_than: datetime, limit: int
+    ) -> list[SagaState]:
+        pass
+
+    @abstractmethod
+    async def increment_retry_count(self, saga_ids: list[str]) -> None:
+        pass
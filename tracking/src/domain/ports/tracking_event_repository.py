@@ -4,9 +4,25 @@ from src.domain.entities.tracking_event import TrackingEvent
 
 class TrackingEventRepository(ABC):
     @abstractmethod
-    async def save(self, tracking_event: TrackingEvent) -> int:
+    async def save(
+        self, tracking_event: TrackingEvent, dedup_key: str | None = None
+    ) -> int | None:
+        pass
+
+    # The tracking_id of the event that claimed a dedup key; None for keys
+    # claimed before events were recorded with them
+    @abstractmethod
+    async def get_id_by_dedup_key(self, dedup_key: str) -> int | None:
+        pass
+
+    @abstractmethod
+    async def get_many(self, tracking_ids: list[int]) -> list[TrackingEvent]:
         pass
 
     @abstractmethod
     async def update_status(self, tracking_id: int, status: str) -> None:
         pass
+
+    @abstractmethod
+    async def update_status_many(self, tracking_ids: list[int], status: str) -> int:
+        pass
@@ -0,0 +1,320 @@
+import asyncio
+import csv
+import gzip
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+import asyncpg
+from src.domain.entities.saga_log import SagaStep, SagaStatus
+
+logger = logging.getLogger(__name__)
+
+TRACKING_COLUMNS = ["campaign_id", "event_type", "status", "timestamp"]
+SAGA_LOG_COLUMNS = ["saga_id", "step", "status", "timestamp", "details"]
+SAGA_STATE_COLUMNS = [
+    "saga_id",
+    "current_step",
+    "status",
+    "started_at",
+    "tracking_saved_at",
+    "updated_at",
+]
+
+
+@dataclass(frozen=True)
+class FileChunk:
+    path: str
+    start: int  # byte offset for plain files, 0 for gzip
+    end: int  # byte offset for plain files, -1 for gzip (whole file)
+
+    @property
+    def key(self) -> str:
+        return f"{self.path}:{self.start}"
+
+    @property
+    def is_gzip(self) -> bool:
+        return self.path.endswith(".gz")
+
+    @property
+    def is_csv(self) -> bool:
+        return self.path.removesuffix(".gz").endswith(".csv")
+
+
+def plan_chunks(paths: list[str], chunk_bytes: int) -> list[FileChunk]:
+    chunks = []
+    for path in paths:
+        if path.endswith(".gz"):
+            # Compressed streams cannot be split, so each file is one chunk
+            chunks.append(FileChunk(path, 0, -1))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            chunks.append(FileChunk(path, start, min(start + chunk_bytes, size)))
+    return chunks
+
+
+async def register_job(
+    dsn: str, job: str, chunk_bytes: int, chunks: list[FileChunk]
+) -> None:
+    # Checkpoints are keyed by chunk start offset, so they only line up with
+    # the chunks of the same size. A job remembers its chunk size and refuses
+    # to resume with another one, which would load checkpointed rows again.
+    conn = await asyncpg.connect(dsn)
+    try:
+        async with conn.transaction():
+            chunk_size = await conn.fetchval(
+                "SELECT chunk_bytes FROM bulk_load_jobs WHERE job = $1 FOR UPDATE", job
+            )
+            if chunk_size is not None:
+                if chunk_size != chunk_bytes:
+                    raise SystemExit(
+                        f"Job {job} was started with --chunk-mb "
+                        f"{chunk_size // (1024 * 1024)}; resume it with the same value"
+                    )
+                return
+            # Jobs started before chunk sizes were recorded are adopted only
+            # when all of their checkpoints are chunks of this plan
+            keys = await conn.fetch(
+                "SELECT chunk_key FROM bulk_load_checkpoints WHERE job = $1", job
+            )
+            planned = {chunk.key for chunk in chunks}
+            if any(row["chunk_key"] not in planned for row in keys):
+                raise SystemExit(
+                    f"Job {job} has checkpoints for other chunks; "
+                    "resume it with its original --chunk-mb"
+                )
+            await conn.execute(
+                "INSERT INTO bulk_load_jobs (job, chunk_bytes, created_at) "
+                "VALUES ($1, $2, $3)",
+                job,
+                chunk_bytes,
+                datetime.utcnow(),
+            )
+    finally:
+        await conn.close()
+
+
+def to_asyncpg_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+class _ChunkReader:
+    # Yields (position, row) pairs where position is where reading resumes
+    # after that row: a byte offset for plain files, a line count for gzip.
+
+    def __init__(self, chunk: FileChunk):
+        self.chunk = chunk
+        self.fieldnames = None
+        if chunk.is_csv:
+            opener = gzip.open if chunk.is_gzip else open
+            with opener(chunk.path, "rt", newline="") as f:
+                self.fieldnames = next(csv.reader([f.readline()]))
+
+    def _parse(self, line: str) -> dict | None:
+        line = line.strip()
+        if not line:
+            return None
+        if self.fieldnames:
+            return dict(zip(self.fieldnames, next(csv.reader([line]))))
+        return json.loads(line)
+
+    def _is_header(self, line_start: int) -> bool:
+        return self.fieldnames is not None and line_start == 0
+
+    def rows(self, position: int):
+        if self.chunk.is_gzip:
+            yield from self._gzip_rows(position)
+        else:
+            yield from self._plain_rows(position)
+
+    def _plain_rows(self, position: int):
+        with open(self.chunk.path, "rb") as f:
+            if position > self.chunk.start:
+                f.seek(position)
+            elif self.chunk.start > 0:
+                # A chunk owns the lines that start inside it; skip the tail
+                # of the line owned by the previous chunk
+                f.seek(self.chunk.start - 1)
+                f.readline()
+            while f.tell() < self.chunk.end:
+                line_start = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if self._is_header(line_start):
+                    continue
+                row = self._parse(line.decode())
+                if row is not None:
+                    yield f.tell(), row
+
+    def _gzip_rows(self, position: int):
+        with gzip.open(self.chunk.path, "rt", newline="") as f:
+            if self.fieldnames:
+                f.readline()
+            for line_number, line in enumerate(f, start=1):
+                if line_number <= position:
+                    continue
+                row = self._parse(line)
+                if row is not None:
+                    yield line_number, row
+
+
+class BulkTrackingLoader:
+    def __init__(
+        self,
+        dsn: str,
+        job: str,
+        batch_size: int = 50_000,
+        with_saga_logs: bool = False,
+    ):
+        self.dsn = dsn
+        self.job = job
+        self.batch_size = batch_size
+        self.with_saga_logs = with_saga_logs
+
+    async def _get_checkpoint(self, conn, chunk: FileChunk) -> tuple[int, bool]:
+        row = await conn.fetchrow(
+            "SELECT position, completed FROM bulk_load_checkpoints "
+            "WHERE job = $1 AND chunk_key = $2",
+            self.job,
+            chunk.key,
+        )
+        if row is None:
+            return chunk.start, False
+        return row["position"], row["completed"]
+
+    async def _save_checkpoint(
+        self, conn, chunk: FileChunk, position: int, rows: int, completed: bool
+    ) -> None:
+        await conn.execute(
+            "INSERT INTO bulk_load_checkpoints "
+            "(job, chunk_key, position, rows_loaded, completed, updated_at) "
+            "VALUES ($1, $2, $3, $4, $5, $6) "
+            "ON CONFLICT (job, chunk_key) DO UPDATE SET "
+            "position = EXCLUDED.position, "
+            "rows_loaded = bulk_load_checkpoints.rows_loaded + EXCLUDED.rows_loaded, "
+            "completed = EXCLUDED.completed, updated_at = EXCLUDED.updated_at",
+            self.job,
+            chunk.key,
+            position,
+            rows,
+            completed,
+            datetime.utcnow(),
+        )
+
+    async def _write_batch(
+        self, conn, chunk: FileChunk, batch: list[tuple], position: int, done: bool
+    ) -> None:
+        # Rows and checkpoint commit together, so a resumed chunk never
+        # loads a row twice
+        async with conn.transaction():
+            if batch and self.with_saga_logs:
+                ids = await conn.fetch(
+                    "SELECT nextval(pg_get_serial_sequence('tracking_events', 'id')) "
+                    "FROM generate_series(1, $1)",
+                    len(batch),
+                )
+                records = [(row[0],) + event for row, event in zip(ids, batch)]
+                await conn.copy_records_to_table(
+                    "tracking_events",
+                    records=records,
+                    columns=["id"] + TRACKING_COLUMNS,
+                )
+                saga_logs = []
+                saga_states = []
+                for record in records:
+                    saga_id = str(record[0])
+                    timestamp = record[4]
+                    saga_logs.append(
+                        (
+                            saga_id,
+                            SagaStep.STARTED.value,
+                            SagaStatus.PENDING.value,
+                            timestamp,
+                            "backfill",
+                        )
+                    )
+                    saga_logs.append(
+                        (
+                            saga_id,
+                            SagaStep.TRACKING_SAVED.value,
+                            SagaStatus.SUCCESS.value,
+                            timestamp,
+                            f"tracking_id: {saga_id}",
+                        )
+                    )
+                    saga_states.append(
+                        (
+                            saga_id,
+                            SagaStep.TRACKING_SAVED.value,
+                            SagaStatus.SUCCESS.value,
+                            timestamp,
+                            timestamp,
+                            timestamp,
+                        )
+                    )
+                await conn.copy_records_to_table(
+                    "saga_logs", records=saga_logs, columns=SAGA_LOG_COLUMNS
+                )
+                await conn.copy_records_to_table(
+                    "saga_state", records=saga_states, columns=SAGA_STATE_COLUMNS
+                )
+            elif batch:
+                await conn.copy_records_to_table(
+                    "tracking_events", records=batch, columns=TRACKING_COLUMNS
+                )
+            await self._save_checkpoint(conn, chunk, position, len(batch), done)
+
+    async def load_chunk(self, chunk: FileChunk) -> int:
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            position, completed = await self._get_checkpoint(conn, chunk)
+            if completed:
+                logger.info(f"Chunk {chunk.key} already loaded, skipping")
+                return 0
+            reader = _ChunkReader(chunk)
+            loaded = 0
+            batch = []
+            started = time.monotonic()
+            for position, row in reader.rows(position):
+                batch.append(
+                    (
+                        row["campaign_id"],
+                        row["event_type"],
+                        row.get("status") or "success",
+                        _parse_timestamp(row["timestamp"]),
+                    )
+                )
+                if len(batch) >= self.batch_size:
+                    await self._write_batch(conn, chunk, batch, position, False)
+                    loaded += len(batch)
+                    batch = []
+            await self._write_batch(conn, chunk, batch, position, True)
+            loaded += len(batch)
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Chunk {chunk.key} loaded {loaded} rows in {elapsed:.1f}s "
+                f"({loaded / max(elapsed, 1e-6):.0f} rows/s)"
+            )
+            return loaded
+        finally:
+            await conn.close()
+
+
+def load_chunk_in_process(
+    dsn: str, job: str, batch_size: int, with_saga_logs: bool, chunk: FileChunk
+) -> int:
+    # Entry point for worker processes; each runs its own loop and connection
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    loader = BulkTrackingLoader(dsn, job, batch_size, with_saga_logs)
+    return asyncio.run(loader.load_chunk(chunk))
@@ -0,0 +1,124 @@
+import pulsar
+import asyncio
+import logging
+from pulsar.schema import AvroSchema
+from src.application.handlers.complete_tracking_saga_handler import (
+    CompleteTrackingSagaHandler,
+)
+from src.application.commands.complete_tracking_saga_command import (
+    CompleteTrackingSagaCommand,
+)
+from .schemas import CommissionCompletedRecord
+from .dead_letter_policy import DeadLetterPolicy
+
+logger = logging.getLogger(__name__)
+
+
+# Closes tracking sagas once comissions has saved the commission, so the
+# stuck-saga scan only sees sagas that are really waiting
+class CommissionCompletedConsumer:
+    def __init__(
+        self,
+        handler: CompleteTrackingSagaHandler,
+        pulsar_service_url: str = "pulsar://localhost:6650",
+        topic: str = "persistent://miso-1-2025/default/commission-completed-events",
+        token: str = "",
+        batch_max_messages: int = 500,
+        batch_timeout_ms: int = 200,
+        dead_letter_policy: DeadLetterPolicy | None = None,
+    ):
+        self.handler = handler
+        self.pulsar_service_url = pulsar_service_url
+        self.topic = topic
+        self.token = token
+        self.batch_max_messages = batch_max_messages
+        self.batch_timeout_ms = batch_timeout_ms
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
+        self.client = None
+        self.consumer = None
+
+    async def start(self):
+        logger.info(f"Connecting to Pulsar at {self.pulsar_service_url}")
+        try:
+            if self.token:
+                self.client = pulsar.Client(
+                    self.pulsar_service_url,
+                    authentication=pulsar.AuthenticationToken(self.token),
+                )
+            else:
+                self.client = pulsar.Client(self.pulsar_service_url)
+            self.consumer = await asyncio.to_thread(
+                self.client.subscribe,
+                self.topic,
+                "tracking-commission-completed-subscriber",
+                schema=AvroSchema(CommissionCompletedRecord),
+                initial_position=pulsar.InitialPosition.Earliest,
+                batch_receive_policy=pulsar.ConsumerBatchReceivePolicy(
+                    self.batch_max_messages, 10 * 1024 * 1024, self.batch_timeout_ms
+                ),
+                **self.dead_letter_policy.subscribe_options(),
+            )
+            await self.dead_letter_policy.attach(
+                self.client,
+                self.consumer,
+                self.topic,
+                "tracking-commission-completed-subscriber",
+            )
+            logger.info(f"Subscribed to topic: {self.topic}")
+        except Exception as e:
+            logger.error(f"Failed to start CommissionCompletedConsumer: {e}")
+            raise
+
+        while True:
+            if asyncio.current_task().cancelled():
+                break
+            messages = []
+            try:
+                messages = list(await asyncio.to_thread(self.consumer.batch_receive))
+                if not messages:
+                    continue
+                await self._process_batch(messages)
+            except pulsar.Interrupted:
+                logger.info("Consumer interrupted, shutting down")
+                break
+            except Exception as e:
+                logger.error(f"Error processing batch of commission completed events: {e}")
+                for msg in messages:
+                    await self.dead_letter_policy.fail(msg, e)
+
+    async def _process_batch(self, messages: list) -> None:
+        commands = []
+        invalid = []
+        for msg in messages:
+            try:
+                tracking_id = int(msg.value().tracking_id)
+            except Exception as e:
+                logger.error(f"Invalid commission completed event {msg.message_id()}: {e}")
+                invalid.append((msg, e))
+                continue
+            commands.append(CompleteTrackingSagaCommand(tracking_id=tracking_id))
+
+        # Completing a saga twice is harmless, so redelivery needs no dedup table
+        if commands:
+            await self.handler.handle_batch(commands)
+
+        # Individual acks, which the client groups on the wire: a cumulative
+        # ack would also cover earlier messages still waiting for a retry
+        invalid_messages = [msg for msg, _ in invalid]
+        for msg in messages:
+            if msg not in invalid_messages:
+                self.consumer.acknowledge(msg)
+        for msg, error in invalid:
+            await self.dead_letter_policy.fail(msg, error, permanent=True)
+        logger.info(
+            f"Commission completed batch processed: {len(commands)} sagas, {len(invalid)} invalid"
+        )
+
+    def stop(self):
+        logger.info("Stopping commission completed consumer")
+        if self.consumer:
+            self.consumer.close()
+        self.dead_letter_policy.close()
+        if self.client:
+            self.client.close()
+        logger.info("Commission completed consumer stopped")
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from src.domain.ports.event_dedup_repository import EventDedupRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Windowed duplicate suppression for ingested tracking events. Keys are kept
+# as short digests in one set per time bucket; whole buckets expire once they
+# leave the window, and the oldest bucket is dropped early when the key budget
+# is exceeded. With a repository, keys are also claimed durably in the same
+# transaction as their event (see RegisterTrackingEventCommand.dedup_key), so
+# they are shared by all replicas; the repository here only expires them.
+class EventDeduplicator:
+    def __init__(
+        self,
+        repository: EventDedupRepository | None = None,
+        window_seconds: float = 600.0,
+        bucket_seconds: float = 60.0,
+        max_keys: int = 1_000_000,
+    ):
+        self.repository = repository
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[int, set[bytes]] = OrderedDict()
+        self._size = 0
+        self._running = False
+        self.checked = 0
+        self.duplicates = 0
+        self.evictions = 0
+
+    @staticmethod
+    def dedup_key(
+        campaign_id: str,
+        event_type: str,
+        timestamp: str,
+        source: str | None = None,
+        event_id: str | None = None,
+    ) -> str:
+        if event_id:
+            raw = f"id|{event_id}"
+        else:
+            raw = f"fp|{campaign_id}|{event_type}|{timestamp}|{source or ''}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _expire(self, now: float) -> None:
+        oldest_kept = int((now - self.window_seconds) // self.bucket_seconds)
+        while self._buckets:
+            bucket, keys = next(iter(self._buckets.items()))
+            if bucket > oldest_kept and self._size <= self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+            self._size -= len(keys)
+            self.evictions += len(keys)
+
+    def _contains(self, digest: bytes) -> bool:
+        return any(digest in keys for keys in self._buckets.values())
+
+    def _remember(self, digest: bytes, now: float) -> None:
+        bucket = int(now // self.bucket_seconds)
+        keys = self._buckets.get(bucket)
+        if keys is None:
+            keys = self._buckets[bucket] = set()
+        if digest not in keys:
+            keys.add(digest)
+            self._size += 1
+        self._expire(now)
+
+    @property
+    def durable(self) -> bool:
+        return self.repository is not None
+
+    def is_duplicate(self, dedup_key: str) -> bool:
+        now = time.time()
+        digest = bytes.fromhex(dedup_key)
+        self.checked += 1
+        self._expire(now)
+        if self._contains(digest):
+            self.duplicates += 1
+            return True
+        self._remember(digest, now)
+        return False
+
+    def durable_duplicate(self, dedup_key: str) -> None:
+        # The key was already claimed in the database; is_duplicate has
+        # remembered it, so later copies are dropped without a round trip
+        self.duplicates += 1
+
+    def release(self, dedup_key: str) -> None:
+        # Called when processing fails so the redelivered copy is not dropped
+        digest = bytes.fromhex(dedup_key)
+        for keys in self._buckets.values():
+            if digest in keys:
+                keys.discard(digest)
+                self._size -= 1
+                break
+
+    def stats(self) -> dict:
+        return {
+            "dedup_checked": self.checked,
+            "dedup_duplicates": self.duplicates,
+            "dedup_evictions": self.evictions,
+            "dedup_keys_in_memory": self._size,
+        }
+
+    async def start(self) -> None:
+        if not self.repository:
+            return
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.bucket_seconds)
+            try:
+                cutoff = datetime.utcnow() - timedelta(seconds=self.window_seconds)
+                await self.repository.purge_older_than(cutoff)
+            except Exception as e:
+                logger.error(f"Failed to purge dedup keys: {e}")
+
+    def stop(self) -> None:
+        self._running = False
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from src.domain.entities.event_rollup import EventRollup, RollupGranularity
+from src.domain.entities.tracking_event import TrackingEvent
+from src.domain.ports.event_rollup_repository import EventRollupRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Per-minute event counters kept in memory for fresh reads and flushed as
+# upserts. A flush claims the recorded tracking events by flipping their
+# rolled_up flag and adds the counts of the rows it actually flipped, in one
+# transaction, so every event is counted exactly once whichever writer stored
+# it and in whatever order ids commit. Events nobody recorded in memory (bulk
+# loads, replays, a replica that crashed before flushing) are claimed by a
+# periodic sweep.
+class EventRollupAggregator:
+    def __init__(
+        self,
+        repository: EventRollupRepository,
+        flush_interval_seconds: float = 5.0,
+        compaction_interval_seconds: float = 300.0,
+        minute_retention: timedelta = timedelta(hours=2),
+        hour_retention: timedelta = timedelta(days=2),
+        sweep_interval_seconds: float = 60.0,
+        sweep_chunk_size: int = 50_000,
+    ):
+        self.repository = repository
+        self.flush_interval_seconds = flush_interval_seconds
+        self.compaction_interval_seconds = compaction_interval_seconds
+        self.minute_retention = minute_retention
+        self.hour_retention = hour_retention
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.sweep_chunk_size = sweep_chunk_size
+        self._counts: dict[tuple[str, str, datetime], int] = defaultdict(int)
+        self._tracking_ids: list[int] = []
+        # Highest id seen by the previous sweep; the next one only claims up
+        # to it, leaving the events live replicas are about to flush alone
+        self._sweep_up_to = 0
+        self._flush_lock = asyncio.Lock()
+        self._running = False
+
+    async def recover(self) -> None:
+        # Everything unclaimed at startup is counted now; a live replica
+        # holding some of it in memory just finds it claimed on its flush
+        up_to = await self.repository.max_tracking_id()
+        swept = await self._sweep(up_to)
+        self._sweep_up_to = up_to
+        logger.info(
+            f"Rollup aggregator recovered {swept} unclaimed events up to id {up_to}"
+        )
+
+    async def sweep(self) -> int:
+        up_to = await self.repository.max_tracking_id()
+        swept = await self._sweep(self._sweep_up_to)
+        self._sweep_up_to = up_to
+        if swept:
+            logger.info(f"Rollup sweep claimed {swept} events missed by the flushes")
+        return swept
+
+    async def _sweep(self, up_to: int) -> int:
+        swept = 0
+        while True:
+            claimed = await self.repository.claim_unrolled(up_to, self.sweep_chunk_size)
+            swept += claimed
+            if claimed < self.sweep_chunk_size:
+                return swept
+
+    def record(self, tracking_id: int, tracking_event: TrackingEvent) -> None:
+        # Bucket by event time, so late and out-of-order events land correctly
+        bucket = tracking_event.timestamp.replace(second=0, microsecond=0)
+        key = (tracking_event.campaign_id, tracking_event.event_type, bucket)
+        self._counts[key] += 1
+        self._tracking_ids.append(tracking_id)
+
+    def pending(self, campaign_id: str) -> list[EventRollup]:
+        return [
+            EventRollup(
+                campaign_id=key_campaign_id,
+                event_type=event_type,
+                bucket_start=bucket,
+                count=count,
+            )
+            for (key_campaign_id, event_type, bucket), count in self._counts.items()
+            if key_campaign_id == campaign_id
+        ]
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._tracking_ids:
+                return 0
+            tracking_ids, self._tracking_ids = self._tracking_ids, []
+            counts, self._counts = self._counts, defaultdict(int)
+            try:
+                claimed = await self.repository.flush(tracking_ids)
+            except Exception:
+                # Put the events back so the next flush retries them
+                self._tracking_ids = tracking_ids + self._tracking_ids
+                for key, count in counts.items():
+                    self._counts[key] += count
+                raise
+            logger.info(f"Flushed {claimed} of {len(tracking_ids)} recorded events")
+            return claimed
+
+    async def compact(self, now: datetime | None = None) -> None:
+        now = now or datetime.utcnow()
+        # Cut-offs are aligned to the target bucket so whole hours/days move at once
+        minute_cutoff = (now - self.minute_retention).replace(
+            minute=0, second=0, microsecond=0
+        )
+        hour_cutoff = (now - self.hour_retention).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        await self.repository.compact(
+            RollupGranularity.MINUTE, RollupGranularity.HOUR, minute_cutoff
+        )
+        await self.repository.compact(
+            RollupGranularity.HOUR, RollupGranularity.DAY, hour_cutoff
+        )
+
+    async def start(self) -> None:
+        self._running = True
+        loop = asyncio.get_running_loop()
+        next_compaction = loop.time() + self.compaction_interval_seconds
+        next_sweep = loop.time() + self.sweep_interval_seconds
+        while self._running:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+                if loop.time() >= next_sweep:
+                    await self.sweep()
+                    next_sweep = loop.time() + self.sweep_interval_seconds
+                if loop.time() >= next_compaction:
+                    await self.compact()
+                    next_compaction = loop.time() + self.compaction_interval_seconds
+            except Exception as e:
+                logger.error(f"Rollup aggregator cycle failed: {e}")
+
+    async def stop(self) -> None:
+        logger.info("Stopping rollup aggregator")
+        self._running = False
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final rollup flush failed: {e}")
+        logger.info("Rollup aggregator stopped")
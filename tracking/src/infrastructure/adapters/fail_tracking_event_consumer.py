@@ -11,6 +11,7 @@ from src.application.commands.fail_tracking_event_command import (
 )
 from src.domain.ports.processed_message_repository import ProcessedMessageRepository
 from .schemas import FailTrackingEventRecord
+from .dead_letter_policy import DeadLetterPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +24,18 @@ class FailTrackingEventConsumer:
         pulsar_service_url: str = "pulsar://localhost:6650",
         topic: str = "persistent://miso-1-2025/default/fail-tracking-events",
         token: str = "",
+        batch_max_messages: int = 500,
+        batch_timeout_ms: int = 200,
+        dead_letter_policy: DeadLetterPolicy | None = None,
     ):
         self.handler = handler
         self.processed_message_repository = processed_message_repository
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.batch_max_messages = batch_max_messages
+        self.batch_timeout_ms = batch_timeout_ms
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
         self.client = None
         self.consumer = None
 
@@ -51,16 +58,28 @@ class FailTrackingEventConsumer:
                 "fail-tracking-consumer-debug2",
                 schema=AvroSchema(FailTrackingEventRecord),
                 initial_position=pulsar.InitialPosition.Earliest,
+                batch_receive_policy=pulsar.ConsumerBatchReceivePolicy(
+                    self.batch_max_messages, 10 * 1024 * 1024, self.batch_timeout_ms
+                ),
+                **self.dead_letter_policy.subscribe_options(),
+            )
+            await self.dead_letter_policy.attach(
+                self.client, self.consumer, self.topic, "fail-tracking-consumer-debug2"
             )
             logger.info(f"Subscribed to topic: {self.topic}")
         except Exception as e:
             logger.error(f"Failed to start FailTrackingEventConsumer: {e}")
             raise
 
+        if self.batch_max_messages > 1:
+            await self._consume_batches()
+            return
+
         while True:
             if asyncio.current_task().cancelled():
                 break
             msg = None
+            permanent = True
             try:
                 msg = await asyncio.to_thread(self.consumer.receive)
                 logger.info("Received fail tracking event message from Pulsar")
@@ -73,6 +92,7 @@ class FailTrackingEventConsumer:
                 tracking_id_str = record.tracking_id
                 logger.info(f"Record received: tracking_id={tracking_id_str}")
                 command = FailTrackingEventCommand(tracking_id=int(tracking_id_str))
+                permanent = False
                 logger.info(f"Created command for tracking_id: {command.tracking_id}")
                 await self.handler.handle(command)
                 await self.processed_message_repository.mark_processed(message_id)
@@ -86,12 +106,73 @@ class FailTrackingEventConsumer:
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 if msg:
-                    self.consumer.negative_acknowledge(msg)
+                    # A tracking_id that does not parse is never retried
+                    await self.dead_letter_policy.fail(msg, e, permanent)
+
+    async def _consume_batches(self):
+        # Fail events arrive in bursts; a whole burst is compensated with one
+        # UPDATE and one multi-row saga insert, then acknowledged cumulatively
+        while True:
+            if asyncio.current_task().cancelled():
+                break
+            messages = []
+            try:
+                messages = list(await asyncio.to_thread(self.consumer.batch_receive))
+                if not messages:
+                    continue
+                logger.info(f"Received batch of {len(messages)} fail tracking events")
+                await self._process_batch(messages)
+            except pulsar.Interrupted:
+                logger.info("Consumer interrupted, shutting down")
+                break
+            except Exception as e:
+                logger.error(f"Error processing batch of fail tracking events: {e}")
+                for msg in messages:
+                    await self.dead_letter_policy.fail(msg, e)
+
+    async def _process_batch(self, messages: list) -> None:
+        message_ids = [str(msg.message_id()) for msg in messages]
+        already_processed = await self.processed_message_repository.get_processed(
+            message_ids
+        )
+        commands = []
+        newly_processed = []
+        valid = []
+        invalid = []
+        for msg, message_id in zip(messages, message_ids):
+            if message_id in already_processed:
+                valid.append(msg)
+                continue
+            try:
+                tracking_id = int(msg.value().tracking_id)
+            except Exception as e:
+                logger.error(f"Invalid fail tracking event {message_id}: {e}")
+                invalid.append((msg, e))
+                continue
+            commands.append(FailTrackingEventCommand(tracking_id=tracking_id))
+            newly_processed.append(message_id)
+            valid.append(msg)
+
+        if commands:
+            await self.handler.handle_batch(commands)
+        await self.processed_message_repository.mark_processed_many(newly_processed)
+
+        # Individual acks, which the client groups on the wire: a cumulative
+        # ack would also cover earlier messages still waiting for a retry
+        for msg in valid:
+            self.consumer.acknowledge(msg)
+        for msg, error in invalid:
+            await self.dead_letter_policy.fail(msg, error, permanent=True)
+        logger.info(
+            f"Fail tracking batch processed: {len(commands)} compensated, "
+            f"{len(already_processed)} already processed, {len(invalid)} invalid"
+        )
 
     def stop(self):
         logger.info("Stopping fail tracking event consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Fail tracking event consumer stopped")
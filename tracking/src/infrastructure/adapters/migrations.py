@@ -0,0 +1,233 @@
+from .schema_migrator import Migration
+
+# Applied in order by migrate.py; never edit a released migration, add a new one.
+# Version 1 uses IF NOT EXISTS so databases created by metadata.create_all
+# are adopted as they are.
+MIGRATIONS = [
+    Migration(
+        1,
+        "baseline schema",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS tracking_events (
+                id SERIAL PRIMARY KEY,
+                campaign_id VARCHAR(255) NOT NULL,
+                event_type VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS saga_logs (
+                id SERIAL PRIMARY KEY,
+                saga_id VARCHAR(255) NOT NULL,
+                step VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                details TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS processed_messages (
+                id SERIAL PRIMARY KEY,
+                message_id VARCHAR(255) NOT NULL UNIQUE,
+                processed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS event_rollups (
+                id SERIAL PRIMARY KEY,
+                campaign_id VARCHAR(255) NOT NULL,
+                event_type VARCHAR(50) NOT NULL,
+                granularity VARCHAR(10) NOT NULL,
+                bucket_start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                count BIGINT NOT NULL,
+                CONSTRAINT uq_event_rollups_bucket
+                    UNIQUE (campaign_id, event_type, granularity, bucket_start)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS rollup_watermarks (
+                name VARCHAR(100) PRIMARY KEY,
+                last_tracking_id BIGINT NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS event_dedup_keys (
+                dedup_key VARCHAR(64) PRIMARY KEY,
+                seen_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_event_dedup_keys_seen_at ON event_dedup_keys (seen_at)",
+            """
+            CREATE TABLE IF NOT EXISTS bulk_load_checkpoints (
+                job VARCHAR(100) NOT NULL,
+                chunk_key VARCHAR(1024) NOT NULL,
+                position BIGINT NOT NULL,
+                rows_loaded BIGINT NOT NULL,
+                completed BOOLEAN NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (job, chunk_key)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS replay_checkpoints (
+                name VARCHAR(100) PRIMARY KEY,
+                topic VARCHAR(255) NOT NULL,
+                message_id BYTEA NOT NULL,
+                processed BIGINT NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS saga_state (
+                saga_id VARCHAR(255) PRIMARY KEY,
+                current_step VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                started_at TIMESTAMP WITHOUT TIME ZONE,
+                tracking_saved_at TIMESTAMP WITHOUT TIME ZONE,
+                commission_published_at TIMESTAMP WITHOUT TIME ZONE,
+                commission_failed_at TIMESTAMP WITHOUT TIME ZONE,
+                compensation_completed_at TIMESTAMP WITHOUT TIME ZONE,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                last_error TEXT
+            )
+            """,
+            # Added after saga_state first shipped; create_all never altered it
+            "ALTER TABLE saga_state ADD COLUMN IF NOT EXISTS commission_completed_at TIMESTAMP WITHOUT TIME ZONE",
+            "ALTER TABLE saga_state ADD COLUMN IF NOT EXISTS retry_count INTEGER NOT NULL DEFAULT 0",
+        ),
+    ),
+    Migration(
+        2,
+        "hot-path indexes",
+        (
+            # Saga history lookups and per-step status updates
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_saga_logs_saga_id_step ON saga_logs (saga_id, step)",
+            # Event series for one campaign over a time range
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_event_rollups_campaign_bucket ON event_rollups (campaign_id, bucket_start)",
+            # Rollup compaction of one granularity older than a cutoff
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_event_rollups_granularity_bucket ON event_rollups (granularity, bucket_start)",
+            # Stuck saga scan; only sagas waiting on comissions are indexed
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_saga_state_awaiting_commission ON saga_state (updated_at) "
+            "WHERE current_step = 'commission_published'",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        3,
+        "claim-based event rollups",
+        (
+            # The single max tracking_id watermark missed events committed
+            # below it after a flush (bulk loads, replays, other replicas).
+            # Each event now carries whether it is counted. Adding the column
+            # as true is a catalog-only change; only events above the old
+            # watermark are marked as still to count.
+            "ALTER TABLE tracking_events ADD COLUMN IF NOT EXISTS rolled_up BOOLEAN NOT NULL DEFAULT true",
+            "ALTER TABLE tracking_events ALTER COLUMN rolled_up SET DEFAULT false",
+            """
+            UPDATE tracking_events SET rolled_up = false
+            WHERE id > coalesce(
+                (SELECT last_tracking_id FROM rollup_watermarks WHERE name = 'event_rollups'),
+                0
+            )
+            """,
+            "DROP TABLE IF EXISTS rollup_watermarks",
+        ),
+    ),
+    Migration(
+        4,
+        "unrolled tracking events index",
+        (
+            # Only events still to be counted are indexed, so the rollup sweep
+            # costs in proportion to them, not to the table
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tracking_events_unrolled ON tracking_events (id) WHERE NOT rolled_up",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        5,
+        "bulk load job chunk sizes",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS bulk_load_jobs (
+                job VARCHAR(100) PRIMARY KEY,
+                chunk_bytes BIGINT NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        6,
+        "replay failures",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS replay_failures (
+                name VARCHAR(100) NOT NULL,
+                message_id BYTEA NOT NULL,
+                error TEXT,
+                failed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (name, message_id)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        7,
+        "tracking event of a dedup key",
+        (
+            # Nullable, so adding it does not rewrite the table; keys claimed
+            # before this migration age out with the dedup retention
+            "ALTER TABLE event_dedup_keys ADD COLUMN IF NOT EXISTS tracking_id INTEGER",
+        ),
+    ),
+]
+
+# Hot queries reported by `python migrate.py --explain`, run before and after
+# migrating to compare plans and latency
+HOT_QUERIES = [
+    (
+        "saga log history",
+        "SELECT * FROM saga_logs WHERE saga_id = :saga_id",
+        {"saga_id": "1"},
+    ),
+    (
+        "saga log status update",
+        "UPDATE saga_logs SET status = status WHERE saga_id = :saga_id AND step = :step",
+        {"saga_id": "1", "step": "commission_published"},
+    ),
+    (
+        "processed message lookup",
+        "SELECT message_id FROM processed_messages WHERE message_id = :message_id",
+        {"message_id": "(1,1,-1,-1)"},
+    ),
+    (
+        "campaign event series",
+        "SELECT event_type, date_trunc('hour', bucket_start), sum(count) FROM event_rollups "
+        "WHERE campaign_id = :campaign_id "
+        "AND bucket_start >= (now() at time zone 'utc') - interval '1 day' "
+        "GROUP BY 1, 2",
+        {"campaign_id": "campaign-1"},
+    ),
+    (
+        "rollup compaction",
+        "SELECT count(*) FROM event_rollups WHERE granularity = 'minute' "
+        "AND bucket_start < (now() at time zone 'utc') - interval '2 hours'",
+        {},
+    ),
+    (
+        "rollup sweep",
+        "SELECT id FROM tracking_events WHERE NOT rolled_up AND id <= :up_to_id "
+        "ORDER BY id LIMIT 50000 FOR UPDATE SKIP LOCKED",
+        {"up_to_id": 2147483647},
+    ),
+    (
+        "stuck saga scan",
+        "SELECT * FROM saga_state WHERE current_step = 'commission_published' "
+        "AND updated_at < (now() at time zone 'utc') - interval '5 minutes' "
+        "ORDER BY updated_at LIMIT 100",
+        {},
+    ),
+]
@@ -1,4 +1,18 @@
-from sqlalchemy import Table, Column, Integer, String, DateTime, Text, MetaData
+from sqlalchemy import (
+    Table,
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    DateTime,
+    Text,
+    Boolean,
+    LargeBinary,
+    MetaData,
+    UniqueConstraint,
+    Index,
+    text,
+)
 
 metadata = MetaData()
 
@@ -10,6 +24,13 @@ tracking_events_table = Table(
     Column("event_type", String(50), nullable=False),
     Column("status", String(20), nullable=False, default="success"),
     Column("timestamp", DateTime, nullable=False),
+    # Set once the event is counted in event_rollups
+    Column("rolled_up", Boolean, nullable=False, default=False),
+    Index(
+        "ix_tracking_events_unrolled",
+        "id",
+        postgresql_where=text("NOT rolled_up"),
+    ),
 )
 
 saga_logs_table = Table(
@@ -30,3 +51,98 @@ processed_messages_table = Table(
     Column("message_id", String(255), nullable=False, unique=True),
     Column("processed_at", DateTime, nullable=False),
 )
+
+# Pre-aggregated event counts per (campaign, event type, time bucket)
+event_rollups_table = Table(
+    "event_rollups",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("campaign_id", String(255), nullable=False),
+    Column("event_type", String(50), nullable=False),
+    Column("granularity", String(10), nullable=False),
+    Column("bucket_start", DateTime, nullable=False),
+    Column("count", BigInteger, nullable=False, default=0),
+    UniqueConstraint(
+        "campaign_id",
+        "event_type",
+        "granularity",
+        "bucket_start",
+        name="uq_event_rollups_bucket",
+    ),
+)
+
+# Recently seen ingestion keys, shared by all replicas for duplicate suppression
+event_dedup_keys_table = Table(
+    "event_dedup_keys",
+    metadata,
+    Column("dedup_key", String(64), primary_key=True),
+    Column("seen_at", DateTime, nullable=False, index=True),
+    Column("tracking_id", Integer, nullable=True),
+)
+
+# Progress of bulk backfill jobs, one row per file chunk
+bulk_load_checkpoints_table = Table(
+    "bulk_load_checkpoints",
+    metadata,
+    Column("job", String(100), primary_key=True),
+    Column("chunk_key", String(1024), primary_key=True),
+    Column("position", BigInteger, nullable=False),
+    Column("rows_loaded", BigInteger, nullable=False, default=0),
+    Column("completed", Boolean, nullable=False, default=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Chunk size of each bulk backfill job; its checkpoints are only valid for it
+bulk_load_jobs_table = Table(
+    "bulk_load_jobs",
+    metadata,
+    Column("job", String(100), primary_key=True),
+    Column("chunk_bytes", BigInteger, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+# Last message handled by each replay job, so a restarted replay resumes
+replay_checkpoints_table = Table(
+    "replay_checkpoints",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("topic", String(255), nullable=False),
+    Column("message_id", LargeBinary, nullable=False),
+    Column("processed", BigInteger, nullable=False, default=0),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Messages a replay job failed to process, retried when it resumes
+replay_failures_table = Table(
+    "replay_failures",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("message_id", LargeBinary, primary_key=True),
+    Column("error", Text, nullable=True),
+    Column("failed_at", DateTime, nullable=False),
+)
+
+# Current state of each saga, one row per saga_id maintained with upserts
+saga_state_table = Table(
+    "saga_state",
+    metadata,
+    Column("saga_id", String(255), primary_key=True),
+    Column("current_step", String(50), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("started_at", DateTime, nullable=True),
+    Column("tracking_saved_at", DateTime, nullable=True),
+    Column("commission_published_at", DateTime, nullable=True),
+    Column("commission_completed_at", DateTime, nullable=True),
+    Column("commission_failed_at", DateTime, nullable=True),
+    Column("compensation_completed_at", DateTime, nullable=True),
+    Column("updated_at", DateTime, nullable=False),
+    Column("last_error", Text, nullable=True),
+    Column("retry_count", Integer, nullable=False, default=0, server_default="0"),
+    # Only sagas waiting on comissions are indexed, so scanning for stuck
+    # sagas costs in proportion to in-flight sagas, not total history
+    Index(
+        "ix_saga_state_awaiting_commission",
+        "updated_at",
+        postgresql_where=text("current_step = 'commission_published'"),
+    ),
+)
@@ -0,0 +1,32 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import delete
+from src.domain.ports.event_dedup_repository import EventDedupRepository
+from .models import event_dedup_keys_table
+
+logger = logging.getLogger(__name__)
+
+
+# Keys are claimed by PostgresTrackingEventRepository.save in the transaction
+# that stores their event; this repository only expires them
+class PostgresEventDedupRepository(EventDedupRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    async def purge_older_than(self, cutoff: datetime) -> int:
+        session = self.sessionmaker()
+        try:
+            stmt = delete(event_dedup_keys_table).where(
+                event_dedup_keys_table.c.seen_at < cutoff
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+            logger.info(f"Purged {result.rowcount} dedup keys older than {cutoff}")
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Failed to purge dedup keys older than {cutoff}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -0,0 +1,216 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    func,
+    literal,
+    any_,
+    bindparam,
+    Integer,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.entities.event_rollup import EventRollup, RollupGranularity
+from src.domain.ports.event_rollup_repository import EventRollupRepository
+from .models import event_rollups_table, tracking_events_table
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresEventRollupRepository(EventRollupRepository):
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    def _upsert_counts(self, stmt):
+        # Counts are deltas, so a conflicting bucket is incremented, never replaced
+        return stmt.on_conflict_do_update(
+            constraint="uq_event_rollups_bucket",
+            set_={"count": event_rollups_table.c.count + stmt.excluded.count},
+        )
+
+    def _claim_and_count(self, tracking_ids: list[int]):
+        # Flips rolled_up on the given events that are still unclaimed and
+        # adds only those to their minute buckets, in a single statement that
+        # returns how many events it claimed
+        claimed = (
+            update(tracking_events_table)
+            .where(
+                tracking_events_table.c.id
+                == any_(bindparam("tracking_ids", tracking_ids, ARRAY(Integer))),
+                ~tracking_events_table.c.rolled_up,
+            )
+            .values(rolled_up=True)
+            .returning(
+                tracking_events_table.c.campaign_id,
+                tracking_events_table.c.event_type,
+                tracking_events_table.c.timestamp,
+            )
+            .cte("claimed")
+        )
+        bucket = func.date_trunc("minute", claimed.c.timestamp)
+        counted = select(
+            claimed.c.campaign_id,
+            claimed.c.event_type,
+            literal(RollupGranularity.MINUTE.value),
+            bucket,
+            func.count(),
+        ).group_by(claimed.c.campaign_id, claimed.c.event_type, bucket)
+        stmt = pg_insert(event_rollups_table).from_select(
+            ["campaign_id", "event_type", "granularity", "bucket_start", "count"],
+            counted,
+        )
+        upserted = self._upsert_counts(stmt).returning(literal(1)).cte("upserted")
+        return select(func.count()).select_from(claimed).add_cte(upserted)
+
+    async def flush(self, tracking_ids: list[int]) -> int:
+        logger.info(f"Flushing rollups of {len(tracking_ids)} tracking events")
+        session = self.sessionmaker()
+        try:
+            # Events a sweep has already claimed are skipped
+            result = await session.execute(self._claim_and_count(tracking_ids))
+            claimed = result.scalar_one()
+            await session.commit()
+            return claimed
+        except Exception as e:
+            logger.error(f"Failed to flush rollups of {len(tracking_ids)} events: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def claim_unrolled(self, up_to_id: int, limit: int) -> int:
+        session = self.sessionmaker()
+        try:
+            # SKIP LOCKED leaves events a concurrent flush is claiming to it
+            stmt = (
+                select(tracking_events_table.c.id)
+                .where(
+                    ~tracking_events_table.c.rolled_up,
+                    tracking_events_table.c.id <= up_to_id,
+                )
+                .order_by(tracking_events_table.c.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            tracking_ids = list((await session.execute(stmt)).scalars())
+            if tracking_ids:
+                await session.execute(self._claim_and_count(tracking_ids))
+            await session.commit()
+            # The selected events are locked, so all of them were claimed
+            return len(tracking_ids)
+        except Exception as e:
+            logger.error(f"Failed to claim unrolled events up to id {up_to_id}: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def max_tracking_id(self) -> int:
+        session = self.sessionmaker()
+        try:
+            stmt = select(func.max(tracking_events_table.c.id))
+            return (await session.execute(stmt)).scalar_one_or_none() or 0
+        finally:
+            await session.close()
+
+    async def compact(
+        self,
+        source: RollupGranularity,
+        target: RollupGranularity,
+        older_than: datetime,
+    ) -> int:
+        logger.info(
+            f"Compacting {source.value} rollups older than {older_than} into {target.value}"
+        )
+        session = self.sessionmaker()
+        try:
+            # Delete and re-insert in one statement so rows flushed concurrently
+            # are either moved whole or left for the next run, never lost
+            moved = (
+                delete(event_rollups_table)
+                .where(
+                    (event_rollups_table.c.granularity == source.value)
+                    & (event_rollups_table.c.bucket_start < older_than)
+                )
+                .returning(
+                    event_rollups_table.c.campaign_id,
+                    event_rollups_table.c.event_type,
+                    event_rollups_table.c.bucket_start,
+                    event_rollups_table.c.count,
+                )
+                .cte("moved")
+            )
+            bucket = func.date_trunc(target.value, moved.c.bucket_start)
+            rolled = select(
+                moved.c.campaign_id,
+                moved.c.event_type,
+                literal(target.value),
+                bucket,
+                func.sum(moved.c.count),
+            ).group_by(moved.c.campaign_id, moved.c.event_type, bucket)
+            stmt = pg_insert(event_rollups_table).from_select(
+                ["campaign_id", "event_type", "granularity", "bucket_start", "count"],
+                rolled,
+            )
+            stmt = self._upsert_counts(stmt).add_cte(moved)
+            result = await session.execute(stmt)
+            await session.commit()
+            logger.info(
+                f"Compacted {source.value} rollups into {result.rowcount} {target.value} buckets"
+            )
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Failed to compact {source.value} rollups: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def get_series(
+        self,
+        campaign_id: str,
+        granularity: RollupGranularity,
+        start: datetime,
+        end: datetime,
+        event_type: str | None = None,
+    ) -> list[EventRollup]:
+        session = self.sessionmaker()
+        try:
+            # Finer rows are truncated up to the requested bucket; rows already
+            # compacted to a coarser level are reported at their own bucket start
+            bucket = func.date_trunc(
+                granularity.value, event_rollups_table.c.bucket_start
+            ).label("bucket_start")
+            conditions = (
+                (event_rollups_table.c.campaign_id == campaign_id)
+                & (event_rollups_table.c.bucket_start >= start)
+                & (event_rollups_table.c.bucket_start < end)
+            )
+            if event_type:
+                conditions = conditions & (event_rollups_table.c.event_type == event_type)
+            stmt = (
+                select(
+                    event_rollups_table.c.event_type,
+                    bucket,
+                    func.sum(event_rollups_table.c.count).label("count"),
+                )
+                .where(conditions)
+                .group_by(event_rollups_table.c.event_type, bucket)
+                .order_by(bucket, event_rollups_table.c.event_type)
+            )
+            result = await session.execute(stmt)
+            return [
+                EventRollup(
+                    campaign_id=campaign_id,
+                    event_type=row.event_type,
+                    granularity=granularity,
+                    bucket_start=row.bucket_start,
+                    count=row.count,
+                )
+                for row in result.fetchall()
+            ]
+        finally:
+            await session.close()
@@ -2,6 +2,7 @@ import logging
 from datetime import datetime
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from src.domain.ports.processed_message_repository import ProcessedMessageRepository
 from .models import processed_messages_table
 
@@ -24,6 +25,45 @@ class PostgresProcessedMessageRepository(ProcessedMessageRepository):
         finally:
             await session.close()
 
+    async def get_processed(self, message_ids: list[str]) -> set[str]:
+        session = self.sessionmaker()
+        try:
+            stmt = select(processed_messages_table.c.message_id).where(
+                processed_messages_table.c.message_id.in_(message_ids)
+            )
+            result = await session.execute(stmt)
+            return set(result.scalars().all())
+        finally:
+            await session.close()
+
+    async def mark_processed_many(self, message_ids: list[str]) -> None:
+        if not message_ids:
+            return
+        session = self.sessionmaker()
+        try:
+            processed_at = datetime.utcnow()
+            stmt = (
+                pg_insert(processed_messages_table)
+                .values(
+                    [
+                        {"message_id": message_id, "processed_at": processed_at}
+                        for message_id in message_ids
+                    ]
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[processed_messages_table.c.message_id]
+                )
+            )
+            await session.execute(stmt)
+            await session.commit()
+            logger.info(f"{len(message_ids)} messages marked as processed")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Failed to mark {len(message_ids)} messages as processed: {e}")
+            raise
+        finally:
+            await session.close()
+
     async def mark_processed(self, message_id: str) -> None:
         session = self.sessionmaker()
         try:
@@ -8,6 +8,33 @@ from .models import saga_logs_table
 logger = logging.getLogger(__name__)
 
 
+# Statement builders are shared with the saga state repository, which writes
+# sampled detail rows in the same transaction as the state upsert
+def insert_saga_logs(saga_logs: list[SagaLog]):
+    return insert(saga_logs_table).values(
+        [
+            {
+                "saga_id": saga_log.saga_id,
+                "step": saga_log.step,
+                "status": saga_log.status,
+                "timestamp": saga_log.timestamp,
+                "details": saga_log.details,
+            }
+            for saga_log in saga_logs
+        ]
+    )
+
+
+def update_saga_log_status(saga_id: str, step: str, status: str):
+    return (
+        update(saga_logs_table)
+        .where(
+            (saga_logs_table.c.saga_id == saga_id) & (saga_logs_table.c.step == step)
+        )
+        .values(status=status)
+    )
+
+
 class PostgresSagaLogRepository(SagaLogRepository):
     def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
         self.sessionmaker = sessionmaker
@@ -42,6 +69,20 @@ class PostgresSagaLogRepository(SagaLogRepository):
         finally:
             await session.close()
 
+    async def save_many(self, saga_logs: list[SagaLog]) -> None:
+        if not saga_logs:
+            return
+        logger.info(f"Saving {len(saga_logs)} saga logs in one insert")
+        session = self.sessionmaker()
+        try:
+            await session.execute(insert_saga_logs(saga_logs))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
     async def get_by_saga_id(self, saga_id: str) -> list[SagaLog]:
         logger.info(f"Retrieving saga logs for saga_id: {saga_id}")
         session = self.sessionmaker()
@@ -69,15 +110,9 @@ class PostgresSagaLogRepository(SagaLogRepository):
         logger.info(f"Updating status for saga_id: {saga_id}, step: {step} to {status}")
         session = self.sessionmaker()
         try:
-            stmt = (
-                update(saga_logs_table)
-                .where(
-                    (saga_logs_table.c.saga_id == saga_id)
-                    & (saga_logs_table.c.step == step)
-                )
-                .values(status=status)
+            result = await session.execute(
+                update_saga_log_status(saga_id, step, status)
             )
-            result = await session.execute(stmt)
             logger.info(
                 f"Update executed for saga_id {saga_id}, step {step}, rows affected: {result.rowcount}"
             )
@@ -1,9 +1,12 @@
 import logging
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy import insert
+from datetime import datetime
+from sqlalchemy import insert, select, update, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from src.domain.entities.tracking_event import TrackingEvent
 from src.domain.ports.tracking_event_repository import TrackingEventRepository
-from .models import tracking_events_table
+from .models import tracking_events_table, event_dedup_keys_table
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +15,9 @@ class PostgresTrackingEventRepository(TrackingEventRepository):
     def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
         self.sessionmaker = sessionmaker
 
-    async def save(self, tracking_event: TrackingEvent) -> int:
+    async def save(
+        self, tracking_event: TrackingEvent, dedup_key: str | None = None
+    ) -> int | None:
         logger.info(
             f"Saving tracking event to database for campaign: {tracking_event.campaign_id}, event: {tracking_event.event_type}"
         )
@@ -30,6 +35,27 @@ class PostgresTrackingEventRepository(TrackingEventRepository):
             )
             result = await session.execute(stmt)
             tracking_id = result.scalar_one()
+            if dedup_key:
+                # The key commits with the event or not at all, so a crash in
+                # between never leaves a claimed key without its event. A
+                # replica inserting the same key waits for this transaction.
+                # The key records its event so a redelivery can resume the saga.
+                claim = (
+                    pg_insert(event_dedup_keys_table)
+                    .values(
+                        dedup_key=dedup_key,
+                        seen_at=datetime.utcnow(),
+                        tracking_id=tracking_id,
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=[event_dedup_keys_table.c.dedup_key]
+                    )
+                    .returning(event_dedup_keys_table.c.dedup_key)
+                )
+                if (await session.execute(claim)).scalar_one_or_none() is None:
+                    await session.rollback()
+                    logger.info(f"Tracking event with dedup key {dedup_key} already stored")
+                    return None
             await session.commit()
             logger.info(
                 f"Tracking event saved successfully for campaign: {tracking_event.campaign_id} with id: {tracking_id}"
@@ -41,12 +67,41 @@ class PostgresTrackingEventRepository(TrackingEventRepository):
         finally:
             await session.close()
 
+    async def get_id_by_dedup_key(self, dedup_key: str) -> int | None:
+        session = self.sessionmaker()
+        try:
+            stmt = select(event_dedup_keys_table.c.tracking_id).where(
+                event_dedup_keys_table.c.dedup_key == dedup_key
+            )
+            return (await session.execute(stmt)).scalar_one_or_none()
+        finally:
+            await session.close()
+
+    async def get_many(self, tracking_ids: list[int]) -> list[TrackingEvent]:
+        session = self.sessionmaker()
+        try:
+            stmt = select(tracking_events_table).where(
+                tracking_events_table.c.id
+                == any_(bindparam("tracking_ids", tracking_ids, ARRAY(Integer)))
+            )
+            result = await session.execute(stmt)
+            return [
+                TrackingEvent(
+                    id=row.id,
+                    campaign_id=row.campaign_id,
+                    event_type=row.event_type,
+                    status=row.status,
+                    timestamp=row.timestamp,
+                )
+                for row in result.fetchall()
+            ]
+        finally:
+            await session.close()
+
     async def update_status(self, tracking_id: int, status: str) -> None:
         logger.info(f"Updating status of tracking event {tracking_id} to {status}")
         session = self.sessionmaker()
         try:
-            from sqlalchemy import update
-
             stmt = (
                 update(tracking_events_table)
                 .where(tracking_events_table.c.id == tracking_id)
@@ -66,3 +121,30 @@ class PostgresTrackingEventRepository(TrackingEventRepository):
             raise
         finally:
             await session.close()
+
+    async def update_status_many(self, tracking_ids: list[int], status: str) -> int:
+        logger.info(f"Updating status of {len(tracking_ids)} tracking events to {status}")
+        session = self.sessionmaker()
+        try:
+            stmt = (
+                update(tracking_events_table)
+                .where(
+                    # One array parameter: id = ANY($1), whatever the batch size
+                    tracking_events_table.c.id
+                    == any_(bindparam("tracking_ids", tracking_ids, ARRAY(Integer)))
+                )
+                .values(status=status)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+            if result.rowcount < len(tracking_ids):
+                logger.info(
+                    f"{len(tracking_ids) - result.rowcount} of {len(tracking_ids)} tracking events not found to update"
+                )
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Failed to update status for {len(tracking_ids)} tracking events: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -1,6 +1,7 @@
 import pulsar
 import asyncio
 import logging
+from datetime import datetime
 from pulsar.schema import AvroSchema
 from src.application.handlers.register_tracking_event_handler import (
     RegisterTrackingEventHandler,
@@ -10,10 +11,33 @@ from src.application.commands.register_tracking_event_command import (
 )
 from src.domain.entities.tracking_event import TrackingEvent
 from .schemas import TrackingEventRecord
+from .event_deduplicator import EventDeduplicator
+from .dead_letter_policy import DeadLetterPolicy
 
 logger = logging.getLogger(__name__)
 
 
+def record_to_tracking_event(record: TrackingEventRecord) -> TrackingEvent:
+    data = {
+        "campaign_id": record.campaign_id,
+        "event_type": record.event_type,
+        "timestamp": datetime.fromisoformat(
+            record.timestamp.replace("Z", "+00:00")
+        ).replace(tzinfo=None),
+    }
+    return TrackingEvent(**data)
+
+
+def record_dedup_key(record: TrackingEventRecord) -> str:
+    return EventDeduplicator.dedup_key(
+        record.campaign_id,
+        record.event_type,
+        record.timestamp,
+        record.source,
+        record.event_id,
+    )
+
+
 class PulsarConsumer:
     def __init__(
         self,
@@ -21,11 +45,15 @@ class PulsarConsumer:
         pulsar_service_url: str = "pulsar://localhost:6650",
         topic: str = "persistent://miso-1-2025/default/campaign-tracking-events",
         token: str = "",
+        deduplicator: EventDeduplicator | None = None,
+        dead_letter_policy: DeadLetterPolicy | None = None,
     ):
         self.handler = handler
         self.pulsar_service_url = pulsar_service_url
         self.topic = topic
         self.token = token
+        self.deduplicator = deduplicator
+        self.dead_letter_policy = dead_letter_policy or DeadLetterPolicy()
         self.client = None
         self.consumer = None
 
@@ -43,6 +71,10 @@ class PulsarConsumer:
             self.topic,
             "tracking-subscriber",
             schema=AvroSchema(TrackingEventRecord),
+            **self.dead_letter_policy.subscribe_options(),
+        )
+        await self.dead_letter_policy.attach(
+            self.client, self.consumer, self.topic, "tracking-subscriber"
         )
         logger.info(f"Subscribed to topic: {self.topic}")
 
@@ -50,6 +82,9 @@ class PulsarConsumer:
             if asyncio.current_task().cancelled():
                 break
             msg = None
+            dedup_key = None
+            # Events that cannot be decoded will never succeed
+            permanent = True
             try:
                 logger.info(
                     f"PulsarConsumer waiting for message on topic: {self.topic}"
@@ -57,18 +92,25 @@ class PulsarConsumer:
                 msg = await asyncio.to_thread(self.consumer.receive)
                 logger.info("Received tracking event message from Pulsar")
                 record = msg.value()
-                from datetime import datetime
-
-                data = {
-                    "campaign_id": record.campaign_id,
-                    "event_type": record.event_type,
-                    "timestamp": datetime.fromisoformat(
-                        record.timestamp.replace("Z", "+00:00")
-                    ).replace(tzinfo=None),
-                }
-                tracking_event = TrackingEvent(**data)
-                command = RegisterTrackingEventCommand(tracking_event)
-                await self.handler.handle(command)
+                tracking_event = record_to_tracking_event(record)
+                permanent = False
+                if self.deduplicator:
+                    dedup_key = record_dedup_key(record)
+                    if self.deduplicator.is_duplicate(dedup_key):
+                        logger.info(
+                            f"Duplicate tracking event for campaign {record.campaign_id} suppressed"
+                        )
+                        self.consumer.acknowledge(msg)
+                        continue
+                command = RegisterTrackingEventCommand(
+                    tracking_event,
+                    dedup_key if dedup_key and self.deduplicator.durable else None,
+                )
+                if await self.handler.handle(command) is None:
+                    self.deduplicator.durable_duplicate(dedup_key)
+                    logger.info(
+                        f"Duplicate tracking event for campaign {record.campaign_id} suppressed"
+                    )
                 self.consumer.acknowledge(msg)
                 logger.info(
                     f"Message processed successfully for campaign: {tracking_event.campaign_id}"
@@ -78,13 +120,16 @@ class PulsarConsumer:
                 break
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
+                if dedup_key:
+                    self.deduplicator.release(dedup_key)
                 if msg:
-                    self.consumer.negative_acknowledge(msg)
+                    await self.dead_letter_policy.fail(msg, e, permanent)
 
     def stop(self):
         logger.info("Stopping Pulsar consumer")
         if self.consumer:
             self.consumer.close()
+        self.dead_letter_policy.close()
         if self.client:
             self.client.close()
         logger.info("Pulsar consumer stopped")
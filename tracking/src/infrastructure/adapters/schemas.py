@@ -5,6 +5,8 @@ class TrackingEventRecord(Record):
     campaign_id = String()
     event_type = String()
     timestamp = String()  # ISO string
+    event_id = String()  # optional client-supplied id used for dedup
+    source = String()  # optional origin of the event
 
 
 class CommissionRecord(Record):
@@ -16,3 +18,7 @@ class CommissionRecord(Record):
 
 class FailTrackingEventRecord(Record):
     tracking_id = String()
+
+
+class CommissionCompletedRecord(Record):
+    tracking_id = String()
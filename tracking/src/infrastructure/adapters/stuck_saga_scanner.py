@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from src.application.handlers.recover_stuck_sagas_handler import (
+    RecoverStuckSagasHandler,
+)
+from src.application.commands.recover_stuck_sagas_command import (
+    RecoverStuckSagasCommand,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Periodically recovers sagas stuck waiting for their commission. Each pass
+# drains the backlog in batches, so one scan costs O(stuck sagas) rather than
+# O(all sagas).
+class StuckSagaScanner:
+    def __init__(
+        self,
+        handler: RecoverStuckSagasHandler,
+        command: RecoverStuckSagasCommand,
+        interval_seconds: float = 60.0,
+    ):
+        self.handler = handler
+        self.command = command
+        self.interval_seconds = interval_seconds
+        self.scans = 0
+        self.recovered = 0
+        self._running = False
+
+    async def scan(self) -> int:
+        total = 0
+        while True:
+            found = await self.handler.handle(self.command)
+            total += found
+            if found < self.command.batch_size:
+                break
+        self.scans += 1
+        self.recovered += total
+        if total:
+            logger.info(f"Stuck saga scan recovered {total} sagas")
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "stuck_saga_scans": self.scans,
+            "stuck_sagas_recovered": self.recovered,
+        }
+
+    async def start(self) -> None:
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.scan()
+            except Exception as e:
+                logger.error(f"Stuck saga scan failed: {e}")
+
+    def stop(self) -> None:
+        self._running = False
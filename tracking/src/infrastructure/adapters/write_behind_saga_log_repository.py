@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from src.domain.entities.saga_log import SagaLog
+from src.domain.ports.saga_log_repository import SagaLogRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Saga logs are audit data, so saves only append to a bounded buffer and a
+# background flusher group-commits them through the wrapped repository every
+# flush interval or whenever max_batch_size rows are waiting. When the
+# buffer is full, saves wait for the flusher (backpressure). In durable
+# mode a save returns only once its group commit has succeeded.
+class WriteBehindSagaLogRepository(SagaLogRepository):
+    def __init__(
+        self,
+        repository: SagaLogRepository,
+        flush_interval_ms: int = 50,
+        max_batch_size: int = 500,
+        max_buffered: int = 10_000,
+        durable: bool = False,
+    ):
+        self.repository = repository
+        self.flush_interval_ms = flush_interval_ms
+        self.max_batch_size = max_batch_size
+        self.max_buffered = max(max_buffered, max_batch_size)
+        self.durable = durable
+        self._buffer: list[SagaLog] = []
+        self._waiters: list[asyncio.Future] = []
+        self._batch_ready = asyncio.Event()
+        self._space_available = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._running = False
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.flush_failures = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+
+    async def _enqueue(self, saga_logs: list[SagaLog]) -> None:
+        if not saga_logs:
+            return
+        async with self._space_available:
+            if len(self._buffer) + len(saga_logs) > self.max_buffered:
+                self.backpressure_waits += 1
+                self._batch_ready.set()
+                await self._space_available.wait_for(
+                    lambda: not self._buffer
+                    or len(self._buffer) + len(saga_logs) <= self.max_buffered
+                )
+            self._buffer.extend(saga_logs)
+            waiter = None
+            if self.durable:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+        if len(self._buffer) >= self.max_batch_size:
+            self._batch_ready.set()
+        if waiter:
+            await waiter
+
+    async def save(self, saga_log: SagaLog) -> int:
+        # Row ids are not known until the group commit
+        await self._enqueue([saga_log])
+        return 0
+
+    async def save_many(self, saga_logs: list[SagaLog]) -> None:
+        await self._enqueue(saga_logs)
+
+    async def get_by_saga_id(self, saga_id: str) -> list[SagaLog]:
+        await self.flush()
+        return await self.repository.get_by_saga_id(saga_id)
+
+    async def update_status(self, saga_id: str, step: str, status: str) -> None:
+        # The row being updated may still be buffered
+        await self.flush()
+        await self.repository.update_status(saga_id, step, status)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            async with self._space_available:
+                batch, self._buffer = self._buffer, []
+                waiters, self._waiters = self._waiters, []
+                self._batch_ready.clear()
+            if not batch:
+                return
+            started = time.monotonic()
+            written = 0
+            try:
+                while written < len(batch):
+                    chunk = batch[written : written + self.max_batch_size]
+                    await self.repository.save_many(chunk)
+                    written += len(chunk)
+            except Exception as e:
+                self.flush_failures += 1
+                logger.error(
+                    f"Failed to flush {len(batch) - written} buffered saga logs: {e}"
+                )
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                if not waiters:
+                    # Nobody is waiting on these rows, so keep them for the
+                    # next flush instead of losing them
+                    async with self._space_available:
+                        self._buffer[:0] = batch[written:]
+                raise
+            finally:
+                async with self._space_available:
+                    self._space_available.notify_all()
+            self.flushes += 1
+            self.rows_flushed += written
+            self.last_flush_ms = (time.monotonic() - started) * 1000
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "saga_log_buffered": len(self._buffer),
+            "saga_log_flushes": self.flushes,
+            "saga_log_rows_flushed": self.rows_flushed,
+            "saga_log_rows_per_flush": (
+                self.rows_flushed / self.flushes if self.flushes else 0.0
+            ),
+            "saga_log_flush_failures": self.flush_failures,
+            "saga_log_backpressure_waits": self.backpressure_waits,
+            "saga_log_last_flush_ms": self.last_flush_ms,
+        }
+
+    async def start(self) -> None:
+        self._running = True
+        while self._running:
+            try:
+                await asyncio.wait_for(
+                    self._batch_ready.wait(), timeout=self.flush_interval_ms / 1000
+                )
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                await asyncio.sleep(self.flush_interval_ms / 1000)
+
+    async def stop(self) -> None:
+        # Synchronous final flush so nothing buffered is lost on shutdown
+        self._running = False
+        await self.flush()